@@ -14,7 +14,9 @@
 
 import logging
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from camel.messages import BaseMessage
@@ -32,8 +34,14 @@ from app.model.subscription_runtime import (
     apply_subscription_runtime,
     is_subscription_auth,
 )
-from app.service.task import ActionCreateAgentData, Agents, get_task_lock
+from app.service.task import (
+    ActionCreateAgentData,
+    Agents,
+    get_task_lock,
+    get_task_lock_if_exists,
+)
 from app.utils.event_loop_utils import _schedule_async_task
+from app.utils.model_clients import build_shared_model, model_client_key
 
 # OpenAI chat-completions streaming only returns token usage when
 # `stream_options.include_usage` is requested. Without it the request-level
@@ -52,6 +60,39 @@ _NATIVE_STREAM_USAGE_PLATFORMS = {
     "watsonx",
 }
 
+# Set while building pre-warmed agents: create_agent events are collected
+# here and announced when the agents are bound to a task.
+_deferred_create_events: ContextVar[list[ActionCreateAgentData] | None] = (
+    ContextVar("deferred_create_events", default=None)
+)
+
+
+@contextmanager
+def defer_create_agent_events() -> Iterator[list[ActionCreateAgentData]]:
+    r"""Collect create_agent events of agents built in this context.
+
+    Covers agents built in tasks and ``asyncio.to_thread`` calls started
+    inside the block, since both copy the current context.
+    """
+    events: list[ActionCreateAgentData] = []
+    token = _deferred_create_events.set(events)
+    try:
+        yield events
+    finally:
+        _deferred_create_events.reset(token)
+
+
+async def announce_created_agents(
+    project_id: str, events: list[ActionCreateAgentData]
+) -> None:
+    r"""Publish create_agent events collected by
+    :func:`defer_create_agent_events`."""
+    task_lock = get_task_lock_if_exists(project_id)
+    if task_lock is None:
+        return
+    for event in events:
+        await task_lock.put_queue(event)
+
 
 def agent_model(
     agent_name: str,
@@ -70,18 +111,19 @@ def agent_model(
         f"Creating agent: {agent_name} with id: {agent_id} "
         f"for project: {options.project_id}"
     )
-    # Use thread-safe scheduling to support parallel agent creation
-    _schedule_async_task(
-        task_lock.put_queue(
-            ActionCreateAgentData(
-                data={
-                    "agent_name": agent_name,
-                    "agent_id": agent_id,
-                    "tools": tool_names or [],
-                }
-            )
-        )
+    create_event = ActionCreateAgentData(
+        data={
+            "agent_name": agent_name,
+            "agent_id": agent_id,
+            "tools": tool_names or [],
+        }
     )
+    deferred_events = _deferred_create_events.get()
+    if deferred_events is not None:
+        deferred_events.append(create_event)
+    else:
+        # Use thread-safe scheduling to support parallel agent creation
+        _schedule_async_task(task_lock.put_queue(create_event))
 
     # Determine model configuration - use custom config if provided,
     # otherwise use task defaults
@@ -283,15 +325,33 @@ def agent_model(
             if isinstance(stream_options, dict):
                 stream_options.setdefault("include_usage", True)
 
-        return ModelFactory.create(
-            model_platform=effective_config["model_platform"],
-            model_type=effective_config["model_type"],
-            api_key=effective_config["api_key"],
-            url=effective_config["api_url"],
-            model_config_dict=model_config or None,
-            timeout=600,  # 10 minutes
-            **init_params,
+        # Agents hitting the same endpoint with the same credentials share
+        # one SDK client (and its keep-alive pool); the lease is released
+        # by TaskLock.cleanup.
+        timeout = 600  # 10 minutes
+        client_key = model_client_key(
+            effective_config["model_platform"],
+            effective_config["api_url"],
+            effective_config["api_key"],
+            init_params,
+            timeout,
+        )
+        model, lease = build_shared_model(
+            client_key,
+            lambda shared_clients: ModelFactory.create(
+                model_platform=effective_config["model_platform"],
+                model_type=effective_config["model_type"],
+                api_key=effective_config["api_key"],
+                url=effective_config["api_url"],
+                model_config_dict=model_config or None,
+                timeout=timeout,
+                **init_params,
+                **shared_clients,
+            ),
         )
+        if lease is not None:
+            task_lock.model_client_leases.append(lease)
+        return model
 
     model = build_model()
 
@@ -15,7 +15,6 @@
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
 
 from camel.toolkits import FileToolkit as BaseFileToolkit
 
@@ -34,13 +33,14 @@ from app.utils.listen.toolkit_listen import (
     listen_toolkit,
 )
 from app.utils.space_overlay_client import (
+    overlay_journal,
     path_write_lock,
-    post_overlay_write,
     relative_to_workdir,
     run_context_for_task,
-    sha256_of_file,
     should_record_overlay,
+    workdir_file_hash,
 )
+from app.utils.workspace_baseline import copy_up
 
 
 @dataclass(frozen=True)
@@ -50,18 +50,6 @@ class OverlayWriteContext:
     target_path: Path
 
 
-@dataclass(frozen=True)
-class PendingOverlayWrite:
-    run_context: RunContext
-    rel_path: str
-    target_path: Path
-    base_hash: str | None
-    status: Literal["added", "modified"]
-    file_hash: str | None
-    size: int
-    mode: int
-
-
 @auto_listen_toolkit(BaseFileToolkit)
 class FileToolkit(BaseFileToolkit, AbstractToolkit):
     agent_name: str = Agents.document_agent
@@ -97,6 +85,25 @@ class FileToolkit(BaseFileToolkit, AbstractToolkit):
             return None
         return OverlayWriteContext(context, rel_path, target_path)
 
+    def edit_file(
+        self, file_path: str, old_content: str, new_content: str
+    ) -> str:
+        copy_up(self._resolve_existing_filepath(file_path))
+        return super().edit_file(file_path, old_content, new_content)
+
+    def notebook_edit_cell(
+        self,
+        notebook_path: str,
+        new_source: str = "",
+        cell_id: str | None = None,
+        cell_type: str | None = None,
+        edit_mode: str = "replace",
+    ) -> str:
+        copy_up(self._resolve_existing_filepath(notebook_path))
+        return super().notebook_edit_cell(
+            notebook_path, new_source, cell_id, cell_type, edit_mode
+        )
+
     @listen_toolkit(
         BaseFileToolkit.write_to_file,
         lambda _,
@@ -116,19 +123,33 @@ class FileToolkit(BaseFileToolkit, AbstractToolkit):
     ) -> str:
         overlay_context = self._overlay_write_context(filename)
         if overlay_context is None:
+            # A copy-mode workdir may hardlink the file to a baseline blob
+            copy_up(Path(self.working_directory) / filename)
             res = super().write_to_file(
                 title, content, filename, encoding, use_latex
             )
         else:
-            pending_overlay_write: PendingOverlayWrite | None = None
+            run_context = overlay_context.run_context
+            journal = overlay_journal(run_context)
             with path_write_lock(
-                overlay_context.run_context.space_id,
-                overlay_context.run_context.project_id,
-                overlay_context.run_context.run_id,
+                run_context.space_id,
+                run_context.project_id,
+                run_context.run_id,
                 overlay_context.rel_path,
             ):
+                copy_up(overlay_context.target_path)
                 existed = overlay_context.target_path.exists()
-                base_hash = sha256_of_file(overlay_context.target_path)
+                # Only the first write of a path in a run needs its base;
+                # later writes merge into the same overlay.
+                base_hash = (
+                    None
+                    if journal.knows(overlay_context.rel_path)
+                    else workdir_file_hash(
+                        run_context,
+                        overlay_context.rel_path,
+                        overlay_context.target_path,
+                    )
+                )
                 res = super().write_to_file(
                     title, content, filename, encoding, use_latex
                 )
@@ -142,29 +163,13 @@ class FileToolkit(BaseFileToolkit, AbstractToolkit):
                         written_path = (
                             Path(self.working_directory) / written_path
                         )
-                    written_hash = sha256_of_file(written_path)
-                    written_stat = written_path.stat()
-                    pending_overlay_write = PendingOverlayWrite(
-                        run_context=overlay_context.run_context,
-                        rel_path=overlay_context.rel_path,
-                        target_path=written_path,
+                    # Hashed and reported by the journal's flusher
+                    journal.record(
+                        overlay_context.rel_path,
+                        written_path,
                         base_hash=base_hash,
                         status="modified" if existed else "added",
-                        file_hash=written_hash,
-                        size=written_stat.st_size,
-                        mode=written_stat.st_mode,
                     )
-            if pending_overlay_write is not None:
-                post_overlay_write(
-                    pending_overlay_write.run_context,
-                    pending_overlay_write.rel_path,
-                    pending_overlay_write.target_path,
-                    base_hash=pending_overlay_write.base_hash,
-                    status=pending_overlay_write.status,
-                    file_hash=pending_overlay_write.file_hash,
-                    size=pending_overlay_write.size,
-                    mode=pending_overlay_write.mode,
-                )
         if "Content successfully written to file: " in res:
             task_lock = get_task_lock(self.api_task_id)
             # Capture ContextVar value before creating async task
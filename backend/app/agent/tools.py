@@ -16,8 +16,6 @@ import asyncio
 import logging
 import os
 
-from camel.toolkits import MCPToolkit
-
 from app.agent.toolkit.abstract_toolkit import AbstractToolkit
 from app.agent.toolkit.audio_analysis_toolkit import AudioAnalysisToolkit
 from app.agent.toolkit.excel_toolkit import ExcelToolkit
@@ -45,6 +43,7 @@ from app.agent.toolkit.whatsapp_toolkit import WhatsAppToolkit
 from app.component.environment import env
 from app.hands.interface import IHands
 from app.model.chat import McpServers
+from app.utils.mcp_pool import get_pooled_mcp_tools
 
 logger = logging.getLogger(__name__)
 
@@ -164,16 +163,15 @@ async def get_mcp_tools(
                 "MCP_REMOTE_CONFIG_DIR", os.path.expanduser("~/.mcp-auth")
             )
 
-    mcp_toolkit = None
     try:
-        mcp_toolkit = MCPToolkit(config_dict=config_dict, timeout=180)
-        await mcp_toolkit.connect()
+        # Servers stay connected in the Brain-wide pool across tasks, so
+        # only the first workforce pays for process spawn and handshake.
+        tools = await get_pooled_mcp_tools(config_dict["mcpServers"])
 
         logger.info(
-            f"Successfully connected to MCP toolkit with "
+            f"Got {len(tools)} MCP tools from "
             f"{len(mcp_server['mcpServers'])} servers"
         )
-        tools = mcp_toolkit.get_tools()
         if tools:
             tool_names = [
                 (
@@ -27,7 +27,8 @@ from fastapi.responses import FileResponse
 from starlette.concurrency import run_in_threadpool
 
 from app.component.environment import env
-from app.utils.file_utils import list_files, resolve_under_base
+from app.utils.file_index import indexed_files
+from app.utils.file_utils import resolve_under_base
 from app.utils.workspace_paths import runtime_owner_key, task_dir_name
 from app.utils.workspace_resolver import get_workspace_resolver
 
@@ -245,7 +246,7 @@ async def list_project_files(
         async with FILE_LIST_SEMAPHORE:
             paths = await run_in_threadpool(
                 partial(
-                    list_files,
+                    indexed_files,
                     list_dir,
                     base=base_path,
                     max_entries=500,
@@ -263,15 +264,14 @@ async def list_project_files(
     )
     log(
         "list_project_files: project_id=%s space_id=%s task_id=%s count=%d "
-        "elapsed_ms=%.1f scan_ms=%.1f realpath_ms=%.1f symlinks=%d root=%s",
+        "elapsed_ms=%.1f scanned_dirs=%d indexed_dirs=%d root=%s",
         project_id,
         space_id,
         task_id,
         len(paths),
         elapsed_ms,
-        float(stats.get("scan_elapsed_ms", 0)),
-        float(stats.get("realpath_elapsed_ms", 0)),
-        int(stats.get("symlink_count", 0)),
+        int(stats.get("scanned_dirs", 0)),
+        int(stats.get("indexed_dirs", 0)),
         _redacted_path_suffix(project_root),
     )
     result: list[dict] = []
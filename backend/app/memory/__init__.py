@@ -14,9 +14,9 @@
 
 """Local-first Project memory (see docs/core/space-project-memory-local-first-design.md).
 
-Provides schema dataclasses, path helpers, LocalMemoryStore, context assembly,
-and best-effort runtime lifecycle hooks for chat_controller, Single Agent, and
-Workforce.
+Provides schema dataclasses, path helpers, LocalMemoryStore (plus the
+SqliteMemoryStore alternative), context assembly, and best-effort runtime
+lifecycle hooks for chat_controller, Single Agent, and Workforce.
 """
 
 from app.memory.context_builder import (
@@ -51,6 +51,11 @@ from app.memory.service import (
     finalize_task_lock_run_memory,
     get_memory_service,
 )
+from app.memory.sqlite_store import (
+    MemoryStore,
+    SqliteMemoryStore,
+    migrate_local_store_to_sqlite,
+)
 
 __all__ = [
     "SCHEMA_VERSION",
@@ -61,17 +66,20 @@ __all__ = [
     "MemoryArtifact",
     "MemoryFact",
     "MemoryService",
+    "MemoryStore",
     "ProjectContextBuilder",
     "ProjectMemory",
     "RunMemory",
     "RunStatus",
     "SpaceMemory",
+    "SqliteMemoryStore",
     "SyncSettings",
     "ToolEvent",
     "build_durable_context_for_task_lock",
     "canonical_user_id",
     "finalize_task_lock_run_memory",
     "get_memory_service",
+    "migrate_local_store_to_sqlite",
     "memory_root",
     "project_dir",
     "run_dir",
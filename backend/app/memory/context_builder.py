@@ -20,6 +20,10 @@ Callers usually do not consume the bundle directly; they call
 prompt. Keeping rendering separate from data lets future callers (audit,
 diagnostics, alternative model formats) reuse the same fetched payload.
 
+Reads go through `LocalMemoryStore.cached_read`, so back-to-back builds for
+the same Project (next run, workforce worker fan-out) only stat the source
+files and reuse the parsed, pre-ranked payload unless something changed.
+
 Token budget is a rough char-based proxy: 1 token ~= 4 chars matches what
 chatStore.ts uses on the frontend side. Section weights are tuned so the most
 important continuity signal -- recent assistant/user turns -- gets the
@@ -28,11 +32,18 @@ majority share.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
 from typing import Literal
 
-from app.memory.events import ConversationEvent, MemoryArtifact, MemoryFact
-from app.memory.local_store import LocalMemoryStore
+from app.memory.events import (
+    ConversationEvent,
+    MemoryArtifact,
+    MemoryFact,
+    ProjectMemory,
+    SpaceMemory,
+)
+from app.memory.sqlite_store import MemoryStore
 
 # Section weights when allocating a token budget. They sum to ~1.0 plus a
 # small slack so the final assembled prompt rarely overshoots.
@@ -171,6 +182,17 @@ class AgentContextBundle:
         return "\n\n".join(sections)
 
 
+def _rank_facts(facts: Iterable[MemoryFact]) -> list[MemoryFact]:
+    return sorted(facts, key=lambda f: f.confidence, reverse=True)
+
+
+def _rank_artifacts(
+    artifacts: Iterable[MemoryArtifact],
+) -> list[MemoryArtifact]:
+    # Most recent first; created_at is ISO string so lex sort works.
+    return sorted(artifacts, key=lambda a: a.created_at, reverse=True)
+
+
 def _section(label: str, name: str, body: str) -> str:
     title = f"{label}: {name}".strip(": ").rstrip() if name else label
     body = body.strip()
@@ -180,11 +202,81 @@ def _section(label: str, name: str, body: str) -> str:
 
 
 class ProjectContextBuilder:
-    """Reads LocalMemoryStore + assembles a budgeted AgentContextBundle."""
+    """Reads a memory store + assembles a budgeted AgentContextBundle."""
 
-    def __init__(self, store: LocalMemoryStore) -> None:
+    def __init__(self, store: MemoryStore) -> None:
         self._store = store
 
+    def _load_sources(
+        self, user_key: str, space_id: str, project_id: str
+    ) -> tuple[
+        SpaceMemory | None,
+        ProjectMemory | None,
+        str,
+        list[MemoryFact],
+        list[MemoryArtifact],
+        list[ConversationEvent],
+    ]:
+        """Fetch the Project's memory files through the store's read cache.
+
+        Facts come back ranked by confidence and artifacts filtered to
+        context-eligible ones ranked newest-first, so a cache hit skips both
+        the JSON decode and the sort. Returned lists are shared; do not
+        mutate them.
+        """
+
+        store = self._store
+        space_path = store.space_path(user_key, space_id)
+        project_path = store.project_path(user_key, space_id, project_id)
+        space = store.cached_read(
+            space_path / "space.json",
+            "space",
+            lambda: store.read_space(user_key, space_id),
+        )
+        project = store.cached_read(
+            project_path / "project.json",
+            "project",
+            lambda: store.read_project(user_key, space_id, project_id),
+        )
+        project_summary = store.cached_read(
+            project_path / "summary.md",
+            "summary",
+            lambda: store.read_project_summary(user_key, space_id, project_id),
+        )
+        ranked_facts = store.cached_read(
+            project_path / "facts.json",
+            "ranked_facts",
+            lambda: _rank_facts(
+                store.read_facts(user_key, space_id, project_id)
+            ),
+        )
+        ranked_artifacts = store.cached_read(
+            project_path / "artifacts.json",
+            "ranked_context_artifacts",
+            lambda: _rank_artifacts(
+                # Drop runtime-log artifacts; only context-eligible ones
+                # make it in.
+                art
+                for art in store.read_artifacts(user_key, space_id, project_id)
+                if art.eligible_for_context
+            ),
+        )
+        recent_conversation = store.cached_read(
+            project_path / "conversation.jsonl",
+            f"tail:{_MAX_RECENT_CONVO_EVENTS}",
+            lambda: store.read_conversation_tail(
+                user_key, space_id, project_id, limit=_MAX_RECENT_CONVO_EVENTS
+            ),
+        )
+        return (
+            space,
+            project,
+            project_summary,
+            ranked_facts,
+            ranked_artifacts,
+            recent_conversation,
+        )
+
     def build(
         self,
         *,
@@ -203,18 +295,14 @@ class ProjectContextBuilder:
         informational in this milestone.
         """
 
-        space = self._store.read_space(user_key, space_id)
-        project = self._store.read_project(user_key, space_id, project_id)
-        project_summary_raw = self._store.read_project_summary(
-            user_key, space_id, project_id
-        )
-        facts_raw = self._store.read_facts(user_key, space_id, project_id)
-        artifacts_raw = self._store.read_artifacts(
-            user_key, space_id, project_id
-        )
-        recent_conv_raw = self._store.read_conversation_tail(
-            user_key, space_id, project_id, limit=_MAX_RECENT_CONVO_EVENTS
-        )
+        (
+            space,
+            project,
+            project_summary_raw,
+            ranked_facts,
+            artifacts_in_context,
+            recent_conv_raw,
+        ) = self._load_sources(user_key, space_id, project_id)
 
         # Drop debug_only / audit_only events from the context view -- only
         # `context`-visibility turns may show up in prompts.
@@ -226,11 +314,6 @@ class ProjectContextBuilder:
             != run_id  # exclude the in-flight run's own prompt
         ]
 
-        # Drop runtime-log artifacts; only context-eligible ones make it in.
-        artifacts_in_context = [
-            art for art in artifacts_raw if art.eligible_for_context
-        ]
-
         header_budget = _chars_for(token_budget, _HEADER_WEIGHT)
         convo_budget = _chars_for(token_budget, _RECENT_CONVO_WEIGHT)
         artifacts_budget = _chars_for(token_budget, _ARTIFACTS_WEIGHT)
@@ -249,7 +332,7 @@ class ProjectContextBuilder:
         )
 
         # Facts: take top-confidence, char-trim by artifacts/todos budget.
-        relevant_facts = self._top_facts(facts_raw, todos_budget)
+        relevant_facts = self._top_facts(ranked_facts, todos_budget)
 
         relevant_artifacts = self._top_artifacts(
             artifacts_in_context, artifacts_budget
@@ -318,13 +401,14 @@ class ProjectContextBuilder:
 
     @staticmethod
     def _top_facts(
-        facts: list[MemoryFact], char_budget: int
+        ranked: list[MemoryFact], char_budget: int
     ) -> list[MemoryFact]:
-        if char_budget <= 0 or not facts:
+        """Greedy budget fit over facts already ordered by `_rank_facts`."""
+
+        if char_budget <= 0 or not ranked:
             return []
         framing = 4  # "- " prefix + newline
         marker = "... [truncated]"
-        ranked = sorted(facts, key=lambda f: f.confidence, reverse=True)
         kept: list[MemoryFact] = []
         used = 0
         for fact in ranked:
@@ -342,22 +426,20 @@ class ProjectContextBuilder:
             allowed = remaining - framing - len(marker)
             if allowed <= 0:
                 return []
-            from dataclasses import replace as _replace
-
-            kept.append(_replace(fact, text=fact.text[:allowed] + marker))
+            kept.append(replace(fact, text=fact.text[:allowed] + marker))
             break
         return kept
 
     @staticmethod
     def _top_artifacts(
-        artifacts: list[MemoryArtifact], char_budget: int
+        ranked: list[MemoryArtifact], char_budget: int
     ) -> list[MemoryArtifact]:
-        if char_budget <= 0 or not artifacts:
+        """Greedy budget fit over artifacts ordered by `_rank_artifacts`."""
+
+        if char_budget <= 0 or not ranked:
             return []
         framing = 8  # "- " + " (kind)" overhead
         marker = "... [truncated]"
-        # Most recent first; created_at is ISO string so lex sort works.
-        ranked = sorted(artifacts, key=lambda a: a.created_at, reverse=True)
         kept: list[MemoryArtifact] = []
         used = 0
         for art in ranked:
@@ -375,8 +457,6 @@ class ProjectContextBuilder:
             allowed = remaining - framing - len(art.kind) - len(marker)
             if allowed <= 0:
                 return []
-            from dataclasses import replace as _replace
-
-            kept.append(_replace(art, path=art.path[:allowed] + marker))
+            kept.append(replace(art, path=art.path[:allowed] + marker))
             break
         return kept
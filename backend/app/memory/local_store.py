@@ -20,19 +20,40 @@ by a per-path threading.Lock so concurrent writers in the same Brain process
 do not interleave lines (cross-process writes are out of scope -- single Brain
 per user is the design invariant).
 
+Appends are group-committed: a background thread collects pending lines,
+writes each file's batch in one call and fsyncs it once, waiting at most
+`fsync_max_latency_ms` for a batch to fill. `flush()` blocks until everything
+appended so far is durable; reads of a jsonl file flush it first so callers
+still read their own writes. A latency of 0 restores the synchronous
+write-and-fsync-per-line behaviour.
+
 Reads tolerate missing files: return None for `read_project`/`read_space`,
 return [] for list-returning helpers. First-time callers do not need a
 special "init" step -- writes auto-create parent directories.
+
+facts.json / artifacts.json upserts go to an append-only `<name>.log.jsonl`
+that is replayed over the snapshot on read and compacted into it once it
+grows past a size threshold, so an upsert costs O(1) instead of a full
+rewrite.
+
+`cached_read` memoises derived values per file, validated against the file's
+(st_mtime_ns, st_size) stamp (and that of its upsert log, if any). Writers
+in this module invalidate the entries for the file they touched, so
+in-process writes are visible immediately even when the filesystem's mtime
+granularity would hide them.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
 import tempfile
 import threading
+import time
 import weakref
+from collections.abc import Callable
 from dataclasses import asdict, fields, is_dataclass
 from pathlib import Path
 from typing import Any, TypeVar
@@ -60,6 +81,9 @@ logger = logging.getLogger("memory.local_store")
 
 T = TypeVar("T")
 
+# (st_mtime_ns, st_size) of a file, or None when it does not exist.
+_FileStamp = tuple[int, int] | None
+
 # Per-path locks so two coroutines / threads cannot interleave lines in the
 # same jsonl file. WeakValueDictionary so unused locks GC after their last
 # holder releases.
@@ -104,6 +128,14 @@ def _atomic_write_json(path: Path, payload: Any) -> None:
     _atomic_write_text(path, json.dumps(payload, indent=2, ensure_ascii=False))
 
 
+def _file_stamp(path: Path) -> _FileStamp:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def _read_json(path: Path) -> Any | None:
     try:
         text = path.read_text(encoding="utf-8")
@@ -171,35 +203,249 @@ def _to_dataclass_dict(value: Any) -> Any:
     return value
 
 
-def _append_jsonl(path: Path, payload: Any) -> None:
-    """Append one JSON line to `path`, atomic-per-line under a per-path lock."""
+def _jsonl_line(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False) + "\n"
+
+
+def _write_jsonl_lines(path: Path, lines: list[str]) -> None:
+    """Append whole lines to `path` in one write + one fsync."""
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(payload, ensure_ascii=False) + "\n"
     with _path_lock(path):
         with path.open("a", encoding="utf-8") as fh:
-            fh.write(line)
+            fh.write("".join(lines))
             fh.flush()
             os.fsync(fh.fileno())
 
 
+def _append_jsonl(path: Path, payload: Any) -> None:
+    """Append one JSON line to `path`, atomic-per-line under a per-path lock."""
+
+    _write_jsonl_lines(path, [_jsonl_line(payload)])
+
+
+# Fold an upsert log back into its snapshot once it grows past this size.
+_UPSERT_LOG_COMPACT_BYTES = 256 * 1024
+
+
+def _upsert_log_path(snapshot: Path) -> Path:
+    return snapshot.with_name(f"{snapshot.stem}.log.jsonl")
+
+
+def _default_fsync_max_latency_ms() -> float:
+    raw = os.environ.get("EIGENT_MEMORY_FSYNC_MAX_LATENCY_MS")
+    if not raw:
+        return 50.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning(
+            "Invalid EIGENT_MEMORY_FSYNC_MAX_LATENCY_MS=%r; using default 50",
+            raw,
+        )
+        return 50.0
+
+
+# Upper bound on lines per batch so a burst cannot hold the writer hostage
+# until the latency deadline with an unbounded buffer.
+_GROUP_COMMIT_MAX_BATCH_LINES = 4096
+# The writer thread exits after this long without work and is restarted on
+# the next append, so idle stores do not pin a thread.
+_GROUP_COMMIT_IDLE_EXIT_SECONDS = 5.0
+
+
+class _GroupCommitWriter:
+    """Batches jsonl appends across paths behind a single writer thread.
+
+    `submit` only enqueues. The writer waits up to `max_latency` seconds (or
+    until `flush` is requested / the batch is full), then writes every path's
+    pending lines in one call and fsyncs each file once. Lines for the same
+    path keep submission order.
+    """
+
+    def __init__(self, max_latency: float) -> None:
+        self._max_latency = max_latency
+        self._cond = threading.Condition()
+        self._pending: dict[Path, list[str]] = {}
+        self._pending_lines = 0
+        self._in_flight: set[Path] = set()
+        # Monotonic sequence numbers: lines submitted / lines committed.
+        self._submitted = 0
+        self._committed = 0
+        self._flush_requested = False
+        # First write error / writer crash not yet reported by `flush`.
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        _LIVE_GROUP_COMMIT_WRITERS.add(self)
+
+    def submit(self, path: Path, line: str) -> None:
+        with self._cond:
+            self._pending.setdefault(path, []).append(line)
+            self._pending_lines += 1
+            self._submitted += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def has_pending(self, path: Path) -> bool:
+        with self._cond:
+            return path in self._pending or path in self._in_flight
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every line submitted so far is written and fsynced.
+
+        Returns False if `timeout` elapsed first. Raises the first write
+        error (or writer crash) recorded since the previous flush; the
+        lines of the failed batch are not durable.
+        """
+
+        done = self.wait(timeout)
+        with self._cond:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+        return done
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Like `flush`, but leaves any recorded error for `flush` to raise.
+
+        Also returns False if the writer thread crashed before committing
+        everything submitted so far.
+        """
+
+        with self._cond:
+            target = self._submitted
+            if self._committed >= target:
+                return True
+            # A crashed writer leaves lines queued with no thread.
+            self._ensure_thread()
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: self._committed >= target or self._thread is None,
+                timeout,
+            )
+            return self._committed >= target
+
+    def _ensure_thread(self) -> None:
+        # Caller holds self._cond.
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="memory-group-commit",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        batch_end: int | None = None
+        try:
+            while True:
+                with self._cond:
+                    if not self._cond.wait_for(
+                        lambda: self._pending,
+                        _GROUP_COMMIT_IDLE_EXIT_SECONDS,
+                    ):
+                        self._thread = None
+                        return
+                    deadline = time.monotonic() + self._max_latency
+                    while (
+                        not self._flush_requested
+                        and self._pending_lines < _GROUP_COMMIT_MAX_BATCH_LINES
+                    ):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    batch = self._pending
+                    self._pending = {}
+                    self._pending_lines = 0
+                    self._in_flight = set(batch)
+                    batch_end = self._submitted
+                    self._flush_requested = False
+                error: OSError | None = None
+                for path, lines in batch.items():
+                    try:
+                        _write_jsonl_lines(path, lines)
+                    except OSError as e:
+                        logger.warning(
+                            "memory.local_store: failed to write %d jsonl"
+                            " lines for %s",
+                            len(lines),
+                            path,
+                            exc_info=True,
+                        )
+                        error = error or e
+                with self._cond:
+                    self._in_flight = set()
+                    self._committed = batch_end
+                    batch_end = None
+                    if error is not None and self._error is None:
+                        self._error = error
+                    self._cond.notify_all()
+        except BaseException as e:
+            logger.error(
+                "memory.local_store: group-commit writer crashed",
+                exc_info=True,
+            )
+            with self._cond:
+                # The in-flight batch is lost; lines still queued are
+                # picked up by a new thread on the next submit / flush.
+                self._in_flight = set()
+                if batch_end is not None:
+                    self._committed = batch_end
+                if self._error is None:
+                    self._error = e
+                self._thread = None
+                self._cond.notify_all()
+
+
+_LIVE_GROUP_COMMIT_WRITERS: weakref.WeakSet[_GroupCommitWriter] = (
+    weakref.WeakSet()
+)
+
+
+@atexit.register
+def _flush_group_commit_writers_at_exit() -> None:
+    # Writer threads are daemons; make sure buffered lines reach disk before
+    # the interpreter tears them down.
+    for writer in list(_LIVE_GROUP_COMMIT_WRITERS):
+        try:
+            writer.flush(timeout=5.0)
+        except Exception:  # noqa: BLE001
+            logger.warning(
+                "memory.local_store: flush at exit failed", exc_info=True
+            )
+
+
+# Block size for the reverse tail reader. Conversation events are typically
+# well under 1 KiB, so one block usually covers a whole context-sized tail.
+_TAIL_READ_BLOCK_BYTES = 64 * 1024
+
+
+def _decode_jsonl_line(path: Path, raw: bytes) -> dict[str, Any] | None:
+    line = raw.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        logger.warning(
+            "memory.local_store: skipping malformed jsonl line in %s",
+            path,
+        )
+        return None
+
+
 def _read_jsonl_lines(path: Path) -> list[dict[str, Any]]:
     if not path.exists():
         return []
     out: list[dict[str, Any]] = []
     try:
-        with path.open("r", encoding="utf-8") as fh:
+        with path.open("rb") as fh:
             for raw in fh:
-                line = raw.strip()
-                if not line:
-                    continue
-                try:
-                    out.append(json.loads(line))
-                except json.JSONDecodeError:
-                    logger.warning(
-                        "memory.local_store: skipping malformed jsonl line in %s",
-                        path,
-                    )
+                row = _decode_jsonl_line(path, raw)
+                if row is not None:
+                    out.append(row)
     except OSError:
         logger.warning(
             "memory.local_store: failed to read %s", path, exc_info=True
@@ -208,6 +454,48 @@ def _read_jsonl_lines(path: Path) -> list[dict[str, Any]]:
     return out
 
 
+def _read_jsonl_tail(path: Path, limit: int) -> list[dict[str, Any]]:
+    """Return the last `limit` well-formed JSON lines of `path`, oldest-first.
+
+    Seeks backwards from EOF block by block, so the cost depends on `limit`
+    (and line length) rather than on the size of the whole log. Malformed
+    lines are skipped exactly like `_read_jsonl_lines` and do not count
+    toward `limit`.
+    """
+
+    if limit <= 0:
+        return []
+    newest_first: list[dict[str, Any]] = []
+    try:
+        with path.open("rb") as fh:
+            pos = fh.seek(0, os.SEEK_END)
+            # Bytes of the line straddling the previous block boundary; only
+            # complete once the block before it (or BOF) has been read.
+            partial = b""
+            while pos > 0 and len(newest_first) < limit:
+                step = min(_TAIL_READ_BLOCK_BYTES, pos)
+                pos -= step
+                fh.seek(pos)
+                lines = (fh.read(step) + partial).split(b"\n")
+                partial = lines.pop(0) if pos > 0 else b""
+                for raw in reversed(lines):
+                    row = _decode_jsonl_line(path, raw)
+                    if row is None:
+                        continue
+                    newest_first.append(row)
+                    if len(newest_first) >= limit:
+                        break
+    except FileNotFoundError:
+        return []
+    except OSError:
+        logger.warning(
+            "memory.local_store: failed to read %s", path, exc_info=True
+        )
+        return []
+    newest_first.reverse()
+    return newest_first
+
+
 class LocalMemoryStore:
     """Filesystem-backed Project memory store.
 
@@ -216,13 +504,99 @@ class LocalMemoryStore:
     whole tree for tests; default is `~/.eigent/memory`.
     """
 
-    def __init__(self, root: Path | None = None) -> None:
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        fsync_max_latency_ms: float | None = None,
+    ) -> None:
         self._root = root or memory_root()
+        latency_ms = (
+            fsync_max_latency_ms
+            if fsync_max_latency_ms is not None
+            else _default_fsync_max_latency_ms()
+        )
+        # None => synchronous per-line write + fsync.
+        self._group_commit = (
+            _GroupCommitWriter(latency_ms / 1000.0) if latency_ms > 0 else None
+        )
+        # path -> key -> (stamp at load time, derived value). Generations are
+        # bumped by writers so a load racing a write never re-populates the
+        # cache with the pre-write value.
+        self._read_cache: dict[
+            str, dict[str, tuple[tuple[_FileStamp, _FileStamp], Any]]
+        ] = {}
+        self._read_cache_generations: dict[str, int] = {}
+        self._read_cache_lock = threading.Lock()
 
     @property
     def root(self) -> Path:
         return self._root
 
+    # ----- Durability -----
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until all jsonl appends made so far are fsynced.
+
+        Returns False if `timeout` (seconds) elapsed first and raises if a
+        queued append failed to reach disk. A no-op when group commit is
+        disabled.
+        """
+
+        if self._group_commit is None:
+            return True
+        return self._group_commit.flush(timeout)
+
+    def _append_line(self, path: Path, payload: Any) -> None:
+        if self._group_commit is None:
+            _append_jsonl(path, payload)
+            return
+        self._group_commit.submit(path, _jsonl_line(payload))
+
+    def _flush_path(self, path: Path) -> None:
+        # Read-your-writes for jsonl readers: only pay for a flush when this
+        # file actually has lines queued or being written.
+        if self._group_commit is not None and self._group_commit.has_pending(
+            path
+        ):
+            # Write errors are left for the next `flush` to report.
+            self._group_commit.wait()
+
+    # ----- Read cache -----
+
+    def cached_read(self, path: Path, key: str, loader: Callable[[], T]) -> T:
+        """Return `loader()` memoised against the current stamp of `path`.
+
+        `key` distinguishes several derived values of the same file (e.g. raw
+        vs ranked facts). The returned value is shared between callers and
+        must be treated as read-only.
+        """
+
+        path_key = str(path)
+        with self._read_cache_lock:
+            generation = self._read_cache_generations.get(path_key, 0)
+            cached = self._read_cache.get(path_key, {}).get(key)
+        # Land queued appends first so the stamp describes what we will read.
+        self._flush_path(path)
+        stamp = (_file_stamp(path), _file_stamp(_upsert_log_path(path)))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = loader()
+        with self._read_cache_lock:
+            if self._read_cache_generations.get(path_key, 0) == generation:
+                self._read_cache.setdefault(path_key, {})[key] = (stamp, value)
+        return value
+
+    def invalidate_cached_reads(self, path: Path) -> None:
+        """Drop every `cached_read` entry derived from `path`."""
+
+        path_key = str(path)
+        with self._read_cache_lock:
+            self._read_cache_generations[path_key] = (
+                self._read_cache_generations.get(path_key, 0) + 1
+            )
+            self._read_cache.pop(path_key, None)
+
     # ----- Path helpers (exposed for tests / debug logging) -----
 
     def user_path(self, user_key: str) -> Path:
@@ -256,6 +630,7 @@ class LocalMemoryStore:
     def write_space(self, user_key: str, payload: SpaceMemory) -> None:
         target = self.space_path(user_key, payload.space_id) / "space.json"
         _atomic_write_json(target, _to_dataclass_dict(payload))
+        self.invalidate_cached_reads(target)
 
     # ----- Project-level -----
 
@@ -273,6 +648,7 @@ class LocalMemoryStore:
             / "project.json"
         )
         _atomic_write_json(target, _to_dataclass_dict(payload))
+        self.invalidate_cached_reads(target)
 
     def append_conversation(
         self,
@@ -285,7 +661,8 @@ class LocalMemoryStore:
             self.project_path(user_key, space_id, project_id)
             / "conversation.jsonl"
         )
-        _append_jsonl(target, asdict(event))
+        self._append_line(target, asdict(event))
+        self.invalidate_cached_reads(target)
 
     def read_conversation_tail(
         self,
@@ -300,10 +677,8 @@ class LocalMemoryStore:
             self.project_path(user_key, space_id, project_id)
             / "conversation.jsonl"
         )
-        rows = _read_jsonl_lines(target)
-        if not rows:
-            return []
-        tail = rows[-limit:]
+        self._flush_path(target)
+        tail = _read_jsonl_tail(target, limit)
         out: list[ConversationEvent] = []
         for row in tail:
             event = _from_dataclass_payload(ConversationEvent, row)
@@ -336,22 +711,17 @@ class LocalMemoryStore:
     ) -> None:
         path = self.project_path(user_key, space_id, project_id) / "summary.md"
         _atomic_write_text(path, text)
+        self.invalidate_cached_reads(path)
 
     def read_facts(
         self, user_key: str, space_id: str, project_id: str
     ) -> list[MemoryFact]:
-        payload = _read_json(
-            self.project_path(user_key, space_id, project_id) / "facts.json"
+        return self._read_upserted(
+            self.project_path(user_key, space_id, project_id) / "facts.json",
+            "facts",
+            MemoryFact,
+            "fact_id",
         )
-        if not isinstance(payload, dict):
-            return []
-        rows = payload.get("facts", [])
-        out: list[MemoryFact] = []
-        for row in rows if isinstance(rows, list) else []:
-            fact = _from_dataclass_payload(MemoryFact, row)
-            if fact is not None:
-                out.append(fact)
-        return out
 
     def upsert_fact(
         self,
@@ -360,39 +730,24 @@ class LocalMemoryStore:
         project_id: str,
         fact: MemoryFact,
     ) -> None:
-        path = self.project_path(user_key, space_id, project_id) / "facts.json"
-        with _path_lock(path):
-            payload = _read_json(path)
-            rows = (
-                payload.get("facts", []) if isinstance(payload, dict) else []
-            )
-            existing: list[MemoryFact] = []
-            for row in rows if isinstance(rows, list) else []:
-                existing_fact = _from_dataclass_payload(MemoryFact, row)
-                if existing_fact is not None:
-                    existing.append(existing_fact)
-            by_id = {f.fact_id: f for f in existing}
-            by_id[fact.fact_id] = fact
-            _atomic_write_json(
-                path, {"facts": [asdict(f) for f in by_id.values()]}
-            )
+        self._upsert(
+            self.project_path(user_key, space_id, project_id) / "facts.json",
+            "facts",
+            MemoryFact,
+            "fact_id",
+            fact,
+        )
 
     def read_artifacts(
         self, user_key: str, space_id: str, project_id: str
     ) -> list[MemoryArtifact]:
-        payload = _read_json(
+        return self._read_upserted(
             self.project_path(user_key, space_id, project_id)
-            / "artifacts.json"
+            / "artifacts.json",
+            "artifacts",
+            MemoryArtifact,
+            "artifact_id",
         )
-        if not isinstance(payload, dict):
-            return []
-        rows = payload.get("artifacts", [])
-        out: list[MemoryArtifact] = []
-        for row in rows if isinstance(rows, list) else []:
-            artifact = _from_dataclass_payload(MemoryArtifact, row)
-            if artifact is not None:
-                out.append(artifact)
-        return out
 
     def upsert_artifact(
         self,
@@ -401,29 +756,69 @@ class LocalMemoryStore:
         project_id: str,
         artifact: MemoryArtifact,
     ) -> None:
-        path = (
+        self._upsert(
             self.project_path(user_key, space_id, project_id)
-            / "artifacts.json"
+            / "artifacts.json",
+            "artifacts",
+            MemoryArtifact,
+            "artifact_id",
+            artifact,
         )
-        with _path_lock(path):
-            payload = _read_json(path)
-            rows = (
-                payload.get("artifacts", [])
-                if isinstance(payload, dict)
-                else []
-            )
-            existing: list[MemoryArtifact] = []
-            for row in rows if isinstance(rows, list) else []:
-                existing_artifact = _from_dataclass_payload(
-                    MemoryArtifact, row
-                )
-                if existing_artifact is not None:
-                    existing.append(existing_artifact)
-            by_id = {a.artifact_id: a for a in existing}
-            by_id[artifact.artifact_id] = artifact
+
+    # facts.json / artifacts.json are a snapshot plus an append-only upsert
+    # log (`<name>.log.jsonl`). Upserts append one line; reads replay the log
+    # over the snapshot (last write per id wins, first-seen order kept); once
+    # the log passes `_UPSERT_LOG_COMPACT_BYTES` it is folded back into the
+    # snapshot. Replaying is idempotent, so a crash between rewriting the
+    # snapshot and removing the log loses nothing. Snapshot-only trees from
+    # before the log existed read unchanged.
+
+    def _load_upserted(
+        self, path: Path, key: str, cls: type[T], id_field: str
+    ) -> dict[str, T]:
+        # Caller holds the log's path lock so compaction cannot swap the
+        # snapshot between the two reads.
+        payload = _read_json(path)
+        rows = payload.get(key, []) if isinstance(payload, dict) else []
+        if not isinstance(rows, list):
+            rows = []
+        rows = rows + _read_jsonl_lines(_upsert_log_path(path))
+        by_id: dict[str, T] = {}
+        for row in rows:
+            item = _from_dataclass_payload(cls, row)
+            if item is not None:
+                by_id[getattr(item, id_field)] = item
+        return by_id
+
+    def _read_upserted(
+        self, path: Path, key: str, cls: type[T], id_field: str
+    ) -> list[T]:
+        with _path_lock(_upsert_log_path(path)):
+            return list(self._load_upserted(path, key, cls, id_field).values())
+
+    def _upsert(
+        self, path: Path, key: str, cls: type[T], id_field: str, item: T
+    ) -> None:
+        log_path = _upsert_log_path(path)
+        _append_jsonl(log_path, asdict(item))
+        stamp = _file_stamp(log_path)
+        if stamp is not None and stamp[1] >= _UPSERT_LOG_COMPACT_BYTES:
+            self._compact_upsert_log(path, key, cls, id_field)
+        self.invalidate_cached_reads(path)
+
+    def _compact_upsert_log(
+        self, path: Path, key: str, cls: type[T], id_field: str
+    ) -> None:
+        log_path = _upsert_log_path(path)
+        with _path_lock(log_path):
+            stamp = _file_stamp(log_path)
+            if stamp is None or stamp[1] < _UPSERT_LOG_COMPACT_BYTES:
+                return  # another writer compacted while we waited
+            merged = self._load_upserted(path, key, cls, id_field)
             _atomic_write_json(
-                path, {"artifacts": [asdict(a) for a in by_id.values()]}
+                path, {key: [asdict(item) for item in merged.values()]}
             )
+            log_path.unlink(missing_ok=True)
 
     # ----- Run-level -----
 
@@ -460,7 +855,7 @@ class LocalMemoryStore:
             self.run_path(user_key, space_id, project_id, run_id)
             / "tool_events.jsonl"
         )
-        _append_jsonl(target, asdict(event))
+        self._append_line(target, asdict(event))
 
     def write_run_status(
         self,
@@ -14,8 +14,10 @@
 
 """MemoryService — Run/Project/Space lifecycle hooks (§7 of design doc).
 
-Thin orchestration layer above LocalMemoryStore that callers (chat_controller,
-single_agent_service) use without having to know how the on-disk layout works.
+Thin orchestration layer above the memory store (LocalMemoryStore, or
+SqliteMemoryStore when EIGENT_MEMORY_BACKEND=sqlite) that callers
+(chat_controller, single_agent_service) use without having to know how the
+on-disk layout works.
 
 Every hook is wrapped so a memory write failure logs and returns silently --
 chat must not break because the memory writer hit an OSError. Callers can
@@ -49,6 +51,11 @@ from app.memory.events import (
 )
 from app.memory.local_store import LocalMemoryStore
 from app.memory.paths import canonical_user_id
+from app.memory.sqlite_store import (
+    MemoryStore,
+    SqliteMemoryStore,
+    migrate_local_store_to_sqlite,
+)
 from app.run_context import RunContext
 from app.utils.workspace_paths import task_dir_name
 
@@ -178,10 +185,17 @@ def finalize_task_lock_run_memory(
     Shared by Single Agent and Workforce paths. The helper is intentionally
     best-effort and idempotent per run id so duplicate SSE end/finally paths do
     not rewrite a successful `done` as `cancelled`.
+
+    As the shared run-end hook it also flushes the Run's overlay journal, so
+    every file write is on the server before the client can Apply.
     """
 
+    # Inline import avoids a startup cycle through app.service.task
+    from app.utils.space_overlay_client import close_overlay_journal
+
     service = getattr(task_lock, "memory_service", None)
     run_context = getattr(task_lock, "run_context", None)
+    close_overlay_journal(run_context)
     if service is None or run_context is None:
         return False
 
@@ -221,17 +235,17 @@ def finalize_task_lock_run_memory(
 
 
 class MemoryService:
-    """Lifecycle facade over LocalMemoryStore.
+    """Lifecycle facade over a memory store.
 
-    One service instance per Brain process is enough; the LocalMemoryStore
-    underneath is filesystem-backed and concurrency-safe per path.
+    One service instance per Brain process is enough; both store backends
+    are concurrency-safe within the process.
     """
 
-    def __init__(self, store: LocalMemoryStore | None = None) -> None:
+    def __init__(self, store: MemoryStore | None = None) -> None:
         self._store = store or LocalMemoryStore()
 
     @property
-    def store(self) -> LocalMemoryStore:
+    def store(self) -> MemoryStore:
         return self._store
 
     # ----- Run Start -----
@@ -428,6 +442,9 @@ class MemoryService:
                 run_context=run_context,
                 now=now,
             )
+            # jsonl appends are group-committed; the run is only "ended" once
+            # its transcript and tool events are on disk.
+            self._store.flush()
         except Exception:  # noqa: BLE001
             logger.warning(
                 "memory.service.on_run_end: write failed",
@@ -694,10 +711,45 @@ class MemoryService:
 _DEFAULT_SERVICE: MemoryService | None = None
 
 
+def _memory_backend() -> Literal["file", "sqlite"]:
+    raw = (os.environ.get("EIGENT_MEMORY_BACKEND") or "file").strip().lower()
+    if raw in ("file", "sqlite"):
+        return raw
+    logger.warning("Invalid EIGENT_MEMORY_BACKEND=%r; using 'file'", raw)
+    return "file"
+
+
+def _open_sqlite_store() -> SqliteMemoryStore:
+    """SQLite store at the default root, seeded once from the file layout."""
+
+    store = SqliteMemoryStore()
+    try:
+        if not store.is_migrated():
+            projects = migrate_local_store_to_sqlite(
+                LocalMemoryStore(root=store.root), store
+            )
+            store.mark_migrated(f"{_utc_now()} projects={projects}")
+            logger.info(
+                "memory.service: migrated file layout into SQLite",
+                extra={"projects": projects},
+            )
+    except Exception:  # noqa: BLE001 — retried on next start
+        logger.warning(
+            "memory.service: file layout migration failed; will retry",
+            exc_info=True,
+        )
+    return store
+
+
 def get_memory_service() -> MemoryService:
     global _DEFAULT_SERVICE
     if _DEFAULT_SERVICE is None:
-        _DEFAULT_SERVICE = MemoryService()
+        store = (
+            _open_sqlite_store()
+            if _memory_backend() == "sqlite"
+            else LocalMemoryStore()
+        )
+        _DEFAULT_SERVICE = MemoryService(store=store)
     return _DEFAULT_SERVICE
 
 
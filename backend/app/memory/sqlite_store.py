@@ -0,0 +1,788 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""SQLite-backed alternative to LocalMemoryStore.
+
+Same public surface as LocalMemoryStore, but every record lives in one WAL-mode
+database at `<root>/memory.sqlite3` instead of a tree of JSON/JSONL files.
+Rows keep the dataclass payload as JSON (so schema evolution follows the same
+"drop unknown keys" policy) next to indexed key columns, which makes
+cross-project queries such as "all facts in a Space" or "runs since last
+week" a single indexed SELECT instead of a directory walk.
+
+The path helpers still return the file-layout paths under `root`; they are
+only used as stable keys (e.g. by `cached_read`) and debug output.
+
+Connections are per thread. Commits are durable against process crashes;
+`flush()` checkpoints the WAL so the same `on_run_end` contract as the file
+store's group commit holds against power loss too.
+
+`migrate_local_store_to_sqlite` copies an existing file tree into the
+database once; `get_memory_service()` runs it automatically the first time
+the SQLite backend is selected.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from app.memory.events import (
+    ConversationEvent,
+    MemoryArtifact,
+    MemoryFact,
+    ProjectMemory,
+    RunMemory,
+    RunStatus,
+    SpaceMemory,
+    ToolEvent,
+)
+from app.memory.local_store import (
+    LocalMemoryStore,
+    _from_dataclass_payload,
+    _read_jsonl_lines,
+    _to_dataclass_dict,
+)
+from app.memory.paths import (
+    memory_root,
+    project_dir,
+    run_dir,
+    space_dir,
+    user_dir,
+)
+
+logger = logging.getLogger("memory.sqlite_store")
+
+T = TypeVar("T")
+
+DB_FILENAME = "memory.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spaces (
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (user_key, space_id)
+);
+CREATE TABLE IF NOT EXISTS projects (
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    summary TEXT,
+    PRIMARY KEY (user_key, space_id, project_id)
+);
+CREATE TABLE IF NOT EXISTS conversation_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    UNIQUE (user_key, space_id, project_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS ix_conversation_events_scope
+    ON conversation_events (space_id, project_id, run_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_conversation_events_tail
+    ON conversation_events (user_key, space_id, project_id, seq);
+CREATE TABLE IF NOT EXISTS facts (
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    fact_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    UNIQUE (user_key, space_id, project_id, fact_id)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    artifact_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    UNIQUE (user_key, space_id, project_id, artifact_id)
+);
+CREATE INDEX IF NOT EXISTS ix_artifacts_scope
+    ON artifacts (space_id, project_id, run_id, created_at);
+CREATE TABLE IF NOT EXISTS runs (
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT,
+    summary TEXT,
+    PRIMARY KEY (user_key, space_id, project_id, run_id)
+);
+CREATE INDEX IF NOT EXISTS ix_runs_scope
+    ON runs (space_id, project_id, run_id, started_at);
+CREATE INDEX IF NOT EXISTS ix_runs_started_at
+    ON runs (user_key, started_at);
+CREATE TABLE IF NOT EXISTS tool_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_key TEXT NOT NULL,
+    space_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    UNIQUE (user_key, space_id, project_id, run_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS ix_tool_events_scope
+    ON tool_events (space_id, project_id, run_id, timestamp);
+"""
+
+_MIGRATED_META_KEY = "migrated_from_file_layout"
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(_to_dataclass_dict(payload), ensure_ascii=False)
+
+
+def _loads(cls: type[T], raw: str | None) -> T | None:
+    if raw is None:
+        return None
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning(
+            "memory.sqlite_store: malformed %s payload; ignoring",
+            cls.__name__,
+        )
+        return None
+    return _from_dataclass_payload(cls, payload)
+
+
+def _loads_all(cls: type[T], rows: list[tuple[str]]) -> list[T]:
+    out: list[T] = []
+    for (raw,) in rows:
+        item = _loads(cls, raw)
+        if item is not None:
+            out.append(item)
+    return out
+
+
+class SqliteMemoryStore:
+    """SQLite-backed Project memory store (drop-in for LocalMemoryStore).
+
+    Construction is cheap and does NOT touch the filesystem -- the database
+    and schema are created on first use.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self._root = root or memory_root()
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def db_path(self) -> Path:
+        return self._root / DB_FILENAME
+
+    # ----- Connection handling -----
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self._root.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; `_transaction` issues BEGIN IMMEDIATE explicitly.
+        conn = sqlite3.connect(
+            self.db_path, timeout=30.0, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the calling thread's connection (tests / shutdown)."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ----- Durability -----
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Checkpoint the WAL so every committed write is fsynced.
+
+        `timeout` is accepted for parity with LocalMemoryStore; SQLite's own
+        busy timeout bounds the wait.
+        """
+
+        try:
+            self._connection().execute("PRAGMA wal_checkpoint(FULL)")
+        except sqlite3.Error:
+            logger.warning(
+                "memory.sqlite_store: WAL checkpoint failed", exc_info=True
+            )
+            return False
+        return True
+
+    # ----- Read cache -----
+
+    def cached_read(self, path: Path, key: str, loader: Callable[[], T]) -> T:
+        """Parity with LocalMemoryStore; indexed reads are cheap, so this
+        always calls `loader`."""
+
+        return loader()
+
+    def invalidate_cached_reads(self, path: Path) -> None:
+        return None
+
+    # ----- Path helpers (stable keys / debug logging) -----
+
+    def user_path(self, user_key: str) -> Path:
+        return user_dir(user_key, self._root)
+
+    def space_path(self, user_key: str, space_id: str) -> Path:
+        return space_dir(user_key, space_id, self._root)
+
+    def project_path(
+        self, user_key: str, space_id: str, project_id: str
+    ) -> Path:
+        return project_dir(user_key, space_id, project_id, self._root)
+
+    def run_path(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+    ) -> Path:
+        return run_dir(user_key, space_id, project_id, run_id, self._root)
+
+    # ----- Space-level -----
+
+    def read_space(self, user_key: str, space_id: str) -> SpaceMemory | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM spaces WHERE user_key=? AND space_id=?",
+                (user_key, space_id),
+            )
+            .fetchone()
+        )
+        return _loads(SpaceMemory, row[0] if row else None)
+
+    def write_space(self, user_key: str, payload: SpaceMemory) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO spaces (user_key, space_id, payload)"
+                " VALUES (?, ?, ?)"
+                " ON CONFLICT (user_key, space_id)"
+                " DO UPDATE SET payload=excluded.payload",
+                (user_key, payload.space_id, _dumps(payload)),
+            )
+
+    # ----- Project-level -----
+
+    def read_project(
+        self, user_key: str, space_id: str, project_id: str
+    ) -> ProjectMemory | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM projects"
+                " WHERE user_key=? AND space_id=? AND project_id=?",
+                (user_key, space_id, project_id),
+            )
+            .fetchone()
+        )
+        return _loads(ProjectMemory, row[0] if row else None)
+
+    def write_project(self, user_key: str, payload: ProjectMemory) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO projects"
+                " (user_key, space_id, project_id, payload)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (user_key, space_id, project_id)"
+                " DO UPDATE SET payload=excluded.payload",
+                (
+                    user_key,
+                    payload.space_id,
+                    payload.project_id,
+                    _dumps(payload),
+                ),
+            )
+
+    def append_conversation(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        event: ConversationEvent,
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO conversation_events"
+                " (user_key, space_id, project_id, run_id, event_id,"
+                " timestamp, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_key,
+                    space_id,
+                    project_id,
+                    event.run_id,
+                    event.event_id,
+                    event.timestamp,
+                    _dumps(event),
+                ),
+            )
+
+    def read_conversation_tail(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        limit: int,
+    ) -> list[ConversationEvent]:
+        if limit <= 0:
+            return []
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM conversation_events"
+                " WHERE user_key=? AND space_id=? AND project_id=?"
+                " ORDER BY seq DESC LIMIT ?",
+                (user_key, space_id, project_id, limit),
+            )
+            .fetchall()
+        )
+        rows.reverse()
+        return _loads_all(ConversationEvent, rows)
+
+    def read_project_summary(
+        self, user_key: str, space_id: str, project_id: str
+    ) -> str:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT summary FROM projects"
+                " WHERE user_key=? AND space_id=? AND project_id=?",
+                (user_key, space_id, project_id),
+            )
+            .fetchone()
+        )
+        return (row[0] or "") if row else ""
+
+    def write_project_summary(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        text: str,
+    ) -> None:
+        # The summary may be written before project.json exists (tests,
+        # imports); keep an empty payload placeholder until then.
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO projects"
+                " (user_key, space_id, project_id, payload, summary)"
+                " VALUES (?, ?, ?, 'null', ?)"
+                " ON CONFLICT (user_key, space_id, project_id)"
+                " DO UPDATE SET summary=excluded.summary",
+                (user_key, space_id, project_id, text),
+            )
+
+    def read_facts(
+        self, user_key: str, space_id: str, project_id: str
+    ) -> list[MemoryFact]:
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM facts"
+                " WHERE user_key=? AND space_id=? AND project_id=?"
+                " ORDER BY rowid",
+                (user_key, space_id, project_id),
+            )
+            .fetchall()
+        )
+        return _loads_all(MemoryFact, rows)
+
+    def upsert_fact(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        fact: MemoryFact,
+    ) -> None:
+        # ON CONFLICT ... DO UPDATE keeps the rowid, so first-seen order is
+        # preserved exactly like the file store's upsert.
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO facts"
+                " (user_key, space_id, project_id, fact_id, payload)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (user_key, space_id, project_id, fact_id)"
+                " DO UPDATE SET payload=excluded.payload",
+                (user_key, space_id, project_id, fact.fact_id, _dumps(fact)),
+            )
+
+    def read_artifacts(
+        self, user_key: str, space_id: str, project_id: str
+    ) -> list[MemoryArtifact]:
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM artifacts"
+                " WHERE user_key=? AND space_id=? AND project_id=?"
+                " ORDER BY rowid",
+                (user_key, space_id, project_id),
+            )
+            .fetchall()
+        )
+        return _loads_all(MemoryArtifact, rows)
+
+    def upsert_artifact(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        artifact: MemoryArtifact,
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO artifacts"
+                " (user_key, space_id, project_id, artifact_id, run_id,"
+                " created_at, payload) VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (user_key, space_id, project_id, artifact_id)"
+                " DO UPDATE SET run_id=excluded.run_id,"
+                " created_at=excluded.created_at, payload=excluded.payload",
+                (
+                    user_key,
+                    space_id,
+                    project_id,
+                    artifact.artifact_id,
+                    artifact.run_id,
+                    artifact.created_at,
+                    _dumps(artifact),
+                ),
+            )
+
+    # ----- Run-level -----
+
+    def write_run(self, user_key: str, payload: RunMemory) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO runs"
+                " (user_key, space_id, project_id, run_id, started_at,"
+                " payload) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (user_key, space_id, project_id, run_id)"
+                " DO UPDATE SET started_at=excluded.started_at,"
+                " payload=excluded.payload",
+                (
+                    user_key,
+                    payload.space_id,
+                    payload.project_id,
+                    payload.run_id,
+                    payload.started_at,
+                    _dumps(payload),
+                ),
+            )
+
+    def read_run(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+    ) -> RunMemory | None:
+        row = self._run_column(
+            user_key, space_id, project_id, run_id, "payload"
+        )
+        return _loads(RunMemory, row)
+
+    def append_tool_event(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+        event: ToolEvent,
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO tool_events"
+                " (user_key, space_id, project_id, run_id, event_id,"
+                " timestamp, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_key,
+                    space_id,
+                    project_id,
+                    run_id,
+                    event.event_id,
+                    event.timestamp,
+                    _dumps(event),
+                ),
+            )
+
+    def write_run_status(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+        status: RunStatus,
+    ) -> None:
+        self._write_run_column(
+            user_key,
+            space_id,
+            project_id,
+            run_id,
+            "status",
+            _dumps(status),
+            started_at=status.started_at,
+        )
+
+    def read_run_status(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+    ) -> RunStatus | None:
+        row = self._run_column(
+            user_key, space_id, project_id, run_id, "status"
+        )
+        return _loads(RunStatus, row)
+
+    def write_run_summary(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+        text: str,
+    ) -> None:
+        self._write_run_column(
+            user_key, space_id, project_id, run_id, "summary", text
+        )
+
+    # ----- Cross-project queries (what the file layout cannot index) -----
+
+    def list_space_facts(
+        self, user_key: str, space_id: str
+    ) -> list[MemoryFact]:
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM facts WHERE user_key=? AND space_id=?"
+                " ORDER BY rowid",
+                (user_key, space_id),
+            )
+            .fetchall()
+        )
+        return _loads_all(MemoryFact, rows)
+
+    def list_runs_since(self, user_key: str, since: str) -> list[RunMemory]:
+        """Runs whose ISO-8601 `started_at` is >= `since`, oldest first."""
+
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM runs WHERE user_key=? AND started_at>=?"
+                " ORDER BY started_at",
+                (user_key, since),
+            )
+            .fetchall()
+        )
+        return _loads_all(RunMemory, rows)
+
+    # ----- Internals -----
+
+    def _run_column(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+        column: str,
+    ) -> str | None:
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {column} FROM runs"  # nosec B608 - fixed names
+                " WHERE user_key=? AND space_id=? AND project_id=?"
+                " AND run_id=?",
+                (user_key, space_id, project_id, run_id),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def _write_run_column(
+        self,
+        user_key: str,
+        space_id: str,
+        project_id: str,
+        run_id: str,
+        column: str,
+        value: str,
+        *,
+        started_at: str = "",
+    ) -> None:
+        # status.json / summary.md may land before run.json (file-store
+        # parity); a 'null' payload reads back as "no run header".
+        with self._transaction() as conn:
+            conn.execute(
+                f"INSERT INTO runs"  # nosec B608 - fixed names
+                f" (user_key, space_id, project_id, run_id, started_at,"
+                f" payload, {column}) VALUES (?, ?, ?, ?, ?, 'null', ?)"
+                f" ON CONFLICT (user_key, space_id, project_id, run_id)"
+                f" DO UPDATE SET {column}=excluded.{column}",
+                (user_key, space_id, project_id, run_id, started_at, value),
+            )
+
+    # ----- Migration bookkeeping -----
+
+    def is_migrated(self) -> bool:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM meta WHERE key=?", (_MIGRATED_META_KEY,)
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def mark_migrated(self, note: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value=excluded.value",
+                (_MIGRATED_META_KEY, note),
+            )
+
+
+MemoryStore = LocalMemoryStore | SqliteMemoryStore
+
+
+def _child_dirs(path: Path) -> list[Path]:
+    try:
+        return sorted(p for p in path.iterdir() if p.is_dir())
+    except FileNotFoundError:
+        return []
+
+
+def migrate_local_store_to_sqlite(
+    source: LocalMemoryStore, target: SqliteMemoryStore
+) -> int:
+    """Copy every record under `source.root` into `target`.
+
+    Idempotent: events are keyed by event_id and everything else is an
+    upsert, so re-running after a partial migration only fills the gaps.
+    The file tree is left untouched. Returns the number of Projects copied.
+    """
+
+    projects = 0
+    for user_path in _child_dirs(source.root / "users"):
+        user_key = user_path.name
+        for space_path in _child_dirs(user_path / "spaces"):
+            space_id = space_path.name
+            space = source.read_space(user_key, space_id)
+            if space is not None:
+                target.write_space(user_key, space)
+            for project_path in _child_dirs(space_path / "projects"):
+                _migrate_project(
+                    source, target, user_key, space_id, project_path.name
+                )
+                projects += 1
+    return projects
+
+
+def _migrate_project(
+    source: LocalMemoryStore,
+    target: SqliteMemoryStore,
+    user_key: str,
+    space_id: str,
+    project_id: str,
+) -> None:
+    project_path = source.project_path(user_key, space_id, project_id)
+    project = source.read_project(user_key, space_id, project_id)
+    if project is not None:
+        target.write_project(user_key, project)
+    summary = source.read_project_summary(user_key, space_id, project_id)
+    if summary:
+        target.write_project_summary(user_key, space_id, project_id, summary)
+    source.flush()
+    for row in _read_jsonl_lines(project_path / "conversation.jsonl"):
+        event = _from_dataclass_payload(ConversationEvent, row)
+        if event is not None:
+            target.append_conversation(user_key, space_id, project_id, event)
+    for fact in source.read_facts(user_key, space_id, project_id):
+        target.upsert_fact(user_key, space_id, project_id, fact)
+    for artifact in source.read_artifacts(user_key, space_id, project_id):
+        target.upsert_artifact(user_key, space_id, project_id, artifact)
+
+    for run_path in _child_dirs(project_path / "runs"):
+        run_id = run_path.name
+        run = source.read_run(user_key, space_id, project_id, run_id)
+        if run is not None:
+            target.write_run(user_key, run)
+        status = source.read_run_status(user_key, space_id, project_id, run_id)
+        if status is not None:
+            target.write_run_status(
+                user_key, space_id, project_id, run_id, status
+            )
+        try:
+            run_summary = (run_path / "summary.md").read_text(encoding="utf-8")
+        except OSError:
+            run_summary = ""
+        if run_summary:
+            target.write_run_summary(
+                user_key, space_id, project_id, run_id, run_summary
+            )
+        for row in _read_jsonl_lines(run_path / "tool_events.jsonl"):
+            event = _from_dataclass_payload(ToolEvent, row)
+            if event is not None:
+                target.append_tool_event(
+                    user_key, space_id, project_id, run_id, event
+                )
@@ -274,6 +274,33 @@ class RemoveTaskRequest(BaseModel):
     task_id: str
 
 
-def sse_json(step: str, data):
-    res_format = {"step": step, "data": data}
-    return f"data: {json.dumps(res_format, ensure_ascii=False)}\n\n"
+class StepEvent(str):
+    """SSE frame that keeps its step name and JSON-encoded data.
+
+    The frame is byte-identical to ``json.dumps({"step", "data"})`` framing,
+    so it streams as a plain ``str``. Consumers such as cloud step sync
+    read ``step``/``data``/``encoded_data`` instead of re-parsing the frame.
+    """
+
+    step: str
+    data: Any
+    encoded_data: str
+
+    def __new__(cls, step: str, data: Any) -> "StepEvent":
+        encoded_data = json.dumps(data, ensure_ascii=False)
+        encoded_step = json.dumps(step, ensure_ascii=False)
+        frame = super().__new__(
+            cls,
+            f'data: {{"step": {encoded_step}, "data": {encoded_data}}}\n\n',
+        )
+        frame.step = step
+        frame.data = data
+        frame.encoded_data = encoded_data
+        return frame
+
+    def __reduce__(self):
+        return (StepEvent, (self.step, self.data))
+
+
+def sse_json(step: str, data) -> StepEvent:
+    return StepEvent(step, data)
@@ -34,7 +34,11 @@ from fastapi import Request
 from inflection import titleize
 from pydash import chain
 
-from app.agent.agent_model import agent_model
+from app.agent.agent_model import (
+    agent_model,
+    announce_created_agents,
+    defer_create_agent_events,
+)
 from app.agent.factory import (
     browser_agent,
     developer_agent,
@@ -80,14 +84,24 @@ from app.service.task import (
 )
 from app.utils.agent_memory import (
     build_memory_context,
+    conversation_entry_chars,
     estimate_memory_size,
     record_agent_memory_snapshot,
     record_workforce_memory_snapshot,
 )
 from app.utils.event_loop_utils import set_main_event_loop
-from app.utils.file_utils import get_working_directory, list_files
+from app.utils.file_index import indexed_files, refresh_file_indexes
+from app.utils.file_utils import get_working_directory
+from app.utils.mcp_pool import invalidate_mcp_servers
 from app.utils.server.sync_step import sync_step
 from app.utils.telemetry.workforce_metrics import WorkforceMetricsCallback
+from app.utils.warm_agents import (
+    StartupTimer,
+    prewarm_agents,
+    take_warm_agents,
+    warm_agent_pool_enabled,
+    warm_agents_key,
+)
 from app.utils.workforce import Workforce
 
 logger = logging.getLogger("chat_service")
@@ -162,6 +176,46 @@ def _extract_stream_chunk_content(chunk: Any) -> str:
     return ""
 
 
+# Filters for the "Generated Files" sections of follow-up context
+_GENERATED_FILE_FILTERS: dict[str, Any] = {
+    "skip_dirs": {"node_modules", "__pycache__", "venv"},
+    "skip_extensions": (".pyc", ".tmp"),
+    "skip_prefix": ".",
+}
+# step_solve refreshes the indexes off the event loop right before building
+# context, so the synchronous builders below reuse that refresh.
+_GENERATED_FILES_MAX_AGE = 2.0
+
+
+def _generated_files(working_directory: str) -> list[str]:
+    return indexed_files(
+        working_directory,
+        base=working_directory,
+        max_age=_GENERATED_FILES_MAX_AGE,
+        **_GENERATED_FILE_FILTERS,
+    )
+
+
+async def refresh_generated_files(task_lock: TaskLock) -> None:
+    """Refresh the file indexes for every working directory the
+    conversation context will list, in a worker thread."""
+    working_directories = {
+        entry["content"]["working_directory"]
+        for entry in getattr(task_lock, "conversation_history", None) or []
+        if entry.get("role") == "task_result"
+        and isinstance(entry.get("content"), dict)
+        and entry["content"].get("working_directory")
+    }
+    if not working_directories:
+        return
+    try:
+        await refresh_file_indexes(
+            working_directories, **_GENERATED_FILE_FILTERS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to refresh generated files index: {e}")
+
+
 def format_task_context(
     task_data: dict, seen_files: set | None = None, skip_files: bool = False
 ) -> str:
@@ -190,13 +244,7 @@ def format_task_context(
         working_directory = task_data.get("working_directory")
         if working_directory:
             try:
-                generated_files = list_files(
-                    working_directory,
-                    base=working_directory,
-                    skip_dirs={"node_modules", "__pycache__", "venv"},
-                    skip_extensions=(".pyc", ".tmp"),
-                    skip_prefix=".",
-                )
+                generated_files = _generated_files(working_directory)
                 if seen_files is not None:
                     generated_files = [
                         p for p in generated_files if p not in seen_files
@@ -253,13 +301,7 @@ def collect_previous_task_context(
 
     # Collect generated files from working directory (safe listing)
     try:
-        generated_files = list_files(
-            working_directory,
-            base=working_directory,
-            skip_dirs={"node_modules", "__pycache__", "venv"},
-            skip_extensions=(".pyc", ".tmp"),
-            skip_prefix=".",
-        )
+        generated_files = _generated_files(working_directory)
         if generated_files:
             context_parts.append("Generated Files from Previous Task:")
             for file_path in sorted(generated_files):
@@ -288,10 +330,14 @@ def check_conversation_history_length(
     ):
         return False, 0
 
-    total_length = 0
-    for entry in task_lock.conversation_history:
-        total_length += len(entry.get("content", ""))
-    total_length += estimate_memory_size(task_lock)
+    if isinstance(task_lock, TaskLock):
+        total_length = task_lock.history_chars()
+    else:
+        total_length = sum(
+            conversation_entry_chars(entry)
+            for entry in task_lock.conversation_history
+        )
+        total_length += estimate_memory_size(task_lock)
 
     is_exceeded = total_length > max_length
 
@@ -331,6 +377,8 @@ def _trim_in_process_history(task_lock: TaskLock, keep_recent: int = 4) -> int:
         task_lock.agent_memory_history = snaps[-keep_recent:]
     if dropped == 0:
         return 0
+    if isinstance(task_lock, TaskLock):
+        task_lock.recount_history_chars()
     marker = (
         f"\n[memory] Compacted {dropped} older in-process turn(s); the full "
         f"transcript is preserved in ~/.eigent/memory under this Project."
@@ -386,13 +434,7 @@ def build_conversation_context(
             all_generated_files: set[str] = set()
             for working_directory in working_directories:
                 try:
-                    files_list = list_files(
-                        working_directory,
-                        base=working_directory,
-                        skip_dirs={"node_modules", "__pycache__", "venv"},
-                        skip_extensions=(".pyc", ".tmp"),
-                        skip_prefix=".",
-                    )
+                    files_list = _generated_files(working_directory)
                     all_generated_files.update(files_list)
                 except Exception as e:
                     logger.warning(
@@ -462,6 +504,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
         SSE formatted responses for task progress, errors, and results
     """
     start_event_loop = True
+    startup = StartupTimer(options.project_id, options.task_id)
 
     # Initialize task_lock attributes
     if not hasattr(task_lock, "conversation_history"):
@@ -523,6 +566,9 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
             yield chunk
         return
 
+    # Build the workforce agents while the question is being classified
+    prewarm_workforce_agents(options, hands=hands)
+
     while True:
         loop_iteration += 1
         logger.debug(
@@ -713,6 +759,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
                         ", providing direct answer "
                         "without workforce"
                     )
+                    await refresh_generated_files(task_lock)
                     conv_ctx = build_conversation_context(
                         task_lock, header="=== Previous Conversation ==="
                     )
@@ -818,8 +865,10 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
                         )
                         task_lock.summary_generated = False
 
+                    startup.mark("confirmed")
                     yield sse_json("confirmed", {"question": question})
 
+                    await refresh_generated_files(task_lock)
                     context_for_coordinator = build_context_for_workforce(
                         task_lock, options
                     )
@@ -837,7 +886,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
                             "[NEW-QUESTION] Creating NEW workforce instance"
                         )
                         (workforce, mcp) = await construct_workforce(
-                            options, hands=hands
+                            options, hands=hands, startup=startup
                         )
                         for new_agent in options.new_agents:
                             workforce.add_single_agent_worker(
@@ -1033,6 +1082,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
                 summary_task_content_local = getattr(
                     task_lock, "summary_task_content", summary_task_content
                 )
+                startup.mark("to_sub_tasks")
                 yield to_sub_tasks(camel_task, summary_task_content_local)
             elif item.action == Action.add_task:
                 # Check if this might be a misrouted second question
@@ -1435,6 +1485,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
                                 " direct answer without "
                                 "workforce"
                             )
+                            await refresh_generated_files(task_lock)
                             conv_ctx = build_conversation_context(
                                 task_lock,
                                 header="=== Previous Conversation ===",
@@ -1539,6 +1590,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
                             "building context for "
                             "workforce"
                         )
+                        await refresh_generated_files(task_lock)
                         context_for_multi_turn = build_context_for_workforce(
                             task_lock, options
                         )
@@ -1786,6 +1838,7 @@ async def step_solve(options: Chat, request: Request, task_lock: TaskLock):
             elif item.action == Action.decompose_text:
                 yield sse_json("decompose_text", item.data)
             elif item.action == Action.decompose_progress:
+                startup.mark("to_sub_tasks")
                 yield sse_json("to_sub_tasks", item.data)
             elif item.action == Action.new_agent:
                 if workforce is not None:
@@ -2105,6 +2158,8 @@ async def install_mcp(
 ):
     mcp_keys = list(install_mcp.data.get("mcpServers", {}).keys())
     logger.info(f"Installing MCP tools: {mcp_keys}")
+    # A (re)install must not be served a pooled connection to the old config
+    invalidate_mcp_servers(mcp_keys)
     try:
         mcp.add_tools(await get_mcp_tools(install_mcp.data))
         logger.info("MCP tools installed successfully")
@@ -2196,6 +2251,7 @@ async def question_confirm(
 
     context_prompt = ""
     if task_lock:
+        await refresh_generated_files(task_lock)
         context_prompt = build_conversation_context(
             task_lock, header="=== Previous Conversation ==="
         )
@@ -2535,29 +2591,23 @@ async def get_task_result_with_optional_summary(
     return result
 
 
-async def construct_workforce(
+async def _create_workforce_agents(
     options: Chat,
     hands: IHands | None = None,
-) -> tuple[Workforce, ListenChatAgent]:
-    """Construct a workforce with all required agents.
-
-    This function creates all agents in PARALLEL to minimize startup time.
-    Sync functions are run in thread pool, async functions
-    are awaited concurrently.
-
-    When hands is passed, base agents add tools based on Brain capabilities:
-    hands.can_execute_terminal(), hands.can_use_browser(), etc. determine whether terminal/browser hands are enabled.
+) -> tuple[
+    list[ListenChatAgent],
+    ListenChatAgent,
+    ListenChatAgent,
+    ListenChatAgent,
+    ListenChatAgent,
+    ListenChatAgent,
+]:
+    """Create every workforce agent that is not bound to a single task.
+
+    Returns coordinator/task agents, the new worker agent, and the
+    developer, document, multi-modal and MCP agents. The browser agent is
+    left out because it leases a CDP browser for the current task id.
     """
-    logger.debug(
-        "construct_workforce started",
-        extra={"project_id": options.project_id, "task_id": options.task_id},
-    )
-
-    # Store main event loop reference for thread-safe async task scheduling
-    # This allows agent_model() to schedule tasks
-    # when called from worker threads
-    set_main_event_loop(asyncio.get_running_loop())
-
     working_directory = get_working_directory(options)
     remote_sub_agent_planning_notice = (
         build_remote_sub_agent_planning_notice()
@@ -2676,38 +2726,139 @@ the current date.
     # Execute all agent creations in PARALLEL
     # ========================================================================
 
+    # asyncio.gather runs all coroutines concurrently
+    # asyncio.to_thread runs sync functions in
+    # thread pool without blocking event loop
+    return await asyncio.gather(
+        asyncio.to_thread(_create_coordinator_and_task_agents),
+        asyncio.to_thread(_create_new_worker_agent),
+        developer_agent(options, hands=hands),
+        document_agent(options, hands=hands),
+        asyncio.to_thread(partial(multi_modal_agent, options, hands=hands)),
+        mcp_agent(options),
+    )
+
+
+def _warm_workforce_key(options: Chat, hands: IHands | None) -> str:
+    return warm_agents_key(
+        options,
+        get_working_directory(options),
+        {
+            "terminal": hands is None or hands.can_execute_terminal(),
+            "browser": hands is None or hands.can_use_browser(),
+        },
+    )
+
+
+def prewarm_workforce_agents(
+    options: Chat,
+    hands: IHands | None = None,
+) -> None:
+    """Build the next task's workforce agents in the background.
+
+    Does nothing when the warm agent pool is disabled or a set for the
+    same configuration is already pooled.
+    """
+    if not warm_agent_pool_enabled():
+        return
+    snapshot = options.model_copy(deep=True)
+
+    async def build():
+        set_main_event_loop(asyncio.get_running_loop())
+        with defer_create_agent_events() as events:
+            agents = await _create_workforce_agents(snapshot, hands=hands)
+        return agents, events
+
     try:
-        # asyncio.gather runs all coroutines concurrently
-        # asyncio.to_thread runs sync functions in
-        # thread pool without blocking event loop
-        results = await asyncio.gather(
-            asyncio.to_thread(_create_coordinator_and_task_agents),
-            asyncio.to_thread(_create_new_worker_agent),
-            asyncio.to_thread(partial(browser_agent, options, hands=hands)),
-            developer_agent(options, hands=hands),
-            document_agent(options, hands=hands),
-            asyncio.to_thread(
-                partial(multi_modal_agent, options, hands=hands)
+        prewarm_agents(
+            _warm_workforce_key(snapshot, hands), snapshot.project_id, build
+        )
+    except Exception as e:
+        logger.warning(f"Failed to pre-warm workforce agents: {e}")
+
+
+async def _take_warm_workforce_agents(
+    options: Chat,
+    hands: IHands | None,
+):
+    """Return a pooled agent set for ``options``, or None."""
+    if not warm_agent_pool_enabled():
+        return None
+    warm = take_warm_agents(_warm_workforce_key(options, hands))
+    if warm is None:
+        return None
+    try:
+        agents, events = await warm
+    except Exception as e:
+        logger.warning(f"Pre-warmed workforce agents unusable: {e}")
+        return None
+    await announce_created_agents(options.project_id, events)
+    logger.info(
+        "Using pre-warmed workforce agents",
+        extra={"project_id": options.project_id, "task_id": options.task_id},
+    )
+    return agents
+
+
+async def construct_workforce(
+    options: Chat,
+    hands: IHands | None = None,
+    startup: StartupTimer | None = None,
+) -> tuple[Workforce, ListenChatAgent]:
+    """Construct a workforce with all required agents.
+
+    This function creates all agents in PARALLEL to minimize startup time.
+    Sync functions are run in thread pool, async functions
+    are awaited concurrently. With the warm agent pool enabled, a set
+    pre-built by :func:`prewarm_workforce_agents` is used when available and
+    the pool is refilled for the next task.
+
+    When hands is passed, base agents add tools based on Brain capabilities:
+    hands.can_execute_terminal(), hands.can_use_browser(), etc. determine whether terminal/browser hands are enabled.
+    """
+    logger.debug(
+        "construct_workforce started",
+        extra={"project_id": options.project_id, "task_id": options.task_id},
+    )
+
+    # Store main event loop reference for thread-safe async task scheduling
+    # This allows agent_model() to schedule tasks
+    # when called from worker threads
+    set_main_event_loop(asyncio.get_running_loop())
+
+    warm_agents = await _take_warm_workforce_agents(options, hands)
+    if startup is not None:
+        startup.warm_hit = warm_agents is not None
+
+    async def _workforce_agents():
+        if warm_agents is not None:
+            return warm_agents
+        return await _create_workforce_agents(options, hands=hands)
+
+    try:
+        (
+            (
+                coord_task_agents,
+                new_worker_agent,
+                developer,
+                documenter,
+                multi_modaler,
+                mcp,
             ),
-            mcp_agent(options),
+            searcher,
+        ) = await asyncio.gather(
+            _workforce_agents(),
+            asyncio.to_thread(partial(browser_agent, options, hands=hands)),
         )
     except Exception as e:
         logger.error(
             f"Failed to create agents in parallel: {e}", exc_info=True
         )
         raise
-    # Unpack results
-    (
-        coord_task_agents,
-        new_worker_agent,
-        searcher,
-        developer,
-        documenter,
-        multi_modaler,
-        mcp,
-    ) = results
 
     coordinator_agent, task_agent = coord_task_agents
+    # Refill so the next task in this project starts warm as well
+    prewarm_workforce_agents(options, hands=hands)
 
     # ========================================================================
     # Create Workforce instance and add workers (must be sequential)
@@ -16,6 +16,8 @@ import json
 import logging
 from pathlib import Path
 
+from app.utils.mcp_pool import invalidate_mcp_servers
+
 logger = logging.getLogger("mcp_config")
 
 MCP_CONFIG_DIR = Path.home() / ".eigent"
@@ -96,6 +98,7 @@ def remove_mcp(name: str) -> None:
     if name in config["mcpServers"]:
         del config["mcpServers"][name]
         write_mcp_config(config)
+    invalidate_mcp_servers([name])
 
 
 def update_mcp(name: str, mcp: dict) -> None:
@@ -103,3 +106,4 @@ def update_mcp(name: str, mcp: dict) -> None:
     config = read_mcp_config()
     config["mcpServers"][name] = _normalize_mcp(mcp)
     write_mcp_config(config)
+    invalidate_mcp_servers([name])
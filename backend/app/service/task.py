@@ -34,6 +34,9 @@ from app.model.chat import (
 )
 from app.model.enums import Status
 from app.run_context import RunContext
+from app.utils.agent_memory import conversation_entry_chars, snapshot_chars
+from app.utils.model_clients import ModelClientKey, release_model_clients
+from app.utils.warm_agents import discard_warm_agents
 
 logger = logging.getLogger("task_service")
 
@@ -371,6 +374,8 @@ class TaskLock:
     """Track all background tasks for cleanup"""
     registered_toolkits: list[Any]
     """Track toolkits for cleanup (e.g., TerminalToolkit venvs)"""
+    model_client_leases: list[ModelClientKey]
+    """Shared model client pools held by this task's agents"""
 
     # Context management fields
     conversation_history: list[dict[str, Any]]
@@ -379,6 +384,13 @@ class TaskLock:
     """Serialized ChatAgent memory snapshots for session continuity"""
     memory_summary: str
     """Compressed summary of older serialized agent memory"""
+    conversation_chars: int
+    """Running size of conversation_history, see history_chars()"""
+    agent_memory_chars: int
+    """Running size of agent_memory_history, see history_chars()"""
+    _counted_history: tuple[int, int, int, int] | None
+    """(id, len) of both history lists when the running sizes were last
+    exact; a mismatch means the lists were changed behind our back."""
     last_task_result: str
     """Store the last task execution result"""
     last_task_summary: str
@@ -427,11 +439,15 @@ class TaskLock:
         self.last_accessed = datetime.now()
         self.background_tasks = set()
         self.registered_toolkits = []
+        self.model_client_leases = []
 
         # Initialize context management fields
         self.conversation_history = []
         self.agent_memory_history = []
         self.memory_summary = ""
+        self.conversation_chars = 0
+        self.agent_memory_chars = 0
+        self._counted_history = self._history_key()
         self.last_task_result = ""
         self.last_task_summary = ""
         self.question_agent = None
@@ -558,6 +574,14 @@ class TaskLock:
                     waiter.set_result(TASK_LOCK_CLEANUP_SENTINEL)
             waiters.clear()
 
+        # Pre-warmed agents for this project would outlive their toolkits
+        discard_warm_agents(self.id)
+
+        # Report overlay writes a run ended without flushing
+        from app.utils.space_overlay_client import close_overlay_journal
+
+        await asyncio.to_thread(close_overlay_journal, self.run_context)
+
         # Clean up registered toolkits (e.g., remove TerminalToolkit venvs)
         for toolkit in self.registered_toolkits:
             try:
@@ -580,6 +604,9 @@ class TaskLock:
                 )
         self.registered_toolkits.clear()
 
+        leases, self.model_client_leases = self.model_client_leases, []
+        await release_model_clients(leases)
+
         logger.info("Task lock cleanup completed", extra={"task_id": self.id})
 
     def register_toolkit(self, toolkit: Any) -> None:
@@ -618,13 +645,16 @@ class TaskLock:
                 "content_length": len(str(content)),
             },
         )
-        self.conversation_history.append(
-            {
-                "role": role,
-                "content": content,
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        entry = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat(),
+        }
+        in_sync = self._counted_history == self._history_key()
+        self.conversation_history.append(entry)
+        if in_sync:
+            self.conversation_chars += conversation_entry_chars(entry)
+            self._counted_history = self._history_key()
 
     def add_agent_memory_snapshot(self, snapshot: dict[str, Any]) -> None:
         logger.debug(
@@ -636,7 +666,44 @@ class TaskLock:
                 "message_count": len(snapshot.get("messages", [])),
             },
         )
+        in_sync = self._counted_history == self._history_key()
         self.agent_memory_history.append(snapshot)
+        if in_sync:
+            self.agent_memory_chars += snapshot_chars(snapshot)
+            self._counted_history = self._history_key()
+
+    def _history_key(self) -> tuple[int, int, int, int]:
+        return (
+            id(self.conversation_history),
+            len(self.conversation_history),
+            id(self.agent_memory_history),
+            len(self.agent_memory_history),
+        )
+
+    def recount_history_chars(self) -> None:
+        """Recompute the running sizes from the current history lists."""
+        self.conversation_chars = sum(
+            conversation_entry_chars(entry)
+            for entry in self.conversation_history
+        )
+        self.agent_memory_chars = sum(
+            snapshot_chars(snapshot) for snapshot in self.agent_memory_history
+        )
+        self._counted_history = self._history_key()
+
+    def history_chars(self) -> int:
+        """Size of in-process history plus memory summary, in O(1).
+
+        add_conversation/add_agent_memory_snapshot keep the totals current;
+        lists replaced or appended to directly are recounted once here.
+        """
+        if self._counted_history != self._history_key():
+            self.recount_history_chars()
+        return (
+            self.conversation_chars
+            + self.agent_memory_chars
+            + len(self.memory_summary or "")
+        )
 
     def get_recent_context(self, max_entries: int = None) -> str:
         """Get recent conversation context as a formatted string"""
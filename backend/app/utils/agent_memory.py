@@ -13,6 +13,7 @@
 # ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
 
 import datetime
+import hashlib
 import json
 import logging
 import os
@@ -231,8 +232,27 @@ def _iter_workforce_agents(workforce: Any):
             yield "workforce_worker_accumulator", accumulator
 
 
-def _message_dedup_key(msg: dict[str, Any]) -> str:
-    return json.dumps(msg, ensure_ascii=False, sort_keys=True)
+def _message_dedup_key(msg: dict[str, Any]) -> bytes:
+    """Compact stable digest of a serialized snapshot message.
+
+    Content (the bulk of each message) is hashed as-is; only the small,
+    already-capped tool_calls list goes through json. Fields are length
+    prefixed so adjacent values cannot run together.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    tool_calls = msg.get("tool_calls")
+    for field in (
+        msg.get("role") or "",
+        msg.get("content") or "",
+        str(msg.get("tool_call_id") or ""),
+        json.dumps(tool_calls, ensure_ascii=False, sort_keys=True)
+        if tool_calls
+        else "",
+    ):
+        encoded = field.encode("utf-8", "surrogatepass")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.digest()
 
 
 def _append_snapshot_to_task_lock(
@@ -271,7 +291,7 @@ def record_workforce_memory_snapshot(
     """
 
     snapshots: list[dict[str, Any]] = []
-    seen_message_keys: set[str] = set()
+    seen_message_keys: set[bytes] = set()
     for scope, agent in _iter_workforce_agents(workforce):
         snapshot = build_agent_memory_snapshot(
             agent,
@@ -282,20 +302,22 @@ def record_workforce_memory_snapshot(
         )
         if snapshot is None:
             continue
+        keys = [_message_dedup_key(msg) for msg in snapshot["messages"]]
         if seen_message_keys:
             original_count = len(snapshot["messages"])
-            snapshot["messages"] = [
-                msg
-                for msg in snapshot["messages"]
-                if _message_dedup_key(msg) not in seen_message_keys
+            kept = [
+                (msg, key)
+                for msg, key in zip(snapshot["messages"], keys, strict=True)
+                if key not in seen_message_keys
             ]
+            snapshot["messages"] = [msg for msg, _ in kept]
+            keys = [key for _, key in kept]
             dropped = original_count - len(snapshot["messages"])
             if dropped:
                 snapshot["dedup_dropped_from_earlier_agent"] = dropped
             if not snapshot["messages"]:
                 continue
-        for msg in snapshot["messages"]:
-            seen_message_keys.add(_message_dedup_key(msg))
+        seen_message_keys.update(keys)
         _append_snapshot_to_task_lock(task_lock, snapshot)
         snapshots.append(snapshot)
     return snapshots
@@ -350,14 +372,22 @@ def build_memory_context(
     return "\n".join(lines) + "\n\n"
 
 
+def conversation_entry_chars(entry: dict[str, Any]) -> int:
+    """Size one conversation_history entry counts against the history budget."""
+    return len(entry.get("content", ""))
+
+
+def snapshot_chars(snapshot: dict[str, Any]) -> int:
+    """Size one agent memory snapshot counts against the history budget."""
+    total = len(snapshot.get("task_content") or "")
+    total += len(snapshot.get("task_result") or "")
+    for message in snapshot.get("messages") or []:
+        total += len(message.get("content") or "")
+        total += len(json.dumps(message.get("tool_calls") or []))
+    return total
+
+
 def estimate_memory_size(task_lock: Any) -> int:
     snapshots = getattr(task_lock, "agent_memory_history", []) or []
     summary = getattr(task_lock, "memory_summary", "") or ""
-    total = len(summary)
-    for snapshot in snapshots:
-        total += len(snapshot.get("task_content") or "")
-        total += len(snapshot.get("task_result") or "")
-        for message in snapshot.get("messages") or []:
-            total += len(message.get("content") or "")
-            total += len(json.dumps(message.get("tool_calls") or []))
-    return total
+    return len(summary) + sum(snapshot_chars(s) for s in snapshots)
@@ -0,0 +1,403 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""Incremental per-directory file index backing ``list_files`` callers.
+
+The first listing of a directory walks it like :func:`list_files` and
+remembers every directory's mtime. Later refreshes only ``stat`` the known
+directories and re-scan the ones whose mtime moved (a file or subdirectory
+was created, deleted or renamed), so follow-up questions in a large working
+directory no longer pay for a full ``os.walk``.
+
+Creation time is tracked per file so callers can ask which files appeared
+or changed since a task started. A file rewritten in place without touching
+its directory is not seen as changed until that directory is re-scanned.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from app.exception.exception import PathEscapesBaseError
+from app.utils.file_utils import (
+    DEFAULT_SKIP_DIRS,
+    DEFAULT_SKIP_EXTENSIONS,
+    _is_under_base,
+    _should_skip,
+    list_files,
+    resolve_under_base,
+)
+
+logger = logging.getLogger("file_index")
+
+# Indexes kept alive at once; the least recently used one is dropped.
+MAX_INDEXES = 32
+# Directories with more files than this are not indexed; callers fall back
+# to a bounded list_files walk instead of holding the whole tree in memory.
+MAX_INDEXED_FILES = 100_000
+# How long an overflowed index stays unbuilt before it tries again, unless
+# the root directory's mtime moves first.
+OVERFLOW_RETRY_SECONDS = 300.0
+
+
+class FileIndexOverflow(Exception):
+    r"""Raised when a directory has more than ``MAX_INDEXED_FILES`` files."""
+
+
+@dataclass
+class _IndexedFile:
+    path: str
+    # Wall-clock time the index first saw the file; 0.0 for the initial scan.
+    first_seen: float
+    # Only known for files found by an incremental re-scan.
+    mtime: float | None = None
+
+
+@dataclass
+class _IndexedDir:
+    mtime_ns: int
+    subdirs: list[str] = field(default_factory=list)
+    files: dict[str, _IndexedFile] = field(default_factory=dict)
+
+
+class FileIndex:
+    r"""Files under one directory, refreshed incrementally.
+
+    Args:
+        root (str): Resolved directory to index.
+        base_real (str): Real path symlinked files must stay under.
+        skip_dirs (frozenset[str]): Directory names to skip.
+        skip_extensions (tuple[str, ...]): File extensions to skip.
+        skip_prefix (str): Skip dirs/files whose name starts with this.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        base_real: str,
+        skip_dirs: frozenset[str],
+        skip_extensions: tuple[str, ...],
+        skip_prefix: str,
+    ):
+        self.root = root
+        self.base_real = base_real
+        self.skip_dirs = skip_dirs
+        self.skip_extensions = skip_extensions
+        self.skip_prefix = skip_prefix
+        self._dirs: dict[str, _IndexedDir] = {}
+        self._lock = threading.Lock()
+        self._built = False
+        self._file_count = 0
+        self.last_refresh = 0.0
+        # (monotonic time, root mtime_ns) of the last overflow
+        self._overflow: tuple[float, int | None] | None = None
+        # Running total of directory scans, for callers' timing logs
+        self.scanned_dirs = 0
+
+    def refresh(self) -> int:
+        r"""Bring the index up to date; returns how many dirs were scanned.
+
+        Raises:
+            FileIndexOverflow: If the tree holds too many files to index.
+        """
+        with self._lock:
+            if self._overflow is not None:
+                # Skip the doomed scan until the tree may have shrunk
+                overflowed_at, root_mtime_ns = self._overflow
+                if (
+                    time.monotonic() - overflowed_at < OVERFLOW_RETRY_SECONDS
+                    and self._root_mtime_ns() == root_mtime_ns
+                ):
+                    raise FileIndexOverflow(self.root)
+                self._overflow = None
+            now = time.time()
+            try:
+                scanned = self._refresh_dir(
+                    self.root, now, initial=not self._built
+                )
+            except FileIndexOverflow:
+                self._dirs.clear()
+                self._file_count = 0
+                self._built = False
+                self._overflow = (time.monotonic(), self._root_mtime_ns())
+                raise
+            self._built = True
+            self.last_refresh = time.monotonic()
+            self.scanned_dirs += scanned
+            return scanned
+
+    def files(self, max_age: float = 0.0) -> list[str]:
+        r"""All indexed files, refreshing first unless refreshed within
+        ``max_age`` seconds."""
+        self._refresh_if_stale(max_age)
+        with self._lock:
+            return sorted(
+                f.path for d in self._dirs.values() for f in d.files.values()
+            )
+
+    def changed_since(self, since: float, max_age: float = 0.0) -> list[str]:
+        r"""Files created, or re-scanned with a newer mtime, at or after
+        the wall-clock time ``since``."""
+        self._refresh_if_stale(max_age)
+        with self._lock:
+            return sorted(
+                f.path
+                for d in self._dirs.values()
+                for f in d.files.values()
+                if f.first_seen >= since
+                or (f.mtime is not None and f.mtime >= since)
+            )
+
+    def _refresh_if_stale(self, max_age: float) -> None:
+        if not self._built or time.monotonic() - self.last_refresh >= max_age:
+            self.refresh()
+
+    def _root_mtime_ns(self) -> int | None:
+        try:
+            return os.stat(self.root).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh_dir(self, path: str, now: float, initial: bool) -> int:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._forget(path)
+            return 0
+        entry = self._dirs.get(path)
+        scanned = 0
+        if entry is None or entry.mtime_ns != mtime_ns:
+            entry = self._scan(path, mtime_ns, entry, now, initial)
+            scanned = 1
+        for subdir in entry.subdirs:
+            scanned += self._refresh_dir(subdir, now, initial)
+        return scanned
+
+    def _scan(
+        self,
+        path: str,
+        mtime_ns: int,
+        previous: _IndexedDir | None,
+        now: float,
+        initial: bool,
+    ) -> _IndexedDir:
+        known = previous.files if previous is not None else {}
+        entry = _IndexedDir(mtime_ns=mtime_ns)
+        try:
+            with os.scandir(path) as it:
+                for dirent in it:
+                    name = dirent.name
+                    try:
+                        if dirent.is_dir():
+                            # Like os.walk(followlinks=False), symlinked
+                            # directories are neither listed nor entered.
+                            if (
+                                not dirent.is_symlink()
+                                and name not in self.skip_dirs
+                                and not _should_skip(name, self.skip_prefix)
+                            ):
+                                entry.subdirs.append(dirent.path)
+                            continue
+                        if _should_skip(
+                            name, self.skip_prefix, self.skip_extensions
+                        ):
+                            continue
+                        indexed = self._index_file(
+                            dirent, known.get(name), now, initial
+                        )
+                    except OSError:
+                        continue
+                    if indexed is not None:
+                        entry.files[name] = indexed
+        except OSError as e:
+            # Left unindexed so the next refresh retries the scan
+            logger.warning("file index scan failed for %r: %s", path, e)
+            return entry
+        self._file_count += len(entry.files) - len(known)
+        if self._file_count > MAX_INDEXED_FILES:
+            raise FileIndexOverflow(path)
+        if previous is not None:
+            kept = set(entry.subdirs)
+            for subdir in previous.subdirs:
+                if subdir not in kept:
+                    self._forget(subdir)
+        self._dirs[path] = entry
+        return entry
+
+    def _index_file(
+        self,
+        dirent: os.DirEntry,
+        known: _IndexedFile | None,
+        now: float,
+        initial: bool,
+    ) -> _IndexedFile | None:
+        if dirent.is_symlink():
+            real_path = os.path.realpath(dirent.path)
+            if not _is_under_base(real_path, self.base_real):
+                logger.debug(
+                    "file index: skipping %r (escapes base)", dirent.path
+                )
+                return None
+            path = real_path
+        else:
+            path = os.path.normpath(dirent.path)
+        if initial:
+            return _IndexedFile(path=path, first_seen=0.0)
+        mtime = dirent.stat(follow_symlinks=False).st_mtime
+        if known is not None and known.path == path:
+            return _IndexedFile(
+                path=path, first_seen=known.first_seen, mtime=mtime
+            )
+        return _IndexedFile(path=path, first_seen=now, mtime=mtime)
+
+    def _forget(self, path: str) -> None:
+        entry = self._dirs.pop(path, None)
+        if entry is None:
+            return
+        self._file_count -= len(entry.files)
+        for subdir in entry.subdirs:
+            self._forget(subdir)
+
+
+_indexes: OrderedDict[tuple, FileIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(
+    dir_path: str,
+    base: str | None = None,
+    *,
+    skip_dirs: set[str] | None = None,
+    skip_extensions: tuple[str, ...] = DEFAULT_SKIP_EXTENSIONS,
+    skip_prefix: str = ".",
+) -> FileIndex | None:
+    r"""Return the shared index for ``dir_path`` and filters.
+
+    Applies the same base confinement as :func:`list_files`; returns None
+    when ``dir_path`` is invalid, escapes ``base`` or is not a directory.
+    """
+    if not dir_path or not dir_path.strip():
+        logger.warning("file index: empty dir_path")
+        return None
+    resolve_base = base if base else os.getcwd()
+    try:
+        resolved_dir = resolve_under_base(dir_path, resolve_base)
+    except PathEscapesBaseError as e:
+        logger.warning("file index: %s", e)
+        return None
+    except (ValueError, OSError) as e:
+        logger.warning("file index: invalid dir_path %r: %s", dir_path, e)
+        return None
+    if not os.path.isdir(resolved_dir):
+        return None
+    base_real = os.path.realpath(resolve_base)
+    all_skip_dirs = frozenset(DEFAULT_SKIP_DIRS.union(skip_dirs or set()))
+    key = (
+        resolved_dir,
+        base_real,
+        all_skip_dirs,
+        tuple(skip_extensions),
+        skip_prefix,
+    )
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = FileIndex(
+                resolved_dir,
+                base_real,
+                all_skip_dirs,
+                tuple(skip_extensions),
+                skip_prefix,
+            )
+            _indexes[key] = index
+            while len(_indexes) > MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+
+def indexed_files(
+    dir_path: str,
+    base: str | None = None,
+    *,
+    max_entries: int = 10_000,
+    max_age: float = 0.0,
+    skip_dirs: set[str] | None = None,
+    skip_extensions: tuple[str, ...] = DEFAULT_SKIP_EXTENSIONS,
+    skip_prefix: str = ".",
+    stats: dict[str, float | int] | None = None,
+) -> list[str]:
+    r"""Index-backed equivalent of :func:`list_files`, sorted by path.
+
+    Args:
+        max_age (float): Reuse the index without touching the disk when it
+            was refreshed within this many seconds.
+        stats (dict | None): Filled with ``scanned_dirs`` (directories
+            re-scanned by this call) and ``indexed_dirs``.
+    """
+    index = get_file_index(
+        dir_path,
+        base,
+        skip_dirs=skip_dirs,
+        skip_extensions=skip_extensions,
+        skip_prefix=skip_prefix,
+    )
+    if index is None:
+        return []
+    try:
+        scanned_before = index.scanned_dirs
+        files = index.files(max_age=max_age)[:max_entries]
+        if stats is not None:
+            stats["scanned_dirs"] = index.scanned_dirs - scanned_before
+            stats["indexed_dirs"] = len(index._dirs)
+        return files
+    except FileIndexOverflow:
+        logger.info(
+            "file index: %r too large to index, listing directly", dir_path
+        )
+        return list_files(
+            dir_path,
+            base,
+            max_entries=max_entries,
+            skip_dirs=skip_dirs,
+            skip_extensions=skip_extensions,
+            skip_prefix=skip_prefix,
+            stats=stats,
+        )
+
+
+async def refresh_file_indexes(
+    dir_paths: Iterable[str],
+    base: str | None = None,
+    **filters,
+) -> None:
+    r"""Refresh the indexes for ``dir_paths`` in a worker thread."""
+
+    def refresh() -> None:
+        for dir_path in dir_paths:
+            index = get_file_index(dir_path, base or dir_path, **filters)
+            if index is None:
+                continue
+            try:
+                index.refresh()
+            except FileIndexOverflow:
+                pass
+
+    await asyncio.to_thread(refresh)
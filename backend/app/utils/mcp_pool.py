@@ -0,0 +1,314 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+"""Brain-wide pool of connected MCP servers.
+
+Spawning a stdio MCP server, running the initialize handshake and listing
+its tools costs seconds per server, and used to happen for every server on
+every workforce construction. The pool keeps one connected ``MCPToolkit``
+per server, keyed by a hash of the server's normalized config, and hands
+out copies of the cached tool list.
+
+- Checkouts are health-checked (MCP ping) at most every
+  ``EIGENT_MCP_POOL_HEALTH_INTERVAL`` seconds; a dead server is replaced by
+  a fresh connection.
+- Tools handed to agents are tracked weakly. A server nobody holds tools
+  for is disconnected after ``EIGENT_MCP_POOL_IDLE_TTL`` seconds.
+- :func:`invalidate_mcp_servers` retires every entry for the given server
+  names, so the next checkout reconnects with the new config. Retired
+  servers are disconnected once their last tools are released.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from camel.toolkits import FunctionTool, MCPToolkit
+
+from app.component.environment import env
+
+logger = logging.getLogger("mcp_pool")
+
+MCP_CONNECT_TIMEOUT = 180
+_PING_TIMEOUT = 5.0
+_DEFAULT_IDLE_TTL = 900.0
+_DEFAULT_HEALTH_INTERVAL = 30.0
+
+
+def _float_setting(name: str, default: float) -> float:
+    raw = env(name, "")
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        value = -1.0
+    if value < 0:
+        logger.warning("Invalid %s=%r, using default %s", name, raw, default)
+        return default
+    return value
+
+
+@dataclass(eq=False)
+class _PooledServer:
+    key: str
+    name: str
+    toolkit: MCPToolkit
+    loop: asyncio.AbstractEventLoop
+    tools: list[FunctionTool]
+    leases: weakref.WeakSet = field(default_factory=weakref.WeakSet)
+    last_used: float = field(default_factory=time.monotonic)
+    last_checked: float = field(default_factory=time.monotonic)
+
+    def checkout(self) -> list[FunctionTool]:
+        # Agents tag tools with per-agent attributes (e.g. _toolkit_name),
+        # so each checkout gets its own shallow copies of the cached tools.
+        tools = [copy.copy(tool) for tool in self.tools]
+        self.leases.update(tools)
+        self.last_used = time.monotonic()
+        return tools
+
+
+_servers: dict[str, _PooledServer] = {}
+_retired: list[_PooledServer] = []
+# Guards _servers/_retired: config routes invalidate from worker threads.
+_servers_lock = threading.Lock()
+_connecting: dict[str, asyncio.Task[_PooledServer]] = {}
+_closing: set[asyncio.Task] = set()
+
+
+def server_config_key(name: str, config: dict[str, Any]) -> str:
+    r"""Stable hash of a server name and its normalized config."""
+    payload = json.dumps(
+        {"name": name, "config": config}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_pooled_mcp_tools(
+    servers: dict[str, dict[str, Any]],
+) -> list[FunctionTool]:
+    r"""Return tools for ``servers``, reusing pooled connections.
+
+    Servers are checked out concurrently. A server that fails to connect
+    is logged and skipped, as ``MCPToolkit(skip_failed=True)`` did.
+    """
+    # The loop handle that resumed the caller still references the result
+    # of its previous checkout; yield once so those leases can drop before
+    # idle and retired servers are reaped.
+    await asyncio.sleep(0)
+    _reap_idle()
+    names = list(servers)
+    results = await asyncio.gather(
+        *(_checkout(name, servers[name]) for name in names),
+        return_exceptions=True,
+    )
+    tools: list[FunctionTool] = []
+    seen: set[str] = set()
+    for name, result in zip(names, results, strict=True):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            logger.warning(f"MCP server {name} unavailable: {result}")
+            continue
+        for tool in result:
+            tool_name = tool.get_function_name()
+            if tool_name in seen:
+                logger.warning(
+                    f"Duplicate MCP tool '{tool_name}' from {name} skipped"
+                )
+                continue
+            seen.add(tool_name)
+            tools.append(tool)
+    return tools
+
+
+def invalidate_mcp_servers(names: Iterable[str]) -> int:
+    r"""Retire pooled connections for the given server names.
+
+    Safe to call from any thread. Returns the number of retired entries.
+    """
+    names = set(names)
+    with _servers_lock:
+        stale = [e for e in _servers.values() if e.name in names]
+        for entry in stale:
+            del _servers[entry.key]
+        _retired.extend(stale)
+    if stale:
+        logger.info(
+            f"Invalidated {len(stale)} pooled MCP connection(s) for "
+            f"{sorted(names)}"
+        )
+    return len(stale)
+
+
+async def close_mcp_pool() -> None:
+    r"""Disconnect every pooled server; used on Brain shutdown."""
+    with _servers_lock:
+        entries = [*_servers.values(), *_retired]
+        _servers.clear()
+        _retired.clear()
+    for task in list(_connecting.values()):
+        task.cancel()
+    _connecting.clear()
+    for entry in entries:
+        _schedule_close(entry)
+    if _closing:
+        await asyncio.gather(*_closing, return_exceptions=True)
+
+
+async def _checkout(name: str, config: dict[str, Any]) -> list[FunctionTool]:
+    key = server_config_key(name, config)
+    loop = asyncio.get_running_loop()
+    with _servers_lock:
+        entry = _servers.get(key)
+    if entry is not None and (
+        entry.loop is not loop or not await _is_healthy(entry)
+    ):
+        logger.info(f"Reconnecting pooled MCP server {name}")
+        _retire(entry)
+        entry = None
+    if entry is None:
+        entry = await _connect_shared(key, name, config, loop)
+    return entry.checkout()
+
+
+async def _is_healthy(entry: _PooledServer) -> bool:
+    if not entry.toolkit.is_connected:
+        return False
+    now = time.monotonic()
+    interval = _float_setting(
+        "EIGENT_MCP_POOL_HEALTH_INTERVAL", _DEFAULT_HEALTH_INTERVAL
+    )
+    if now - entry.last_checked < interval:
+        return True
+    try:
+        for client in entry.toolkit.clients:
+            session = client.session
+            if session is None:
+                return False
+            await asyncio.wait_for(session.send_ping(), _PING_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"MCP server {entry.name} failed health check: {e}")
+        return False
+    entry.last_checked = now
+    return True
+
+
+async def _connect_shared(
+    key: str,
+    name: str,
+    config: dict[str, Any],
+    loop: asyncio.AbstractEventLoop,
+) -> _PooledServer:
+    # Concurrent checkouts of the same server share one connect attempt.
+    task = _connecting.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_connect(key, name, config, loop))
+        _connecting[key] = task
+
+        def _forget(done: asyncio.Task, key: str = key) -> None:
+            if _connecting.get(key) is done:
+                del _connecting[key]
+
+        task.add_done_callback(_forget)
+    return await asyncio.shield(task)
+
+
+async def _connect(
+    key: str,
+    name: str,
+    config: dict[str, Any],
+    loop: asyncio.AbstractEventLoop,
+) -> _PooledServer:
+    started = time.perf_counter()
+    toolkit = MCPToolkit(
+        config_dict={"mcpServers": {name: config}},
+        timeout=MCP_CONNECT_TIMEOUT,
+    )
+    await toolkit.connect()
+    entry = _PooledServer(
+        key=key,
+        name=name,
+        toolkit=toolkit,
+        loop=loop,
+        tools=toolkit.get_tools(),
+    )
+    with _servers_lock:
+        previous = _servers.get(key)
+        _servers[key] = entry
+        if previous is not None:
+            _retired.append(previous)
+    logger.info(
+        f"MCP server {name} connected in "
+        f"{time.perf_counter() - started:.2f}s with {len(entry.tools)} tools"
+    )
+    return entry
+
+
+def _retire(entry: _PooledServer) -> None:
+    with _servers_lock:
+        if _servers.get(entry.key) is entry:
+            del _servers[entry.key]
+        _retired.append(entry)
+
+
+def _reap_idle() -> None:
+    ttl = _float_setting("EIGENT_MCP_POOL_IDLE_TTL", _DEFAULT_IDLE_TTL)
+    now = time.monotonic()
+    with _servers_lock:
+        idle = [
+            e
+            for e in _servers.values()
+            if not e.leases and now - e.last_used >= ttl
+        ]
+        for entry in idle:
+            del _servers[entry.key]
+        released = [e for e in _retired if not e.leases]
+        _retired[:] = [e for e in _retired if e.leases]
+    for entry in [*idle, *released]:
+        _schedule_close(entry)
+
+
+def _schedule_close(entry: _PooledServer) -> None:
+    # Connections belong to the loop that opened them.
+    if entry.loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is entry.loop:
+        task = running.create_task(_disconnect(entry))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    else:
+        asyncio.run_coroutine_threadsafe(_disconnect(entry), entry.loop)
+
+
+async def _disconnect(entry: _PooledServer) -> None:
+    try:
+        await entry.toolkit.disconnect()
+        logger.info(f"Disconnected pooled MCP server {entry.name}")
+    except Exception as e:
+        # The stdio transport may refuse to close from a task other than
+        # the one that opened it; the process exits with the Brain anyway.
+        logger.debug(f"Error disconnecting MCP server {entry.name}: {e}")
@@ -0,0 +1,183 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+"""Process-wide registry of model-backend SDK clients.
+
+Every agent in a workforce gets its own camel model backend, and each
+backend would normally construct its own OpenAI/Anthropic SDK client with a
+private HTTP connection pool. Agents that talk to the same endpoint with the
+same credentials can share those clients instead, so they reuse warm
+keep-alive connections rather than each paying for a TLS handshake.
+
+The first backend built for a key donates its clients to the registry; later
+backends for the same key are constructed with ``client=``/``async_client=``.
+Each hand-out is a reference (a "lease") that the owning TaskLock releases on
+cleanup; the clients are closed when the last lease goes away.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from camel.models import (
+    AnthropicModel,
+    AzureOpenAIModel,
+    OpenAICompatibleModel,
+    OpenAIModel,
+)
+
+logger = logging.getLogger("model_clients")
+
+# Backends that accept pre-built ``client``/``async_client`` objects and keep
+# them on ``_client``/``_async_client``. OpenAI-compatible subclasses
+# (OpenRouter, DeepSeek, Qwen, ...) forward both through to their base.
+_SHAREABLE_BACKENDS = (
+    OpenAIModel,
+    OpenAICompatibleModel,
+    AnthropicModel,
+    AzureOpenAIModel,
+)
+
+ModelClientKey = tuple[str, str, str, str, float | None]
+ModelT = TypeVar("ModelT")
+
+
+@dataclass
+class _SharedClients:
+    client: Any
+    async_client: Any
+    refs: int
+
+
+_registry: dict[ModelClientKey, _SharedClients] = {}
+_registry_lock = threading.Lock()
+
+
+def model_client_key(
+    model_platform: str,
+    api_url: str | None,
+    api_key: str | None,
+    init_params: dict[str, Any],
+    timeout: float | None,
+) -> ModelClientKey | None:
+    r"""Return the sharing key for a backend, or None if it must not share.
+
+    Everything that ends up inside the SDK client is part of the key; the
+    per-request model config is not, so agents with different temperatures
+    or streaming settings still share a pool. The API key is fingerprinted
+    so the registry never holds it in the clear.
+    """
+    if "client" in init_params or "async_client" in init_params:
+        return None
+    fingerprint = (
+        hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else ""
+    )
+    params = json.dumps(init_params, sort_keys=True, default=repr)
+    return (
+        str(model_platform).lower(),
+        api_url or "",
+        fingerprint,
+        params,
+        timeout,
+    )
+
+
+def build_shared_model(
+    key: ModelClientKey | None,
+    factory: Callable[[dict[str, Any]], ModelT],
+) -> tuple[ModelT, ModelClientKey | None]:
+    r"""Build a model backend, sharing SDK clients with earlier backends.
+
+    Args:
+        key: Sharing key from :func:`model_client_key`, or None to build an
+            unshared backend.
+        factory: Builds the backend; receives ``client``/``async_client``
+            kwargs when shared clients exist for ``key``, else ``{}``.
+
+    Returns:
+        The backend and the key it holds a lease on (None when the backend
+        owns private clients). The caller must hand the lease to
+        :func:`release_model_clients` when the backend is retired.
+    """
+    if key is None:
+        return factory({}), None
+
+    with _registry_lock:
+        entry = _registry.get(key)
+        if entry is not None:
+            entry.refs += 1
+            shared = {
+                "client": entry.client,
+                "async_client": entry.async_client,
+            }
+        else:
+            shared = {}
+
+    try:
+        model = factory(shared)
+    except Exception:
+        if shared:
+            _release([key])
+        raise
+    if shared:
+        return model, key
+
+    client = getattr(model, "_client", None)
+    async_client = getattr(model, "_async_client", None)
+    if (
+        not isinstance(model, _SHAREABLE_BACKENDS)
+        or client is None
+        or async_client is None
+    ):
+        return model, None
+    with _registry_lock:
+        if key in _registry:
+            # Another thread donated first; this backend keeps its own
+            # clients and they are dropped with it.
+            return model, None
+        _registry[key] = _SharedClients(client, async_client, refs=1)
+    return model, key
+
+
+def _release(keys: Iterable[ModelClientKey]) -> list[_SharedClients]:
+    retired = []
+    with _registry_lock:
+        for key in keys:
+            entry = _registry.get(key)
+            if entry is None:
+                continue
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del _registry[key]
+                retired.append(entry)
+    return retired
+
+
+async def release_model_clients(keys: Iterable[ModelClientKey]) -> None:
+    r"""Drop one lease per key and close clients nobody references."""
+    for entry in _release(keys):
+        try:
+            entry.client.close()
+            await entry.async_client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close shared model client: {e}")
+
+
+def shared_model_client_count() -> int:
+    r"""Number of distinct client pools currently held by the registry."""
+    with _registry_lock:
+        return len(_registry)
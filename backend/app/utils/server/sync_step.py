@@ -17,18 +17,29 @@ Cloud sync step decorator.
 Syncs SSE step data to cloud server when SERVER_URL is configured.
 High-frequency events (decompose_text) are batched to reduce API calls.
 
+Steps are queued per task_id and posted to ``/chat/steps/batch`` by one
+flusher per task, so order is preserved and a slow server cannot pile up
+unbounded pending requests. All requests to one server share a pooled
+keep-alive client.
+
 Config (~/.eigent/.env):
     SERVER_URL=https://dev.eigent.ai/api/v1
+    EIGENT_STEP_SYNC_BATCH_SIZE=50
+    EIGENT_STEP_SYNC_FLUSH_MS=250
+    EIGENT_STEP_SYNC_MAX_PENDING=2000
 """
 
 import asyncio
 import json
 import logging
 import time
+from collections import deque
+from dataclasses import dataclass, field
 
 import httpx
 
 from app.component.environment import env
+from app.model.chat import StepEvent
 from app.service.task import get_task_lock_if_exists
 
 logger = logging.getLogger("sync_step")
@@ -36,6 +47,12 @@ logger = logging.getLogger("sync_step")
 # Batch config for decompose_text events
 BATCH_WORD_THRESHOLD = 5
 
+_DEFAULT_SYNC_BATCH_SIZE = 50
+_DEFAULT_SYNC_FLUSH_MS = 250
+_DEFAULT_SYNC_MAX_PENDING = 2000
+_SYNC_REQUEST_TIMEOUT_SECONDS = 5.0
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Buffer storage: task_id -> accumulated text
 _text_buffers: dict[str, str] = {}
 _warned_missing_auth_projects: set[str] = set()
@@ -43,6 +60,13 @@ _warned_missing_server_url_projects: set[str] = set()
 _logged_sync_targets: set[str] = set()
 _logged_first_sync_tasks: set[str] = set()
 
+# Pooled keep-alive clients: server base URL -> (event loop, client)
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+# Outbound queues: task_id -> pending steps for that task
+_outboxes: dict[str, "_TaskOutbox"] = {}
+# Base URLs whose server predates POST /chat/steps/batch
+_batch_unsupported: set[str] = set()
+
 
 def _normalize_server_url(server_url: str | None) -> str:
     if not server_url:
@@ -90,6 +114,10 @@ def sync_step(func):
             _try_sync(args, value, config)
             yield value
 
+        task_id = _get_task_id(args)
+        if task_id:
+            _request_flush(config, task_id)
+
     return wrapper
 
 
@@ -107,25 +135,23 @@ def sync_step_event(
     if not sync_base or not authorization:
         return
 
-    payload = {
-        "task_id": task_id,
-        "run_id": run_id or task_id,
-        "step": step,
-        "data": data,
-        "timestamp": time.time_ns() / 1_000_000_000,
-    }
-    asyncio.create_task(
-        _send(
-            f"{sync_base}/chat/steps",
-            payload,
-            {"Authorization": authorization},
-        )
+    body = _step_body(
+        task_id,
+        step,
+        json.dumps(data, ensure_ascii=False),
+        run_id=run_id or task_id,
+    )
+    _enqueue(
+        f"{sync_base}/chat/steps",
+        task_id,
+        body,
+        {"Authorization": authorization},
     )
 
 
 def _try_sync(args, value, sync_url):
-    data = _parse_value(value)
-    if not data:
+    event = _parse_value(value)
+    if event is None:
         return
 
     task_id = _get_task_id(args)
@@ -137,11 +163,11 @@ def _try_sync(args, value, sync_url):
         _warn_missing_auth(args)
         return
 
-    step = data.get("step")
+    step = event.step
 
     # Batch decompose_text events to reduce API calls
     if step == "decompose_text":
-        _buffer_text(task_id, data["data"].get("content", ""))
+        _buffer_text(task_id, event.data.get("content", ""))
         if _should_flush(task_id):
             _flush_buffer(task_id, sync_url, headers)
         return
@@ -150,12 +176,7 @@ def _try_sync(args, value, sync_url):
     if task_id in _text_buffers:
         _flush_buffer(task_id, sync_url, headers)
 
-    payload = {
-        "task_id": task_id,
-        "step": step,
-        "data": data["data"],
-        "timestamp": time.time_ns() / 1_000_000_000,
-    }
+    body = _step_body(task_id, step, event.encoded_data)
 
     if task_id not in _logged_first_sync_tasks:
         _logged_first_sync_tasks.add(task_id)
@@ -166,7 +187,7 @@ def _try_sync(args, value, sync_url):
             sync_url,
         )
 
-    asyncio.create_task(_send(sync_url, payload, headers))
+    _enqueue(sync_url, task_id, body, headers)
 
 
 def _buffer_text(task_id: str, content: str):
@@ -193,30 +214,49 @@ def _flush_buffer(
     if not text:
         return
 
-    payload = {
-        "task_id": task_id,
-        "step": "decompose_text",
-        "data": {"content": text},
-        "timestamp": time.time_ns() / 1_000_000_000,
-    }
+    body = _step_body(
+        task_id,
+        "decompose_text",
+        json.dumps({"content": text}, ensure_ascii=False),
+    )
+    _enqueue(sync_url, task_id, body, headers)
 
-    asyncio.create_task(_send(sync_url, payload, headers))
 
+def _parse_value(value) -> StepEvent | None:
+    # Frames built by sse_json already carry their step and encoded data.
+    if isinstance(value, StepEvent):
+        return value
 
-def _parse_value(value):
     if isinstance(value, str) and value.startswith("data: "):
         value = value[6:].strip()
 
     try:
         data = json.loads(value)
         if "step" in data and "data" in data:
-            return data
+            return StepEvent(data["step"], data["data"])
     except (json.JSONDecodeError, TypeError):
         pass
 
     return None
 
 
+def _step_body(
+    task_id: str,
+    step: str,
+    encoded_data: str,
+    *,
+    run_id: str | None = None,
+) -> str:
+    """Build one ChatStepIn JSON object around already-encoded ``data``."""
+    fields = {"task_id": task_id}
+    if run_id is not None:
+        fields["run_id"] = run_id
+    fields["step"] = step
+    head = json.dumps(fields, ensure_ascii=False)[:-1]
+    timestamp = time.time_ns() / 1_000_000_000
+    return f'{head}, "data": {encoded_data}, "timestamp": {timestamp!r}}}'
+
+
 def _get_task_id(args):
     if not args or not hasattr(args[0], "task_id"):
         return None
@@ -278,16 +318,206 @@ def _warn_missing_server_url(args) -> None:
     )
 
 
-async def _send(url, data, headers: dict[str, str]):
+def _int_setting(name: str, default: int) -> int:
+    raw = env(name, "")
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value <= 0:
+        logger.warning(
+            "Invalid %s=%r, using default %s",
+            name,
+            raw,
+            default,
+        )
+        return default
+    return value
+
+
+@dataclass
+class _TaskOutbox:
+    """Pending steps for one task, drained in order by a single flusher."""
+
+    sync_url: str
+    headers: dict[str, str]
+    batch_size: int
+    flush_interval: float
+    max_pending: int
+    pending: deque[str] = field(default_factory=deque)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    flusher: asyncio.Task | None = None
+    dropped: int = 0
+
+
+def _enqueue(
+    sync_url: str, task_id: str, body: str, headers: dict[str, str]
+) -> None:
+    """Queue one encoded step for ``task_id`` and ensure a flusher runs.
+
+    The queue is bounded: when the server cannot keep up, the oldest
+    pending steps are dropped instead of growing memory without limit.
+    """
+    key = f"{sync_url}|{task_id}"
+    outbox = _outboxes.get(key)
+    if outbox is None:
+        outbox = _TaskOutbox(
+            sync_url=sync_url,
+            headers=headers,
+            batch_size=_int_setting(
+                "EIGENT_STEP_SYNC_BATCH_SIZE", _DEFAULT_SYNC_BATCH_SIZE
+            ),
+            flush_interval=_int_setting(
+                "EIGENT_STEP_SYNC_FLUSH_MS", _DEFAULT_SYNC_FLUSH_MS
+            )
+            / 1000,
+            max_pending=_int_setting(
+                "EIGENT_STEP_SYNC_MAX_PENDING", _DEFAULT_SYNC_MAX_PENDING
+            ),
+        )
+        _outboxes[key] = outbox
+    outbox.headers = headers
+
+    if len(outbox.pending) >= outbox.max_pending:
+        outbox.pending.popleft()
+        outbox.dropped += 1
+        if outbox.dropped == 1 or outbox.dropped % outbox.max_pending == 0:
+            logger.warning(
+                "Cloud step sync is falling behind for task_id=%s; "
+                "dropped %s oldest pending steps",
+                task_id,
+                outbox.dropped,
+            )
+    outbox.pending.append(body)
+    if len(outbox.pending) >= outbox.batch_size:
+        outbox.wakeup.set()
+
+    if outbox.flusher is None or outbox.flusher.done():
+        outbox.flusher = asyncio.create_task(_drain(key, outbox))
+
+
+def _request_flush(sync_url: str, task_id: str) -> None:
+    """Send whatever is queued for ``task_id`` without waiting for a timer."""
+    outbox = _outboxes.get(f"{sync_url}|{task_id}")
+    if outbox is not None:
+        outbox.wakeup.set()
+
+
+async def _drain(key: str, outbox: _TaskOutbox) -> None:
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(url, json=data, headers=headers)
+        while outbox.pending:
+            if len(outbox.pending) < outbox.batch_size:
+                try:
+                    await asyncio.wait_for(
+                        outbox.wakeup.wait(), outbox.flush_interval
+                    )
+                except TimeoutError:
+                    pass
+            outbox.wakeup.clear()
+            count = min(outbox.batch_size, len(outbox.pending))
+            batch = [outbox.pending.popleft() for _ in range(count)]
+            await _send_batch(outbox.sync_url, batch, outbox.headers)
+    finally:
+        if _outboxes.get(key) is outbox and not outbox.pending:
+            del _outboxes[key]
+
+
+async def flush_step_sync(timeout: float = 5.0) -> None:
+    """Drain all queued steps and close pooled clients.
+
+    Called on shutdown; steps still queued after ``timeout`` are dropped.
+    """
+    flushers = []
+    for outbox in list(_outboxes.values()):
+        outbox.wakeup.set()
+        if outbox.flusher is not None and not outbox.flusher.done():
+            flushers.append(outbox.flusher)
+    if flushers:
+        _, still_running = await asyncio.wait(flushers, timeout=timeout)
+        for flusher in still_running:
+            flusher.cancel()
+        if still_running:
+            logger.warning(
+                "Cloud step sync did not drain %s task queues before shutdown",
+                len(still_running),
+            )
+
+    loop = asyncio.get_running_loop()
+    for base, (client_loop, client) in list(_clients.items()):
+        if client_loop is loop:
+            await client.aclose()
+        _clients.pop(base, None)
+
+
+def _get_client(url: str) -> httpx.AsyncClient:
+    """Return the keep-alive client shared by every request to this server.
+
+    httpx clients are bound to the loop they first ran on, so a client is
+    replaced when it is reused from a different event loop.
+    """
+    parsed = httpx.URL(url)
+    base = f"{parsed.scheme}://{parsed.netloc.decode()}"
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(base)
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+    client = httpx.AsyncClient(timeout=_SYNC_REQUEST_TIMEOUT_SECONDS)
+    _clients[base] = (loop, client)
+    return client
+
+
+async def _send_batch(
+    sync_url: str, batch: list[str], headers: dict[str, str]
+) -> None:
+    if sync_url not in _batch_unsupported:
+        batch_url = f"{sync_url}/batch"
+        try:
+            response = await _get_client(batch_url).post(
+                batch_url,
+                content=f"[{','.join(batch)}]",
+                headers={**headers, **_JSON_HEADERS},
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to sync {len(batch)} steps to {batch_url}: "
+                f"{type(e).__name__}: {e}"
+            )
+            return
+        # Servers without the batch route answer 404/405; fall back to
+        # posting steps one at a time on the shared client.
+        if response.status_code not in (404, 405):
             if response.is_error:
                 logger.error(
-                    "Failed to sync step to %s: HTTP %s: %s",
-                    url,
+                    "Failed to sync %s steps to %s: HTTP %s: %s",
+                    len(batch),
+                    batch_url,
                     response.status_code,
                     response.text[:500],
                 )
+            return
+        _batch_unsupported.add(sync_url)
+        logger.info(
+            "Server does not accept batched steps, sending one at a time: %s",
+            sync_url,
+        )
+
+    for body in batch:
+        await _send(sync_url, body, headers)
+
+
+async def _send(url, body: str, headers: dict[str, str]):
+    try:
+        response = await _get_client(url).post(
+            url, content=body, headers={**headers, **_JSON_HEADERS}
+        )
+        if response.is_error:
+            logger.error(
+                "Failed to sync step to %s: HTTP %s: %s",
+                url,
+                response.status_code,
+                response.text[:500],
+            )
     except Exception as e:
         logger.error(f"Failed to sync step to {url}: {type(e).__name__}: {e}")
@@ -18,17 +18,26 @@ import hashlib
 import logging
 import threading
 import weakref
+from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
-from typing import Literal
+from typing import Any, Literal
 
 import httpx
 
 from app.run_context import RunContext, get_current_run_context
 from app.service.task import get_task_lock_if_exists
+from app.utils.workdir_manifest import WorkdirManifest, workdir_manifest
 
 logger = logging.getLogger("space_overlay")
 
 HASH_CHUNK_SIZE = 1024 * 1024
+# Journal flushes: at most this many paths per request, sent this often or
+# as soon as a full batch is pending.
+OVERLAY_BATCH_SIZE = 100
+OVERLAY_FLUSH_INTERVAL_SECONDS = 0.5
+OVERLAY_REQUEST_TIMEOUT_SECONDS = 10.0
+
+OverlayStatus = Literal["added", "modified", "deleted"]
 
 _PATH_LOCKS: weakref.WeakValueDictionary[
     tuple[str, str, str, str], threading.Lock
@@ -59,6 +68,20 @@ def sha256_of_file(path: Path) -> str | None:
     return digest.hexdigest()
 
 
+def workdir_file_hash(
+    context: RunContext, rel_path: str, target_path: Path
+) -> str | None:
+    r"""Hash of a workdir file, served from the workdir manifest when the
+    file is unchanged since it was last hashed."""
+    manifest = workdir_manifest(context.working_directory)
+    if (
+        manifest is not None
+        and target_path.resolve() == manifest.workdir / rel_path
+    ):
+        return manifest.hash_of(rel_path)
+    return sha256_of_file(target_path)
+
+
 def normalize_relative_path(path: str) -> str:
     normalized = PurePosixPath(path.replace("\\", "/"))
     if (
@@ -162,33 +185,40 @@ def should_record_overlay(context: RunContext, target: Path) -> bool:
         return True
 
 
-def post_overlay_write(
+def _overlays_url(context: RunContext, server_url: str) -> str:
+    return (
+        f"{server_url}/spaces/{context.space_id}/projects/"
+        f"{context.project_id}/overlays"
+    )
+
+
+def _overlay_headers(context: RunContext) -> dict[str, str]:
+    headers = {"Authorization": context.auth_header}
+    if context.user_id:
+        headers["X-User-ID"] = context.user_id
+    return headers
+
+
+def _overlay_payload(
     context: RunContext,
     rel_path: str,
     target_path: Path,
     *,
     base_hash: str | None,
-    status: Literal["added", "modified", "deleted"],
+    status: OverlayStatus,
     file_hash: str | None = None,
     size: int | None = None,
     mode: int | None = None,
-) -> bool:
-    if not should_record_overlay(context, target_path):
-        return True
-
-    server_url = normalize_server_url(context.server_url)
-    if not server_url:
-        return True
-
+) -> dict[str, Any]:
     if status == "deleted":
         file_hash = None
     elif file_hash is None:
-        file_hash = sha256_of_file(target_path)
+        file_hash = workdir_file_hash(context, rel_path, target_path)
     if (size is None or mode is None) and target_path.exists():
         stat_result = target_path.stat()
         size = stat_result.st_size if size is None else size
         mode = stat_result.st_mode if mode is None else mode
-    payload = {
+    return {
         "run_id": context.run_id,
         "path": rel_path,
         "status": status,
@@ -201,17 +231,48 @@ def post_overlay_write(
         "source_root": str(context.working_directory.expanduser().resolve()),
         "metadata": {},
     }
-    url = (
-        f"{server_url}/spaces/{context.space_id}/projects/"
-        f"{context.project_id}/overlays"
-    )
-    headers = {"Authorization": context.auth_header}
-    if context.user_id:
-        headers["X-User-ID"] = context.user_id
 
+
+def post_overlay_write(
+    context: RunContext,
+    rel_path: str,
+    target_path: Path,
+    *,
+    base_hash: str | None,
+    status: OverlayStatus,
+    file_hash: str | None = None,
+    size: int | None = None,
+    mode: int | None = None,
+) -> bool:
+    r"""Report one overlay write synchronously.
+
+    Tool writes go through the run's :class:`OverlayJournal` instead, which
+    batches them off the calling thread.
+    """
+    if not should_record_overlay(context, target_path):
+        return True
+
+    server_url = normalize_server_url(context.server_url)
+    if not server_url:
+        return True
+
+    payload = _overlay_payload(
+        context,
+        rel_path,
+        target_path,
+        base_hash=base_hash,
+        status=status,
+        file_hash=file_hash,
+        size=size,
+        mode=mode,
+    )
     try:
         with httpx.Client(timeout=5.0) as client:
-            response = client.post(url, json=payload, headers=headers)
+            response = client.post(
+                _overlays_url(context, server_url),
+                json=payload,
+                headers=_overlay_headers(context),
+            )
             if response.is_error:
                 _record_overlay_sync_failure(
                     reason=f"http_{response.status_code}",
@@ -229,3 +290,348 @@ def post_overlay_write(
             error_message=str(exc),
         )
         return False
+
+
+def coalesce_overlay_status(
+    previous: OverlayStatus,
+    incoming: OverlayStatus,
+    base_hash: str | None,
+) -> OverlayStatus:
+    r"""Status of a path written twice in one run.
+
+    Mirrors the server's merge of a write into an existing overlay row.
+    """
+    if incoming == "deleted":
+        return "deleted"
+    if previous == "added":
+        return "added"
+    if previous == "deleted":
+        return "added" if base_hash is None else "modified"
+    if previous == "modified" and incoming == "added":
+        return "modified"
+    return incoming
+
+
+@dataclass
+class _JournalEntry:
+    target_path: Path
+    base_hash: str | None
+    status: OverlayStatus
+
+
+class OverlayJournal:
+    r"""Pending overlay writes of one run, flushed in batches.
+
+    Writes to the same path are coalesced until the next flush; hashing and
+    the HTTP round trip happen on the journal's flusher thread, not in the
+    tool call. Each flush sends up to ``OVERLAY_BATCH_SIZE`` paths per
+    request to the bulk overlay endpoint over one reused connection.
+
+    Args:
+        context (RunContext): Run whose writes are recorded.
+    """
+
+    def __init__(self, context: RunContext):
+        self.context = context
+        self._entries: dict[str, _JournalEntry] = {}
+        # Paths the server already holds an overlay row for in this run
+        self._sent: set[str] = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._client: httpx.Client | None = None
+        self._batch_supported = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"overlay-journal-{context.run_id}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def knows(self, rel_path: str) -> bool:
+        r"""Whether ``rel_path`` already has an overlay in this run, so its
+        base hash is not needed again."""
+        with self._lock:
+            return rel_path in self._entries or rel_path in self._sent
+
+    def record(
+        self,
+        rel_path: str,
+        target_path: Path,
+        *,
+        base_hash: str | None,
+        status: OverlayStatus,
+    ) -> None:
+        with self._lock:
+            previous = self._entries.get(rel_path)
+            if previous is None:
+                self._entries[rel_path] = _JournalEntry(
+                    target_path, base_hash, status
+                )
+            else:
+                previous.status = coalesce_overlay_status(
+                    previous.status, status, previous.base_hash
+                )
+                previous.target_path = target_path
+            pending = len(self._entries)
+        if pending >= OVERLAY_BATCH_SIZE:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def flush(self) -> bool:
+        r"""Send every pending write; returns False if any path failed.
+
+        Writes whose request fails stay journaled for the next flush;
+        writes the server rejects with a client error are dropped.
+        """
+        ok = True
+        with self._flush_lock:
+            with self._lock:
+                paths = list(self._entries)
+            for offset in range(0, len(paths), OVERLAY_BATCH_SIZE):
+                with self._lock:
+                    batch = [
+                        (path, self._entries.pop(path))
+                        for path in paths[offset : offset + OVERLAY_BATCH_SIZE]
+                        if path in self._entries
+                    ]
+                if batch:
+                    ok = self._send(batch) and ok
+        return ok
+
+    def close(self, timeout: float = OVERLAY_REQUEST_TIMEOUT_SECONDS) -> bool:
+        r"""Stop the flusher and send whatever is still pending.
+
+        Returns False if any write could not be reported; those writes are
+        dropped, as nothing flushes the journal after it is closed.
+        """
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+        try:
+            return self.flush()
+        finally:
+            with self._flush_lock:
+                with self._lock:
+                    self._entries.clear()
+                if self._client is not None:
+                    self._client.close()
+                    self._client = None
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(OVERLAY_FLUSH_INTERVAL_SECONDS)
+            self._wake.clear()
+            if self._closed:
+                # close() sends the final flush itself.
+                break
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001 - keep the flusher alive.
+                logger.warning("overlay journal flush failed", exc_info=True)
+
+    def _payloads(
+        self, batch: list[tuple[str, _JournalEntry]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        context = self.context
+        payloads = []
+        for rel_path, entry in batch:
+            status = entry.status
+            try:
+                # Hash under the writer lock so a write in progress is not
+                # reported half-finished.
+                with path_write_lock(
+                    context.space_id,
+                    context.project_id,
+                    context.run_id,
+                    rel_path,
+                ):
+                    if status != "deleted" and not entry.target_path.exists():
+                        status = "deleted"
+                    payload = _overlay_payload(
+                        context,
+                        rel_path,
+                        entry.target_path,
+                        base_hash=entry.base_hash,
+                        status=status,
+                    )
+            except Exception as exc:  # noqa: BLE001 - skip only this path.
+                _record_overlay_sync_failure(
+                    reason="hash_failed",
+                    context=context,
+                    rel_path=rel_path,
+                    error_message=str(exc),
+                )
+                continue
+            payloads.append((rel_path, payload))
+        return payloads
+
+    def _send(self, batch: list[tuple[str, _JournalEntry]]) -> bool:
+        context = self.context
+        entries = dict(batch)
+        payloads = self._payloads(batch)
+        ok = len(payloads) == len(batch)
+        if not payloads:
+            return ok
+        if self._client is None:
+            self._client = httpx.Client(
+                timeout=OVERLAY_REQUEST_TIMEOUT_SECONDS
+            )
+        url = _overlays_url(context, normalize_server_url(context.server_url))
+        headers = _overlay_headers(context)
+
+        if self._batch_supported:
+            try:
+                response = self._client.post(
+                    f"{url}/batch",
+                    json={"writes": [payload for _, payload in payloads]},
+                    headers=headers,
+                )
+            except Exception as exc:  # noqa: BLE001 - must not fail the run.
+                return self._failed(entries, payloads, "exception", str(exc))
+            if response.status_code in (404, 405):
+                # Older server without the bulk endpoint
+                self._batch_supported = False
+            elif response.is_server_error:
+                return self._failed(
+                    entries,
+                    payloads,
+                    f"http_{response.status_code}",
+                    response.text[:500],
+                )
+            elif not response.is_error:
+                self._mark_sent(payloads)
+                return ok
+            # Any other rejection fails the whole batch; sending the writes
+            # one by one finds the ones the server refuses.
+
+        for item in payloads:
+            try:
+                response = self._client.post(
+                    url, json=item[1], headers=headers
+                )
+            except Exception as exc:  # noqa: BLE001 - must not fail the run.
+                ok = self._failed(entries, [item], "exception", str(exc))
+                continue
+            if response.is_error:
+                ok = self._failed(
+                    entries,
+                    [item],
+                    f"http_{response.status_code}",
+                    response.text[:500],
+                    requeue=response.is_server_error,
+                )
+                continue
+            self._mark_sent([item])
+        return ok
+
+    def _mark_sent(self, payloads: list[tuple[str, dict[str, Any]]]) -> None:
+        with self._lock:
+            self._sent.update(rel_path for rel_path, _ in payloads)
+
+    def _failed(
+        self,
+        entries: dict[str, _JournalEntry],
+        payloads: list[tuple[str, dict[str, Any]]],
+        reason: str,
+        error_message: str,
+        *,
+        requeue: bool = True,
+    ) -> bool:
+        r"""Record a failed send of ``payloads``.
+
+        With ``requeue`` the writes are journaled again for the next flush;
+        otherwise the server refused them and they are dropped.
+        """
+        if requeue:
+            with self._lock:
+                for rel_path, _ in payloads:
+                    # Journal the write again for the next flush, under any
+                    # write recorded for the path while this one was in flight.
+                    entry = entries[rel_path]
+                    newer = self._entries.get(rel_path)
+                    if newer is not None:
+                        entry.status = coalesce_overlay_status(
+                            entry.status, newer.status, entry.base_hash
+                        )
+                        entry.target_path = newer.target_path
+                    self._entries[rel_path] = entry
+        for rel_path, _ in payloads:
+            _record_overlay_sync_failure(
+                reason=reason,
+                context=self.context,
+                rel_path=rel_path,
+                error_message=error_message,
+            )
+        return False
+
+
+_JOURNALS: dict[tuple[str, str, str], OverlayJournal] = {}
+_JOURNALS_GUARD = threading.Lock()
+
+
+def _journal_key(context: RunContext) -> tuple[str, str, str]:
+    return (context.space_id, context.project_id, context.run_id)
+
+
+def overlay_journal(context: RunContext) -> OverlayJournal:
+    r"""Return the journal for ``context``'s run, creating it if needed."""
+    key = _journal_key(context)
+    with _JOURNALS_GUARD:
+        journal = _JOURNALS.get(key)
+        if journal is None:
+            journal = _JOURNALS[key] = OverlayJournal(context)
+        return journal
+
+
+def close_overlay_journal(
+    context: RunContext | None,
+    timeout: float = OVERLAY_REQUEST_TIMEOUT_SECONDS,
+) -> bool:
+    r"""Flush and drop the journal of ``context``'s run at run end.
+
+    Workdir changes no tool reported are found by diffing the workdir
+    manifest and journaled first. Returns False if any pending write could
+    not be reported.
+    """
+    if context is None:
+        return True
+    manifest = workdir_manifest(context.working_directory)
+    if manifest is not None:
+        _journal_workdir_changes(context, manifest)
+    with _JOURNALS_GUARD:
+        journal = _JOURNALS.pop(_journal_key(context), None)
+    ok = journal.close(timeout) if journal is not None else True
+    if manifest is not None:
+        manifest.save()
+    return ok
+
+
+def _journal_workdir_changes(
+    context: RunContext, manifest: WorkdirManifest
+) -> None:
+    # Shell commands and other tools write without reporting; diffing the
+    # manifest against the workdir picks up what they changed.
+    if not should_record_overlay(context, manifest.workdir):
+        return
+    try:
+        changes = manifest.sync()
+    except Exception:  # noqa: BLE001 - must not fail the run end.
+        logger.warning("workdir manifest sync failed", exc_info=True)
+        return
+    if not changes:
+        return
+    journal = overlay_journal(context)
+    for rel_path, status, previous_hash in changes:
+        target_path = manifest.workdir / rel_path
+        if should_record_overlay(context, target_path):
+            journal.record(
+                rel_path,
+                target_path,
+                base_hash=previous_hash,
+                status=status,
+            )
@@ -0,0 +1,259 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+"""Optional pool of pre-built workforce agent sets.
+
+Building the workforce agents (toolkits, prompts, terminal venv clones,
+MCP tool lists) dominates the time between a complex question arriving and
+the first decomposition event. When ``EIGENT_WARM_AGENT_POOL`` is enabled,
+``step_solve`` starts building the next agent set in the background as soon
+as it starts, and ``construct_workforce`` takes that set instead of building
+one from scratch.
+
+Entries are keyed by everything the agent factories read from ``Chat``
+(model config, project, working directory, toolkit settings) plus the hands
+capabilities, so a set is only reused for an identical configuration.
+
+- ``EIGENT_WARM_AGENT_POOL_PER_CONFIG`` caps ready/in-flight sets per key
+  (default 1).
+- ``EIGENT_WARM_AGENT_POOL_MAX_CONFIGS`` caps distinct keys; the least
+  recently used key is evicted first (default 4).
+- ``EIGENT_WARM_AGENT_POOL_TTL`` drops sets older than this many seconds
+  (default 600).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.component.environment import env
+
+logger = logging.getLogger("warm_agents")
+
+_DEFAULT_PER_CONFIG = 1
+_DEFAULT_MAX_CONFIGS = 4
+_DEFAULT_TTL = 600.0
+
+# Chat fields that only describe the current task; agents built for one
+# task are valid for any other task with the same remaining fields.
+_PER_TASK_FIELDS = {
+    "task_id",
+    "question",
+    "attaches",
+    "summary_prompt",
+    "new_agents",
+    "project_context",
+}
+
+
+def warm_agent_pool_enabled() -> bool:
+    return env("EIGENT_WARM_AGENT_POOL", "").lower() in ("1", "true", "yes")
+
+
+def _int_setting(name: str, default: int) -> int:
+    raw = env(name, "")
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = -1
+    if value < 1:
+        logger.warning("Invalid %s=%r, using default %s", name, raw, default)
+        return default
+    return value
+
+
+def _ttl() -> float:
+    raw = env("EIGENT_WARM_AGENT_POOL_TTL", "")
+    try:
+        value = float(raw) if raw else _DEFAULT_TTL
+    except ValueError:
+        value = -1.0
+    if value < 0:
+        logger.warning(
+            "Invalid EIGENT_WARM_AGENT_POOL_TTL=%r, using default %s",
+            raw,
+            _DEFAULT_TTL,
+        )
+        return _DEFAULT_TTL
+    return value
+
+
+def warm_agents_key(
+    options: Any,
+    working_directory: str,
+    capabilities: dict[str, bool],
+) -> str:
+    r"""Hash of the ``Chat`` config and hands capabilities agents depend on."""
+    payload = json.dumps(
+        {
+            "options": options.model_dump(
+                mode="json", exclude=_PER_TASK_FIELDS
+            ),
+            "working_directory": working_directory,
+            "capabilities": capabilities,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(eq=False)
+class _WarmEntry:
+    project_id: str
+    task: asyncio.Task
+    created: float = field(default_factory=time.monotonic)
+
+
+_pool: OrderedDict[str, deque[_WarmEntry]] = OrderedDict()
+
+
+def prewarm_agents(
+    key: str,
+    project_id: str,
+    build: Callable[[], Awaitable[Any]],
+) -> bool:
+    r"""Start building an agent set for ``key`` unless the key is full.
+
+    Must be called on the event loop that will consume the set. Returns
+    whether a build was started.
+    """
+    _evict_expired()
+    entries = _pool.get(key)
+    if entries is not None and len(entries) >= _int_setting(
+        "EIGENT_WARM_AGENT_POOL_PER_CONFIG", _DEFAULT_PER_CONFIG
+    ):
+        _pool.move_to_end(key)
+        return False
+
+    task = asyncio.get_running_loop().create_task(build())
+    task.add_done_callback(lambda t, key=key: _on_built(key, t))
+    if entries is None:
+        entries = _pool[key] = deque()
+    entries.append(_WarmEntry(project_id=project_id, task=task))
+    _pool.move_to_end(key)
+
+    max_configs = _int_setting(
+        "EIGENT_WARM_AGENT_POOL_MAX_CONFIGS", _DEFAULT_MAX_CONFIGS
+    )
+    while len(_pool) > max_configs:
+        evicted_key, evicted = _pool.popitem(last=False)
+        logger.info(f"Evicting warm agents for config {evicted_key[:12]}")
+        _drop(evicted)
+    logger.info(f"Pre-warming workforce agents for project {project_id}")
+    return True
+
+
+def take_warm_agents(key: str) -> asyncio.Task | None:
+    r"""Pop the oldest ready or in-flight set for ``key``, if any.
+
+    The caller awaits the returned task; a build that failed raises there.
+    """
+    _evict_expired()
+    entries = _pool.get(key)
+    if not entries:
+        return None
+    entry = entries.popleft()
+    if not entries:
+        del _pool[key]
+    return entry.task
+
+
+def discard_warm_agents(project_id: str) -> int:
+    r"""Drop every set built for ``project_id``; returns how many."""
+    dropped = [
+        e
+        for entries in _pool.values()
+        for e in entries
+        if e.project_id == project_id
+    ]
+    _remove(dropped)
+    return len(dropped)
+
+
+def _on_built(key: str, task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is None:
+        return
+    # A failed build is useless to hand out; let the next task build fresh.
+    logger.warning(f"Pre-warming workforce agents failed: {error!r}")
+    _remove([e for e in _pool.get(key, ()) if e.task is task])
+
+
+def _evict_expired() -> None:
+    ttl = _ttl()
+    now = time.monotonic()
+    _remove(
+        [
+            e
+            for entries in _pool.values()
+            for e in entries
+            if now - e.created >= ttl
+        ]
+    )
+
+
+def _remove(entries: list[_WarmEntry]) -> None:
+    if not entries:
+        return
+    for key in list(_pool):
+        kept = deque(e for e in _pool[key] if e not in entries)
+        if kept:
+            _pool[key] = kept
+        else:
+            del _pool[key]
+    _drop(entries)
+
+
+def _drop(entries) -> None:
+    # Built agents own no Brain-wide resources: their toolkits and model
+    # client leases are registered on the project's TaskLock and released
+    # when it is cleaned up. Only unfinished builds need cancelling.
+    for entry in entries:
+        if not entry.task.done():
+            entry.task.cancel()
+
+
+class StartupTimer:
+    r"""Measures ``step_solve`` latency up to its first key SSE events."""
+
+    def __init__(self, project_id: str, task_id: str):
+        self.project_id = project_id
+        self.task_id = task_id
+        self.started = time.perf_counter()
+        self.warm_hit: bool | None = None
+        self._reported: set[str] = set()
+
+    def mark(self, step: str) -> None:
+        if step in self._reported:
+            return
+        self._reported.add(step)
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        logger.info(
+            f"[STARTUP] first '{step}' after {elapsed_ms:.0f}ms",
+            extra={
+                "project_id": self.project_id,
+                "task_id": self.task_id,
+                "step": step,
+                "elapsed_ms": round(elapsed_ms, 1),
+                "warm_agents": self.warm_hit,
+            },
+        )
@@ -0,0 +1,262 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""Content manifest of a copy-mode Project workdir.
+
+Stored next to the workdir marker, the manifest maps each tracked path to
+the ``(size, mtime_ns, sha256)`` last seen for it. A lookup stats the file
+and only rehashes it when size or mtime moved, so overlay base hashes and
+the end-of-run diff cost a ``stat`` per unchanged file instead of a read.
+
+Files modified within ``RACY_WINDOW_NS`` of being hashed are not recorded:
+a second write in the same mtime tick would leave the stat unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Literal
+
+from app.utils.workspace_baseline import (
+    HASH_CHUNK_SIZE,
+    WORKDIR_MANIFEST,
+    WORKDIR_MARKER,
+    ManifestEntry,
+    iter_tracked_files,
+)
+
+logger = logging.getLogger("workdir_manifest")
+
+ChangeStatus = Literal["added", "modified", "deleted"]
+RACY_WINDOW_NS = 2 * 10**9
+# Manifests kept loaded at once; the least recently used one is saved and
+# dropped.
+MAX_LOADED_MANIFESTS = 32
+
+
+class WorkdirManifest:
+    r"""Stat-validated hashes of the files in one Project workdir.
+
+    Args:
+        workdir (Path): Resolved Project workdir.
+        base_snapshot_id (str | None): Baseline the workdir was built from.
+        entries (dict[str, tuple[int, int, str]] | None): Known
+            ``(size, mtime_ns, sha256)`` per relative path; None when no
+            manifest was ever written for this workdir.
+    """
+
+    def __init__(
+        self,
+        workdir: Path,
+        base_snapshot_id: str | None,
+        entries: dict[str, tuple[int, int, str]] | None,
+    ):
+        self.workdir = workdir
+        self.base_snapshot_id = base_snapshot_id
+        # Workdirs created before manifests existed are seeded by the first
+        # sync instead of reporting every file as added.
+        self._seeded = entries is not None
+        self._entries = entries or {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.workdir / WORKDIR_MANIFEST
+
+    @classmethod
+    def load(cls, workdir: Path) -> "WorkdirManifest":
+        path = workdir / WORKDIR_MANIFEST
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = None
+        except Exception:
+            logger.warning("Failed to read workdir manifest: %s", path)
+            data = None
+        if data is None:
+            return cls(workdir, None, None)
+        return cls(
+            workdir,
+            data.get("base_snapshot_id"),
+            {
+                rel: (size, mtime_ns, file_hash)
+                for rel, (size, mtime_ns, file_hash) in data.get(
+                    "entries", {}
+                ).items()
+            },
+        )
+
+    def hash_of(self, rel_path: str) -> str | None:
+        r"""sha256 of the workdir file at ``rel_path``, None if missing.
+
+        Raises:
+            ValueError: If the path is not a regular file.
+        """
+        path = self.workdir / rel_path
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            self._forget(rel_path)
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            raise ValueError(f"Cannot hash non-regular file: {path}")
+        return self._hash_with_stat(rel_path, path, st)
+
+    def sync(self) -> list[tuple[str, ChangeStatus, str | None]]:
+        r"""Bring the manifest up to date with the workdir.
+
+        Returns ``(path, status, previous_hash)`` for every tracked file
+        whose content differs from what the manifest last recorded. Only
+        files whose stat changed are read.
+        """
+        with self._lock:
+            recorded = {rel: entry[2] for rel, entry in self._entries.items()}
+            seeding = not self._seeded
+        current: dict[str, str] = {}
+        for rel, path, st in iter_tracked_files(self.workdir):
+            try:
+                current[rel] = self._hash_with_stat(rel, path, st)
+            except OSError:
+                continue
+        with self._lock:
+            for rel in set(self._entries) - set(current):
+                del self._entries[rel]
+                self._dirty = True
+            if seeding:
+                self._seeded = True
+                self._dirty = True
+                return []
+
+        changes: list[tuple[str, ChangeStatus, str | None]] = []
+        for rel, file_hash in current.items():
+            previous = recorded.get(rel)
+            if previous is None:
+                changes.append((rel, "added", None))
+            elif previous != file_hash:
+                changes.append((rel, "modified", previous))
+        for rel in sorted(set(recorded) - set(current)):
+            changes.append((rel, "deleted", recorded[rel]))
+        return changes
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": 1,
+                "base_snapshot_id": self.base_snapshot_id,
+                "entries": {
+                    rel: list(entry) for rel, entry in self._entries.items()
+                },
+            }
+            self._dirty = False
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps(data, separators=(",", ":")), encoding="utf-8"
+            )
+            tmp_path.replace(self.path)
+        except OSError:
+            logger.warning(
+                "Failed to save workdir manifest: %s", self.path, exc_info=True
+            )
+            with self._lock:
+                self._dirty = True
+
+    def _hash_with_stat(
+        self, rel_path: str, path: Path, st: os.stat_result
+    ) -> str:
+        with self._lock:
+            known = self._entries.get(rel_path)
+        if known is not None and known[:2] == (st.st_size, st.st_mtime_ns):
+            return known[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()
+        with self._lock:
+            if time.time_ns() - st.st_mtime_ns >= RACY_WINDOW_NS:
+                self._entries[rel_path] = (
+                    st.st_size,
+                    st.st_mtime_ns,
+                    file_hash,
+                )
+            else:
+                # Still recorded for sync diffs, but never matched by stat
+                self._entries[rel_path] = (-1, -1, file_hash)
+            self._dirty = True
+        return file_hash
+
+    def _forget(self, rel_path: str) -> None:
+        with self._lock:
+            if self._entries.pop(rel_path, None) is not None:
+                self._dirty = True
+
+
+_manifests: OrderedDict[Path, WorkdirManifest] = OrderedDict()
+_manifests_lock = threading.Lock()
+
+
+def _remember(key: Path, manifest: WorkdirManifest) -> None:
+    _manifests[key] = manifest
+    _manifests.move_to_end(key)
+    while len(_manifests) > MAX_LOADED_MANIFESTS:
+        _, evicted = _manifests.popitem(last=False)
+        evicted.save()
+
+
+def workdir_manifest(workdir: Path | str) -> WorkdirManifest | None:
+    r"""Shared manifest of a copy-mode Project workdir.
+
+    Returns None for other working directories, which have no marker.
+    """
+    key = Path(workdir).expanduser().resolve()
+    with _manifests_lock:
+        manifest = _manifests.get(key)
+        if manifest is not None:
+            _manifests.move_to_end(key)
+            return manifest
+        if not (key / WORKDIR_MARKER).exists():
+            return None
+        manifest = WorkdirManifest.load(key)
+        _remember(key, manifest)
+        return manifest
+
+
+def create_workdir_manifest(
+    workdir: Path,
+    base_snapshot_id: str,
+    entries: Iterable[ManifestEntry],
+) -> WorkdirManifest:
+    r"""Record a freshly built baseline as the workdir's manifest."""
+    key = workdir.expanduser().resolve()
+    manifest = WorkdirManifest(
+        key,
+        base_snapshot_id,
+        {e.path: (e.size, e.mtime_ns, e.hash) for e in entries},
+    )
+    manifest._dirty = True
+    manifest.save()
+    with _manifests_lock:
+        _remember(key, manifest)
+    return manifest
@@ -0,0 +1,684 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""Project workdir baselines that share storage with the Space folder.
+
+Each Space file is placed in the Project workdir with the cheapest strategy
+the filesystem supports:
+
+``reflink``
+    ``FICLONE`` clone of the Space file. Blocks are shared and the kernel
+    copies them on write, so the workdir behaves like a plain copy.
+``hardlink``
+    Link to a read-only blob in the Space's content-addressed store, shared
+    by every Project workdir of that Space. Writers call :func:`copy_up`
+    first to swap the link for a private copy; a write that skips it fails
+    with a permission error instead of touching the blob. Only writers
+    inside this process do that, so the strategy is opt-in through
+    ``EIGENT_BASELINE_STRATEGIES``.
+``copy``
+    Plain copy, used when neither of the above works.
+
+Every baseline records a manifest of ``(path, size, mtime_ns, hash)`` under
+its snapshot id. Later baselines of the same Space reuse the hash of any
+file whose size and mtime are unchanged, and a refresh keeps every workdir
+file that still matches both the old manifest and the Space.
+"""
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Literal
+
+from app.component.environment import env
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows fallback
+    fcntl = None
+
+logger = logging.getLogger("workspace_baseline")
+
+BaselineStrategy = Literal["reflink", "hardlink", "copy"]
+BASELINE_STRATEGIES: tuple[BaselineStrategy, ...] = (
+    "reflink",
+    "hardlink",
+    "copy",
+)
+# Shell commands and other toolkits write without calling copy_up
+DEFAULT_BASELINE_STRATEGIES: tuple[BaselineStrategy, ...] = (
+    "reflink",
+    "copy",
+)
+WORKDIR_MARKER = ".eigent-workdir.json"
+WORKDIR_MANIFEST = ".eigent-manifest.json"
+COPY_IGNORE_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    ".venv",
+    "venv",
+    "dist",
+    "build",
+    ".next",
+    ".cache",
+    "__pycache__",
+}
+MAX_COPY_FILE_SIZE = 25 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+# Newest manifests kept per Space; older ones are pruned after a baseline.
+MAX_BASELINE_MANIFESTS = 20
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+# Errors meaning the filesystem cannot do a strategy at all, so it is not
+# tried again for the rest of the tree.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EPERM,
+}
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    hash: str
+
+
+@dataclass
+class BaselineResult:
+    base_snapshot_id: str
+    entries: list[ManifestEntry] = field(default_factory=list)
+    # Files placed by each strategy
+    strategies: dict[str, int] = field(default_factory=dict)
+    # Files whose hash could not be reused from an earlier manifest
+    hashed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+def configured_strategies() -> tuple[BaselineStrategy, ...]:
+    r"""Strategies to try, from ``EIGENT_BASELINE_STRATEGIES``.
+
+    Defaults to :data:`DEFAULT_BASELINE_STRATEGIES`; ``hardlink`` is only
+    tried when listed. ``copy`` is always kept as the last resort.
+    """
+    raw = env(
+        "EIGENT_BASELINE_STRATEGIES", ",".join(DEFAULT_BASELINE_STRATEGIES)
+    )
+    names = [name.strip() for name in str(raw).split(",")]
+    strategies = [name for name in BASELINE_STRATEGIES if name in names]
+    if "copy" not in strategies:
+        strategies.append("copy")
+    return tuple(strategies)
+
+
+def _is_ignored(name: str) -> bool:
+    return (
+        name in COPY_IGNORE_DIRS
+        or name == WORKDIR_MARKER
+        or name == WORKDIR_MANIFEST
+    )
+
+
+def iter_tracked_files(
+    root: Path, prefix: str = ""
+) -> Iterator[tuple[str, Path, os.stat_result]]:
+    r"""Yield ``(rel_path, path, stat)`` for every file a baseline covers.
+
+    Applies the baseline's filters: ignored directories, symlinks and files
+    over ``MAX_COPY_FILE_SIZE`` are left out.
+    """
+    try:
+        with os.scandir(root) as it:
+            dirents = list(it)
+    except OSError:
+        return
+    for dirent in dirents:
+        if _is_ignored(dirent.name):
+            continue
+        rel = f"{prefix}{dirent.name}"
+        try:
+            if dirent.is_symlink():
+                continue
+            if dirent.is_dir():
+                yield from iter_tracked_files(Path(dirent.path), f"{rel}/")
+                continue
+            if not dirent.is_file():
+                continue
+            st = dirent.stat()
+        except OSError:
+            continue
+        if st.st_size <= MAX_COPY_FILE_SIZE:
+            yield rel, Path(dirent.path), st
+
+
+def _hardlinks_safe() -> bool:
+    # Read-only blobs only stop writers that honour permissions.
+    return not (hasattr(os, "geteuid") and os.geteuid() == 0)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_and_hash(source: Path, target: Path) -> str:
+    digest = hashlib.sha256()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        while chunk := src.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, target)
+    return digest.hexdigest()
+
+
+def _clone(source: Path, target: Path) -> None:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported here")
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        target.unlink(missing_ok=True)
+        raise
+
+
+def _is_sealed_blob(path: Path, size: int) -> bool:
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISREG(st.st_mode)
+        and not st.st_mode & 0o222
+        and st.st_size == size
+    )
+
+
+def copy_up(path: Path) -> bool:
+    r"""Give ``path`` its own inode if it is linked to a baseline blob.
+
+    Call before writing to a file in a Project workdir. Returns True if a
+    private, writable copy replaced the link.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if (
+        not stat.S_ISREG(st.st_mode)
+        or st.st_nlink < 2
+        or st.st_mode & stat.S_IWUSR
+    ):
+        return False
+    fd, tmp = tempfile.mkstemp(prefix=".eigent-copyup-", dir=path.parent)
+    os.close(fd)
+    tmp_path = Path(tmp)
+    try:
+        try:
+            _clone(path, tmp_path)
+        except OSError:
+            shutil.copyfile(path, tmp_path)
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def manifest_path(baseline_root: Path, snapshot_id: str) -> Path:
+    return baseline_root / "manifests" / f"{snapshot_id}.json"
+
+
+def load_manifest(
+    baseline_root: Path, snapshot_id: str
+) -> list[ManifestEntry] | None:
+    r"""Entries recorded for ``snapshot_id``, or None if unavailable."""
+    data = _read_manifest(manifest_path(baseline_root, snapshot_id))
+    if data is None:
+        return None
+    return [ManifestEntry(*entry) for entry in data.get("entries", [])]
+
+
+def _read_manifest(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Failed to read baseline manifest: %s", path)
+        return None
+
+
+def _manifests_newest_first(baseline_root: Path) -> list[Path]:
+    manifests = []
+    for path in (baseline_root / "manifests").glob("*.json"):
+        try:
+            manifests.append((path.stat().st_mtime_ns, path))
+        except OSError:
+            continue
+    return [path for _, path in sorted(manifests, reverse=True)]
+
+
+def _previous_hashes(
+    baseline_root: Path, source_root: Path
+) -> dict[str, tuple[int, int, str]]:
+    for path in _manifests_newest_first(baseline_root):
+        data = _read_manifest(path)
+        if data and data.get("source_root") == str(source_root):
+            return {
+                rel: (size, mtime_ns, file_hash)
+                for rel, size, mtime_ns, file_hash in data.get("entries", [])
+            }
+    return {}
+
+
+def _write_manifest(
+    baseline_root: Path, source_root: Path, result: BaselineResult
+) -> Path:
+    path = manifest_path(baseline_root, result.base_snapshot_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "base_snapshot_id": result.base_snapshot_id,
+                "source_root": str(source_root),
+                "created_at": datetime.now(UTC).isoformat(),
+                "entries": [
+                    [e.path, e.size, e.mtime_ns, e.hash]
+                    for e in result.entries
+                ],
+            },
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
+    for stale in _manifests_newest_first(baseline_root)[
+        MAX_BASELINE_MANIFESTS:
+    ]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def prune_blobs(baseline_root: Path) -> int:
+    r"""Delete blobs no workdir links to; returns how many were removed.
+
+    Must run under the Space's baseline lock so no baseline is linking
+    blobs at the same time.
+    """
+    removed = 0
+    for blob in (baseline_root / "blobs").glob("*/*"):
+        try:
+            if blob.stat().st_nlink == 1:
+                blob.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class _BaselineBuilder:
+    def __init__(
+        self,
+        source_root: Path,
+        workdir: Path,
+        baseline_root: Path,
+        strategies: Iterable[str],
+        result: BaselineResult,
+        keep: Callable[[str, os.stat_result], str | None] | None = None,
+    ):
+        self.source_root = source_root
+        self.workdir = workdir
+        self.blob_root = baseline_root / "blobs"
+        self.result = result
+        self.previous = _previous_hashes(baseline_root, source_root)
+        # Set when refreshing a populated workdir: returns the hash of a
+        # workdir file that can stay as it is.
+        self.keep = keep
+        self.seen_files: set[str] = set()
+        self.seen_dirs: set[str] = set()
+        self.strategies = list(strategies)
+        if "copy" not in self.strategies:
+            self.strategies.append("copy")
+        if "hardlink" in self.strategies and not self._can_hardlink():
+            self.strategies.remove("hardlink")
+
+    def _can_hardlink(self) -> bool:
+        if not _hardlinks_safe():
+            return False
+        try:
+            self.blob_root.mkdir(parents=True, exist_ok=True)
+            blob_dev = os.stat(self.blob_root).st_dev
+            return blob_dev == os.stat(self.workdir).st_dev
+        except OSError:
+            return False
+
+    def walk(self, source_dir: Path, target_dir: Path, prefix: str) -> None:
+        if self.keep is not None and (
+            target_dir.is_symlink() or target_dir.is_file()
+        ):
+            target_dir.unlink()
+        target_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            with os.scandir(source_dir) as it:
+                dirents = list(it)
+        except OSError:
+            logger.warning(
+                "Failed to list Space baseline directory: %s",
+                source_dir,
+                exc_info=True,
+            )
+            return
+        for dirent in dirents:
+            name = dirent.name
+            if _is_ignored(name):
+                continue
+            try:
+                if dirent.is_symlink():
+                    continue
+                if dirent.is_dir():
+                    self.seen_dirs.add(f"{prefix}{name}")
+                    self.walk(
+                        Path(dirent.path),
+                        target_dir / name,
+                        f"{prefix}{name}/",
+                    )
+                    continue
+                if not dirent.is_file():
+                    continue
+                st = dirent.stat()
+                if st.st_size > MAX_COPY_FILE_SIZE:
+                    self.result.skipped += 1
+                    continue
+                self.seen_files.add(f"{prefix}{name}")
+                self._place(
+                    Path(dirent.path), target_dir / name, f"{prefix}{name}", st
+                )
+            except OSError:
+                logger.warning(
+                    "Failed to copy Space baseline item into Project "
+                    "workdir: %s",
+                    dirent.path,
+                    exc_info=True,
+                )
+
+    def _place(
+        self, source: Path, target: Path, rel: str, st: os.stat_result
+    ) -> None:
+        if self.keep is not None:
+            kept_hash = self.keep(rel, st)
+            if kept_hash is not None:
+                self._placed("kept", rel, st, kept_hash)
+                return
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+        known = self.previous.get(rel)
+        file_hash = (
+            known[2]
+            if known is not None and known[:2] == (st.st_size, st.st_mtime_ns)
+            else None
+        )
+        if file_hash is None:
+            self.result.hashed += 1
+        target.unlink(missing_ok=True)
+        for strategy in list(self.strategies):
+            try:
+                file_hash = self._place_with(
+                    strategy, source, target, st, file_hash
+                )
+            except OSError as e:
+                if strategy == "copy":
+                    raise
+                if e.errno in _UNSUPPORTED_ERRNOS:
+                    logger.info(
+                        "Baseline strategy %s unavailable for %s: %s",
+                        strategy,
+                        self.workdir,
+                        e,
+                    )
+                    self.strategies.remove(strategy)
+                target.unlink(missing_ok=True)
+                continue
+            self._placed(strategy, rel, st, file_hash)
+            return
+
+    def _placed(
+        self, strategy: str, rel: str, st: os.stat_result, file_hash: str
+    ) -> None:
+        counts = self.result.strategies
+        counts[strategy] = counts.get(strategy, 0) + 1
+        self.result.entries.append(
+            ManifestEntry(rel, st.st_size, st.st_mtime_ns, file_hash)
+        )
+
+    def prune_extras(self, target_dir: Path, prefix: str = "") -> None:
+        r"""Remove workdir entries the Space no longer has."""
+        with os.scandir(target_dir) as it:
+            dirents = list(it)
+        for dirent in dirents:
+            rel = f"{prefix}{dirent.name}"
+            if not prefix and dirent.name in (
+                WORKDIR_MARKER,
+                WORKDIR_MANIFEST,
+            ):
+                continue
+            try:
+                if rel in self.seen_files:
+                    continue
+                if dirent.is_dir(follow_symlinks=False):
+                    if rel in self.seen_dirs:
+                        self.prune_extras(Path(dirent.path), f"{rel}/")
+                    else:
+                        shutil.rmtree(dirent.path)
+                    continue
+                os.unlink(dirent.path)
+            except OSError:
+                logger.warning(
+                    "Failed to remove stale Project workdir item: %s",
+                    dirent.path,
+                    exc_info=True,
+                )
+
+    def _place_with(
+        self,
+        strategy: str,
+        source: Path,
+        target: Path,
+        st: os.stat_result,
+        file_hash: str | None,
+    ) -> str:
+        if strategy == "reflink":
+            _clone(source, target)
+            shutil.copystat(source, target)
+            # Hash the clone, which cannot change under us.
+            return file_hash or _hash_file(target)
+        if strategy == "hardlink":
+            blob, file_hash = self._blob_for(source, st, file_hash)
+            os.link(blob, target)
+            return file_hash
+        if file_hash is None:
+            return _copy_and_hash(source, target)
+        shutil.copy2(source, target)
+        return file_hash
+
+    def _blob_path(self, file_hash: str, executable: bool) -> Path:
+        name = f"{file_hash}.x" if executable else file_hash
+        return self.blob_root / file_hash[:2] / name
+
+    def _blob_for(
+        self, source: Path, st: os.stat_result, file_hash: str | None
+    ) -> tuple[Path, str]:
+        executable = bool(st.st_mode & stat.S_IXUSR)
+        if file_hash is not None:
+            blob = self._blob_path(file_hash, executable)
+            if _is_sealed_blob(blob, st.st_size):
+                return blob, file_hash
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.blob_root)
+        tmp_path = Path(tmp)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as dst, open(source, "rb") as src:
+                while chunk := src.read(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+            file_hash = digest.hexdigest()
+            blob = self._blob_path(file_hash, executable)
+            if _is_sealed_blob(blob, size):
+                tmp_path.unlink()
+                return blob, file_hash
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.chmod(tmp_path, stat.S_IMODE(st.st_mode) & ~0o222)
+            blob.parent.mkdir(exist_ok=True)
+            # Replacing a tampered blob leaves existing links untouched.
+            os.replace(tmp_path, blob)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return blob, file_hash
+
+
+def build_baseline(
+    source_root: Path,
+    workdir: Path,
+    baseline_root: Path,
+    snapshot_id: str,
+    strategies: Iterable[str] | None = None,
+) -> BaselineResult:
+    r"""Populate ``workdir`` from ``source_root`` and record its manifest.
+
+    Args:
+        source_root (Path): Space folder to take the baseline from.
+        workdir (Path): Project workdir to fill.
+        baseline_root (Path): The Space's blob store and manifests.
+        snapshot_id (str): Id the manifest is stored under.
+        strategies (Iterable[str] | None): Strategies to try in order;
+            defaults to :func:`configured_strategies`.
+    """
+    return _run_builder(
+        source_root, workdir, baseline_root, snapshot_id, strategies
+    )
+
+
+def refresh_baseline(
+    source_root: Path,
+    workdir: Path,
+    baseline_root: Path,
+    snapshot_id: str,
+    previous_snapshot_id: str,
+    workdir_hash: Callable[[str], str | None],
+    strategies: Iterable[str] | None = None,
+) -> BaselineResult | None:
+    r"""Bring a populated ``workdir`` back in line with ``source_root``.
+
+    A workdir file is kept when the Space file still has the size and mtime
+    recorded under ``previous_snapshot_id`` and ``workdir_hash`` reports the
+    recorded hash for it. Everything else is placed again and workdir files
+    the Space no longer has are removed. Returns None, leaving the workdir
+    untouched, when the previous manifest is unavailable.
+
+    Args:
+        previous_snapshot_id (str): Snapshot the workdir was built from.
+        workdir_hash (Callable[[str], str | None]): Current hash of a
+            workdir path, or None if it is missing.
+    """
+    previous = load_manifest(baseline_root, previous_snapshot_id)
+    if previous is None:
+        return None
+    base = {entry.path: entry for entry in previous}
+
+    def keep(rel: str, st: os.stat_result) -> str | None:
+        entry = base.get(rel)
+        if entry is None or (entry.size, entry.mtime_ns) != (
+            st.st_size,
+            st.st_mtime_ns,
+        ):
+            return None
+        try:
+            current = workdir_hash(rel)
+        except (OSError, ValueError):
+            return None
+        return entry.hash if current == entry.hash else None
+
+    return _run_builder(
+        source_root, workdir, baseline_root, snapshot_id, strategies, keep
+    )
+
+
+def _run_builder(
+    source_root: Path,
+    workdir: Path,
+    baseline_root: Path,
+    snapshot_id: str,
+    strategies: Iterable[str] | None,
+    keep: Callable[[str, os.stat_result], str | None] | None = None,
+) -> BaselineResult:
+    started = time.perf_counter()
+    result = BaselineResult(base_snapshot_id=snapshot_id)
+    workdir.mkdir(parents=True, exist_ok=True)
+    builder = _BaselineBuilder(
+        source_root,
+        workdir,
+        baseline_root,
+        configured_strategies() if strategies is None else strategies,
+        result,
+        keep,
+    )
+    builder.walk(source_root, workdir, "")
+    if keep is not None:
+        builder.prune_extras(workdir)
+    _write_manifest(baseline_root, source_root, result)
+    result.seconds = time.perf_counter() - started
+    logger.info(
+        "Built Project workdir baseline",
+        extra={
+            "workdir": str(workdir),
+            "base_snapshot_id": snapshot_id,
+            "refresh": keep is not None,
+            "files": len(result.entries),
+            "strategies": result.strategies,
+            "hashed": result.hashed,
+            "skipped": result.skipped,
+            "seconds": round(result.seconds, 3),
+        },
+    )
+    return result
@@ -164,6 +164,21 @@ def project_workdir_root(
     )
 
 
+def space_baseline_root(
+    email: str,
+    space_id: str,
+    user_id: str | int | None = None,
+) -> Path:
+    return (
+        Path.home()
+        / ".eigent"
+        / runtime_owner_key(email, user_id)
+        / "spaces"
+        / space_id
+        / "baseline"
+    )
+
+
 def workspace_state_root(email: str, user_id: str | int | None = None) -> Path:
     return (
         Path.home()
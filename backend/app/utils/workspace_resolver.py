@@ -26,6 +26,19 @@ from uuid import uuid4
 
 from app.model.chat import Chat
 from app.router_layer.hands_resolver import get_environment_hands
+from app.utils.workdir_manifest import (
+    create_workdir_manifest,
+    workdir_manifest,
+)
+from app.utils.workspace_baseline import (
+    COPY_IGNORE_DIRS,
+    MAX_COPY_FILE_SIZE,
+    WORKDIR_MARKER,
+    build_baseline,
+    manifest_path,
+    prune_blobs,
+    refresh_baseline,
+)
 from app.utils.workspace_paths import (
     camel_log_root,
     legacy_camel_log_root,
@@ -34,6 +47,7 @@ from app.utils.workspace_paths import (
     project_task_root,
     project_workdir_root,
     run_output_root,
+    space_baseline_root,
     workspace_state_root,
 )
 
@@ -44,21 +58,6 @@ except ImportError:  # pragma: no cover - Windows fallback
 
 logger = logging.getLogger("workspace_resolver")
 BindingSource = Literal["space_local_brain", "default"]
-WORKDIR_MARKER = ".eigent-workdir.json"
-COPY_IGNORE_DIRS = {
-    ".git",
-    ".hg",
-    ".svn",
-    "node_modules",
-    ".venv",
-    "venv",
-    "dist",
-    "build",
-    ".next",
-    ".cache",
-    "__pycache__",
-}
-MAX_COPY_FILE_SIZE = 25 * 1024 * 1024
 
 
 @contextmanager
@@ -138,16 +137,47 @@ def _read_workdir_marker(workdir: Path) -> dict[str, Any] | None:
         return None
 
 
-def _copy_space_baseline(source_root: Path, workdir: Path) -> str:
-    with _filesystem_space_lock(source_root):
-        existing_marker = _read_workdir_marker(workdir)
-        if existing_marker and existing_marker.get("base_snapshot_id"):
-            return str(existing_marker["base_snapshot_id"])
+def _copy_space_baseline(
+    source_root: Path,
+    workdir: Path,
+    *,
+    baseline_root: Path,
+    refresh: bool = False,
+) -> str:
+    """Build the Project workdir baseline, or reuse the existing one.
 
-        workdir.mkdir(parents=True, exist_ok=True)
-        _copy_tree_limited(source_root, workdir)
+    With ``refresh`` the workdir is brought back in line with the Space,
+    keeping the files its manifest shows unchanged on both sides.
+    """
+    with _filesystem_space_lock(source_root):
+        existing_marker = _read_workdir_marker(workdir) or {}
+        previous_snapshot_id = existing_marker.get("base_snapshot_id")
+        if previous_snapshot_id and not refresh:
+            return str(previous_snapshot_id)
 
         base_snapshot_id = f"snapshot_{uuid4().hex}"
+        result = None
+        manifest = workdir_manifest(workdir) if previous_snapshot_id else None
+        if manifest is not None:
+            result = refresh_baseline(
+                source_root,
+                workdir,
+                baseline_root,
+                base_snapshot_id,
+                str(previous_snapshot_id),
+                manifest.hash_of,
+            )
+        if result is None:
+            if refresh and workdir.exists():
+                shutil.rmtree(workdir)
+            result = build_baseline(
+                source_root, workdir, baseline_root, base_snapshot_id
+            )
+        if refresh:
+            # Blobs only the old workdir linked to are no longer needed
+            prune_blobs(baseline_root)
+        create_workdir_manifest(workdir, base_snapshot_id, result.entries)
+
         marker = workdir / WORKDIR_MARKER
         marker.write_text(
             json.dumps(
@@ -157,6 +187,10 @@ def _copy_space_baseline(source_root: Path, workdir: Path) -> str:
                     "created_at": datetime.now(UTC).isoformat(),
                     "copy_ignore_dirs": sorted(COPY_IGNORE_DIRS),
                     "max_copy_file_size": MAX_COPY_FILE_SIZE,
+                    "baseline_strategies": result.strategies,
+                    "manifest_path": str(
+                        manifest_path(baseline_root, base_snapshot_id)
+                    ),
                 },
                 indent=2,
             ),
@@ -165,29 +199,6 @@ def _copy_space_baseline(source_root: Path, workdir: Path) -> str:
         return base_snapshot_id
 
 
-def _copy_tree_limited(source_root: Path, target_root: Path) -> None:
-    target_root.mkdir(parents=True, exist_ok=True)
-    for item in source_root.iterdir():
-        if item.name in COPY_IGNORE_DIRS or item.name == WORKDIR_MARKER:
-            continue
-        target = target_root / item.name
-        try:
-            if item.is_symlink():
-                continue
-            if item.is_dir():
-                _copy_tree_limited(item, target)
-                continue
-            if item.is_file() and item.stat().st_size <= MAX_COPY_FILE_SIZE:
-                target.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, target)
-        except OSError:
-            logger.warning(
-                "Failed to copy Space baseline item into Project workdir: %s",
-                item,
-                exc_info=True,
-            )
-
-
 @dataclass(frozen=True)
 class WorkspaceBinding:
     space_id: str
@@ -581,7 +592,11 @@ class WorkspaceResolver:
                     user_id,
                 )
                 base_snapshot_id = _copy_space_baseline(
-                    source_root, working_directory
+                    source_root,
+                    working_directory,
+                    baseline_root=space_baseline_root(
+                        email, space_id, user_id
+                    ),
                 )
             binding_source: BindingSource = "space_local_brain"
         elif fallback_task_root is not None:
@@ -655,9 +670,12 @@ class WorkspaceResolver:
         if not source_root.is_dir():
             raise ValueError("Bound Space root is not available")
         workdir = project_workdir_root(email, space_id, project_id, user_id)
-        if workdir.exists():
-            shutil.rmtree(workdir)
-        return _copy_space_baseline(source_root, workdir)
+        return _copy_space_baseline(
+            source_root,
+            workdir,
+            baseline_root=space_baseline_root(email, space_id, user_id),
+            refresh=True,
+        )
 
 
 _resolver: WorkspaceResolver | None = None
@@ -178,6 +178,24 @@ async def cleanup_resources():
     if pid_file.exists():
         pid_file.unlink()
 
+    # Drain queued cloud step sync batches and close pooled HTTP clients
+    try:
+        from app.utils.server.sync_step import flush_step_sync
+
+        await flush_step_sync(timeout=3.0)
+    except Exception as e:
+        app_logger.warning(f"Cloud step sync shutdown failed: {e}")
+
+    # Disconnect pooled MCP servers (stdio server processes)
+    try:
+        from app.utils.mcp_pool import close_mcp_pool
+
+        await asyncio.wait_for(close_mcp_pool(), timeout=3.0)
+    except TimeoutError:
+        app_logger.warning("MCP pool shutdown timed out")
+    except Exception as e:
+        app_logger.warning(f"MCP pool shutdown failed: {e}")
+
     # Shutdown OpenTelemetry tracer (releases BatchSpanProcessor worker threads)
     try:
         from app.utils.telemetry.workforce_metrics import (
@@ -15,13 +15,40 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from camel.toolkits import FunctionTool
 
 from app.agent.tools import get_mcp_tools, get_toolkits
 from app.model.chat import McpServers
+from app.utils import mcp_pool
 
 pytestmark = pytest.mark.unit
 
 
+def notion_search(query: str) -> str:
+    r"""Search Notion.
+
+    Args:
+        query (str): Search text.
+    """
+    return query
+
+
+def notion_read(page_id: str) -> str:
+    r"""Read a Notion page.
+
+    Args:
+        page_id (str): Page id.
+    """
+    return page_id
+
+
+@pytest.fixture(autouse=True)
+def empty_mcp_pool():
+    mcp_pool._servers.clear()
+    yield
+    mcp_pool._servers.clear()
+
+
 class TestToolkitFunctions:
     """Test cases for toolkit utility functions."""
 
@@ -140,9 +167,9 @@ class TestMcpTools:
             }
         }
 
-        mock_tools = [MagicMock(), MagicMock()]
+        mock_tools = [FunctionTool(notion_search), FunctionTool(notion_read)]
 
-        with patch("app.agent.tools.MCPToolkit") as mock_mcp_toolkit:
+        with patch("app.utils.mcp_pool.MCPToolkit") as mock_mcp_toolkit:
             mock_toolkit_instance = MagicMock()
             mock_toolkit_instance.connect = AsyncMock()
             mock_toolkit_instance.get_tools.return_value = mock_tools
@@ -151,7 +178,7 @@ class TestMcpTools:
             result = await get_mcp_tools(mcp_servers)
 
             assert len(result) == 2
-            assert result == mock_tools
+            assert [t.func for t in result] == [t.func for t in mock_tools]
             mock_mcp_toolkit.assert_called_once()
             mock_toolkit_instance.connect.assert_called_once()
 
@@ -172,7 +199,7 @@ class TestMcpTools:
         }
 
         with patch(
-            "app.agent.tools.MCPToolkit",
+            "app.utils.mcp_pool.MCPToolkit",
             side_effect=Exception("Connection failed"),
         ):
             result = await get_mcp_tools(mcp_servers)
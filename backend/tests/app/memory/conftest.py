@@ -0,0 +1,61 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""Shared fixtures: run the memory suite against both store backends.
+
+Tests that poke at the on-disk file layout directly (raw jsonl lines,
+facts.log.jsonl, stamp-validated caching) carry `@pytest.mark.file_layout`
+and only run against LocalMemoryStore.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from app.memory import LocalMemoryStore, MemoryStore, SqliteMemoryStore
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "file_layout: test inspects LocalMemoryStore files; skip for SQLite",
+    )
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def memory_backend(request) -> str:
+    if request.param == "sqlite" and request.node.get_closest_marker(
+        "file_layout"
+    ):
+        pytest.skip("exercises the file-store layout directly")
+    return request.param
+
+
+@pytest.fixture
+def make_store(memory_backend) -> Callable[[Path], MemoryStore]:
+    created: list[SqliteMemoryStore] = []
+
+    def factory(root: Path) -> MemoryStore:
+        if memory_backend == "sqlite":
+            store = SqliteMemoryStore(root=root)
+            created.append(store)
+            return store
+        return LocalMemoryStore(root=root)
+
+    yield factory
+    for store in created:
+        store.close()
@@ -23,6 +23,7 @@ from app.memory import (
     LocalMemoryStore,
     MemoryArtifact,
     MemoryFact,
+    MemoryStore,
     ProjectContextBuilder,
     ProjectMemory,
     SpaceMemory,
@@ -30,8 +31,8 @@ from app.memory import (
 
 
 @pytest.fixture
-def store(tmp_path) -> LocalMemoryStore:
-    return LocalMemoryStore(root=tmp_path)
+def store(tmp_path, make_store) -> MemoryStore:
+    return make_store(tmp_path)
 
 
 @pytest.fixture
@@ -428,3 +429,83 @@ class TestRender:
         assert "fetch the dashboard" in rendered
         # Workers must not see full conversation.
         assert "Recent conversation:" not in rendered
+
+
+# ----- Read cache -----
+
+
+@pytest.mark.file_layout
+class TestReadCache:
+    def _build(self, store, ids):
+        return ProjectContextBuilder(store).build(
+            user_key=ids["user_key"],
+            space_id=ids["space_id"],
+            project_id=ids["project_id"],
+            run_id=ids["run_id"],
+            mode="single_agent",
+            token_budget=4000,
+            current_user_prompt="x",
+        )
+
+    def test_repeated_build_reuses_parsed_sources(
+        self, seeded_store, ids, monkeypatch
+    ):
+        first = self._build(seeded_store, ids)
+        calls: list[str] = []
+        for name in (
+            "read_space",
+            "read_project",
+            "read_project_summary",
+            "read_facts",
+            "read_artifacts",
+            "read_conversation_tail",
+        ):
+            original = getattr(seeded_store, name)
+
+            def spy(*args, _name=name, _original=original, **kwargs):
+                calls.append(_name)
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(seeded_store, name, spy)
+
+        second = self._build(seeded_store, ids)
+        assert calls == []
+        assert second == first
+
+    def test_store_writes_invalidate_cached_sources(self, seeded_store, ids):
+        self._build(seeded_store, ids)
+        seeded_store.upsert_fact(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            MemoryFact(
+                fact_id="fact_new",
+                text="Churn dashboard moved to Looker.",
+                scope="project",
+                source_event_ids=[],
+                confidence=0.99,
+                created_at="2026-05-27T09:40:00Z",
+                updated_at="2026-05-27T09:40:00Z",
+            ),
+        )
+        seeded_store.write_project_summary(
+            ids["user_key"], ids["space_id"], ids["project_id"], "Rewritten."
+        )
+        bundle = self._build(seeded_store, ids)
+        assert bundle.relevant_facts[0].fact_id == "fact_new"
+        assert bundle.project_summary == "Rewritten."
+
+    def test_out_of_band_file_change_is_detected_by_stamp(
+        self, seeded_store, ids
+    ):
+        self._build(seeded_store, ids)
+        summary_path = (
+            seeded_store.project_path(
+                ids["user_key"], ids["space_id"], ids["project_id"]
+            )
+            / "summary.md"
+        )
+        # Different size guarantees a new stamp even on coarse-mtime disks.
+        summary_path.write_text("Edited outside the store.", encoding="utf-8")
+        bundle = self._build(seeded_store, ids)
+        assert bundle.project_summary == "Edited outside the store."
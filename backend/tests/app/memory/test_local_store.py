@@ -20,7 +20,9 @@ Exercises the M1 surface on a tmpdir root so no real ~/.eigent is touched.
 from __future__ import annotations
 
 import json
+import statistics
 import threading
+import time
 
 import pytest
 
@@ -29,18 +31,21 @@ from app.memory import (
     LocalMemoryStore,
     MemoryArtifact,
     MemoryFact,
+    MemoryStore,
     ProjectMemory,
     RunMemory,
     RunStatus,
     SpaceMemory,
     SyncSettings,
+    ToolEvent,
     canonical_user_id,
+    local_store,
 )
 
 
 @pytest.fixture
-def store(tmp_path) -> LocalMemoryStore:
-    return LocalMemoryStore(root=tmp_path)
+def store(tmp_path, make_store) -> MemoryStore:
+    return make_store(tmp_path)
 
 
 @pytest.fixture
@@ -120,6 +125,7 @@ class TestSpaceRoundtrip:
         # Sync defaults to local_only
         assert loaded.sync == SyncSettings()
 
+    @pytest.mark.file_layout
     def test_write_creates_parent_dirs(self, store, ids):
         payload = SpaceMemory(
             space_id=ids["space_id"],
@@ -159,6 +165,7 @@ class TestProjectRoundtrip:
             == payload
         )
 
+    @pytest.mark.file_layout
     def test_unknown_fields_in_file_are_ignored(self, store, ids):
         # Simulate an older file with an extra unknown field.
         path = (
@@ -190,6 +197,7 @@ class TestProjectRoundtrip:
         assert loaded is not None
         assert loaded.name == "P"
 
+    @pytest.mark.file_layout
     def test_malformed_json_treated_as_missing(self, store, ids):
         path = (
             store.project_path(
@@ -265,6 +273,7 @@ class TestConversationLog:
             == []
         )
 
+    @pytest.mark.file_layout
     def test_concurrent_appends_do_not_interleave(self, store, ids):
         # Two threads each append 50 events; no line should be partial or lost.
         def writer(start: int) -> None:
@@ -293,6 +302,7 @@ class TestConversationLog:
             t.start()
         for t in threads:
             t.join()
+        assert store.flush(timeout=10)
 
         path = (
             store.project_path(
@@ -305,6 +315,7 @@ class TestConversationLog:
         for line in lines:
             json.loads(line)  # would raise if any line was torn
 
+    @pytest.mark.file_layout
     def test_malformed_line_is_skipped_not_fatal(self, store, ids):
         path = (
             store.project_path(
@@ -335,6 +346,312 @@ class TestConversationLog:
         )
         assert [e.event_id for e in tail] == ["ok"]
 
+    def _write_raw_log(self, store, ids, lines: list[str]) -> None:
+        path = (
+            store.project_path(
+                ids["user_key"], ids["space_id"], ids["project_id"]
+            )
+            / "conversation.jsonl"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(lines), encoding="utf-8")
+
+    def _raw_event(self, ids, i: int, content: str = "") -> str:
+        return (
+            json.dumps(
+                {
+                    "event_id": f"evt_{i}",
+                    "run_id": ids["run_id"],
+                    "timestamp": "t",
+                    "role": "user",
+                    "content": content or f"message {i}",
+                    "source": "chat",
+                    "visibility": "context",
+                    "hash": f"sha256:{i}",
+                }
+            )
+            + "\n"
+        )
+
+    @pytest.mark.file_layout
+    def test_tail_spans_multiple_read_blocks(self, store, ids, monkeypatch):
+        # Force a tiny block size so lines straddle block boundaries.
+        monkeypatch.setattr(
+            "app.memory.local_store._TAIL_READ_BLOCK_BYTES", 37
+        )
+        self._write_raw_log(
+            store, ids, [self._raw_event(ids, i) for i in range(20)]
+        )
+        tail = store.read_conversation_tail(
+            ids["user_key"], ids["space_id"], ids["project_id"], limit=7
+        )
+        assert [e.event_id for e in tail] == [
+            f"evt_{i}" for i in range(13, 20)
+        ]
+
+    @pytest.mark.file_layout
+    def test_tail_skips_malformed_lines_without_counting_them(
+        self, store, ids
+    ):
+        lines = [self._raw_event(ids, i) for i in range(5)]
+        lines.insert(4, "{ not json\n")
+        lines.insert(3, "\n")
+        self._write_raw_log(store, ids, lines)
+        tail = store.read_conversation_tail(
+            ids["user_key"], ids["space_id"], ids["project_id"], limit=3
+        )
+        assert [e.event_id for e in tail] == ["evt_2", "evt_3", "evt_4"]
+
+    @pytest.mark.file_layout
+    def test_tail_without_trailing_newline_and_unicode(self, store, ids):
+        lines = [
+            self._raw_event(ids, i, content="你好 " * 40) for i in range(3)
+        ]
+        lines[-1] = lines[-1].rstrip("\n")
+        self._write_raw_log(store, ids, lines)
+        tail = store.read_conversation_tail(
+            ids["user_key"], ids["space_id"], ids["project_id"], limit=10
+        )
+        assert [e.event_id for e in tail] == ["evt_0", "evt_1", "evt_2"]
+        assert tail[-1].content == "你好 " * 40
+
+    @pytest.mark.file_layout
+    @pytest.mark.very_slow
+    def test_tail_latency_is_flat_in_log_size(self, store, ids):
+        # Micro-benchmark: reading a context-sized tail from a 100k-event
+        # project should cost about the same as from a 1k-event project.
+        def median_tail_seconds() -> float:
+            samples = []
+            for _ in range(20):
+                started = time.perf_counter()
+                store.read_conversation_tail(
+                    ids["user_key"],
+                    ids["space_id"],
+                    ids["project_id"],
+                    limit=24,
+                )
+                samples.append(time.perf_counter() - started)
+            return statistics.median(samples)
+
+        self._write_raw_log(
+            store, ids, [self._raw_event(ids, i) for i in range(1_000)]
+        )
+        small = median_tail_seconds()
+        self._write_raw_log(
+            store, ids, [self._raw_event(ids, i) for i in range(100_000)]
+        )
+        large = median_tail_seconds()
+        print(
+            f"read_conversation_tail(limit=24): 1k events {small * 1e3:.3f}ms,"
+            f" 100k events {large * 1e3:.3f}ms"
+        )
+        assert large < small * 5 + 0.005
+
+
+# ----- Group-commit appends -----
+
+
+def _tool_event(i: int) -> ToolEvent:
+    return ToolEvent(
+        event_id=f"tool_{i}",
+        run_id="run_test_1",
+        timestamp="t",
+        tool_name="shell_exec",
+        arguments={"command": f"ls {i}"},
+        result_summary="ok",
+        visibility="audit_only",
+    )
+
+
+class TestGroupCommit:
+    def _tool_events_path(self, store, ids):
+        return (
+            store.run_path(
+                ids["user_key"],
+                ids["space_id"],
+                ids["project_id"],
+                ids["run_id"],
+            )
+            / "tool_events.jsonl"
+        )
+
+    def test_batch_is_written_with_one_fsync(self, tmp_path, ids, monkeypatch):
+        # Long latency: nothing is committed until flush() is requested.
+        store = LocalMemoryStore(root=tmp_path, fsync_max_latency_ms=60_000)
+        target = self._tool_events_path(store, ids)
+        # Each _write_jsonl_lines call is one write + one fsync; count the
+        # ones for this file only (other tests' writer threads may be live).
+        commits: list[int] = []
+        real_write = local_store._write_jsonl_lines
+
+        def counting_write(path, lines):
+            if path == target:
+                commits.append(len(lines))
+            real_write(path, lines)
+
+        monkeypatch.setattr(local_store, "_write_jsonl_lines", counting_write)
+        for i in range(100):
+            store.append_tool_event(
+                ids["user_key"],
+                ids["space_id"],
+                ids["project_id"],
+                ids["run_id"],
+                _tool_event(i),
+            )
+        assert store.flush(timeout=10)
+
+        lines = (
+            self._tool_events_path(store, ids)
+            .read_text(encoding="utf-8")
+            .splitlines()
+        )
+        assert [json.loads(line)["event_id"] for line in lines] == [
+            f"tool_{i}" for i in range(100)
+        ]
+        assert commits == [100]
+
+    def test_batch_commits_within_max_latency_without_flush(
+        self, tmp_path, ids
+    ):
+        store = LocalMemoryStore(root=tmp_path, fsync_max_latency_ms=5)
+        store.append_tool_event(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            ids["run_id"],
+            _tool_event(0),
+        )
+        path = self._tool_events_path(store, ids)
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.read_text(encoding="utf-8").count("\n") == 1
+
+    def test_conversation_reads_see_queued_appends(self, tmp_path, ids):
+        store = LocalMemoryStore(root=tmp_path, fsync_max_latency_ms=60_000)
+        store.append_conversation(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            ConversationEvent(
+                event_id="evt_queued",
+                run_id=ids["run_id"],
+                timestamp="t",
+                role="user",
+                content="hi",
+                source="chat",
+                visibility="context",
+                hash="sha256:1",
+            ),
+        )
+        tail = store.read_conversation_tail(
+            ids["user_key"], ids["space_id"], ids["project_id"], limit=5
+        )
+        assert [e.event_id for e in tail] == ["evt_queued"]
+
+    def test_flush_raises_when_a_batch_fails_to_write(
+        self, tmp_path, ids, monkeypatch
+    ):
+        store = LocalMemoryStore(root=tmp_path, fsync_max_latency_ms=60_000)
+        target = self._tool_events_path(store, ids)
+        real_write = local_store._write_jsonl_lines
+
+        def failing_write(path, lines):
+            if path == target:
+                raise OSError("disk full")
+            real_write(path, lines)
+
+        monkeypatch.setattr(local_store, "_write_jsonl_lines", failing_write)
+        store.append_tool_event(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            ids["run_id"],
+            _tool_event(0),
+        )
+        with pytest.raises(OSError, match="disk full"):
+            store.flush(timeout=10)
+        # Reported once; later flushes succeed again.
+        assert store.flush(timeout=10)
+
+    def test_flush_is_woken_when_the_writer_crashes(
+        self, tmp_path, ids, monkeypatch
+    ):
+        store = LocalMemoryStore(root=tmp_path, fsync_max_latency_ms=60_000)
+        target = self._tool_events_path(store, ids)
+        real_write = local_store._write_jsonl_lines
+        crashes: list[int] = []
+
+        def crashing_write(path, lines):
+            if path == target and not crashes:
+                crashes.append(1)
+                raise RuntimeError("writer bug")
+            real_write(path, lines)
+
+        monkeypatch.setattr(local_store, "_write_jsonl_lines", crashing_write)
+        store.append_tool_event(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            ids["run_id"],
+            _tool_event(0),
+        )
+        # Untimed, like MemoryService.on_run_end: must not hang.
+        with pytest.raises(RuntimeError, match="writer bug"):
+            store.flush()
+
+        # A fresh writer thread handles the next append.
+        store.append_tool_event(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            ids["run_id"],
+            _tool_event(1),
+        )
+        assert store.flush(timeout=10)
+        assert [
+            json.loads(line)["event_id"]
+            for line in target.read_text(encoding="utf-8").splitlines()
+        ] == ["tool_1"]
+
+    def test_zero_latency_writes_synchronously(self, tmp_path, ids):
+        store = LocalMemoryStore(root=tmp_path, fsync_max_latency_ms=0)
+        store.append_tool_event(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            ids["run_id"],
+            _tool_event(0),
+        )
+        assert self._tool_events_path(store, ids).exists()
+
+    @pytest.mark.very_slow
+    def test_group_commit_throughput_for_10k_tool_events(self, tmp_path, ids):
+        def append_10k(latency_ms: float) -> float:
+            store = LocalMemoryStore(
+                root=tmp_path / f"latency_{latency_ms}",
+                fsync_max_latency_ms=latency_ms,
+            )
+            started = time.perf_counter()
+            for i in range(10_000):
+                store.append_tool_event(
+                    ids["user_key"],
+                    ids["space_id"],
+                    ids["project_id"],
+                    ids["run_id"],
+                    _tool_event(i),
+                )
+            assert store.flush(timeout=120)
+            return time.perf_counter() - started
+
+        per_line = append_10k(0)
+        batched = append_10k(50)
+        print(
+            f"10k tool events: fsync-per-line {10_000 / per_line:,.0f}/s,"
+            f" group commit {10_000 / batched:,.0f}/s"
+        )
+        assert batched < per_line
+
 
 # ----- Facts / artifacts upsert -----
 
@@ -436,6 +753,112 @@ class TestFactsArtifacts:
         )
         assert len(loaded) == 50
 
+    def _facts_path(self, store, ids):
+        return (
+            store.project_path(
+                ids["user_key"], ids["space_id"], ids["project_id"]
+            )
+            / "facts.json"
+        )
+
+    @pytest.mark.file_layout
+    def test_upsert_appends_to_log_instead_of_rewriting_snapshot(
+        self, store, ids
+    ):
+        for i in range(3):
+            store.upsert_fact(
+                ids["user_key"],
+                ids["space_id"],
+                ids["project_id"],
+                self._fact(f"f{i}", f"v{i}"),
+            )
+        snapshot = self._facts_path(store, ids)
+        log = snapshot.with_name("facts.log.jsonl")
+        assert not snapshot.exists()
+        assert len(log.read_text(encoding="utf-8").splitlines()) == 3
+
+    @pytest.mark.file_layout
+    def test_legacy_snapshot_only_layout_still_loads(self, store, ids):
+        snapshot = self._facts_path(store, ids)
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        snapshot.write_text(
+            json.dumps(
+                {
+                    "facts": [
+                        {
+                            "fact_id": "legacy",
+                            "text": "from the old layout",
+                            "scope": "project",
+                            "source_event_ids": [],
+                            "confidence": 0.5,
+                            "created_at": "t",
+                            "updated_at": "t",
+                        }
+                    ]
+                }
+            ),
+            encoding="utf-8",
+        )
+        store.upsert_fact(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            self._fact("f_new", "new"),
+        )
+        facts = store.read_facts(
+            ids["user_key"], ids["space_id"], ids["project_id"]
+        )
+        assert [f.fact_id for f in facts] == ["legacy", "f_new"]
+
+    @pytest.mark.file_layout
+    def test_log_compacts_into_snapshot_past_threshold(
+        self, store, ids, monkeypatch
+    ):
+        monkeypatch.setattr(
+            "app.memory.local_store._UPSERT_LOG_COMPACT_BYTES", 1024
+        )
+        for i in range(20):
+            store.upsert_fact(
+                ids["user_key"],
+                ids["space_id"],
+                ids["project_id"],
+                self._fact(f"f{i % 5}", f"v{i}"),
+            )
+        snapshot = self._facts_path(store, ids)
+        log = snapshot.with_name("facts.log.jsonl")
+        assert snapshot.exists()
+        assert not log.exists() or log.stat().st_size < 1024
+        facts = store.read_facts(
+            ids["user_key"], ids["space_id"], ids["project_id"]
+        )
+        # First-seen order is kept; the last write per id wins.
+        assert [(f.fact_id, f.text) for f in facts] == [
+            (f"f{i}", f"v{15 + i}") for i in range(5)
+        ]
+
+    @pytest.mark.file_layout
+    def test_replaying_log_over_compacted_snapshot_is_idempotent(
+        self, store, ids
+    ):
+        store.upsert_fact(
+            ids["user_key"],
+            ids["space_id"],
+            ids["project_id"],
+            self._fact("f1", "v1"),
+        )
+        snapshot = self._facts_path(store, ids)
+        log = snapshot.with_name("facts.log.jsonl")
+        # Simulate a crash after the snapshot rewrite but before the log was
+        # removed: both hold the same row.
+        snapshot.write_text(
+            json.dumps({"facts": [json.loads(log.read_text("utf-8"))]}),
+            encoding="utf-8",
+        )
+        facts = store.read_facts(
+            ids["user_key"], ids["space_id"], ids["project_id"]
+        )
+        assert [(f.fact_id, f.text) for f in facts] == [("f1", "v1")]
+
 
 # ----- Run-level -----
 
@@ -484,6 +907,7 @@ class TestRunLevel:
         )
         assert loaded == run
 
+    @pytest.mark.file_layout
     def test_run_summary_write_then_read(self, store, ids):
         store.write_run_summary(
             ids["user_key"],
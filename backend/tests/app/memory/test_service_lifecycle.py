@@ -31,6 +31,7 @@ import pytest
 from app.memory import (
     LocalMemoryStore,
     MemoryService,
+    MemoryStore,
     ProjectContextBuilder,
     finalize_task_lock_run_memory,
 )
@@ -55,8 +56,8 @@ def _make_run_context(tmp_path: Path) -> RunContext:
 
 
 @pytest.fixture
-def store(tmp_path) -> LocalMemoryStore:
-    return LocalMemoryStore(root=tmp_path / "memory")
+def store(tmp_path, make_store) -> MemoryStore:
+    return make_store(tmp_path / "memory")
 
 
 @pytest.fixture
@@ -281,6 +282,35 @@ class TestRunEnd:
         assert status.state == "failed"
         assert status.last_error == "boom"
 
+    def test_on_run_end_flushes_group_committed_appends(
+        self, tmp_path, run_context
+    ):
+        # A latency far beyond the test runtime: only the run-end flush can
+        # make the transcript land on disk.
+        store = LocalMemoryStore(
+            root=tmp_path / "memory", fsync_max_latency_ms=60_000
+        )
+        service = MemoryService(store=store)
+        service.on_run_start(
+            run_context=run_context,
+            space_name="W",
+            project_name="P",
+            mode="single_agent",
+            user_prompt="q",
+        )
+        service.on_run_end(
+            run_context=run_context,
+            state="done",
+            final_result="a",
+        )
+        path = (
+            store.project_path(
+                "user_42", run_context.space_id, run_context.project_id
+            )
+            / "conversation.jsonl"
+        )
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
 
 class TestCamelLogsArtifact:
     def test_register_runtime_log_marks_not_eligible(
@@ -0,0 +1,248 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""SqliteMemoryStore-specific behaviour: migration, cross-project queries and
+backend selection. Shared store semantics are covered by the parametrized
+suites in this package."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.memory import (
+    ConversationEvent,
+    LocalMemoryStore,
+    MemoryFact,
+    RunMemory,
+    RunStatus,
+    SpaceMemory,
+    SqliteMemoryStore,
+    ToolEvent,
+    migrate_local_store_to_sqlite,
+    service as memory_service,
+)
+
+
+def _event(event_id: str, run_id: str) -> ConversationEvent:
+    return ConversationEvent(
+        event_id=event_id,
+        run_id=run_id,
+        timestamp="2026-05-27T10:00:00Z",
+        role="user",
+        content=f"content {event_id}",
+        source="chat",
+        visibility="context",
+        hash="sha256:x",
+    )
+
+
+def _fact(fact_id: str) -> MemoryFact:
+    return MemoryFact(
+        fact_id=fact_id,
+        text=f"text {fact_id}",
+        scope="project",
+        source_event_ids=[],
+        confidence=0.5,
+        created_at="t",
+        updated_at="t",
+    )
+
+
+def _run(run_id: str, project_id: str, started_at: str) -> RunMemory:
+    return RunMemory(
+        run_id=run_id,
+        project_id=project_id,
+        space_id="space_a",
+        mode="single_agent",
+        user_prompt="q",
+        started_at=started_at,
+    )
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SqliteMemoryStore(root=tmp_path / "db")
+    yield store
+    store.close()
+
+
+class TestSchema:
+    def test_construct_does_not_touch_disk(self, tmp_path):
+        SqliteMemoryStore(root=tmp_path / "fresh")
+        assert not (tmp_path / "fresh").exists()
+
+    def test_database_uses_wal_and_scope_indexes(self, sqlite_store):
+        sqlite_store.write_space(
+            "user_1",
+            SpaceMemory(
+                space_id="space_a",
+                user_id="1",
+                name="A",
+                source_type="blank",
+                created_at="t",
+                updated_at="t",
+            ),
+        )
+        conn = sqlite3.connect(sqlite_store.db_path)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            index_columns = [
+                row[2]
+                for row in conn.execute(
+                    "PRAGMA index_info('ix_conversation_events_scope')"
+                )
+            ]
+        finally:
+            conn.close()
+        assert index_columns == [
+            "space_id",
+            "project_id",
+            "run_id",
+            "timestamp",
+        ]
+
+
+class TestCrossProjectQueries:
+    def test_list_space_facts_spans_projects(self, sqlite_store):
+        sqlite_store.upsert_fact("user_1", "space_a", "p1", _fact("f1"))
+        sqlite_store.upsert_fact("user_1", "space_a", "p2", _fact("f2"))
+        sqlite_store.upsert_fact("user_1", "space_b", "p3", _fact("f3"))
+        facts = sqlite_store.list_space_facts("user_1", "space_a")
+        assert [f.fact_id for f in facts] == ["f1", "f2"]
+
+    def test_list_runs_since(self, sqlite_store):
+        sqlite_store.write_run(
+            "user_1", _run("old", "p1", "2026-05-01T00:00:00Z")
+        )
+        sqlite_store.write_run(
+            "user_1", _run("new", "p2", "2026-05-26T00:00:00Z")
+        )
+        runs = sqlite_store.list_runs_since("user_1", "2026-05-20T00:00:00Z")
+        assert [r.run_id for r in runs] == ["new"]
+
+
+class TestMigration:
+    def _seed_file_store(self, root) -> LocalMemoryStore:
+        files = LocalMemoryStore(root=root, fsync_max_latency_ms=0)
+        files.write_space(
+            "user_1",
+            SpaceMemory(
+                space_id="space_a",
+                user_id="1",
+                name="A",
+                source_type="blank",
+                created_at="t",
+                updated_at="t",
+            ),
+        )
+        for i in range(3):
+            files.append_conversation(
+                "user_1", "space_a", "p1", _event(f"evt_{i}", "run_1")
+            )
+        files.write_project_summary("user_1", "space_a", "p1", "summary")
+        files.upsert_fact("user_1", "space_a", "p1", _fact("f1"))
+        files.write_run("user_1", _run("run_1", "p1", "2026-05-27T10:00:00Z"))
+        files.write_run_status(
+            "user_1",
+            "space_a",
+            "p1",
+            "run_1",
+            RunStatus(
+                run_id="run_1",
+                state="done",
+                started_at="2026-05-27T10:00:00Z",
+                ended_at="2026-05-27T10:05:00Z",
+                last_error=None,
+            ),
+        )
+        files.append_tool_event(
+            "user_1",
+            "space_a",
+            "p1",
+            "run_1",
+            ToolEvent(
+                event_id="tool_1",
+                run_id="run_1",
+                timestamp="t",
+                tool_name="shell_exec",
+                arguments={},
+                result_summary="ok",
+                visibility="audit_only",
+            ),
+        )
+        return files
+
+    def test_migrates_file_tree_and_is_idempotent(
+        self, tmp_path, sqlite_store
+    ):
+        files = self._seed_file_store(tmp_path / "files")
+        assert migrate_local_store_to_sqlite(files, sqlite_store) == 1
+        # Re-running after a partial/complete migration must not duplicate.
+        assert migrate_local_store_to_sqlite(files, sqlite_store) == 1
+
+        assert sqlite_store.read_space("user_1", "space_a").name == "A"
+        tail = sqlite_store.read_conversation_tail(
+            "user_1", "space_a", "p1", limit=10
+        )
+        assert [e.event_id for e in tail] == ["evt_0", "evt_1", "evt_2"]
+        assert (
+            sqlite_store.read_project_summary("user_1", "space_a", "p1")
+            == "summary"
+        )
+        assert [
+            f.fact_id
+            for f in sqlite_store.read_facts("user_1", "space_a", "p1")
+        ] == ["f1"]
+        status = sqlite_store.read_run_status(
+            "user_1", "space_a", "p1", "run_1"
+        )
+        assert status is not None and status.state == "done"
+        assert sqlite_store.read_run(
+            "user_1", "space_a", "p1", "run_1"
+        ) == files.read_run("user_1", "space_a", "p1", "run_1")
+
+    def test_get_memory_service_selects_sqlite_and_migrates_once(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            memory_service, "memory_root", lambda: tmp_path, raising=False
+        )
+        monkeypatch.setattr(
+            "app.memory.sqlite_store.memory_root", lambda: tmp_path
+        )
+        self._seed_file_store(tmp_path)
+        monkeypatch.setenv("EIGENT_MEMORY_BACKEND", "sqlite")
+        memory_service._reset_memory_service_for_tests()
+        try:
+            service = memory_service.get_memory_service()
+            assert isinstance(service.store, SqliteMemoryStore)
+            assert service.store.is_migrated()
+            tail = service.store.read_conversation_tail(
+                "user_1", "space_a", "p1", limit=10
+            )
+            assert len(tail) == 3
+        finally:
+            service.store.close()
+            memory_service._reset_memory_service_for_tests()
+
+    def test_get_memory_service_defaults_to_file_store(self, monkeypatch):
+        monkeypatch.delenv("EIGENT_MEMORY_BACKEND", raising=False)
+        memory_service._reset_memory_service_for_tests()
+        try:
+            service = memory_service.get_memory_service()
+            assert isinstance(service.store, LocalMemoryStore)
+        finally:
+            memory_service._reset_memory_service_for_tests()
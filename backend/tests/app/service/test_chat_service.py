@@ -35,6 +35,7 @@ from app.service.chat_service import (
     install_mcp,
     new_agent_model,
     normalize_summary_task,
+    prewarm_workforce_agents,
     question_confirm,
     step_solve,
     summary_task,
@@ -50,6 +51,8 @@ from app.service.task import (
     ImprovePayload,
     TaskLock,
 )
+from app.utils import warm_agents
+from app.utils.warm_agents import StartupTimer
 
 
 class _StreamMsg:
@@ -328,15 +331,15 @@ class TestCollectPreviousTaskContext:
         assert "Previous Task:" not in result
         assert "Previous Task Result:" not in result
 
-    @patch("app.utils.file_utils.logger")
+    @patch("app.utils.file_index.logger")
     def test_collect_previous_task_context_file_system_error(
         self, mock_logger, temp_dir
     ):
         """Test collect_previous_task_context handles file system errors gracefully."""
         working_directory = str(temp_dir)
 
-        # Mock os.walk to raise an exception (used inside list_files)
-        with patch("os.walk", side_effect=PermissionError("Access denied")):
+        # Mock os.scandir to raise an exception (used by the file index)
+        with patch("os.scandir", side_effect=PermissionError("Access denied")):
             result = collect_previous_task_context(
                 working_directory=working_directory,
                 previous_task_content="Test task",
@@ -349,7 +352,7 @@ class TestCollectPreviousTaskContext:
             assert "Test task" in result
             assert "Generated Files from Previous Task:" not in result
 
-            # Warning is logged by file_utils.list_files
+            # Warning is logged by the file index scan
             mock_logger.warning.assert_called_once()
 
     def test_collect_previous_task_context_relative_paths(self, temp_dir):
@@ -1170,6 +1173,55 @@ class TestChatServiceAgentOperations:
                 is True
             )
 
+    @pytest.mark.asyncio
+    async def test_construct_workforce_uses_prewarmed_agents(
+        self, sample_chat_data, mock_task_lock, monkeypatch
+    ):
+        """A pre-warmed agent set is bound instead of building agents."""
+        monkeypatch.setenv("EIGENT_WARM_AGENT_POOL", "1")
+        options = Chat(**sample_chat_data)
+        warm_mcp_agent = MagicMock()
+        startup = StartupTimer(options.project_id, options.task_id)
+
+        with (
+            patch("app.service.chat_service.agent_model") as mock_agent_model,
+            patch(
+                "app.service.chat_service.get_working_directory",
+                return_value="/tmp/test_workdir",
+            ),
+            patch("app.service.chat_service.Workforce"),
+            patch("app.service.chat_service.browser_agent") as mock_browser,
+            patch("app.service.chat_service.developer_agent"),
+            patch("app.service.chat_service.document_agent"),
+            patch("app.service.chat_service.multi_modal_agent"),
+            patch(
+                "app.service.chat_service.mcp_agent",
+                return_value=warm_mcp_agent,
+            ) as mock_mcp_agent,
+            patch(
+                "app.agent.toolkit.human_toolkit.get_task_lock",
+                return_value=mock_task_lock,
+            ),
+            patch(
+                "app.service.chat_service.WorkforceMetricsCallback",
+                return_value=MagicMock(),
+            ),
+        ):
+            mock_agent_model.return_value = MagicMock()
+            prewarm_workforce_agents(options)
+
+            _, mcp = await construct_workforce(options, startup=startup)
+
+            assert mcp is warm_mcp_agent
+            assert startup.warm_hit is True
+            # The browser agent leases a CDP browser per task, so it is
+            # always built for the task at hand.
+            mock_browser.assert_called_once()
+            # The pool is refilled for the next task in the background
+            await asyncio.sleep(0.05)
+            assert mock_mcp_agent.await_count == 2
+            warm_agents._pool.clear()
+
     @pytest.mark.asyncio
     async def test_install_mcp_success(self, mock_camel_agent):
         """Test install_mcp successfully installs MCP tools."""
@@ -1451,12 +1503,12 @@ class TestChatServiceWithLLM:
 class TestChatServiceErrorCases:
     """Test error cases and edge conditions for chat service."""
 
-    def test_collect_previous_task_context_os_walk_exception(self, temp_dir):
-        """Test collect_previous_task_context handles os.walk exceptions."""
+    def test_collect_previous_task_context_scandir_exception(self, temp_dir):
+        """Test collect_previous_task_context handles os.scandir exceptions."""
         working_directory = str(temp_dir)
 
-        with patch("os.walk", side_effect=OSError("Permission denied")):
-            with patch("app.utils.file_utils.logger") as mock_logger:
+        with patch("os.scandir", side_effect=OSError("Permission denied")):
+            with patch("app.utils.file_index.logger") as mock_logger:
                 result = collect_previous_task_context(
                     working_directory=working_directory,
                     previous_task_content="Test task",
@@ -1473,7 +1525,7 @@ class TestChatServiceErrorCases:
                 # Should not include file listing
                 assert "Generated Files from Previous Task:" not in result
 
-                # Warning is logged by file_utils.list_files
+                # Warning is logged by the file index scan
                 mock_logger.warning.assert_called_once()
 
     def test_collect_previous_task_context_abspath_used(self, temp_dir):
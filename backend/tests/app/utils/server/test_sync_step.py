@@ -0,0 +1,258 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.model.chat import StepEvent, sse_json
+from app.utils.server import sync_step
+
+SYNC_URL = "https://cloud.test/api/v1/chat/steps"
+HEADERS = {"Authorization": "Bearer test"}
+
+
+@pytest.fixture(autouse=True)
+def _reset_sync_state(monkeypatch):
+    for name in ("_clients", "_outboxes", "_text_buffers"):
+        monkeypatch.setattr(sync_step, name, {})
+    monkeypatch.setattr(sync_step, "_batch_unsupported", set())
+    monkeypatch.setenv("EIGENT_STEP_SYNC_FLUSH_MS", "20")
+    monkeypatch.setenv("EIGENT_STEP_SYNC_BATCH_SIZE", "10")
+
+
+def _install_transport(handler):
+    """Route the pooled client for SYNC_URL through ``handler``."""
+    requests: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    sync_step._clients["https://cloud.test"] = (
+        asyncio.get_running_loop(),
+        client,
+    )
+    return requests
+
+
+def _body(task_id: str, index: int) -> str:
+    return sync_step._step_body(
+        task_id, "activate_agent", json.dumps({"index": index})
+    )
+
+
+@pytest.mark.asyncio
+async def test_steps_are_batched_in_order_per_task():
+    requests = _install_transport(lambda _: httpx.Response(200, json={}))
+
+    for index in range(25):
+        sync_step._enqueue(SYNC_URL, "task-a", _body("task-a", index), HEADERS)
+        sync_step._enqueue(SYNC_URL, "task-b", _body("task-b", index), HEADERS)
+    await sync_step.flush_step_sync(timeout=5)
+
+    assert {str(request.url) for request in requests} == {f"{SYNC_URL}/batch"}
+    # 25 steps per task at batch size 10 -> 3 requests per task, not 50.
+    assert len(requests) == 6
+    sent: dict[str, list[int]] = {"task-a": [], "task-b": []}
+    for request in requests:
+        batch = json.loads(request.content)
+        assert len({step["task_id"] for step in batch}) == 1
+        sent[batch[0]["task_id"]].extend(
+            step["data"]["index"] for step in batch
+        )
+        assert request.headers["Authorization"] == "Bearer test"
+    assert sent == {"task-a": list(range(25)), "task-b": list(range(25))}
+    assert sync_step._outboxes == {}
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_after_flush_interval():
+    requests = _install_transport(lambda _: httpx.Response(200, json={}))
+
+    sync_step._enqueue(SYNC_URL, "task-a", _body("task-a", 0), HEADERS)
+    await asyncio.sleep(0.2)
+
+    assert len(requests) == 1
+    assert len(json.loads(requests[0].content)) == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_queue_is_bounded_when_server_is_slow(monkeypatch):
+    monkeypatch.setenv("EIGENT_STEP_SYNC_MAX_PENDING", "5")
+    release = asyncio.Event()
+    batches: list[list[int]] = []
+
+    async def slow_send_batch(sync_url, batch, headers):
+        await release.wait()
+        batches.append([json.loads(body)["data"]["index"] for body in batch])
+
+    monkeypatch.setattr(sync_step, "_send_batch", slow_send_batch)
+
+    sync_step._enqueue(SYNC_URL, "task-a", _body("task-a", 0), HEADERS)
+    sync_step._request_flush(SYNC_URL, "task-a")
+    await asyncio.sleep(0.05)
+    for index in range(1, 101):
+        sync_step._enqueue(SYNC_URL, "task-a", _body("task-a", index), HEADERS)
+
+    outbox = sync_step._outboxes[f"{SYNC_URL}|task-a"]
+    assert len(outbox.pending) == 5
+    assert outbox.dropped == 95
+
+    release.set()
+    await sync_step.flush_step_sync(timeout=5)
+    assert batches == [[0], [96, 97, 98, 99, 100]]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_single_posts_without_batch_route():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/batch"):
+            return httpx.Response(405)
+        return httpx.Response(200, json={})
+
+    requests = _install_transport(handler)
+
+    for index in range(3):
+        sync_step._enqueue(SYNC_URL, "task-a", _body("task-a", index), HEADERS)
+    await sync_step.flush_step_sync(timeout=5)
+
+    singles = [r for r in requests if not r.url.path.endswith("/batch")]
+    assert [json.loads(r.content)["data"]["index"] for r in singles] == [
+        0,
+        1,
+        2,
+    ]
+    assert SYNC_URL in sync_step._batch_unsupported
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_across_requests():
+    first = sync_step._get_client(f"{SYNC_URL}/batch")
+    second = sync_step._get_client(SYNC_URL)
+
+    assert first is second
+    await sync_step.flush_step_sync()
+    assert first.is_closed
+
+
+def test_step_event_frame_matches_legacy_encoding():
+    data = {"content": "héllo", "tasks": [{"id": "1", "subtasks": []}]}
+    legacy = {"step": "to_sub_tasks", "data": data}
+
+    event = sse_json("to_sub_tasks", data)
+
+    assert isinstance(event, str)
+    assert event == f"data: {json.dumps(legacy, ensure_ascii=False)}\n\n"
+    assert (event.step, event.data) == ("to_sub_tasks", data)
+    assert json.loads(event.encoded_data) == data
+
+
+def test_step_body_embeds_encoded_data_verbatim():
+    body = sync_step._step_body(
+        "task-a", "end", '{"result": "done"}', run_id="run-1"
+    )
+
+    assert json.loads(body) == {
+        "task_id": "task-a",
+        "run_id": "run-1",
+        "step": "end",
+        "data": {"result": "done"},
+        "timestamp": pytest.approx(time.time(), abs=60),
+    }
+
+
+@pytest.mark.asyncio
+async def test_step_events_are_synced_without_reparsing(monkeypatch):
+    queued: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        sync_step,
+        "_enqueue",
+        lambda url, task_id, body, headers: queued.append((task_id, body)),
+    )
+
+    def fail_loads(*_args, **_kwargs):
+        raise AssertionError("StepEvent frames must not be re-parsed")
+
+    monkeypatch.setattr(
+        sync_step, "json", SimpleNamespace(dumps=json.dumps, loads=fail_loads)
+    )
+    chat = SimpleNamespace(task_id="task-a", project_id="project-a")
+    request = SimpleNamespace(headers={"authorization": "Bearer test"})
+
+    sync_step._try_sync(
+        (chat, request), sse_json("end", {"result": "ok"}), SYNC_URL
+    )
+
+    assert [task_id for task_id, _ in queued] == ["task-a"]
+    assert json.loads(queued[0][1])["data"] == {"result": "ok"}
+
+
+@pytest.mark.very_slow
+def test_step_event_halves_json_work_on_recorded_stream():
+    # Micro-benchmark: replay a stream shaped like a long workforce run
+    # through the legacy encode -> parse -> re-encode path and through
+    # StepEvent, which encodes each event's data once.
+    tree = [
+        {
+            "id": f"task.{i}",
+            "content": "Research and summarise the findings " * 8,
+            "state": "OPEN",
+            "subtasks": [
+                {"id": f"task.{i}.{j}", "content": "Sub step " * 10}
+                for j in range(6)
+            ],
+        }
+        for i in range(40)
+    ]
+    stream = []
+    for i in range(200):
+        stream.append(("activate_agent", {"agent_id": str(i), "tokens": i}))
+        stream.append(("to_sub_tasks", {"sub_tasks": tree}))
+        stream.append(("end", {"result": "Final report. " * 400}))
+
+    def legacy() -> float:
+        started = time.perf_counter()
+        for step, data in stream:
+            frame = f"data: {json.dumps({'step': step, 'data': data})}\n\n"
+            parsed = json.loads(frame[6:].strip())
+            json.dumps(
+                {
+                    "task_id": "task-a",
+                    "step": parsed["step"],
+                    "data": parsed["data"],
+                    "timestamp": time.time(),
+                }
+            )
+        return time.perf_counter() - started
+
+    def structured() -> float:
+        started = time.perf_counter()
+        for step, data in stream:
+            event = StepEvent(step, data)
+            sync_step._step_body("task-a", event.step, event.encoded_data)
+        return time.perf_counter() - started
+
+    legacy_seconds = min(legacy() for _ in range(3))
+    structured_seconds = min(structured() for _ in range(3))
+    print(
+        f"{len(stream)} events: legacy {legacy_seconds * 1e3:.1f}ms, "
+        f"StepEvent {structured_seconds * 1e3:.1f}ms"
+    )
+    assert structured_seconds < legacy_seconds * 0.6
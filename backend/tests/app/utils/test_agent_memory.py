@@ -13,12 +13,24 @@
 # ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
 
 import asyncio
+import json
+import time
+from types import SimpleNamespace
 
+import pytest
+
+from app.service.chat_service import (
+    _trim_in_process_history,
+    check_conversation_history_length,
+)
 from app.service.task import TaskLock
 from app.utils.agent_memory import (
     build_agent_memory_snapshot,
     build_memory_context,
+    conversation_entry_chars,
+    estimate_memory_size,
     record_agent_memory_snapshot,
+    record_workforce_memory_snapshot,
     serialize_agent_memory,
 )
 
@@ -104,3 +116,152 @@ def test_build_memory_context_formats_recent_snapshots():
     assert "Serialized Agent Memory" in context
     assert "single_agent" in context
     assert "assistant tool_calls: shell_exec" in context
+
+
+class ListMemory:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def get_context(self):
+        return list(self.messages), 0
+
+
+def _agent(name, messages):
+    return SimpleNamespace(
+        agent_name=name, agent_id=name, memory=ListMemory(messages)
+    )
+
+
+def _workforce(shared, private):
+    """Six agents: the worker accumulators echo their worker's messages."""
+    workers = [_agent(f"worker_{i}", shared + private[i]) for i in range(2)]
+    return SimpleNamespace(
+        coordinator_agent=_agent("coordinator", shared),
+        task_agent=_agent("planner", shared),
+        new_worker_agent=_agent("new_worker", shared[:1]),
+        _children=[
+            SimpleNamespace(
+                worker=workers[0],
+                _conversation_accumulator=_agent(
+                    "accumulator_0", shared + private[0]
+                ),
+            ),
+            SimpleNamespace(worker=workers[1]),
+        ],
+    )
+
+
+def _legacy_total(task_lock) -> int:
+    total = sum(
+        conversation_entry_chars(entry)
+        for entry in task_lock.conversation_history
+    )
+    return total + estimate_memory_size(task_lock)
+
+
+def test_history_chars_tracks_adds_trims_and_direct_edits():
+    task_lock = TaskLock("project_1", asyncio.Queue(), {})
+    for turn in range(10):
+        task_lock.add_conversation("user", f"question {turn} " * 10)
+        task_lock.add_conversation("assistant", {"summary": "done"})
+        record_agent_memory_snapshot(
+            task_lock, FakeAgent(), scope="single_agent", task_id=str(turn)
+        )
+        assert task_lock.history_chars() == _legacy_total(task_lock)
+
+    _trim_in_process_history(task_lock, keep_recent=4)
+    assert task_lock.history_chars() == _legacy_total(task_lock)
+
+    # Callers that bypass add_* are picked up by the length/identity guard.
+    task_lock.conversation_history.append({"content": "x" * 500})
+    task_lock.add_conversation("user", "after a direct append")
+    assert task_lock.history_chars() == _legacy_total(task_lock)
+    assert check_conversation_history_length(task_lock) == (
+        False,
+        _legacy_total(task_lock),
+    )
+
+
+def test_workforce_snapshot_dedups_messages_seen_in_earlier_agents():
+    shared = [
+        {"role": "user", "content": "Plan the release"},
+        {"role": "assistant", "content": "Drafting a plan."},
+    ]
+    private = [
+        [{"role": "assistant", "content": "worker 0 notes"}],
+        [
+            {
+                "role": "tool",
+                "content": "ok",
+                "tool_call_id": "call_1",
+            }
+        ],
+    ]
+    task_lock = TaskLock("project_1", asyncio.Queue(), {})
+
+    snapshots = record_workforce_memory_snapshot(
+        task_lock, _workforce(shared, private), task_id="task_1"
+    )
+
+    assert [s["agent_name"] for s in snapshots] == [
+        "coordinator",
+        "worker_0",
+        "worker_1",
+    ]
+    assert [len(s["messages"]) for s in snapshots] == [2, 1, 1]
+    assert snapshots[1]["dedup_dropped_from_earlier_agent"] == 2
+    assert task_lock.agent_memory_history == snapshots
+    assert task_lock.history_chars() == _legacy_total(task_lock)
+
+
+@pytest.mark.very_slow
+def test_history_accounting_is_linear_over_50_turns_of_6_agents():
+    # Micro-benchmark: 50 workforce turns, each snapshotting 6 agents whose
+    # memories keep growing. Legacy accounting rescans the whole history
+    # every turn; the running total only looks at the new snapshots.
+    shared: list[dict] = []
+    private: list[list[dict]] = [[], []]
+    task_lock = TaskLock("project_1", asyncio.Queue(), {})
+    legacy_seconds = 0.0
+    running_seconds = 0.0
+    for turn in range(50):
+        shared.append({"role": "user", "content": f"turn {turn} " * 200})
+        shared.append(
+            {
+                "role": "assistant",
+                "content": f"answer {turn} " * 300,
+                "tool_calls": [
+                    {
+                        "id": f"call_{turn}",
+                        "function": {
+                            "name": "write_file",
+                            "arguments": json.dumps({"content": "y" * 1500}),
+                        },
+                    }
+                ],
+            }
+        )
+        for i in range(2):
+            private[i].append(
+                {"role": "assistant", "content": f"w{i} {turn} " * 100}
+            )
+        task_lock.add_conversation("user", f"turn {turn} " * 50)
+        record_workforce_memory_snapshot(
+            task_lock, _workforce(shared, private), task_id=str(turn)
+        )
+
+        started = time.perf_counter()
+        legacy = _legacy_total(task_lock)
+        legacy_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        _, running = check_conversation_history_length(
+            task_lock, max_length=10**12
+        )
+        running_seconds += time.perf_counter() - started
+        assert running == legacy
+
+    print(
+        f"50 turns x 6 agents: legacy scan {legacy_seconds * 1e3:.1f}ms, "
+        f"running total {running_seconds * 1e3:.3f}ms"
+    )
+    assert running_seconds * 20 < legacy_seconds
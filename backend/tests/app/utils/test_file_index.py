@@ -0,0 +1,167 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import os
+import time
+
+import pytest
+
+from app.utils import file_index
+from app.utils.file_index import (
+    get_file_index,
+    indexed_files,
+    refresh_file_indexes,
+)
+from app.utils.file_utils import list_files
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def empty_indexes():
+    file_index._indexes.clear()
+    yield
+    file_index._indexes.clear()
+
+
+def make_tree(root):
+    (root / "a.txt").write_text("a")
+    (root / ".hidden").write_text("h")
+    (root / "bad.pyc").write_bytes(b"")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("d")
+    sub = root / "sub" / "deeper"
+    sub.mkdir(parents=True)
+    (sub / "c.txt").write_text("c")
+
+
+def bump_mtime(path):
+    # Directory mtimes can be coarse; make the change visible explicitly.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_matches_list_files(temp_dir):
+    make_tree(temp_dir)
+    (temp_dir / "link.txt").symlink_to(temp_dir / "a.txt")
+    (temp_dir / "linked_dir").symlink_to(temp_dir / "sub")
+
+    expected = sorted(list_files(str(temp_dir), base=str(temp_dir)))
+
+    assert indexed_files(str(temp_dir), base=str(temp_dir)) == expected
+
+
+def test_refresh_only_rescans_changed_directories(temp_dir):
+    make_tree(temp_dir)
+    index = get_file_index(str(temp_dir), base=str(temp_dir))
+    assert index.refresh() == 3
+    assert index.refresh() == 0
+
+    deeper = temp_dir / "sub" / "deeper"
+    (deeper / "new.txt").write_text("n")
+    bump_mtime(deeper)
+
+    assert index.refresh() == 1
+    assert str(deeper / "new.txt") in index.files()
+
+
+def test_deleted_directories_are_forgotten(temp_dir):
+    make_tree(temp_dir)
+    index = get_file_index(str(temp_dir), base=str(temp_dir))
+    index.refresh()
+
+    (temp_dir / "sub" / "deeper" / "c.txt").unlink()
+    (temp_dir / "sub" / "deeper").rmdir()
+    bump_mtime(temp_dir / "sub")
+
+    assert index.files() == [str(temp_dir / "a.txt")]
+
+
+def test_changed_since_reports_files_created_after(temp_dir):
+    make_tree(temp_dir)
+    index = get_file_index(str(temp_dir), base=str(temp_dir))
+    index.refresh()
+    task_started = time.time()
+
+    (temp_dir / "report.md").write_text("r")
+    bump_mtime(temp_dir)
+
+    assert index.changed_since(task_started) == [str(temp_dir / "report.md")]
+    assert index.changed_since(time.time() + 60) == []
+
+
+def test_max_age_reuses_recent_refresh(temp_dir):
+    make_tree(temp_dir)
+    index = get_file_index(str(temp_dir), base=str(temp_dir))
+    index.refresh()
+
+    (temp_dir / "late.txt").write_text("l")
+    bump_mtime(temp_dir)
+
+    assert str(temp_dir / "late.txt") not in index.files(max_age=60)
+    assert str(temp_dir / "late.txt") in index.files()
+
+
+def test_too_many_files_falls_back_to_list_files(temp_dir, monkeypatch):
+    monkeypatch.setattr(file_index, "MAX_INDEXED_FILES", 2)
+    for i in range(5):
+        (temp_dir / f"file{i}.txt").write_text(str(i))
+
+    result = indexed_files(str(temp_dir), base=str(temp_dir), max_entries=3)
+
+    assert len(result) == 3
+
+
+def test_overflow_is_remembered_until_the_root_changes(temp_dir, monkeypatch):
+    monkeypatch.setattr(file_index, "MAX_INDEXED_FILES", 2)
+    for i in range(5):
+        (temp_dir / f"file{i}.txt").write_text(str(i))
+    index = get_file_index(str(temp_dir), base=str(temp_dir))
+    with pytest.raises(file_index.FileIndexOverflow):
+        index.refresh()
+
+    scanned_before = index.scanned_dirs
+    monkeypatch.setattr(
+        index, "_scan", lambda *args: pytest.fail("overflowed index rescanned")
+    )
+    with pytest.raises(file_index.FileIndexOverflow):
+        index.refresh()
+    assert indexed_files(str(temp_dir), base=str(temp_dir)) == list_files(
+        str(temp_dir), str(temp_dir)
+    )
+    assert index.scanned_dirs == scanned_before
+
+    monkeypatch.undo()
+    monkeypatch.setattr(file_index, "MAX_INDEXED_FILES", 100)
+    (temp_dir / "new.txt").write_text("n")
+    bump_mtime(temp_dir)
+    index.refresh()
+    assert str(temp_dir / "new.txt") in index.files()
+
+
+def test_invalid_paths_return_empty(temp_dir):
+    assert indexed_files("") == []
+    assert indexed_files(str(temp_dir.parent), base=str(temp_dir)) == []
+    (temp_dir / "file.txt").write_text("x")
+    assert indexed_files(str(temp_dir / "file.txt"), base=str(temp_dir)) == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_file_indexes_runs_in_thread(temp_dir):
+    make_tree(temp_dir)
+
+    await refresh_file_indexes([str(temp_dir)])
+
+    index = get_file_index(str(temp_dir), base=str(temp_dir))
+    assert index.scanned_dirs == 3
@@ -0,0 +1,235 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import gc
+import sys
+import textwrap
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from camel.toolkits import FunctionTool, MCPToolkit
+
+from app.utils import mcp_pool
+from app.utils.mcp_pool import (
+    close_mcp_pool,
+    get_pooled_mcp_tools,
+    invalidate_mcp_servers,
+)
+
+pytestmark = pytest.mark.unit
+
+SERVERS = {
+    "notes": {"command": "notes-mcp", "args": ["--stdio"]},
+    "search": {"command": "search-mcp"},
+}
+
+
+def list_notes(folder: str) -> str:
+    r"""List notes in a folder.
+
+    Args:
+        folder (str): Folder name.
+    """
+    return folder
+
+
+class FakeToolkit:
+    """MCPToolkit stand-in that counts connects and answers pings."""
+
+    instances: list["FakeToolkit"] = []
+
+    def __init__(self, config_dict, timeout):
+        self.name = next(iter(config_dict["mcpServers"]))
+        self.session = SimpleNamespace(send_ping=AsyncMock())
+        self.clients = [SimpleNamespace(session=self.session)]
+        self.is_connected = False
+        self.disconnect = AsyncMock()
+        FakeToolkit.instances.append(self)
+
+    async def connect(self):
+        await asyncio.sleep(0.01)
+        self.is_connected = True
+        return self
+
+    def get_tools(self):
+        return [FunctionTool(list_notes)] if self.name == "notes" else []
+
+
+async def _closed():
+    # Wait for the disconnects the last checkout scheduled.
+    await asyncio.gather(*mcp_pool._closing)
+
+
+@pytest.fixture(autouse=True)
+def fake_pool(monkeypatch):
+    FakeToolkit.instances = []
+    mcp_pool._servers.clear()
+    mcp_pool._retired.clear()
+    monkeypatch.setattr(mcp_pool, "MCPToolkit", FakeToolkit)
+    yield
+    mcp_pool._servers.clear()
+    mcp_pool._retired.clear()
+
+
+@pytest.mark.asyncio
+async def test_servers_are_connected_once_and_reused():
+    first = await get_pooled_mcp_tools(SERVERS)
+    second = await get_pooled_mcp_tools(SERVERS)
+
+    assert len(FakeToolkit.instances) == 2
+    assert [t.get_function_name() for t in second] == ["list_notes"]
+    # Each checkout gets its own tool objects over the same connection.
+    assert second[0] is not first[0]
+    assert second[0].func is first[0].func
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkouts_share_one_connect():
+    results = await asyncio.gather(
+        *(get_pooled_mcp_tools({"notes": SERVERS["notes"]}) for _ in range(5))
+    )
+
+    assert len(FakeToolkit.instances) == 1
+    assert all(len(tools) == 1 for tools in results)
+
+
+@pytest.mark.asyncio
+async def test_changed_config_gets_its_own_connection():
+    await get_pooled_mcp_tools({"notes": SERVERS["notes"]})
+    await get_pooled_mcp_tools(
+        {"notes": {**SERVERS["notes"], "env": {"NOTES_DIR": "/tmp"}}}
+    )
+
+    assert len(FakeToolkit.instances) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_health_check_reconnects(monkeypatch):
+    monkeypatch.setenv("EIGENT_MCP_POOL_HEALTH_INTERVAL", "0")
+    tools = await get_pooled_mcp_tools({"notes": SERVERS["notes"]})
+    crashed = FakeToolkit.instances[0]
+    crashed.session.send_ping.side_effect = ConnectionError("broken pipe")
+
+    await get_pooled_mcp_tools({"notes": SERVERS["notes"]})
+
+    assert len(FakeToolkit.instances) == 2
+    assert crashed in [e.toolkit for e in mcp_pool._retired]
+    # The crashed server is only torn down once its tools are released.
+    del tools
+    gc.collect()
+    await get_pooled_mcp_tools({"notes": SERVERS["notes"]})
+    await _closed()
+    crashed.disconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failing_server_is_skipped():
+    class Broken(FakeToolkit):
+        async def connect(self):
+            raise ConnectionError("spawn failed")
+
+    with patch.object(mcp_pool, "MCPToolkit", Broken):
+        tools = await get_pooled_mcp_tools(SERVERS)
+
+    assert tools == []
+    assert mcp_pool._servers == {}
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_idle_ttl_disconnect_unused_servers(
+    monkeypatch,
+):
+    await get_pooled_mcp_tools(SERVERS)
+    notes, search = FakeToolkit.instances
+    gc.collect()
+
+    assert invalidate_mcp_servers(["notes"]) == 1
+    await get_pooled_mcp_tools({"search": SERVERS["search"]})
+    await _closed()
+    notes.disconnect.assert_awaited_once()
+    search.disconnect.assert_not_awaited()
+
+    monkeypatch.setenv("EIGENT_MCP_POOL_IDLE_TTL", "0")
+    await get_pooled_mcp_tools({})
+    await _closed()
+    search.disconnect.assert_awaited_once()
+    assert mcp_pool._servers == {}
+
+
+@pytest.mark.asyncio
+async def test_update_mcp_config_invalidates_pool(tmp_path, monkeypatch):
+    from app.service import mcp_config
+
+    monkeypatch.setattr(mcp_config, "MCP_CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(mcp_config, "MCP_CONFIG_PATH", tmp_path / "mcp.json")
+    await get_pooled_mcp_tools(SERVERS)
+
+    mcp_config.update_mcp("notes", {"command": "notes-mcp", "args": "[]"})
+
+    assert [e.name for e in mcp_pool._servers.values()] == ["search"]
+    await close_mcp_pool()
+
+
+STUB_SERVER = textwrap.dedent(
+    """
+    import time
+
+    time.sleep(0.3)  # stand-in for npx/uvx start-up
+
+    from mcp.server.fastmcp import FastMCP
+
+    app = FastMCP("stub")
+
+    @app.tool()
+    def echo(text: str) -> str:
+        return text
+
+    app.run()
+    """
+)
+
+
+@pytest.mark.very_slow
+@pytest.mark.asyncio
+async def test_time_to_first_tool_with_and_without_pool(tmp_path, monkeypatch):
+    # Micro-benchmark against a real stdio MCP server: a fresh MCPToolkit
+    # per workforce (the old path) versus a checkout from the pool.
+    monkeypatch.setattr(mcp_pool, "MCPToolkit", MCPToolkit)
+    script = tmp_path / "stub_server.py"
+    script.write_text(STUB_SERVER)
+    servers = {"stub": {"command": sys.executable, "args": [str(script)]}}
+
+    started = time.perf_counter()
+    toolkit = MCPToolkit(config_dict={"mcpServers": servers}, timeout=60)
+    await toolkit.connect()
+    assert toolkit.get_tools()
+    unpooled = time.perf_counter() - started
+    await toolkit.disconnect()
+
+    await get_pooled_mcp_tools(servers)
+    started = time.perf_counter()
+    tools = await get_pooled_mcp_tools(servers)
+    pooled = time.perf_counter() - started
+
+    assert [t.get_function_name() for t in tools] == ["echo"]
+    assert await tools[0].async_call(text="hi") == "hi"
+    print(
+        f"time to first MCP tool: unpooled {unpooled * 1e3:.0f}ms, "
+        f"pooled {pooled * 1e3:.2f}ms"
+    )
+    assert pooled * 10 < unpooled
+    await close_mcp_pool()
@@ -0,0 +1,152 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+import pytest
+from camel.models import ModelFactory
+
+from app.agent.agent_model import agent_model
+from app.model.chat import AgentModelConfig, Chat
+from app.service.task import Agents, TaskLock
+from app.utils import model_clients
+from app.utils.model_clients import (
+    build_shared_model,
+    model_client_key,
+    release_model_clients,
+)
+
+pytestmark = pytest.mark.unit
+
+URL = "https://api.openai.com/v1"
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    model_clients._registry.clear()
+    yield
+    model_clients._registry.clear()
+
+
+def _build(api_key="sk-test", **init_params):
+    key = model_client_key("openai", URL, api_key, init_params, 600)
+    return build_shared_model(
+        key,
+        lambda shared: ModelFactory.create(
+            model_platform="openai",
+            model_type="gpt-4o",
+            api_key=api_key,
+            url=URL,
+            timeout=600,
+            **init_params,
+            **shared,
+        ),
+    )
+
+
+def test_backends_with_same_endpoint_share_clients_until_released():
+    first, first_lease = _build()
+    second, second_lease = _build()
+
+    assert first_lease == second_lease is not None
+    assert second._client is first._client
+    assert second._async_client is first._async_client
+    assert model_clients._registry[first_lease].refs == 2
+
+    asyncio.run(release_model_clients([first_lease]))
+    assert not first._client.is_closed()
+
+    asyncio.run(release_model_clients([second_lease]))
+    assert first._client.is_closed()
+    assert first._async_client.is_closed()
+    assert model_clients.shared_model_client_count() == 0
+
+
+def test_different_credentials_or_client_params_do_not_share():
+    base, _ = _build()
+    other_key, _ = _build(api_key="sk-other")
+    other_headers, _ = _build(default_headers={"X-Team": "a"})
+
+    assert other_key._client is not base._client
+    assert other_headers._client is not base._client
+    assert model_clients.shared_model_client_count() == 3
+    assert all(
+        "sk-" not in part
+        for key in model_clients._registry
+        for part in map(str, key)
+    )
+
+
+def test_caller_supplied_clients_bypass_registry():
+    key = model_client_key("openai", URL, "k", {"client": object()}, 1)
+    assert key is None
+    model, lease = build_shared_model(None, lambda shared: shared)
+    assert (model, lease) == ({}, None)
+
+
+def test_failed_build_returns_its_lease():
+    _, lease = _build()
+
+    def fail(shared):
+        assert shared
+        raise RuntimeError("bad config")
+
+    with pytest.raises(RuntimeError):
+        build_shared_model(lease, fail)
+    assert model_clients._registry[lease].refs == 1
+
+
+def test_workforce_agents_share_one_pool_released_on_cleanup(
+    sample_chat_data,
+):
+    options = Chat(**sample_chat_data)
+    task_lock = TaskLock(options.project_id, asyncio.Queue(), {})
+    _m = sys.modules["app.agent.agent_model"]
+    with (
+        patch.object(_m, "get_task_lock", return_value=task_lock),
+        patch.object(
+            _m, "_schedule_async_task", side_effect=lambda coro: coro.close()
+        ),
+        patch.object(_m, "ListenChatAgent") as listen_agent,
+    ):
+        for name in [
+            Agents.coordinator_agent,
+            Agents.task_agent,
+            Agents.new_worker_agent,
+            Agents.browser_agent,
+            Agents.developer_agent,
+            Agents.document_agent,
+            Agents.multi_modal_agent,
+        ]:
+            agent_model(name, "system", options)
+        agent_model(
+            Agents.mcp_agent,
+            "system",
+            options,
+            custom_model_config=AgentModelConfig(api_key="sk-custom"),
+        )
+
+    models = [call.kwargs["model"] for call in listen_agent.call_args_list]
+    assert len({id(m._client) for m in models[:7]}) == 1
+    assert models[7]._client is not models[0]._client
+    assert len(task_lock.model_client_leases) == 8
+    assert model_clients.shared_model_client_count() == 2
+
+    asyncio.run(task_lock.cleanup())
+
+    assert task_lock.model_client_leases == []
+    assert model_clients.shared_model_client_count() == 0
+    assert all(m._client.is_closed() for m in models)
@@ -0,0 +1,252 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+from pathlib import Path
+
+import pytest
+
+from app.run_context import RunContext
+from app.utils import space_overlay_client
+from app.utils.space_overlay_client import (
+    OverlayJournal,
+    close_overlay_journal,
+    coalesce_overlay_status,
+    overlay_journal,
+)
+from app.utils.workdir_manifest import create_workdir_manifest
+from app.utils.workspace_baseline import WORKDIR_MARKER
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.is_error = status_code >= 400
+        self.is_server_error = status_code >= 500
+        self.text = ""
+
+
+class FakeClient:
+    def __init__(self, statuses: dict[str, int] | None = None):
+        self.statuses = statuses or {}
+        self.posts: list[tuple[str, dict]] = []
+
+    def post(self, url, json, headers):
+        self.posts.append((url, json))
+        if url.endswith("/batch"):
+            return FakeResponse(self.statuses.get("batch", 200))
+        # Single writes can be refused per path
+        status = self.statuses.get(json["path"], self.statuses.get("single"))
+        return FakeResponse(status or 200)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def context(tmp_path: Path) -> RunContext:
+    work = tmp_path / "work"
+    work.mkdir()
+    return RunContext(
+        space_id="space_1",
+        project_id="project_1",
+        run_id="run_1",
+        task_id="task_1",
+        email="alice@example.com",
+        user_id="42",
+        working_directory=work,
+        task_output_root=tmp_path / "out",
+        camel_log_dir=tmp_path / "logs",
+        binding_source="test",
+        workdir_mode=None,
+        browser_port=9222,
+        server_url="http://server",
+        auth_header="Bearer token",
+    )
+
+
+@pytest.fixture
+def client(monkeypatch) -> FakeClient:
+    fake = FakeClient()
+    monkeypatch.setattr(
+        space_overlay_client.httpx, "Client", lambda timeout: fake
+    )
+    # Keep the background flusher out of the way; tests flush explicitly
+    monkeypatch.setattr(
+        space_overlay_client, "OVERLAY_FLUSH_INTERVAL_SECONDS", 3600
+    )
+    return fake
+
+
+def _write(context: RunContext, name: str, content: str) -> Path:
+    path = context.working_directory / name
+    path.write_text(content)
+    return path
+
+
+def test_coalesce_matches_server_merge():
+    assert coalesce_overlay_status("added", "modified", None) == "added"
+    assert coalesce_overlay_status("modified", "added", "b") == "modified"
+    assert coalesce_overlay_status("deleted", "added", "b") == "modified"
+    assert coalesce_overlay_status("deleted", "added", None) == "added"
+    assert coalesce_overlay_status("added", "deleted", None) == "deleted"
+
+
+def test_repeated_writes_are_sent_once(context, client):
+    journal = OverlayJournal(context)
+    path = _write(context, "a.txt", "one")
+    journal.record("a.txt", path, base_hash=None, status="added")
+    path.write_text("two")
+    journal.record("a.txt", path, base_hash="ignored", status="modified")
+
+    assert journal.pending() == 1
+    assert journal.close()
+
+    [(url, body)] = client.posts
+    assert url.endswith("/overlays/batch")
+    [write] = body["writes"]
+    assert write["status"] == "added"
+    assert write["base_hash"] is None
+    assert write["size"] == 3
+    assert journal.knows("a.txt")
+
+
+def test_flush_splits_into_batches(context, client, monkeypatch):
+    journal = OverlayJournal(context)
+    for i in range(5):
+        name = f"f{i}.txt"
+        journal.record(
+            name, _write(context, name, str(i)), base_hash=None, status="added"
+        )
+    # Lowered after recording so no early wake-up races the final flush
+    monkeypatch.setattr(space_overlay_client, "OVERLAY_BATCH_SIZE", 2)
+
+    assert journal.close()
+
+    assert [len(body["writes"]) for _, body in client.posts] == [2, 2, 1]
+
+
+def test_missing_file_is_reported_deleted(context, client):
+    journal = OverlayJournal(context)
+    path = _write(context, "gone.txt", "x")
+    journal.record("gone.txt", path, base_hash="b", status="modified")
+    path.unlink()
+
+    assert journal.close()
+
+    write = client.posts[0][1]["writes"][0]
+    assert write["status"] == "deleted"
+    assert write["hash"] is None
+
+
+def test_falls_back_to_single_writes_without_bulk_endpoint(context, client):
+    client.statuses["batch"] = 404
+    journal = OverlayJournal(context)
+    for name in ("a.txt", "b.txt"):
+        journal.record(
+            name, _write(context, name, name), base_hash=None, status="added"
+        )
+
+    assert journal.close()
+
+    urls = [url for url, _ in client.posts]
+    assert urls[0].endswith("/overlays/batch")
+    assert [url.endswith("/overlays") for url in urls[1:]] == [True, True]
+
+
+def test_failed_flush_is_counted(context, client):
+    client.statuses["batch"] = 500
+    before = space_overlay_client.overlay_sync_failure_count()
+    journal = OverlayJournal(context)
+    journal.record(
+        "a.txt", _write(context, "a.txt", "a"), base_hash=None, status="added"
+    )
+
+    assert not journal.close()
+    assert space_overlay_client.overlay_sync_failure_count() == before + 1
+    assert not journal.knows("a.txt")
+
+
+def test_failed_batch_is_retried_on_next_flush(context, client):
+    client.statuses["batch"] = 500
+    journal = OverlayJournal(context)
+    journal.record(
+        "a.txt", _write(context, "a.txt", "a"), base_hash=None, status="added"
+    )
+
+    assert not journal.flush()
+    assert journal.pending() == 1
+
+    client.statuses["batch"] = 200
+    assert journal.close()
+    assert [write["path"] for write in client.posts[-1][1]["writes"]] == [
+        "a.txt"
+    ]
+    assert journal.knows("a.txt")
+
+
+def test_rejected_batch_drops_only_the_refused_write(context, client):
+    client.statuses["batch"] = 400
+    client.statuses["bad.txt"] = 400
+    before = space_overlay_client.overlay_sync_failure_count()
+    journal = OverlayJournal(context)
+    for name in ("good.txt", "bad.txt"):
+        journal.record(
+            name, _write(context, name, name), base_hash=None, status="added"
+        )
+
+    assert not journal.flush()
+    assert space_overlay_client.overlay_sync_failure_count() == before + 1
+    assert journal.pending() == 0
+    assert journal.knows("good.txt")
+    assert not journal.knows("bad.txt")
+
+    # Nothing is left to resend, and the bulk endpoint is still used
+    posts = len(client.posts)
+    assert journal.flush()
+    assert len(client.posts) == posts
+    journal.record(
+        "c.txt", _write(context, "c.txt", "c"), base_hash=None, status="added"
+    )
+    client.statuses["batch"] = 200
+    assert journal.close()
+    assert client.posts[-1][0].endswith("/overlays/batch")
+
+
+def test_close_overlay_journal_drops_the_run(context, client):
+    journal = overlay_journal(context)
+    assert overlay_journal(context) is journal
+    journal.record(
+        "a.txt", _write(context, "a.txt", "a"), base_hash=None, status="added"
+    )
+
+    assert close_overlay_journal(context)
+    assert len(client.posts) == 1
+    assert overlay_journal(context) is not journal
+    close_overlay_journal(context)
+
+
+def test_close_journals_changes_no_tool_reported(context, client):
+    work = context.working_directory
+    (work / WORKDIR_MARKER).write_text("{}")
+    create_workdir_manifest(work, "snapshot_1", [])
+    (work / "shell.txt").write_text("from a shell command")
+
+    assert close_overlay_journal(context)
+
+    [write] = client.posts[0][1]["writes"]
+    assert (write["path"], write["status"]) == ("shell.txt", "added")
+    assert close_overlay_journal(context)
+    assert len(client.posts) == 1
@@ -0,0 +1,123 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+
+import pytest
+
+from app.model.chat import Chat
+from app.utils import warm_agents
+from app.utils.warm_agents import (
+    discard_warm_agents,
+    prewarm_agents,
+    take_warm_agents,
+    warm_agents_key,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    warm_agents._pool.clear()
+    yield
+    warm_agents._pool.clear()
+
+
+def builder(value, calls: list):
+    async def build():
+        calls.append(value)
+        await asyncio.sleep(0)
+        return value
+
+    return build
+
+
+def test_key_ignores_per_task_fields(sample_chat_data):
+    first = Chat(**sample_chat_data)
+    second = Chat(
+        **{**sample_chat_data, "task_id": "other", "question": "Other?"}
+    )
+    other_model = Chat(**{**sample_chat_data, "model_type": "gpt-4.1"})
+
+    def key(options):
+        return warm_agents_key(options, "/tmp/w", {"terminal": True})
+
+    assert key(first) == key(second)
+    assert key(first) != key(other_model)
+    assert key(first) != warm_agents_key(first, "/tmp/w", {"terminal": False})
+
+
+@pytest.mark.asyncio
+async def test_prewarmed_set_is_taken_once():
+    calls = []
+    assert prewarm_agents("k", "p1", builder("agents", calls))
+
+    warm = take_warm_agents("k")
+
+    assert warm is not None
+    assert await warm == "agents"
+    assert take_warm_agents("k") is None
+    assert calls == ["agents"]
+
+
+@pytest.mark.asyncio
+async def test_per_config_capacity(monkeypatch):
+    calls = []
+    assert prewarm_agents("k", "p1", builder(1, calls))
+    assert not prewarm_agents("k", "p1", builder(2, calls))
+
+    monkeypatch.setenv("EIGENT_WARM_AGENT_POOL_PER_CONFIG", "2")
+    assert prewarm_agents("k", "p1", builder(2, calls))
+    await asyncio.sleep(0.01)
+    assert calls == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_config_is_evicted(monkeypatch):
+    monkeypatch.setenv("EIGENT_WARM_AGENT_POOL_MAX_CONFIGS", "2")
+    calls = []
+    prewarm_agents("a", "p1", builder("a", calls))
+    prewarm_agents("b", "p1", builder("b", calls))
+    # Touching "a" makes "b" the eviction candidate
+    prewarm_agents("a", "p1", builder("a2", calls))
+    prewarm_agents("c", "p1", builder("c", calls))
+
+    assert list(warm_agents._pool) == ["a", "c"]
+    assert take_warm_agents("b") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_and_discarded_sets_are_dropped(monkeypatch):
+    calls = []
+    prewarm_agents("a", "p1", builder("a", calls))
+    prewarm_agents("b", "p2", builder("b", calls))
+
+    assert discard_warm_agents("p1") == 1
+    assert take_warm_agents("a") is None
+
+    monkeypatch.setenv("EIGENT_WARM_AGENT_POOL_TTL", "0")
+    assert take_warm_agents("b") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_build_is_removed():
+    async def broken():
+        raise RuntimeError("toolkit init failed")
+
+    prewarm_agents("k", "p1", broken)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert take_warm_agents("k") is None
@@ -0,0 +1,141 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import hashlib
+import os
+
+import pytest
+
+from app.utils import workdir_manifest as manifest_module
+from app.utils.workdir_manifest import (
+    WorkdirManifest,
+    create_workdir_manifest,
+    workdir_manifest,
+)
+from app.utils.workspace_baseline import (
+    WORKDIR_MANIFEST,
+    WORKDIR_MARKER,
+    build_baseline,
+)
+
+pytestmark = pytest.mark.unit
+
+OLD_NS = 1_600_000_000 * 10**9
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    manifest_module._manifests.clear()
+    yield
+    manifest_module._manifests.clear()
+
+
+def sha(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def write(path, content: str, mtime_ns: int = OLD_NS):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    # Old mtimes keep files out of the racy window
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    space = tmp_path / "space"
+    write(space / "a.txt", "a")
+    write(space / "src" / "b.txt", "b")
+    workdir = tmp_path / "workdir"
+    result = build_baseline(
+        space, workdir, tmp_path / "baseline", "snapshot_1", ("copy",)
+    )
+    (workdir / WORKDIR_MARKER).write_text("{}")
+    create_workdir_manifest(workdir, "snapshot_1", result.entries)
+    return workdir.resolve()
+
+
+def test_unchanged_files_are_not_read(workdir):
+    manifest = workdir_manifest(workdir)
+    size, mtime_ns, _ = manifest._entries["a.txt"]
+    manifest._entries["a.txt"] = (size, mtime_ns, "recorded")
+
+    assert manifest.hash_of("a.txt") == "recorded"
+
+
+def test_changed_files_are_rehashed(workdir):
+    manifest = workdir_manifest(workdir)
+    write(workdir / "a.txt", "changed", OLD_NS + 10**9)
+
+    assert manifest.hash_of("a.txt") == sha(b"changed")
+    assert manifest.hash_of("missing.txt") is None
+
+
+def test_sync_reports_changes_since_last_sync(workdir):
+    manifest = workdir_manifest(workdir)
+    write(workdir / "a.txt", "changed", OLD_NS + 10**9)
+    (workdir / "src" / "b.txt").unlink()
+    write(workdir / "new.txt", "n")
+
+    changes = manifest.sync()
+
+    assert sorted(changes) == [
+        ("a.txt", "modified", sha(b"a")),
+        ("new.txt", "added", None),
+        ("src/b.txt", "deleted", sha(b"b")),
+    ]
+    assert manifest.sync() == []
+
+
+def test_manifest_is_persisted_next_to_the_marker(workdir):
+    manifest = workdir_manifest(workdir)
+    write(workdir / "new.txt", "n")
+    manifest.sync()
+    manifest.save()
+
+    reloaded = WorkdirManifest.load(workdir)
+
+    assert reloaded.base_snapshot_id == "snapshot_1"
+    assert reloaded.hash_of("new.txt") == sha(b"n")
+    assert (workdir / WORKDIR_MANIFEST).exists()
+    assert reloaded.sync() == []
+
+
+def test_workdir_without_manifest_is_seeded_silently(workdir):
+    (workdir / WORKDIR_MANIFEST).unlink()
+    manifest_module._manifests.clear()
+    manifest = workdir_manifest(workdir)
+
+    assert manifest.sync() == []
+    write(workdir / "a.txt", "changed", OLD_NS + 10**9)
+    assert manifest.sync() == [("a.txt", "modified", sha(b"a"))]
+
+
+def test_racy_files_are_not_trusted_by_stat(workdir):
+    manifest = workdir_manifest(workdir)
+    target = workdir / "fresh.txt"
+    target.write_text("aaaa")
+    stat_result = os.stat(target)
+    assert manifest.hash_of("fresh.txt") == sha(b"aaaa")
+
+    # Same size and mtime, different bytes
+    target.write_text("bbbb")
+    os.utime(target, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+
+    assert manifest.hash_of("fresh.txt") == sha(b"bbbb")
+
+
+def test_other_workdirs_have_no_manifest(tmp_path):
+    assert workdir_manifest(tmp_path) is None
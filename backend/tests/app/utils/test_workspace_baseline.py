@@ -0,0 +1,290 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import errno
+import hashlib
+import os
+import stat
+import time
+
+import pytest
+
+from app.agent.toolkit.file_write_toolkit import FileToolkit
+from app.service.task import TaskLock, task_locks
+from app.utils import workspace_baseline
+from app.utils.workspace_baseline import (
+    build_baseline,
+    configured_strategies,
+    copy_up,
+    load_manifest,
+    prune_blobs,
+    refresh_baseline,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def allow_hardlinks(monkeypatch):
+    # Tests often run as root, where hardlinks are turned off by default.
+    monkeypatch.setattr(workspace_baseline, "_hardlinks_safe", lambda: True)
+
+
+def sha(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_space(root):
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "main.py").write_text("print('hi')\n")
+    (root / "README.md").write_text("readme\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("d")
+    (root / "link.md").symlink_to(root / "README.md")
+
+
+def build(tmp_path, name, strategies):
+    workdir = tmp_path / "projects" / name
+    result = build_baseline(
+        tmp_path / "space",
+        workdir,
+        tmp_path / "baseline",
+        f"snapshot_{name}",
+        strategies,
+    )
+    return workdir, result
+
+
+@pytest.mark.parametrize(
+    "strategies", [("copy",), ("hardlink", "copy"), ("reflink", "copy")]
+)
+def test_every_strategy_builds_the_same_tree(tmp_path, strategies):
+    make_space(tmp_path / "space")
+
+    workdir, result = build(tmp_path, "p1", strategies)
+
+    assert (workdir / "src" / "main.py").read_text() == "print('hi')\n"
+    assert not (workdir / "node_modules").exists()
+    assert not (workdir / "link.md").exists()
+    assert sum(result.strategies.values()) == 2
+    assert {(e.path, e.hash) for e in result.entries} == {
+        ("README.md", sha(b"readme\n")),
+        ("src/main.py", sha(b"print('hi')\n")),
+    }
+    assert load_manifest(tmp_path / "baseline", "snapshot_p1") == (
+        result.entries
+    )
+
+
+def test_hardlinked_workdirs_share_read_only_blobs(tmp_path):
+    make_space(tmp_path / "space")
+
+    first, result = build(tmp_path, "p1", ("hardlink", "copy"))
+    second, _ = build(tmp_path, "p2", ("hardlink", "copy"))
+
+    assert result.strategies == {"hardlink": 2}
+    a, b = first / "README.md", second / "README.md"
+    assert os.stat(a).st_ino == os.stat(b).st_ino
+    assert not os.stat(a).st_mode & stat.S_IWUSR
+
+
+def test_copy_up_gives_the_writer_a_private_file(tmp_path):
+    make_space(tmp_path / "space")
+    first, _ = build(tmp_path, "p1", ("hardlink", "copy"))
+    second, _ = build(tmp_path, "p2", ("hardlink", "copy"))
+    target = first / "README.md"
+
+    assert copy_up(target)
+    target.write_text("mine\n")
+
+    assert (second / "README.md").read_text() == "readme\n"
+    assert os.stat(target).st_nlink == 1
+    assert not copy_up(target)
+
+
+def test_edit_file_copies_up_a_hardlinked_file(tmp_path, monkeypatch):
+    monkeypatch.setitem(
+        task_locks, "task-1", TaskLock("task-1", asyncio.Queue(), {})
+    )
+    make_space(tmp_path / "space")
+    first, _ = build(tmp_path, "p1", ("hardlink", "copy"))
+    second, _ = build(tmp_path, "p2", ("hardlink", "copy"))
+    toolkit = FileToolkit("task-1", working_directory=str(first))
+
+    res = toolkit.edit_file("README.md", "readme", "mine")
+
+    assert res.startswith("Successfully edited")
+    assert (first / "README.md").read_text() == "mine\n"
+    assert (second / "README.md").read_text() == "readme\n"
+    assert os.stat(first / "README.md").st_nlink == 1
+
+
+def test_hardlink_is_opt_in(monkeypatch):
+    monkeypatch.delenv("EIGENT_BASELINE_STRATEGIES", raising=False)
+    assert configured_strategies() == ("reflink", "copy")
+
+    monkeypatch.setenv("EIGENT_BASELINE_STRATEGIES", "hardlink")
+    assert configured_strategies() == ("hardlink", "copy")
+
+
+def test_unchanged_files_reuse_earlier_hashes(tmp_path):
+    make_space(tmp_path / "space")
+    build(tmp_path, "p1", ("copy",))
+    changed = tmp_path / "space" / "README.md"
+    changed.write_text("changed\n")
+    os.utime(changed, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    _, result = build(tmp_path, "p2", ("copy",))
+
+    assert result.hashed == 1
+    entries = {e.path: e.hash for e in result.entries}
+    assert entries["README.md"] == sha(b"changed\n")
+
+
+def test_unsupported_strategy_is_only_tried_once(tmp_path, monkeypatch):
+    make_space(tmp_path / "space")
+    calls = []
+
+    def no_clone(source, target):
+        calls.append(source)
+        raise OSError(errno.EOPNOTSUPP, "no reflink")
+
+    monkeypatch.setattr(workspace_baseline, "_clone", no_clone)
+
+    _, result = build(tmp_path, "p1", ("reflink", "copy"))
+
+    assert len(calls) == 1
+    assert result.strategies == {"copy": 2}
+
+
+def test_tampered_blob_is_not_linked_again(tmp_path):
+    make_space(tmp_path / "space")
+    first, _ = build(tmp_path, "p1", ("hardlink", "copy"))
+    shared = first / "README.md"
+    os.chmod(shared, 0o644)
+    shared.write_text("tampered\n")
+
+    second, _ = build(tmp_path, "p2", ("hardlink", "copy"))
+
+    assert (second / "README.md").read_text() == "readme\n"
+    assert os.stat(second / "README.md").st_ino != os.stat(shared).st_ino
+
+
+def test_prune_blobs_drops_unreferenced_blobs(tmp_path):
+    make_space(tmp_path / "space")
+    workdir, _ = build(tmp_path, "p1", ("hardlink", "copy"))
+    assert prune_blobs(tmp_path / "baseline") == 0
+
+    (workdir / "README.md").unlink()
+
+    assert prune_blobs(tmp_path / "baseline") == 1
+    assert (workdir / "src" / "main.py").read_text() == "print('hi')\n"
+
+
+def test_oversized_files_are_skipped(tmp_path, monkeypatch):
+    make_space(tmp_path / "space")
+    monkeypatch.setattr(workspace_baseline, "MAX_COPY_FILE_SIZE", 8)
+
+    workdir, result = build(tmp_path, "p1", ("copy",))
+
+    assert result.skipped == 1
+    assert not (workdir / "src" / "main.py").exists()
+
+
+@pytest.mark.very_slow
+def test_benchmark_fifty_thousand_files(tmp_path):
+    space = tmp_path / "space"
+    for i in range(50_000):
+        directory = space / f"dir{i % 500}"
+        if i < 500:
+            directory.mkdir(parents=True)
+        (directory / f"file{i}.txt").write_text(f"content {i}\n")
+
+    timings = {}
+    manifests = {}
+    for strategies in (("copy",), ("hardlink", "copy"), ("reflink", "copy")):
+        name = strategies[0]
+        # A fresh blob store and manifest history per strategy
+        started = time.perf_counter()
+        result = build_baseline(
+            space,
+            tmp_path / name / "workdir",
+            tmp_path / name / "baseline",
+            f"snapshot_{name}",
+            strategies,
+        )
+        timings[name] = time.perf_counter() - started
+        manifests[name] = sorted((e.path, e.hash) for e in result.entries)
+        print(f"{name}: {timings[name]:.2f}s {result.strategies}")
+
+    started = time.perf_counter()
+    reused = build_baseline(
+        space,
+        tmp_path / "hardlink" / "second",
+        tmp_path / "hardlink" / "baseline",
+        "snapshot_second",
+        ("hardlink", "copy"),
+    )
+    print(f"hardlink, warm store: {time.perf_counter() - started:.2f}s")
+
+    assert len(manifests["copy"]) == 50_000
+    assert manifests["hardlink"] == manifests["copy"]
+    assert manifests["reflink"] == manifests["copy"]
+    assert reused.hashed == 0
+
+
+def test_refresh_keeps_unchanged_files_and_drops_stale_ones(tmp_path):
+    make_space(tmp_path / "space")
+    workdir, _ = build(tmp_path, "p1", ("copy",))
+    (workdir / "scratch.txt").write_text("agent output")
+    (workdir / "tmp").mkdir()
+    changed = tmp_path / "space" / "README.md"
+    changed.write_text("upstream\n")
+    os.utime(changed, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    result = refresh_baseline(
+        tmp_path / "space",
+        workdir,
+        tmp_path / "baseline",
+        "snapshot_p2",
+        "snapshot_p1",
+        lambda rel: sha((workdir / rel).read_bytes()),
+        ("copy",),
+    )
+
+    assert result.strategies == {"kept": 1, "copy": 1}
+    assert (workdir / "README.md").read_text() == "upstream\n"
+    assert not (workdir / "scratch.txt").exists()
+    assert not (workdir / "tmp").exists()
+    assert load_manifest(tmp_path / "baseline", "snapshot_p2") == (
+        result.entries
+    )
+
+
+def test_refresh_without_previous_manifest_is_declined(tmp_path):
+    make_space(tmp_path / "space")
+    workdir, _ = build(tmp_path, "p1", ("copy",))
+
+    assert (
+        refresh_baseline(
+            tmp_path / "space",
+            workdir,
+            tmp_path / "baseline",
+            "snapshot_p2",
+            "snapshot_missing",
+            lambda rel: None,
+        )
+        is None
+    )
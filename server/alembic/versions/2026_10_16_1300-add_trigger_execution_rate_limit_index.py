@@ -0,0 +1,44 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+"""add trigger execution rate limit index
+
+Revision ID: add_trigger_exec_rate_idx
+Revises: add_user_credits_balance
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_trigger_exec_rate_idx"
+down_revision: str | None = "add_user_credits_balance"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index the per-trigger time window counted by trigger rate limits."""
+    op.create_index(
+        "ix_trigger_execution_trigger_id_created_at",
+        "trigger_execution",
+        ["trigger_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trigger_execution_trigger_id_created_at", table_name="trigger_execution")
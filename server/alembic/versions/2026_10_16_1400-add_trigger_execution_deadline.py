@@ -0,0 +1,53 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""add trigger execution deadline
+
+Revision ID: add_trigger_exec_deadline
+Revises: add_trigger_exec_rate_idx
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_trigger_exec_deadline"
+down_revision: str | None = "add_trigger_exec_rate_idx"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the timeout deadline read by the execution timeout sweeper.
+
+    In-flight executions created before this revision are given a deadline
+    by the sweeper's first run.
+    """
+    op.add_column("trigger_execution", sa.Column("deadline_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_trigger_execution_status_deadline_at",
+        "trigger_execution",
+        ["status", "deadline_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trigger_execution_status_deadline_at", table_name="trigger_execution")
+    op.drop_column("trigger_execution", "deadline_at")
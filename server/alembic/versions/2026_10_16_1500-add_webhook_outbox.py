@@ -0,0 +1,81 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""add webhook outbox
+
+Revision ID: add_webhook_outbox
+Revises: add_trigger_exec_deadline
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_webhook_outbox"
+down_revision: str | None = "add_trigger_exec_deadline"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Look webhooks up by uuid and queue accepted requests for the dispatcher.
+
+    webhook_uuid is backfilled from the last segment of webhook_url, which
+    covers both the /v1/webhook/trigger/ and the older /webhook/trigger/ form.
+    """
+    op.add_column("trigger", sa.Column("webhook_uuid", sa.String(length=64), nullable=True))
+    op.execute(
+        "UPDATE trigger SET webhook_uuid = regexp_replace(webhook_url, '^.*/', '') "
+        "WHERE webhook_url IS NOT NULL AND webhook_uuid IS NULL"
+    )
+    op.create_index(op.f("ix_trigger_webhook_uuid"), "trigger", ["webhook_uuid"], unique=True)
+
+    op.create_table(
+        "webhook_outbox",
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("trigger_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("method", sa.String(length=10), nullable=True),
+        sa.Column("url", sa.String(length=2048), nullable=True),
+        sa.Column("client_ip", sa.String(length=64), nullable=True),
+        sa.Column("headers", sa.JSON(), nullable=True),
+        sa.Column("query_params", sa.JSON(), nullable=True),
+        sa.Column("body", sa.Text(), nullable=True),
+        sa.Column("execution_id", sa.String(length=64), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_webhook_outbox_status_next_attempt_at",
+        "webhook_outbox",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_outbox_status_next_attempt_at", table_name="webhook_outbox")
+    op.drop_table("webhook_outbox")
+    op.drop_index(op.f("ix_trigger_webhook_uuid"), table_name="trigger")
+    op.drop_column("trigger", "webhook_uuid")
@@ -24,6 +24,7 @@ celery = Celery(
 # Configure Celery to autodiscover tasks
 celery.conf.imports = [
     "app.domains.trigger.service.trigger_schedule_task",
+    "app.domains.trigger.service.webhook_dispatch_task",
 ]
 
 # Configure Celery Beat schedule
@@ -33,6 +34,9 @@ TRIGGER_SCHEDULE_POLLER_INTERVAL = int(env("TRIGGER_SCHEDULE_POLLER_INTERVAL", "
 ENABLE_EXECUTION_TIMEOUT_CHECKER = env("ENABLE_EXECUTION_TIMEOUT_CHECKER", "true").lower() == "true"
 EXECUTION_TIMEOUT_CHECKER_INTERVAL = int(env("EXECUTION_TIMEOUT_CHECKER_INTERVAL", "1"))  # in minutes
 
+ENABLE_WEBHOOK_OUTBOX_SWEEPER = env("ENABLE_WEBHOOK_OUTBOX_SWEEPER", "true").lower() == "true"
+WEBHOOK_OUTBOX_SWEEP_INTERVAL = int(env("WEBHOOK_OUTBOX_SWEEP_INTERVAL", "30"))  # in seconds
+
 celery.conf.beat_schedule = {}
 
 if ENABLE_TRIGGER_SCHEDULE_POLLER:
@@ -49,4 +53,11 @@ if ENABLE_EXECUTION_TIMEOUT_CHECKER:
         "options": {"queue": "check_execution_timeouts"},
     }
 
+if ENABLE_WEBHOOK_OUTBOX_SWEEPER:
+    celery.conf.beat_schedule["dispatch-webhook-outbox"] = {
+        "task": "app.domains.trigger.service.webhook_dispatch_task.dispatch_webhook_outbox",
+        "schedule": float(WEBHOOK_OUTBOX_SWEEP_INTERVAL),
+        "options": {"queue": "dispatch_webhook_outbox"},
+    }
+
 celery.conf.timezone = "UTC"
\ No newline at end of file
@@ -16,7 +16,8 @@
 
 import redis
 from redis import Redis
-from typing import Optional, Dict, Any, Set, Callable
+from redis import asyncio as aioredis
+from typing import Optional, Dict, Any, List, Set, Callable, AsyncIterator, Awaitable
 from datetime import datetime, timezone
 import json
 import logging
@@ -26,8 +27,53 @@ import asyncio
 logger = logging.getLogger("server_redis_utils")
 
 
-class RedisSessionManager:
-    """Manages WebSocket sessions in Redis for scalability and persistence."""
+# Connections in the async manager's shared pool, per process
+SESSION_REDIS_MAX_CONNECTIONS = int(os.getenv("SESSION_REDIS_MAX_CONNECTIONS", "50"))
+
+
+class _SessionKeys:
+    """Key layout and TTLs shared by the sync and async session managers."""
+    
+    # Key prefixes
+    SESSION_PREFIX = "ws:session:"
+    USER_SESSIONS_PREFIX = "ws:user:sessions:"
+    PENDING_PREFIX = "ws:pending:"
+    PUBSUB_CHANNEL = "ws:executions"
+    DELIVERY_CONFIRMATION_PREFIX = "ws:delivery:"
+    
+    # TTL for sessions (24 hours)
+    SESSION_TTL = 86400
+    # TTL for delivery confirmations (5 minutes)
+    DELIVERY_TTL = 300
+    
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+    
+    def _session_payload(
+        self, session_id: str, user_id: str, metadata: Optional[Dict[str, Any]]
+    ) -> str:
+        return json.dumps({
+            "user_id": user_id,
+            "session_id": session_id,
+            "connected_at": datetime.now(timezone.utc).isoformat(),
+            **(metadata or {})
+        })
+    
+    @staticmethod
+    def _delivery_payload(execution_id: str, session_id: str) -> str:
+        return json.dumps({
+            "execution_id": execution_id,
+            "session_id": session_id,
+            "delivered_at": datetime.now(timezone.utc).isoformat()
+        })
+
+
+class RedisSessionManager(_SessionKeys):
+    """Manages WebSocket sessions in Redis for scalability and persistence.
+    
+    Blocking client for Celery tasks and other sync code. Async routes and
+    websocket handlers use :class:`AsyncRedisSessionManager`.
+    """
     
     def __init__(self, redis_url: Optional[str] = None):
         """Initialize Redis connection.
@@ -35,24 +81,8 @@ class RedisSessionManager:
         Args:
             redis_url: Redis connection URL. If None, reads from environment.
         """
-        self.redis_url = redis_url or os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+        super().__init__(redis_url)
         self._client: Optional[Redis] = None
-        
-        # Key prefixes
-        self.SESSION_PREFIX = "ws:session:"
-        self.USER_SESSIONS_PREFIX = "ws:user:sessions:"
-        self.PENDING_PREFIX = "ws:pending:"
-        self.PUBSUB_CHANNEL = "ws:executions"
-        self.DELIVERY_CONFIRMATION_PREFIX = "ws:delivery:"
-        
-        # TTL for sessions (24 hours)
-        self.SESSION_TTL = 86400
-        # TTL for delivery confirmations (5 minutes)
-        self.DELIVERY_TTL = 300
-        
-        # Pub/Sub
-        self._pubsub = None
-        self._pubsub_client: Optional[Redis] = None
     
     @property
     def client(self) -> Redis:
@@ -90,26 +120,20 @@ class RedisSessionManager:
             True if successful, False otherwise
         """
         try:
-            session_data = {
-                "user_id": user_id,
-                "session_id": session_id,
-                "connected_at": datetime.now(timezone.utc).isoformat(),
-                **(metadata or {})
-            }
-            
             session_key = f"{self.SESSION_PREFIX}{session_id}"
             user_sessions_key = f"{self.USER_SESSIONS_PREFIX}{user_id}"
             
-            # Store session data
-            self.client.setex(
+            # Store session data and add it to the user's session set in
+            # one round trip
+            pipe = self.client.pipeline(transaction=False)
+            pipe.setex(
                 session_key,
                 self.SESSION_TTL,
-                json.dumps(session_data)
+                self._session_payload(session_id, user_id, metadata)
             )
-            
-            # Add session to user's session set
-            self.client.sadd(user_sessions_key, session_id)
-            self.client.expire(user_sessions_key, self.SESSION_TTL)
+            pipe.sadd(user_sessions_key, session_id)
+            pipe.expire(user_sessions_key, self.SESSION_TTL)
+            pipe.execute()
             
             logger.debug("Session stored in Redis", extra={
                 "session_id": session_id,
@@ -165,18 +189,14 @@ class RedisSessionManager:
             
             user_id = session.get("user_id")
             
-            # Remove session data
-            session_key = f"{self.SESSION_PREFIX}{session_id}"
-            self.client.delete(session_key)
-            
-            # Remove from user's session set
+            # Remove session data, the user's set entry and pending
+            # executions together
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(f"{self.SESSION_PREFIX}{session_id}")
             if user_id:
-                user_sessions_key = f"{self.USER_SESSIONS_PREFIX}{user_id}"
-                self.client.srem(user_sessions_key, session_id)
-            
-            # Remove pending executions
-            pending_key = f"{self.PENDING_PREFIX}{session_id}"
-            self.client.delete(pending_key)
+                pipe.srem(f"{self.USER_SESSIONS_PREFIX}{user_id}", session_id)
+            pipe.delete(f"{self.PENDING_PREFIX}{session_id}")
+            pipe.execute()
             
             logger.debug("Session removed from Redis", extra={
                 "session_id": session_id,
@@ -224,8 +244,10 @@ class RedisSessionManager:
         """
         try:
             pending_key = f"{self.PENDING_PREFIX}{session_id}"
-            self.client.sadd(pending_key, execution_id)
-            self.client.expire(pending_key, self.SESSION_TTL)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.sadd(pending_key, execution_id)
+            pipe.expire(pending_key, self.SESSION_TTL)
+            pipe.execute()
             return True
             
         except Exception as e:
@@ -259,6 +281,44 @@ class RedisSessionManager:
             })
             return False
     
+    def remove_pending_executions_for_users(self, executions_by_user: Dict[str, List[str]]) -> bool:
+        """Remove executions from every session of their users.
+        
+        Reads all users' session sets in one pipelined round trip and
+        removes the executions from those sessions in a second one.
+        
+        Args:
+            executions_by_user: Execution identifiers keyed by user identifier
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        users = [(user_id, ids) for user_id, ids in executions_by_user.items() if ids]
+        if not users:
+            return True
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for user_id, _ in users:
+                pipe.smembers(f"{self.USER_SESSIONS_PREFIX}{user_id}")
+            session_sets = pipe.execute()
+            
+            pipe = self.client.pipeline(transaction=False)
+            queued = 0
+            for (_, execution_ids), session_ids in zip(users, session_sets):
+                for session_id in session_ids or ():
+                    pipe.srem(f"{self.PENDING_PREFIX}{session_id}", *execution_ids)
+                    queued += 1
+            if queued:
+                pipe.execute()
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to remove pending executions", extra={
+                "user_count": len(users),
+                "error": str(e)
+            })
+            return False
+    
     def get_pending_executions(self, session_id: str) -> Set[str]:
         """Get all pending executions for a session.
         
@@ -290,12 +350,10 @@ class RedisSessionManager:
             True if successful, False otherwise
         """
         try:
-            session_key = f"{self.SESSION_PREFIX}{session_id}"
-            self.client.expire(session_key, self.SESSION_TTL)
-            
-            pending_key = f"{self.PENDING_PREFIX}{session_id}"
-            self.client.expire(pending_key, self.SESSION_TTL)
-            
+            pipe = self.client.pipeline(transaction=False)
+            pipe.expire(f"{self.SESSION_PREFIX}{session_id}", self.SESSION_TTL)
+            pipe.expire(f"{self.PENDING_PREFIX}{session_id}", self.SESSION_TTL)
+            pipe.execute()
             return True
             
         except Exception as e:
@@ -317,11 +375,7 @@ class RedisSessionManager:
         """
         try:
             confirmation_key = f"{self.DELIVERY_CONFIRMATION_PREFIX}{execution_id}"
-            confirmation_data = json.dumps({
-                "execution_id": execution_id,
-                "session_id": session_id,
-                "delivered_at": datetime.now(timezone.utc).isoformat()
-            })
+            confirmation_data = self._delivery_payload(execution_id, session_id)
             self.client.setex(confirmation_key, self.DELIVERY_TTL, confirmation_data)
             logger.debug("Delivery confirmed", extra={
                 "execution_id": execution_id,
@@ -336,47 +390,6 @@ class RedisSessionManager:
             })
             return False
     
-    async def wait_for_delivery(
-        self, 
-        execution_id: str, 
-        timeout: float = 10.0,
-        poll_interval: float = 0.1
-    ) -> Optional[Dict[str, Any]]:
-        """Wait for delivery confirmation of an execution.
-        
-        Args:
-            execution_id: The execution ID to wait for
-            timeout: Maximum time to wait in seconds
-            poll_interval: Time between checks in seconds
-            
-        Returns:
-            Confirmation data if delivered, None if timeout
-        """
-        confirmation_key = f"{self.DELIVERY_CONFIRMATION_PREFIX}{execution_id}"
-        elapsed = 0.0
-        
-        while elapsed < timeout:
-            try:
-                data = self.client.get(confirmation_key)
-                if data:
-                    # Clean up the confirmation key
-                    self.client.delete(confirmation_key)
-                    return json.loads(data)
-            except Exception as e:
-                logger.error("Error checking delivery confirmation", extra={
-                    "execution_id": execution_id,
-                    "error": str(e)
-                })
-            
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-        
-        logger.warning("Delivery confirmation timeout", extra={
-            "execution_id": execution_id,
-            "timeout": timeout
-        })
-        return None
-    
     def has_active_sessions_for_user(self, user_id: str) -> bool:
         """Check if a user has any active WebSocket sessions.
         
@@ -398,12 +411,6 @@ class RedisSessionManager:
     
     def close(self):
         """Close Redis connection."""
-        if self._pubsub:
-            self._pubsub.close()
-            self._pubsub = None
-        if self._pubsub_client:
-            self._pubsub_client.close()
-            self._pubsub_client = None
         if self._client:
             self._client.close()
             self._client = None
@@ -431,65 +438,425 @@ class RedisSessionManager:
             }, exc_info=True)
             return False
     
-    async def subscribe_to_execution_events(self, callback: Callable[[Dict[str, Any]], None]):
-        """Subscribe to execution events from Redis pub/sub.
+    def publish_execution_events(self, events: List[Dict[str, Any]]) -> bool:
+        """Publish several execution events in one pipelined round trip.
         
-        This should be run in a background task. It will call the callback
-        for each message received on the pub/sub channel.
+        Args:
+            events: Event data to broadcast, in order
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not events:
+            return True
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for event_data in events:
+                pipe.publish(self.PUBSUB_CHANNEL, json.dumps(event_data))
+            pipe.execute()
+            logger.debug("Published execution events to Redis", extra={
+                "count": len(events)
+            })
+            return True
+        except Exception as e:
+            logger.error("Failed to publish execution events", extra={
+                "count": len(events),
+                "error": str(e)
+            }, exc_info=True)
+            return False
+
+
+class AsyncRedisSessionManager(_SessionKeys):
+    """asyncio-native session manager for FastAPI routes and websocket handlers.
+    
+    Commands go through one shared client whose connection pool is capped at
+    ``max_connections``, so concurrent handlers reuse connections instead of
+    blocking the event loop on a single socket. Multi-key updates are
+    pipelined into one round trip. Pub/sub runs on a separate client without
+    a read timeout so subscribers can block in ``listen()``.
+    """
+    
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        max_connections: int = SESSION_REDIS_MAX_CONNECTIONS
+    ):
+        """Initialize the manager; connections are opened lazily.
         
         Args:
-            callback: Async function to call with each event
+            redis_url: Redis connection URL. If None, reads from environment.
+            max_connections: Size of the shared connection pool.
+        """
+        super().__init__(redis_url)
+        self.max_connections = max_connections
+        self._client: Optional[aioredis.Redis] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def client(self) -> aioredis.Redis:
+        """Get or create the pooled client for the running event loop."""
+        # Async connections are bound to the loop that opened them.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = aioredis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                max_connections=self.max_connections
+            )
+            self._client_loop = loop
+        return self._client
+    
+    def _new_pubsub_client(self) -> aioredis.Redis:
+        return aioredis.from_url(
+            self.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=5,
+            health_check_interval=30
+        )
+    
+    async def store_session(
+        self, 
+        session_id: str, 
+        user_id: str, 
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Store a WebSocket session in Redis in one round trip.
+        
+        Args:
+            session_id: Unique session identifier
+            user_id: User ID associated with the session
+            metadata: Additional metadata to store
+            
+        Returns:
+            True if successful, False otherwise
         """
         try:
-            # Create separate Redis client for pub/sub (can't use the same one)
-            if self._pubsub_client is None:
-                self._pubsub_client = redis.from_url(
-                    self.redis_url,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5
-                )
+            user_sessions_key = f"{self.USER_SESSIONS_PREFIX}{user_id}"
+            pipe = self.client.pipeline(transaction=False)
+            pipe.setex(
+                f"{self.SESSION_PREFIX}{session_id}",
+                self.SESSION_TTL,
+                self._session_payload(session_id, user_id, metadata)
+            )
+            pipe.sadd(user_sessions_key, session_id)
+            pipe.expire(user_sessions_key, self.SESSION_TTL)
+            await pipe.execute()
+            
+            logger.debug("Session stored in Redis", extra={
+                "session_id": session_id,
+                "user_id": user_id
+            })
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to store session in Redis", extra={
+                "session_id": session_id,
+                "error": str(e)
+            }, exc_info=True)
+            return False
+    
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get session data from Redis.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Session data dictionary or None if not found
+        """
+        try:
+            data = await self.client.get(f"{self.SESSION_PREFIX}{session_id}")
+            return json.loads(data) if data else None
+            
+        except Exception as e:
+            logger.error("Failed to get session from Redis", extra={
+                "session_id": session_id,
+                "error": str(e)
+            })
+            return None
+    
+    async def remove_session(self, session_id: str) -> bool:
+        """Remove a session, its user-set entry and its pending executions.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            session = await self.get_session(session_id)
+            if not session:
+                return False
+            
+            user_id = session.get("user_id")
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(f"{self.SESSION_PREFIX}{session_id}")
+            if user_id:
+                pipe.srem(f"{self.USER_SESSIONS_PREFIX}{user_id}", session_id)
+            pipe.delete(f"{self.PENDING_PREFIX}{session_id}")
+            await pipe.execute()
+            
+            logger.debug("Session removed from Redis", extra={
+                "session_id": session_id,
+                "user_id": user_id
+            })
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to remove session from Redis", extra={
+                "session_id": session_id,
+                "error": str(e)
+            }, exc_info=True)
+            return False
+    
+    async def get_user_sessions(self, user_id: str) -> Set[str]:
+        """Get all active session IDs for a user.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            Set of session IDs
+        """
+        try:
+            sessions = await self.client.smembers(f"{self.USER_SESSIONS_PREFIX}{user_id}")
+            return sessions if sessions else set()
+            
+        except Exception as e:
+            logger.error("Failed to get user sessions from Redis", extra={
+                "user_id": user_id,
+                "error": str(e)
+            })
+            return set()
+    
+    async def has_active_sessions_for_user(self, user_id: str) -> bool:
+        """Check if a user has any active WebSocket sessions.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            True if user has active sessions, False otherwise
+        """
+        try:
+            return await self.client.scard(f"{self.USER_SESSIONS_PREFIX}{user_id}") > 0
+        except Exception as e:
+            logger.error("Failed to check user sessions", extra={
+                "user_id": user_id,
+                "error": str(e)
+            })
+            return False
+    
+    async def add_pending_execution(self, session_id: str, execution_id: str) -> bool:
+        """Add a pending execution to a session.
+        
+        Args:
+            session_id: Session identifier
+            execution_id: Execution identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            pending_key = f"{self.PENDING_PREFIX}{session_id}"
+            pipe = self.client.pipeline(transaction=False)
+            pipe.sadd(pending_key, execution_id)
+            pipe.expire(pending_key, self.SESSION_TTL)
+            await pipe.execute()
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to add pending execution", extra={
+                "session_id": session_id,
+                "execution_id": execution_id,
+                "error": str(e)
+            })
+            return False
+    
+    async def remove_pending_execution(self, session_id: str, execution_id: str) -> bool:
+        """Remove a pending execution from a session.
+        
+        Args:
+            session_id: Session identifier
+            execution_id: Execution identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await self.client.srem(f"{self.PENDING_PREFIX}{session_id}", execution_id)
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to remove pending execution", extra={
+                "session_id": session_id,
+                "execution_id": execution_id,
+                "error": str(e)
+            })
+            return False
+    
+    async def get_pending_executions(self, session_id: str) -> Set[str]:
+        """Get all pending executions for a session.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Set of execution IDs
+        """
+        try:
+            pending = await self.client.smembers(f"{self.PENDING_PREFIX}{session_id}")
+            return pending if pending else set()
             
-            self._pubsub = self._pubsub_client.pubsub()
-            await asyncio.get_event_loop().run_in_executor(
-                None, 
-                self._pubsub.subscribe, 
-                self.PUBSUB_CHANNEL
+        except Exception as e:
+            logger.error("Failed to get pending executions", extra={
+                "session_id": session_id,
+                "error": str(e)
+            })
+            return set()
+    
+    async def update_session_ttl(self, session_id: str) -> bool:
+        """Refresh the TTL for a session and its pending executions.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.expire(f"{self.SESSION_PREFIX}{session_id}", self.SESSION_TTL)
+            pipe.expire(f"{self.PENDING_PREFIX}{session_id}", self.SESSION_TTL)
+            await pipe.execute()
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to update session TTL", extra={
+                "session_id": session_id,
+                "error": str(e)
+            })
+            return False
+    
+    async def confirm_delivery(self, execution_id: str, session_id: str) -> bool:
+        """Confirm that a message was delivered to a WebSocket client.
+        
+        Args:
+            execution_id: The execution ID that was delivered
+            session_id: The session ID that received the message
+            
+        Returns:
+            True if confirmation was stored, False otherwise
+        """
+        try:
+            await self.client.setex(
+                f"{self.DELIVERY_CONFIRMATION_PREFIX}{execution_id}",
+                self.DELIVERY_TTL,
+                self._delivery_payload(execution_id, session_id)
             )
+            logger.debug("Delivery confirmed", extra={
+                "execution_id": execution_id,
+                "session_id": session_id
+            })
+            return True
+        except Exception as e:
+            logger.error("Failed to confirm delivery", extra={
+                "execution_id": execution_id,
+                "session_id": session_id,
+                "error": str(e)
+            })
+            return False
+    
+    async def publish_execution_event(self, event_data: Dict[str, Any]) -> bool:
+        """Publish an execution event to all workers via Redis pub/sub.
+        
+        Args:
+            event_data: Event data to broadcast
             
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await self.client.publish(self.PUBSUB_CHANNEL, json.dumps(event_data))
+            logger.debug("Published execution event to Redis", extra={
+                "execution_id": event_data.get("execution_id"),
+                "type": event_data.get("type")
+            })
+            return True
+        except Exception as e:
+            logger.error("Failed to publish execution event", extra={
+                "error": str(e)
+            }, exc_info=True)
+            return False
+    
+    async def execution_events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield execution events from Redis pub/sub as they arrive.
+        
+        Each iterator holds its own subscription, which is closed when the
+        iterator is closed or its task is cancelled.
+        """
+        pubsub_client = self._new_pubsub_client()
+        pubsub = pubsub_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.PUBSUB_CHANNEL)
             logger.info("Subscribed to execution events", extra={
                 "channel": self.PUBSUB_CHANNEL
             })
-            
-            # Listen for messages
-            while True:
-                message = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self._pubsub.get_message,
-                    True,  # ignore_subscribe_messages
-                    1.0    # timeout
-                )
-                
-                if message and message['type'] == 'message':
-                    try:
-                        event_data = json.loads(message['data'])
-                        await callback(event_data)
-                    except Exception as e:
-                        logger.error("Error processing pub/sub message", extra={
-                            "error": str(e)
-                        }, exc_info=True)
-                
-                # Small sleep to prevent tight loop
-                await asyncio.sleep(0.01)
-                
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    event_data = json.loads(message["data"])
+                except ValueError as e:
+                    logger.error("Invalid pub/sub message", extra={
+                        "error": str(e)
+                    })
+                    continue
+                yield event_data
+        finally:
+            await pubsub.aclose()
+            await pubsub_client.aclose()
+    
+    async def subscribe_to_execution_events(
+        self, callback: Callable[[Dict[str, Any]], Awaitable[None]]
+    ):
+        """Subscribe to execution events from Redis pub/sub.
+        
+        This should be run in a background task. It will call the callback
+        for each message received on the pub/sub channel.
+        
+        Args:
+            callback: Async function to call with each event
+        """
+        try:
+            async for event_data in self.execution_events():
+                try:
+                    await callback(event_data)
+                except Exception as e:
+                    logger.error("Error processing pub/sub message", extra={
+                        "error": str(e)
+                    }, exc_info=True)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error("Pub/sub subscription error", extra={
                 "error": str(e)
             }, exc_info=True)
+    
+    async def close(self):
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
 
-# Global instance
+# Global instances
 _redis_manager: Optional[RedisSessionManager] = None
+_async_redis_manager: Optional[AsyncRedisSessionManager] = None
 
 
 def get_redis_manager() -> RedisSessionManager:
@@ -498,3 +865,11 @@ def get_redis_manager() -> RedisSessionManager:
     if _redis_manager is None:
         _redis_manager = RedisSessionManager()
     return _redis_manager
+
+
+def get_async_redis_manager() -> AsyncRedisSessionManager:
+    """Get or create the global asyncio Redis session manager."""
+    global _async_redis_manager
+    if _async_redis_manager is None:
+        _async_redis_manager = AsyncRedisSessionManager()
+    return _async_redis_manager
@@ -14,12 +14,14 @@
 
 """Rate limiting utilities for triggers."""
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
 import logging
-from sqlmodel import select, and_
+from sqlalchemy import case
+from sqlmodel import select, and_, col, func
 
 from app.model.trigger.trigger_execution import TriggerExecution
 from app.core.environment import env
+from app.shared.types.trigger_types import ExecutionStatus
 
 logger = logging.getLogger("server_trigger_utils")
 
@@ -31,65 +33,137 @@ if TYPE_CHECKING:
 # Environment variable configuration with defaults
 MAX_DISPATCH_PER_TICK = int(env("TRIGGER_SCHEDULE_MAX_DISPATCH_PER_TICK", "0"))  # Max triggers to dispatch per tick
 SCHEDULED_FETCH_BATCH_SIZE = int(env("TRIGGER_SCHEDULE_POLLER_BATCH_SIZE", "100"))  # Fetch batch size
+EXECUTION_PENDING_TIMEOUT_SECONDS = int(env("EXECUTION_PENDING_TIMEOUT_SECONDS", "60"))
+EXECUTION_RUNNING_TIMEOUT_SECONDS = int(env("EXECUTION_RUNNING_TIMEOUT_SECONDS", "600"))
+WEBHOOK_MAX_BODY_BYTES = int(env("WEBHOOK_MAX_BODY_BYTES", str(1024 * 1024)))  # Larger webhooks are rejected
+WEBHOOK_OUTBOX_BATCH_SIZE = int(env("WEBHOOK_OUTBOX_BATCH_SIZE", "100"))  # Outbox rows claimed per batch
+WEBHOOK_OUTBOX_MAX_ATTEMPTS = int(env("WEBHOOK_OUTBOX_MAX_ATTEMPTS", "5"))  # Failed attempts before giving up
+WEBHOOK_OUTBOX_RETRY_BASE_SECONDS = int(env("WEBHOOK_OUTBOX_RETRY_BASE_SECONDS", "10"))  # Doubled per attempt
+WEBHOOK_OUTBOX_RETRY_MAX_SECONDS = int(env("WEBHOOK_OUTBOX_RETRY_MAX_SECONDS", "600"))
 
 
-def check_rate_limits(session: "Session", trigger: "Trigger") -> bool:
+def execution_deadline(execution: TriggerExecution) -> Optional[datetime]:
     """
-    Check if trigger execution is within rate limits.
+    Compute when an in-flight execution times out.
+    
+    Pending executions time out EXECUTION_PENDING_TIMEOUT_SECONDS after they
+    were created, running ones EXECUTION_RUNNING_TIMEOUT_SECONDS after they
+    started. Naive timestamps are taken as UTC.
+    
+    Returns:
+        Naive UTC deadline, or None for executions in a terminal status
+    """
+    if execution.status == ExecutionStatus.pending:
+        reference_time = execution.created_at
+        timeout_seconds = EXECUTION_PENDING_TIMEOUT_SECONDS
+    elif execution.status == ExecutionStatus.running:
+        reference_time = execution.started_at or execution.created_at
+        timeout_seconds = EXECUTION_RUNNING_TIMEOUT_SECONDS
+    else:
+        return None
+    
+    if reference_time is None:
+        reference_time = datetime.now(timezone.utc)
+    elif reference_time.tzinfo is not None:
+        reference_time = reference_time.astimezone(timezone.utc)
+    return reference_time.replace(tzinfo=None) + timedelta(seconds=timeout_seconds)
+
+
+def execution_counts(
+    session: "Session",
+    trigger_ids: Iterable[int],
+    current_time: Optional[datetime] = None,
+    include_day: bool = True,
+) -> Dict[int, Tuple[int, int]]:
+    """
+    Count recent executions for several triggers in one aggregate query.
+    
+    Served by the (trigger_id, created_at) index on trigger_execution.
     
     Args:
         session: Database session
-        trigger: The trigger to check rate limits for
+        trigger_ids: Triggers to count executions for
+        current_time: End of the counting windows (defaults to now)
+        include_day: Count the last day as well as the last hour
         
     Returns:
-        True if execution is allowed, False if rate limited
+        Mapping of trigger_id to (executions in the last hour, in the last day);
+        triggers without recent executions are omitted
     """
-    current_time = datetime.now(timezone.utc)
+    trigger_ids = list(trigger_ids)
+    if not trigger_ids:
+        return {}
+    current_time = current_time or datetime.now(timezone.utc)
+    hour_ago = current_time - timedelta(hours=1)
+    window_start = current_time - timedelta(days=1) if include_day else hour_ago
     
-    # Check hourly limit
-    if trigger.max_executions_per_hour:
-        hour_ago = current_time - timedelta(hours=1)
-        hourly_count = session.exec(
-            select(TriggerExecution).where(
-                and_(
-                    TriggerExecution.trigger_id == trigger.id,
-                    TriggerExecution.created_at >= hour_ago
-                )
+    rows = session.exec(
+        select(
+            TriggerExecution.trigger_id,
+            func.sum(case((TriggerExecution.created_at >= hour_ago, 1), else_=0)),
+            func.count(),
+        )
+        .where(
+            and_(
+                col(TriggerExecution.trigger_id).in_(trigger_ids),
+                TriggerExecution.created_at >= window_start
             )
-        ).all()
-        
-        if len(hourly_count) >= trigger.max_executions_per_hour:
-            logger.warning(
-                "Trigger hourly rate limit exceeded",
-                extra={
-                    "trigger_id": trigger.id,
-                    "limit": trigger.max_executions_per_hour,
-                    "current_count": len(hourly_count)
-                }
-            )
-            return False
+        )
+        .group_by(TriggerExecution.trigger_id)
+    ).all()
+    return {
+        trigger_id: (int(hourly or 0), int(window_count) if include_day else int(hourly or 0))
+        for trigger_id, hourly, window_count in rows
+    }
+
+
+def rate_limit_exceeded(trigger: "Trigger", hourly_count: int, daily_count: int) -> bool:
+    """
+    Check precomputed execution counts against a trigger's limits.
     
-    # Check daily limit
-    if trigger.max_executions_per_day:
-        day_ago = current_time - timedelta(days=1)
-        daily_count = session.exec(
-            select(TriggerExecution).where(
-                and_(
-                    TriggerExecution.trigger_id == trigger.id,
-                    TriggerExecution.created_at >= day_ago
-                )
-            )
-        ).all()
-        
-        if len(daily_count) >= trigger.max_executions_per_day:
-            logger.warning(
-                "Trigger daily rate limit exceeded",
-                extra={
-                    "trigger_id": trigger.id,
-                    "limit": trigger.max_executions_per_day,
-                    "current_count": len(daily_count)
-                }
-            )
-            return False
+    Returns:
+        True if the trigger has reached its hourly or daily limit
+    """
+    if trigger.max_executions_per_hour and hourly_count >= trigger.max_executions_per_hour:
+        logger.warning(
+            "Trigger hourly rate limit exceeded",
+            extra={
+                "trigger_id": trigger.id,
+                "limit": trigger.max_executions_per_hour,
+                "current_count": hourly_count
+            }
+        )
+        return True
+    if trigger.max_executions_per_day and daily_count >= trigger.max_executions_per_day:
+        logger.warning(
+            "Trigger daily rate limit exceeded",
+            extra={
+                "trigger_id": trigger.id,
+                "limit": trigger.max_executions_per_day,
+                "current_count": daily_count
+            }
+        )
+        return True
+    return False
+
+
+def check_rate_limits(session: "Session", trigger: "Trigger") -> bool:
+    """
+    Check if trigger execution is within rate limits.
     
-    return True
+    Args:
+        session: Database session
+        trigger: The trigger to check rate limits for
+        
+    Returns:
+        True if execution is allowed, False if rate limited
+    """
+    if not trigger.max_executions_per_hour and not trigger.max_executions_per_day:
+        return True
+    counts = execution_counts(
+        session,
+        [trigger.id],
+        include_day=bool(trigger.max_executions_per_day)
+    )
+    hourly_count, daily_count = counts.get(trigger.id, (0, 0))
+    return not rate_limit_exceeded(trigger, hourly_count, daily_count)
@@ -20,10 +20,10 @@ import asyncio
 import json
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 from loguru import logger
-from sqlalchemy import or_
+from sqlalchemy import or_, tuple_
 from sqlalchemy.sql.expression import case
 from sqlmodel import Session, asc, desc, select
 
@@ -38,11 +38,55 @@ from app.domains.remote_control.service.remote_control_service import RemoteCont
 
 router = APIRouter(prefix="/chat", tags=["V1 Chat Step"])
 
+# Upper bound on steps accepted by one POST /chat/steps/batch request.
+MAX_STEP_BATCH_SIZE = 500
+# Rows fetched per keyset page while streaming playback.
+PLAYBACK_PAGE_SIZE = 200
+MAX_LIST_LIMIT = 1000
+
+StepCursor = tuple[float | None, int]
+
 
 def _task_owned_by_user(db: Session, task_id: str, user_id: int) -> bool:
     return ChatService.verify_task_ownership(TaskOwnershipCheckReq(task_id=task_id, user_id=user_id))
 
 
+def _insert_chat_steps(db: Session, steps: list[ChatStepIn], user_id: int) -> int:
+    """Check ownership once per task, insert all rows in one flush, fan out once.
+
+    Synchronous; endpoints run it on the default executor so the event loop
+    is not blocked by the database round trips.
+    """
+    task_ids = list(dict.fromkeys(step.task_id for step in steps))
+    if set(task_ids) - ChatService.owned_task_ids(task_ids, user_id):
+        raise HTTPException(status_code=403, detail="Task not found or access denied")
+    chat_steps = [
+        ChatStep(
+            task_id=step.task_id,
+            run_id=step.run_id or step.task_id,
+            step=step.step,
+            data=step.data,
+            timestamp=step.timestamp,
+        )
+        for step in steps
+    ]
+    db.add_all(chat_steps)
+    db.flush()
+    # Detach before commit so ids and payloads stay loaded for the fan-out
+    # instead of being expired and re-selected one row at a time.
+    for chat_step in chat_steps:
+        db.expunge(chat_step)
+    db.commit()
+    try:
+        RemoteControlService.publish_chat_steps(chat_steps, db)
+    except Exception as exc:
+        logger.warning(
+            "Remote-control step publish failed",
+            extra={"task_ids": task_ids, "error": str(exc)},
+        )
+    return len(chat_steps)
+
+
 def _history_for_run(db: Session, run_id: str, user_id: int) -> ChatHistory | None:
     return db.exec(
         select(ChatHistory)
@@ -67,23 +111,75 @@ def _steps_for_run_stmt(run_id: str, task_id: str):
 
 
 def _ordered_steps_stmt(stmt):
-    return stmt.order_by(
-        asc(case((ChatStep.timestamp.is_(None), 1), else_=0)),
-        asc(ChatStep.timestamp),
-        asc(ChatStep.id),
+    # (timestamp NULLS LAST, id) matches ix_chat_step_task_run_timestamp_id
+    # and is the keyset order used by _after_cursor.
+    return stmt.order_by(asc(ChatStep.timestamp).nulls_last(), asc(ChatStep.id))
+
+
+def _after_cursor(stmt, cursor: StepCursor | None):
+    """Keep only rows strictly after cursor in _ordered_steps_stmt order."""
+    if cursor is None:
+        return stmt
+    timestamp, step_id = cursor
+    if timestamp is None:
+        return stmt.where(ChatStep.timestamp.is_(None), ChatStep.id > step_id)
+    return stmt.where(
+        or_(
+            ChatStep.timestamp.is_(None),
+            tuple_(ChatStep.timestamp, ChatStep.id) > tuple_(timestamp, step_id),
+        )
     )
 
 
+def _resume_cursor(db: Session, task_id: str, since_id: int | None, last_event_id: str | None) -> StepCursor | None:
+    """Resolve since_id (or an SSE Last-Event-ID) to the keyset position after it."""
+    if since_id is None and last_event_id:
+        try:
+            since_id = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    if since_id is None:
+        return None
+    since_step = db.get(ChatStep, since_id)
+    if since_step is None or since_step.task_id != task_id:
+        raise HTTPException(status_code=404, detail="Chat step not found")
+    return (since_step.timestamp, since_step.id)
+
+
+def _fetch_steps_page(db: Session, stmt, cursor: StepCursor | None, limit: int) -> list[ChatStep]:
+    return list(db.exec(_ordered_steps_stmt(_after_cursor(stmt, cursor)).limit(limit)).all())
+
+
+def _list_steps_page(db: Session, query, task_id: str, since_id: int | None, limit: int) -> list[ChatStep]:
+    """One page of steps after `since_id`; callers page on with the last id returned."""
+    cursor = _resume_cursor(db, task_id, since_id, None)
+    query = _ordered_steps_stmt(_after_cursor(query, cursor)).limit(min(limit, MAX_LIST_LIMIT))
+    return list(db.exec(query).all())
+
+
+async def _stream_steps(db: Session, stmt, cursor: StepCursor | None):
+    """Yield steps page by page so memory stays bounded on multi-hour runs."""
+    loop = asyncio.get_running_loop()
+    while True:
+        page = await loop.run_in_executor(None, _fetch_steps_page, db, stmt, cursor, PLAYBACK_PAGE_SIZE)
+        for s in page:
+            yield s
+        if len(page) < PLAYBACK_PAGE_SIZE:
+            return
+        cursor = (page[-1].timestamp, page[-1].id)
+        db.expunge_all()
+
+
 async def _playback_event_generator(
-    steps: list[ChatStep],
+    steps,
     *,
     delay_time: float,
-    empty_message: str,
+    empty_message: str | None,
 ):
-    if not steps:
-        yield f"data: {json.dumps({'error': empty_message})}\n\n"
-        return
-    for s in steps:
+    """SSE frames for steps; each carries ``id:`` so clients can resume."""
+    empty = True
+    async for s in steps:
+        empty = False
         step_data = {
             "id": s.id,
             "task_id": s.task_id,
@@ -93,9 +189,11 @@ async def _playback_event_generator(
             "timestamp": s.timestamp,
             "created_at": s.created_at.isoformat() if s.created_at else None,
         }
-        yield f"data: {json.dumps(step_data)}\n\n"
+        yield f"id: {s.id}\ndata: {json.dumps(step_data)}\n\n"
         if delay_time > 0:
             await asyncio.sleep(delay_time)
+    if empty and empty_message:
+        yield f"data: {json.dumps({'error': empty_message})}\n\n"
 
 
 @router.get("/steps", name="list chat steps", response_model=List[ChatStepOut])
@@ -103,6 +201,8 @@ async def list_chat_steps(
     task_id: str,
     run_id: Optional[str] = None,
     step: Optional[str] = None,
+    since_id: Optional[int] = None,
+    limit: int = Query(PLAYBACK_PAGE_SIZE, ge=1, le=MAX_LIST_LIMIT),
     db_session: Session = Depends(session),
     auth=Depends(auth_must),
 ):
@@ -113,13 +213,15 @@ async def list_chat_steps(
         query = query.where((ChatStep.run_id == run_id) | ChatStep.run_id.is_(None))
     if step is not None:
         query = query.where(ChatStep.step == step)
-    return list(db_session.exec(query).all())
+    return _list_steps_page(db_session, query, task_id, since_id, limit)
 
 
 @router.get("/runs/{run_id}/steps", name="list chat steps by run", response_model=List[ChatStepOut])
 async def list_chat_steps_by_run(
     run_id: str,
     step: Optional[str] = None,
+    since_id: Optional[int] = None,
+    limit: int = Query(PLAYBACK_PAGE_SIZE, ge=1, le=MAX_LIST_LIMIT),
     db_session: Session = Depends(session),
     auth=Depends(auth_must),
 ):
@@ -129,13 +231,15 @@ async def list_chat_steps_by_run(
     query = _steps_for_run_stmt(run_id, history.task_id)
     if step is not None:
         query = query.where(ChatStep.step == step)
-    return list(db_session.exec(query).all())
+    return _list_steps_page(db_session, query, history.task_id, since_id, limit)
 
 
 @router.get("/steps/playback/{task_id}", name="Playback Chat Step via SSE")
 async def share_playback(
     task_id: str,
     delay_time: float = 0,
+    since_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
     db_session: Session = Depends(session),
     auth=Depends(auth_must),
 ):
@@ -143,14 +247,14 @@ async def share_playback(
         delay_time = 5
     if not _task_owned_by_user(db_session, task_id, auth.user.id):
         raise HTTPException(status_code=404, detail="Task not found")
+    cursor = _resume_cursor(db_session, task_id, since_id, last_event_id)
 
     async def event_generator():
-        stmt = _ordered_steps_stmt(select(ChatStep).where(ChatStep.task_id == task_id))
-        steps = db_session.exec(stmt).all()
+        stmt = select(ChatStep).where(ChatStep.task_id == task_id)
         async for event in _playback_event_generator(
-            list(steps),
+            _stream_steps(db_session, stmt, cursor),
             delay_time=delay_time,
-            empty_message="No steps found for this task.",
+            empty_message=None if cursor else "No steps found for this task.",
         ):
             yield event
 
@@ -161,6 +265,8 @@ async def share_playback(
 async def run_playback(
     run_id: str,
     delay_time: float = 0,
+    since_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
     db_session: Session = Depends(session),
     auth=Depends(auth_must),
 ):
@@ -169,14 +275,14 @@ async def run_playback(
     history = _history_for_run(db_session, run_id, auth.user.id)
     if history is None:
         raise HTTPException(status_code=404, detail="Run not found")
+    cursor = _resume_cursor(db_session, history.task_id, since_id, last_event_id)
 
     async def event_generator():
-        stmt = _ordered_steps_stmt(_steps_for_run_stmt(run_id, history.task_id))
-        steps = db_session.exec(stmt).all()
+        stmt = _steps_for_run_stmt(run_id, history.task_id)
         async for event in _playback_event_generator(
-            list(steps),
+            _stream_steps(db_session, stmt, cursor),
             delay_time=delay_time,
-            empty_message="No steps found for this run.",
+            empty_message=None if cursor else "No steps found for this run.",
         ):
             yield event
 
@@ -203,28 +309,25 @@ async def create_chat_step(
     db_session: Session = Depends(session),
     auth=Depends(auth_must),
 ):
-    if not _task_owned_by_user(db_session, step.task_id, auth.user.id):
-        raise HTTPException(status_code=403, detail="Task not found or access denied")
-    chat_step = ChatStep(
-        task_id=step.task_id,
-        run_id=step.run_id or step.task_id,
-        step=step.step,
-        data=step.data,
-        timestamp=step.timestamp,
-    )
-    db_session.add(chat_step)
-    db_session.commit()
-    db_session.refresh(chat_step)
-    try:
-        RemoteControlService.publish_chat_step(chat_step, db_session)
-    except Exception as exc:
-        logger.warning(
-            "Remote-control step publish failed",
-            extra={"task_id": chat_step.task_id, "error": str(exc)},
-        )
+    await asyncio.get_running_loop().run_in_executor(None, _insert_chat_steps, db_session, [step], auth.user.id)
     return {"code": 200, "msg": "success"}
 
 
+@router.post("/steps/batch", name="create chat steps in batch")
+async def create_chat_steps_batch(
+    steps: List[ChatStepIn],
+    db_session: Session = Depends(session),
+    auth=Depends(auth_must),
+):
+    """Insert steps in request order; all-or-nothing if any task is foreign."""
+    if len(steps) > MAX_STEP_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_STEP_BATCH_SIZE} steps per batch")
+    if not steps:
+        return {"code": 200, "msg": "success", "count": 0}
+    count = await asyncio.get_running_loop().run_in_executor(None, _insert_chat_steps, db_session, steps, auth.user.id)
+    return {"code": 200, "msg": "success", "count": count}
+
+
 @router.put("/steps/{step_id}", name="update chat step", response_model=ChatStepOut)
 async def update_chat_step(
     step_id: int,
@@ -62,6 +62,18 @@ class ChatService:
             ).first()
             return h is not None
 
+    @staticmethod
+    def owned_task_ids(task_ids: list[str], user_id: int) -> set[str]:
+        """Return the subset of task_ids owned by user_id, in one query."""
+        if not task_ids:
+            return set()
+        with session_make() as s:
+            rows = s.exec(
+                select(ChatHistory.task_id)
+                .where(ChatHistory.task_id.in_(task_ids), ChatHistory.user_id == user_id)
+            ).all()
+            return set(rows)
+
     @staticmethod
     def validate_file(req: FileValidationReq) -> FileValidationResult:
         """Validate filename extension and file size."""
@@ -63,7 +63,7 @@ from app.model.remote_control import RemoteControlCommand, RemoteControlSession
 from app.model.user.user import User
 from app.shared.auth import auth_must
 from app.shared.auth.token_blacklist import BLACKLIST_PUBSUB_PREFIX, is_blacklisted
-from app.shared.auth.user_auth import V1UserAuth, _get_jti
+from app.shared.auth.user_auth import V1UserAuth
 from app.shared.middleware.rate_limit import rate_limiter_factory
 from app.shared.middleware.origins import (
     configured_remote_origins,
@@ -362,7 +362,7 @@ async def _auth_token_with_jti(
     if not raw:
         raise HTTPException(status_code=401, detail="Authentication required")
     auth = V1UserAuth.decode_token(raw)
-    jti = _get_jti(raw)
+    jti = auth.jti
     if jti and await is_blacklisted(jti):
         raise HTTPException(status_code=401, detail="Token has been revoked")
     user = db.get(User, auth.id)
@@ -226,6 +226,22 @@ class RemoteControlRedis:
         except Exception:
             return None
 
+    @staticmethod
+    def publish_many(messages: list[tuple[str, dict[str, Any]]]) -> None:
+        """Publish several messages in one pipelined Redis round trip."""
+        if not messages:
+            return
+        try:
+            pipe = get_redis_manager().client.pipeline(transaction=False)
+            for channel, payload in messages:
+                pipe.publish(channel, json.dumps(payload))
+            pipe.execute()
+        except Exception as exc:
+            logger.warning(
+                "Remote control Redis batch publish failed",
+                extra={"count": len(messages), "error": str(exc)},
+            )
+
     @staticmethod
     def is_bridge_online(desktop_instance_id: str, user_id: int) -> bool:
         bridge = RemoteControlRedis.get_bridge(desktop_instance_id)
@@ -1598,25 +1614,45 @@ class RemoteControlService:
 
     @staticmethod
     def publish_chat_step(step: ChatStep, db: Session) -> None:
-        if step.step in REMOTE_CONTROL_HIDDEN_STEPS:
-            return
-        history = db.exec(select(ChatHistory).where(ChatHistory.task_id == step.task_id)).first()
-        if not history:
-            logger.warning("Skipping remote-control step publish for orphan step", extra={"task_id": step.task_id})
+        RemoteControlService.publish_chat_steps([step], db)
+
+    @staticmethod
+    def publish_chat_steps(steps: list[ChatStep], db: Session) -> None:
+        """Fan out steps to remote-control viewers, one message per step.
+
+        Projects are resolved with one query and all messages share one
+        Redis round trip, so a batch costs the same as a single step.
+        """
+        visible = [step for step in steps if step.step not in REMOTE_CONTROL_HIDDEN_STEPS]
+        if not visible:
             return
-        project_id = history.project_id or history.task_id
-        RemoteControlRedis.publish(
-            RemoteControlRedis.step_channel(project_id),
-            {
-                "type": "step",
-                "project_id": project_id,
-                "task_id": step.task_id,
-                "step_id": step.id,
-                "step": step.step,
-                "data": step.data,
-                "timestamp": step.timestamp,
-            },
-        )
+        task_ids = list(dict.fromkeys(step.task_id for step in visible))
+        project_ids: dict[str, str] = {}
+        for task_id, project_id in db.exec(
+            select(ChatHistory.task_id, ChatHistory.project_id).where(ChatHistory.task_id.in_(task_ids))
+        ).all():
+            project_ids.setdefault(task_id, project_id or task_id)
+        messages = []
+        for step in visible:
+            project_id = project_ids.get(step.task_id)
+            if project_id is None:
+                logger.warning("Skipping remote-control step publish for orphan step", extra={"task_id": step.task_id})
+                continue
+            messages.append(
+                (
+                    RemoteControlRedis.step_channel(project_id),
+                    {
+                        "type": "step",
+                        "project_id": project_id,
+                        "task_id": step.task_id,
+                        "step_id": step.id,
+                        "step": step.step,
+                        "data": step.data,
+                        "timestamp": step.timestamp,
+                    },
+                )
+            )
+        RemoteControlRedis.publish_many(messages)
 
     @staticmethod
     def retry_pending_commands(db: Session) -> None:
@@ -26,6 +26,8 @@ from app.domains.space.service.space_service import SpaceHasProjectsError, Space
 from app.model.project import ProjectIn, ProjectOut, ProjectUpdate
 from app.model.space import (
     SpaceIn,
+    SpaceOverlayBatchWriteIn,
+    SpaceOverlayBatchWriteResponse,
     SpaceOverlayDiscardIn,
     SpaceOverlayDiscardResponse,
     SpaceOverlayListResponse,
@@ -310,6 +312,32 @@ def record_space_project_overlay(
         raise HTTPException(status_code=status_code, detail=detail) from exc
 
 
+@router.post(
+    "/{space_id}/projects/{project_id}/overlays/batch",
+    name="record project overlay writes",
+    response_model=SpaceOverlayBatchWriteResponse,
+)
+def record_space_project_overlays(
+    space_id: str,
+    project_id: str,
+    data: SpaceOverlayBatchWriteIn,
+    db_session: Session = Depends(session),
+    auth: V1UserAuth = Depends(auth_must),
+):
+    try:
+        return SpaceOverlayService.record_overlay_writes(
+            space_id,
+            project_id,
+            data.writes,
+            auth.id,
+            db_session,
+        )
+    except ValueError as exc:
+        detail = str(exc)
+        status_code = 403 if "disabled" in detail else 400
+        raise HTTPException(status_code=status_code, detail=detail) from exc
+
+
 @router.post(
     "/{space_id}/projects/{project_id}/discard",
     name="discard project overlays",
@@ -17,16 +17,19 @@ from __future__ import annotations
 import hashlib
 import logging
 import os
-import shutil
+import stat
 import threading
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path, PurePosixPath
+from typing import Any, NamedTuple
 from uuid import uuid4
 
-from sqlalchemy import text
-from sqlmodel import Session, select
+from sqlalchemy import delete, insert, text, update
+from sqlmodel import Session, col, select
 
 from app.domains.space.service.file_ops_guard import assert_local_file_operations_enabled
 from app.domains.space.service.space_service import SpaceService
@@ -53,6 +56,15 @@ except ImportError:  # pragma: no cover - Windows fallback
     fcntl = None
 
 _HASH_CHUNK_SIZE = 1024 * 1024
+# Threads hashing Space files during conflict detection
+_HASH_WORKERS = 8
+# Applied paths whose index updates and overlay deletes share a transaction
+_APPLY_COMMIT_BATCH = 200
+_INDEX_LOOKUP_CHUNK = 500
+# An index hash is only trusted for files last modified at least this long
+# before they were indexed; a write in the same mtime tick could otherwise
+# change the content without changing size or mtime.
+_RACY_MTIME_WINDOW = timedelta(seconds=2)
 _APPLY_LOCKS: weakref.WeakValueDictionary[str, threading.Lock] = (
     weakref.WeakValueDictionary()
 )
@@ -199,11 +211,6 @@ def _resolve_under(root: Path, rel_path: str) -> Path:
     return candidate
 
 
-def _fsync_file(path: Path) -> None:
-    with path.open("rb") as handle:
-        os.fsync(handle.fileno())
-
-
 def _fsync_dir(path: Path) -> None:
     fd = os.open(path, os.O_RDONLY)
     try:
@@ -212,6 +219,121 @@ def _fsync_dir(path: Path) -> None:
         os.close(fd)
 
 
+class _IndexedStat(NamedTuple):
+    """Index fields the stat fast path compares, detached from the session."""
+
+    hash: str | None
+    size: int | None
+    modified_at: datetime | None
+    indexed_at: datetime | None
+
+    @classmethod
+    def of(cls, entry: SpaceFileIndex | None) -> "_IndexedStat | None":
+        if entry is None:
+            return None
+        return cls(entry.hash, entry.size, entry.modified_at, entry.indexed_at)
+
+
+@dataclass
+class _ApplyAction:
+    row: SpaceFileIndexOverlay
+    action: str
+    resolution: ApplyResolutionIn | None
+    current_hash: str | None
+
+
+@dataclass
+class _StagedPath:
+    """A path written to disk whose index row and overlay are not yet committed."""
+
+    row: SpaceFileIndexOverlay
+    status: str
+    hash: str | None
+    stat_result: os.stat_result | None
+    synced_dir: Path | None
+
+
+@contextmanager
+def _keep_loaded_on_commit(s: Session):
+    """Keep rows loaded across grouped commits instead of reloading each one.
+
+    Safe while the Space write lock is held: no other writer can change them.
+    """
+
+    expire_on_commit = s.expire_on_commit
+    s.expire_on_commit = False
+    try:
+        yield
+    finally:
+        s.expire_on_commit = expire_on_commit
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _index_matches(indexed: _IndexedStat | None, stat_result: os.stat_result) -> bool:
+    if indexed is None or indexed.hash is None or indexed.modified_at is None or indexed.indexed_at is None:
+        return False
+    if not stat.S_ISREG(stat_result.st_mode) or indexed.size != stat_result.st_size:
+        return False
+    modified_at = _as_utc(indexed.modified_at)
+    if modified_at != datetime.fromtimestamp(stat_result.st_mtime, timezone.utc):
+        return False
+    return _as_utc(indexed.indexed_at) - modified_at >= _RACY_MTIME_WINDOW
+
+
+def _live_hash(target: Path, indexed: _IndexedStat | None) -> str | None:
+    """Hash of ``target`` on disk, reusing the index hash when size and mtime match."""
+
+    try:
+        stat_result = os.lstat(target)
+    except OSError:
+        stat_result = None
+    if stat_result is not None and _index_matches(indexed, stat_result):
+        return indexed.hash
+    return sha256_of_file(target)
+
+
+def _live_hashes(jobs: list[tuple[Path, _IndexedStat | None]]) -> list[str | None | ValueError]:
+    """Hash many Space files on a bounded pool, in order.
+
+    Files that cannot be hashed yield their ValueError; other errors raise.
+    """
+
+    def check(job: tuple[Path, _IndexedStat | None]) -> str | None | ValueError:
+        try:
+            return _live_hash(*job)
+        except ValueError as exc:
+            return exc
+
+    if len(jobs) <= 1:
+        return [check(job) for job in jobs]
+    with ThreadPoolExecutor(
+        max_workers=min(_HASH_WORKERS, len(jobs)),
+        thread_name_prefix="space-apply-hash",
+    ) as pool:
+        return list(pool.map(check, jobs))
+
+
+def _copy_and_hash(source: Path, destination: Path, mode: int | None) -> str:
+    """Copy ``source`` to a new file, fsync it and return the bytes' sha256.
+
+    Hashing while copying replaces a second read of the staged file.
+    """
+
+    digest = hashlib.sha256()
+    with source.open("rb") as reader, destination.open("xb") as writer:
+        while chunk := reader.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            writer.write(chunk)
+        writer.flush()
+        if mode is not None:
+            os.chmod(destination, mode)
+        os.fsync(writer.fileno())
+    return digest.hexdigest()
+
+
 class SpaceApplyService:
     """Apply run-scoped Project overlays back to a folder-backed Space."""
 
@@ -265,21 +387,36 @@ class SpaceApplyService:
             for resolution in data.force_resolutions or []
         }
 
-        with space_write_lock(space_id), filesystem_space_lock(root):
-            actions: list[tuple[SpaceFileIndexOverlay, str, ApplyResolutionIn | None]] = []
+        with space_write_lock(space_id), filesystem_space_lock(root), _keep_loaded_on_commit(s):
+            indexed = SpaceApplyService._load_index_rows(space_id, [row.path for row in rows], s)
+            targets: list[Path | ValueError] = []
             for row in rows:
-                resolution = resolutions.get(row.path)
                 try:
-                    target = _resolve_under(root, row.path)
-                    current_hash = sha256_of_file(target)
+                    targets.append(_resolve_under(root, row.path))
                 except ValueError as exc:
+                    targets.append(exc)
+            live_hashes = iter(
+                _live_hashes(
+                    [
+                        (target, _IndexedStat.of(indexed.get(row.path)))
+                        for row, target in zip(rows, targets)
+                        if isinstance(target, Path)
+                    ]
+                )
+            )
+
+            actions: list[_ApplyAction] = []
+            for row, target in zip(rows, targets):
+                resolution = resolutions.get(row.path)
+                current_hash = target if isinstance(target, ValueError) else next(live_hashes)
+                if isinstance(current_hash, ValueError):
                     response.conflicts.append(
                         ApplyConflict(
                             path=row.path,
                             status=row.status,
                             base_hash=row.base_hash,
                             mine_hash=row.hash,
-                            message=str(exc),
+                            message=str(current_hash),
                         )
                     )
                     continue
@@ -298,59 +435,188 @@ class SpaceApplyService:
                             )
                         )
                         continue
-                actions.append((row, resolution.action if resolution else "apply_mine", resolution))
+                actions.append(
+                    _ApplyAction(
+                        row=row,
+                        action=resolution.action if resolution else "apply_mine",
+                        resolution=resolution,
+                        current_hash=current_hash,
+                    )
+                )
 
             if response.conflicts:
                 response.kind = "conflict"
                 return response
 
-            for row, action, resolution in actions:
-                if action == "keep_theirs":
-                    try:
-                        live_hash = sha256_of_file(_resolve_under(root, row.path))
-                        SpaceApplyService._update_index(space, row.path, live_hash, s)
-                        s.delete(row)
-                        s.commit()
-                        response.applied.append(
-                            AppliedPath(path=row.path, status="kept_theirs", hash=live_hash)
+            staged: list[_StagedPath] = []
+            for item in actions:
+                row = item.row
+                try:
+                    if item.action == "keep_theirs":
+                        # The Space file is unchanged since it was hashed above:
+                        # both locks have been held throughout.
+                        target = _resolve_under(root, row.path)
+                        applied_hash, synced_dir, status = item.current_hash, None, "kept_theirs"
+                    else:
+                        target, applied_hash, synced_dir = SpaceApplyService._apply_row_to_disk(
+                            root=root,
+                            row=row,
+                            action=item.action,
+                            resolution=item.resolution,
                         )
-                    except Exception as exc:  # noqa: BLE001 - per-path failure must keep overlay.
-                        s.rollback()
-                        response.failed.append(
-                            ApplyFailure(
-                                path=row.path,
-                                reason="keep_theirs_failed",
-                                message=str(exc),
-                            )
+                        status = row.status
+                    stat_result = target.stat() if applied_hash is not None else None
+                except Exception as exc:  # noqa: BLE001 - per-path failure keeps overlay retryable.
+                    response.failed.append(
+                        ApplyFailure(
+                            path=row.path,
+                            reason="keep_theirs_failed" if item.action == "keep_theirs" else "apply_path_failed",
+                            message=str(exc),
                         )
+                    )
                     continue
 
+                staged.append(_StagedPath(row, status, applied_hash, stat_result, synced_dir))
+                if len(staged) >= _APPLY_COMMIT_BATCH:
+                    SpaceApplyService._commit_staged(space, staged, indexed, response, s)
+                    staged = []
+            if staged:
+                SpaceApplyService._commit_staged(space, staged, indexed, response, s)
+
+            response.kind = "partial" if response.failed else "success"
+            return response
+
+    @staticmethod
+    def _commit_staged(
+        space: Space,
+        staged: list[_StagedPath],
+        indexed: dict[str, SpaceFileIndex],
+        response: SpaceProjectApplyResponse,
+        s: Session,
+    ) -> None:
+        """Commit index updates and overlay deletes for paths already on disk.
+
+        A group shares one transaction and a handful of bulk statements. If it
+        fails, each path is retried in its own transaction so only the paths
+        that fail keep their overlay.
+        """
+        synced_dirs: dict[Path, list[str]] = {}
+        for item in staged:
+            if item.synced_dir is not None:
+                synced_dirs.setdefault(item.synced_dir, []).append(item.row.path)
+        for parent, paths in synced_dirs.items():
+            response.warnings.extend(SpaceApplyService._warn_parent_fsync(parent, paths))
+
+        try:
+            SpaceApplyService._write_staged(space, staged, indexed, s)
+            s.commit()
+        except Exception as exc:  # noqa: BLE001 - fall back to per-path transactions.
+            s.rollback()
+            _LOGGER.warning(
+                "Grouped Space apply commit failed; retrying per path",
+                extra={"space_id": space.id, "paths": len(staged), "error": str(exc)},
+            )
+            paths = [item.row.path for item in staged]
+            for path in paths:
+                indexed.pop(path, None)
+            indexed.update(SpaceApplyService._load_index_rows(space.id, paths, s))
+            for item in staged:
+                path = item.row.path
                 try:
-                    applied_hash, warnings = SpaceApplyService._apply_row_to_disk(
-                        root=root,
-                        row=row,
-                        action=action,
-                        resolution=resolution,
-                    )
-                    response.warnings.extend(warnings)
-                    SpaceApplyService._update_index(space, row.path, applied_hash, s)
-                    s.delete(row)
+                    SpaceApplyService._stage_path(space, item, indexed, s)
                     s.commit()
-                    response.applied.append(
-                        AppliedPath(path=row.path, status=row.status, hash=applied_hash)
-                    )
-                except Exception as exc:  # noqa: BLE001 - per-path failure keeps overlay retryable.
+                except Exception as path_exc:  # noqa: BLE001 - per-path failure keeps overlay retryable.
                     s.rollback()
+                    indexed.pop(path, None)
                     response.failed.append(
                         ApplyFailure(
-                            path=row.path,
-                            reason="apply_path_failed",
-                            message=str(exc),
+                            path=path,
+                            reason="keep_theirs_failed" if item.status == "kept_theirs" else "apply_path_failed",
+                            message=str(path_exc),
                         )
                     )
+                    continue
+                response.applied.append(AppliedPath(path=path, status=item.status, hash=item.hash))
+            return
 
-            response.kind = "partial" if response.failed else "success"
-            return response
+        response.applied.extend(
+            AppliedPath(path=item.row.path, status=item.status, hash=item.hash) for item in staged
+        )
+
+    @staticmethod
+    def _write_staged(
+        space: Space,
+        staged: list[_StagedPath],
+        indexed: dict[str, SpaceFileIndex],
+        s: Session,
+    ) -> None:
+        """Write a group's index rows and overlay deletes as bulk statements."""
+        removed: list[int] = []
+        updated: list[dict[str, Any]] = []
+        inserted: list[dict[str, Any]] = []
+        for item in staged:
+            path = item.row.path
+            existing = indexed.get(path)
+            values = SpaceApplyService._index_row_values(space, path, item.hash, existing, item.stat_result)
+            if values is None:
+                if existing is not None:
+                    removed.append(existing.id)
+            elif existing is None:
+                inserted.append(values)
+            else:
+                updated.append({"id": existing.id, **values})
+
+        if removed:
+            s.execute(delete(SpaceFileIndex).where(col(SpaceFileIndex.id).in_(removed)))
+        if updated:
+            s.execute(update(SpaceFileIndex), updated)
+        if inserted:
+            s.execute(insert(SpaceFileIndex), inserted)
+        s.execute(
+            delete(SpaceFileIndexOverlay).where(col(SpaceFileIndexOverlay.id).in_([item.row.id for item in staged]))
+        )
+        # Loaded index rows are now stale; paths are not revisited in this apply
+        for item in staged:
+            entry = indexed.pop(item.row.path, None)
+            if entry is not None:
+                s.expunge(entry)
+
+    @staticmethod
+    def _stage_path(
+        space: Space,
+        item: _StagedPath,
+        indexed: dict[str, SpaceFileIndex],
+        s: Session,
+    ) -> None:
+        """Per-path retry of `_write_staged` through the ORM."""
+        path = item.row.path
+        existing = indexed.get(path)
+        values = SpaceApplyService._index_row_values(space, path, item.hash, existing, item.stat_result)
+        if values is None:
+            if existing is not None:
+                s.delete(existing)
+            indexed.pop(path, None)
+        else:
+            entry = existing or SpaceFileIndex()
+            for key, value in values.items():
+                setattr(entry, key, value)
+            s.add(entry)
+            indexed[path] = entry
+        s.delete(item.row)
+
+    @staticmethod
+    def _load_index_rows(space_id: str, paths: list[str], s: Session) -> dict[str, SpaceFileIndex]:
+        indexed: dict[str, SpaceFileIndex] = {}
+        for offset in range(0, len(paths), _INDEX_LOOKUP_CHUNK):
+            chunk = paths[offset:offset + _INDEX_LOOKUP_CHUNK]
+            for entry in s.exec(
+                select(SpaceFileIndex).where(
+                    SpaceFileIndex.space_id == space_id,
+                    SpaceFileIndex.path.in_(chunk),
+                )
+            ).all():
+                indexed[entry.path] = entry
+        return indexed
 
     @staticmethod
     def _apply_row_to_disk(
@@ -359,33 +625,32 @@ class SpaceApplyService:
         row: SpaceFileIndexOverlay,
         action: str,
         resolution: ApplyResolutionIn | None,
-    ) -> tuple[str | None, list[ApplyWarning]]:
+    ) -> tuple[Path, str | None, Path | None]:
+        """Write or delete one overlay path.
+
+        Returns the target, its new hash and the parent directory that still
+        needs an fsync, or None when nothing on disk changed.
+        """
         target = _resolve_under(root, row.path)
-        warnings: list[ApplyWarning] = []
 
         if row.status == "deleted":
             if target.exists() and (target.is_symlink() or not target.is_file()):
                 raise ValueError("Cannot delete non-regular file")
             if target.exists():
                 target.unlink()
-                warnings.extend(SpaceApplyService._warn_parent_fsync(target.parent, row.path))
-            return None, warnings
+                return target, None, target.parent
+            return target, None, None
 
         source = SpaceApplyService._resolve_source_path(row, action, resolution)
         target.parent.mkdir(parents=True, exist_ok=True)
         tmp = target.parent / f".{target.name}.apply-{uuid4().hex}.tmp"
         try:
-            shutil.copyfile(source, tmp)
-            if row.mode is not None:
-                os.chmod(tmp, row.mode)
-            _fsync_file(tmp)
-            staged_hash = sha256_of_file(tmp)
+            staged_hash = _copy_and_hash(source, tmp, row.mode)
             expected_hash = resolution.hash if action == "write_chosen" and resolution else row.hash
             if expected_hash and staged_hash != expected_hash:
                 raise ValueError("hash_mismatch_before_swap")
             os.replace(tmp, target)
-            warnings.extend(SpaceApplyService._warn_parent_fsync(target.parent, row.path))
-            return staged_hash, warnings
+            return target, staged_hash, target.parent
         finally:
             if tmp.exists():
                 tmp.unlink()
@@ -425,7 +690,7 @@ class SpaceApplyService:
         return source
 
     @staticmethod
-    def _warn_parent_fsync(parent: Path, path: str) -> list[ApplyWarning]:
+    def _warn_parent_fsync(parent: Path, paths: list[str]) -> list[ApplyWarning]:
         try:
             _fsync_dir(parent)
             return []
@@ -436,34 +701,27 @@ class SpaceApplyService:
                     path=path,
                     message=f"Parent directory fsync failed after commit: {exc}",
                 )
+                for path in paths
             ]
 
     @staticmethod
-    def _update_index(
+    def _index_row_values(
         space: Space,
         rel_path: str,
         file_hash: str | None,
-        s: Session,
-    ) -> None:
-        existing = s.exec(
-            select(SpaceFileIndex).where(
-                SpaceFileIndex.space_id == space.id,
-                SpaceFileIndex.path == rel_path,
-            )
-        ).first()
-        if file_hash is None:
-            if existing:
-                s.delete(existing)
-            return
-
-        target = _resolve_under(Path(space.root_path).resolve(), rel_path)
-        stat_result = target.stat()
-        if existing is None:
-            existing = SpaceFileIndex(space_id=space.id, path=rel_path)
-        existing.hash = file_hash
-        existing.size = stat_result.st_size
-        existing.mode = stat_result.st_mode
-        existing.modified_at = datetime.fromtimestamp(stat_result.st_mtime, timezone.utc)
-        existing.indexed_at = datetime.now(timezone.utc)
-        existing.row_version = (existing.row_version or 0) + 1
-        s.add(existing)
+        existing: SpaceFileIndex | None,
+        stat_result: os.stat_result | None,
+    ) -> dict[str, Any] | None:
+        """Column values of the index row for an applied path, or None to drop it."""
+        if file_hash is None or stat_result is None:
+            return None
+        return {
+            "space_id": space.id,
+            "path": rel_path,
+            "hash": file_hash,
+            "size": stat_result.st_size,
+            "mode": stat_result.st_mode,
+            "modified_at": datetime.fromtimestamp(stat_result.st_mtime, timezone.utc),
+            "indexed_at": datetime.now(timezone.utc),
+            "row_version": ((existing.row_version or 0) if existing else 0) + 1,
+        }
@@ -30,6 +30,7 @@ from app.model.space import (
     OVERLAY_SOURCE_PATH_METADATA_KEY,
     OVERLAY_SOURCE_ROOT_METADATA_KEY,
     SpaceFileIndexOverlay,
+    SpaceOverlayBatchWriteResponse,
     SpaceOverlayDiscardResponse,
     SpaceOverlayListResponse,
     SpaceOverlayOut,
@@ -113,9 +114,93 @@ class SpaceOverlayService:
         user_id: int | str,
         s: Session,
     ) -> SpaceOverlayOut:
+        return SpaceOverlayService.record_overlay_writes(
+            space_id,
+            project_id,
+            [data],
+            user_id,
+            s,
+        ).overlays[0]
+
+    @staticmethod
+    def record_overlay_writes(
+        space_id: str,
+        project_id: str,
+        writes: list[SpaceOverlayWriteIn],
+        user_id: int | str,
+        s: Session,
+    ) -> SpaceOverlayBatchWriteResponse:
+        """Upsert overlay writes with one lookup and one commit.
+
+        Writes are merged in order, so a path written twice in a batch ends
+        up as it would after two single writes. Returns one overlay per
+        distinct run and path.
+        """
         SpaceOverlayService._get_owned_project(space_id, project_id, user_id, s)
         assert_local_file_operations_enabled()
-        path = normalize_overlay_path(data.path)
+        prepared = [
+            (normalize_overlay_path(data.path), SpaceOverlayService._overlay_metadata(data), data)
+            for data in writes
+        ]
+        response = SpaceOverlayBatchWriteResponse(space_id=space_id, project_id=project_id)
+        if not prepared:
+            return response
+
+        with space_write_lock(space_id):
+            rows = {
+                (row.run_id, row.path): row
+                for row in s.exec(
+                    select(SpaceFileIndexOverlay).where(
+                        SpaceFileIndexOverlay.space_id == space_id,
+                        SpaceFileIndexOverlay.project_id == project_id,
+                        SpaceFileIndexOverlay.run_id.in_({data.run_id for _, _, data in prepared}),
+                        SpaceFileIndexOverlay.path.in_({path for path, _, _ in prepared}),
+                    )
+                ).all()
+            }
+            written: dict[tuple[str, str], SpaceFileIndexOverlay] = {}
+            for path, metadata, data in prepared:
+                key = (data.run_id, path)
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = SpaceFileIndexOverlay(
+                        space_id=space_id,
+                        project_id=project_id,
+                        run_id=data.run_id,
+                        path=path,
+                        status=data.status,
+                        base_hash=data.base_hash,
+                        base_snapshot_id=data.base_snapshot_id,
+                    )
+                else:
+                    row.status = SpaceOverlayService._next_overlay_status(
+                        row.status,
+                        data.status,
+                        row.base_hash,
+                    )
+                row.hash = None if data.status == "deleted" else data.hash
+                row.size = data.size
+                row.mode = data.mode
+                row.modified_at = (
+                    datetime.fromisoformat(data.modified_at)
+                    if data.modified_at
+                    else datetime.now(timezone.utc)
+                )
+                row.metadata_json = {
+                    **(row.metadata_json or {}),
+                    **metadata,
+                }
+                s.add(row)
+                written[key] = row
+            # Flush rather than refresh: ids are assigned and nothing else
+            # needs reloading.
+            s.flush()
+            response.overlays = [SpaceOverlayService._overlay_out(row) for row in written.values()]
+            s.commit()
+            return response
+
+    @staticmethod
+    def _overlay_metadata(data: SpaceOverlayWriteIn) -> dict:
         metadata = dict(data.metadata or {})
         source_path = data.source_path or metadata.get(OVERLAY_SOURCE_PATH_METADATA_KEY)
         source_root = data.source_root or metadata.get(OVERLAY_SOURCE_ROOT_METADATA_KEY)
@@ -131,64 +216,24 @@ class SpaceOverlayService:
             # absolute path on the same machine. Cloud Brain must replace it with
             # an opaque file handle or a server-readable content reference.
             metadata[OVERLAY_SOURCE_ROOT_METADATA_KEY] = source_root
+        return metadata
 
-        with space_write_lock(space_id):
-            existing = s.exec(
-                select(SpaceFileIndexOverlay).where(
-                    SpaceFileIndexOverlay.space_id == space_id,
-                    SpaceFileIndexOverlay.project_id == project_id,
-                    SpaceFileIndexOverlay.run_id == data.run_id,
-                    SpaceFileIndexOverlay.path == path,
-                )
-            ).first()
-            row = existing or SpaceFileIndexOverlay(
-                space_id=space_id,
-                project_id=project_id,
-                run_id=data.run_id,
-                path=path,
-                status=data.status,
-                base_hash=data.base_hash,
-                base_snapshot_id=data.base_snapshot_id,
-            )
-            if existing is None:
-                row.base_hash = data.base_hash
-                row.base_snapshot_id = data.base_snapshot_id
-                row.status = data.status
-            else:
-                row.status = SpaceOverlayService._next_overlay_status(
-                    existing.status,
-                    data.status,
-                    existing.base_hash,
-                )
-            row.hash = None if data.status == "deleted" else data.hash
-            row.size = data.size
-            row.mode = data.mode
-            row.modified_at = (
-                datetime.fromisoformat(data.modified_at)
-                if data.modified_at
-                else datetime.now(timezone.utc)
-            )
-            row.metadata_json = {
-                **(row.metadata_json or {}),
-                **metadata,
-            }
-            s.add(row)
-            s.commit()
-            s.refresh(row)
-            return SpaceOverlayOut(
-                id=row.id,
-                space_id=row.space_id,
-                project_id=row.project_id,
-                run_id=row.run_id,
-                path=row.path,
-                status=row.status,
-                hash=row.hash,
-                base_hash=row.base_hash,
-                base_snapshot_id=row.base_snapshot_id,
-                size=row.size,
-                mode=row.mode,
-                metadata=row.metadata_json,
-            )
+    @staticmethod
+    def _overlay_out(row: SpaceFileIndexOverlay) -> SpaceOverlayOut:
+        return SpaceOverlayOut(
+            id=row.id,
+            space_id=row.space_id,
+            project_id=row.project_id,
+            run_id=row.run_id,
+            path=row.path,
+            status=row.status,
+            hash=row.hash,
+            base_hash=row.base_hash,
+            base_snapshot_id=row.base_snapshot_id,
+            size=row.size,
+            mode=row.mode,
+            metadata=row.metadata_json,
+        )
 
     @staticmethod
     def _next_overlay_status(
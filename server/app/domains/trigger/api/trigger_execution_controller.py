@@ -35,7 +35,7 @@ from app.shared.types.trigger_types import ExecutionStatus, ExecutionType
 from app.shared.auth import auth_must
 from app.shared.auth.user_auth import V1UserAuth
 from app.core.database import session
-from app.core.redis_utils import RedisSessionManager, get_redis_manager
+from app.core.redis_utils import get_async_redis_manager
 from app.domains.trigger.service.trigger_crud_service import TriggerCrudService
 
 # Store active WebSocket connections per session (WebSocket objects only, metadata in Redis)
@@ -256,8 +256,8 @@ async def subscribe_executions(websocket: WebSocket):
             return
         
         # Register session in Redis and store WebSocket reference
-        redis_manager = get_redis_manager()
-        redis_manager.store_session(session_id, str(user_id))
+        redis_manager = get_async_redis_manager()
+        await redis_manager.store_session(session_id, str(user_id))
         active_websockets[session_id] = websocket
         
         logger.info(f"WebSocket session registered", extra={
@@ -289,7 +289,7 @@ async def subscribe_executions(websocket: WebSocket):
                         execution_id = msg["execution_id"]
                         
                         # Remove from pending in Redis
-                        redis_manager.remove_pending_execution(session_id, execution_id)
+                        await redis_manager.remove_pending_execution(session_id, execution_id)
                         
                         # Update execution status to running
                         execution = ws_db_session.exec(
@@ -317,7 +317,7 @@ async def subscribe_executions(websocket: WebSocket):
                     
                     elif msg.get("type") == "ping":
                         # Publish pong through Redis pub/sub
-                        redis_manager.publish_execution_event({
+                        await redis_manager.publish_execution_event({
                             "type": "pong",
                             "session_id": session_id,
                             "user_id": str(user_id),
@@ -357,10 +357,10 @@ async def subscribe_executions(websocket: WebSocket):
     finally:
         # Mark pending executions as missed
         if session_id:
-            redis_manager = get_redis_manager()
+            redis_manager = get_async_redis_manager()
             
             # Clean up session from Redis and local WebSocket dict
-            redis_manager.remove_session(session_id)
+            await redis_manager.remove_session(session_id)
             if session_id in active_websockets:
                 del active_websockets[session_id]
             logger.info("Session cleaned up", extra={"session_id": session_id})
@@ -414,8 +414,8 @@ async def handle_pubsub_message(event_data: Dict[str, Any]):
             return
         
         # Get user sessions from Redis
-        redis_manager = get_redis_manager()
-        user_session_ids = redis_manager.get_user_sessions(event_user_id)
+        redis_manager = get_async_redis_manager()
+        user_session_ids = await redis_manager.get_user_sessions(event_user_id)
         
         # Get user sessions from Redis and match with local connections
         logger.debug(f"User has {len(user_session_ids)} active session(s)", extra={
@@ -455,9 +455,9 @@ async def handle_pubsub_message(event_data: Dict[str, Any]):
                 
                 # Track as pending if it's a new execution
                 if event_data.get("type") == "execution_created" and execution_id:
-                    redis_manager.add_pending_execution(session_id, execution_id)
+                    await redis_manager.add_pending_execution(session_id, execution_id)
                     # Confirm delivery for webhook to proceed
-                    redis_manager.confirm_delivery(execution_id, session_id)
+                    await redis_manager.confirm_delivery(execution_id, session_id)
                     
                 logger.debug("Notified session of execution", extra={
                     "session_id": session_id,
@@ -474,7 +474,7 @@ async def handle_pubsub_message(event_data: Dict[str, Any]):
                 
         # Clean up disconnected sessions
         for session_id in disconnected_sessions:
-            redis_manager.remove_session(session_id)
+            await redis_manager.remove_session(session_id)
             if session_id in active_websockets:
                 del active_websockets[session_id]
         
@@ -496,8 +496,9 @@ async def handle_pubsub_message(event_data: Dict[str, Any]):
 async def start_pubsub_listener():
     """Start the Redis pub/sub listener for this worker.
 
-    Each uvicorn worker needs its own Redis pub/sub connection. A dedicated
-    manager avoids sharing sockets across forked worker processes.
+    Each uvicorn worker needs its own Redis pub/sub connection. The async
+    manager opens it lazily on this worker's event loop, so no sockets are
+    shared across forked worker processes.
     """
     global _pubsub_task
     
@@ -506,7 +507,7 @@ async def start_pubsub_listener():
     
     import os
     logger.info(f"[PID {os.getpid()}] Starting Redis pub/sub listener for execution events")
-    pubsub_manager = RedisSessionManager()
+    pubsub_manager = get_async_redis_manager()
     
     async def run_subscriber():
         try:
@@ -15,57 +15,57 @@
 """
 Webhook Controller
 
-Handles incoming webhook triggers with modular app-specific processing.
+Accepts incoming webhook triggers with app-specific authentication and hands
+them to the webhook outbox dispatcher.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlmodel import Session, select, and_, or_
-from uuid import uuid4
-from datetime import datetime, timezone
-import json
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, select, and_
 from loguru import logger
 from fastapi_limiter.depends import RateLimiter
 
 from app.model.trigger.trigger import Trigger
-from app.model.trigger.trigger_execution import TriggerExecution
-from app.shared.types.trigger_types import TriggerType, TriggerStatus, ExecutionType, ExecutionStatus
+from app.shared.types.trigger_types import TriggerType, TriggerStatus
 from app.core.database import session
-from app.core.trigger_utils import check_rate_limits
+from app.core.trigger_utils import WEBHOOK_MAX_BODY_BYTES
 from app.domains.trigger.service.app_handler_service import get_app_handler
+from app.domains.trigger.service.webhook_outbox_service import (
+    WEBHOOK_TRIGGER_STATUSES,
+    WEBHOOK_TRIGGER_TYPES,
+    WebhookOutboxService,
+    request_dispatch,
+)
 
 router = APIRouter(prefix="/webhook", tags=["Webhook"])
 
 
-# Trigger types that use webhooks
-WEBHOOK_TRIGGER_TYPES = [TriggerType.webhook, TriggerType.slack_trigger]
-
-
 @router.api_route("/trigger/{webhook_uuid}", methods=["GET", "POST"], name="webhook trigger", dependencies=[Depends(RateLimiter(times=10, seconds=60))])
 async def webhook_trigger(
     webhook_uuid: str,
     request: Request,
     db_session: Session = Depends(session)
 ):
-    """Handle incoming webhook triggers with app-specific processing."""
+    """
+    Accept an incoming webhook trigger.
+    
+    Only authentication and request validation happen here. The request is
+    stored in the webhook outbox and answered with 202; the dispatcher then
+    filters it, applies rate limits, creates the execution and notifies
+    connected clients.
+    """
     try:
-        # Get request body
         body = await request.body()
-        try:
-            input_data = json.loads(body) if body else {}
-        except json.JSONDecodeError:
-            input_data = {"raw_body": body.decode()}
-        
-        headers = dict(request.headers)
-        webhook_url_new = f"/v1/webhook/trigger/{webhook_uuid}"
-        webhook_url_old = f"/webhook/trigger/{webhook_uuid}"
+        if len(body) > WEBHOOK_MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="Webhook payload too large")
 
-        # Find the trigger (match both old and new URL formats)
+        # Find the trigger
         trigger = db_session.exec(
             select(Trigger).where(
                 and_(
-                    or_(Trigger.webhook_url == webhook_url_new, Trigger.webhook_url == webhook_url_old),
+                    Trigger.webhook_uuid == webhook_uuid,
                     Trigger.trigger_type.in_(WEBHOOK_TRIGGER_TYPES),
-                    Trigger.status.in_([TriggerStatus.active, TriggerStatus.pending_verification])
+                    Trigger.status.in_(WEBHOOK_TRIGGER_STATUSES)
                 )
             )
         ).first()
@@ -110,9 +110,9 @@ async def webhook_trigger(
             
                 # Notify Redis subscribers of successful activation
                 try:
-                    from app.core.redis_utils import get_redis_manager
-                    redis_manager = get_redis_manager()
-                    redis_manager.publish_execution_event({
+                    from app.core.redis_utils import get_async_redis_manager
+                    redis_manager = get_async_redis_manager()
+                    await redis_manager.publish_execution_event({
                         "type": "trigger_activated",
                         "trigger_id": trigger.id,
                         "trigger_type": trigger.trigger_type.value,
@@ -134,175 +134,35 @@ async def webhook_trigger(
                     detail=f"Method not allowed. This webhook only accepts {expected_method} requests"
                 )
         
-        # Prepare request metadata for filtering and normalization
-        safe_headers = {k: v for k, v in headers.items() if k.lower() not in ['authorization', 'cookie']}
-        query_params = dict(request.query_params)
-        body_raw = body.decode() if body else ""
-        
+        # Request metadata kept for filtering and normalization
         request_meta = {
-            "headers": safe_headers,
-            "query_params": query_params,
+            "headers": {k: v for k, v in request.headers.items() if k.lower() not in ['authorization', 'cookie']},
+            "query_params": dict(request.query_params),
             "method": request.method,
             "url": str(request.url),
             "client_ip": request.client.host if request.client else None
         }
-        
-        # App-specific event filtering (pass headers and body for webhook config filtering)
-        if handler:
-            # For default webhook handler, pass additional context
-            if trigger.trigger_type == TriggerType.webhook:
-                filter_result = await handler.filter_event(
-                    input_data, 
-                    trigger,
-                    headers=safe_headers,
-                    body_raw=body_raw
-                )
-            else:
-                filter_result = await handler.filter_event(input_data, trigger)
-            
-            if not filter_result.success:
-                logger.debug("Event filtered", extra={
-                    "trigger_id": trigger.id,
-                    "reason": filter_result.reason
-                })
-                return {"status": "ignored", "reason": filter_result.reason}
-        
-        # Check rate limits
-        current_time = datetime.now(timezone.utc)
-        if trigger.max_executions_per_hour or trigger.max_executions_per_day:
-            if not check_rate_limits(db_session, trigger):
-                logger.warning("Webhook rate limit exceeded", extra={
-                    "trigger_id": trigger.id
-                })
-                raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
-        # Check single execution
-        if trigger.is_single_execution:
-            from sqlmodel import func
-            execution_count = db_session.exec(
-                select(func.count(TriggerExecution.id)).where(
-                    TriggerExecution.trigger_id == trigger.id
-                )
-            ).first()
-            if execution_count > 0:
-                raise HTTPException(status_code=409, detail="Single execution trigger already executed")
-        
-        # Normalize input data (pass request_meta for full webhook input)
-        if handler:
-            execution_input = handler.normalize_payload(input_data, trigger, request_meta=request_meta)
-        else:
-            execution_input = {
-                "headers": safe_headers,
-                "query_params": query_params,
-                "body": input_data,
-                "method": request.method,
-                "url": str(request.url),
-                "client_ip": request.client.host if request.client else None
-            }
-        
-        # Determine execution type
-        execution_type = handler.execution_type if handler else ExecutionType.webhook
-        
-        # Create execution record
-        execution_id = str(uuid4())
-        execution = TriggerExecution(
-            trigger_id=trigger.id,
-            execution_id=execution_id,
-            execution_type=execution_type,
-            status=ExecutionStatus.pending,
-            input_data=execution_input,
-            started_at=current_time
+        outbox_id = WebhookOutboxService(db_session).enqueue(
+            trigger,
+            request_meta,
+            body.decode(errors="replace") if body else ""
         )
+        await request_dispatch()
         
-        db_session.add(execution)
-        
-        # Update trigger
-        trigger.last_executed_at = current_time
-        trigger.last_execution_status = "pending"
-        db_session.add(trigger)
-        db_session.commit()
-        db_session.refresh(execution)
-        
-        logger.info("Webhook trigger executed", extra={
+        logger.info("Webhook trigger accepted", extra={
             "trigger_id": trigger.id,
-            "execution_id": execution_id,
+            "outbox_id": outbox_id,
             "trigger_type": trigger.trigger_type.value,
             "user_id": trigger.user_id
         })
-        
-        # Notify WebSocket subscribers and wait for delivery confirmation
-        try:
-            from app.core.redis_utils import get_redis_manager
-            redis_manager = get_redis_manager()
-            
-            # Check if user has any active WebSocket sessions
-            has_active_sessions = redis_manager.has_active_sessions_for_user(str(trigger.user_id))
-            
-            redis_manager.publish_execution_event({
-                "type": "execution_created",
-                "execution_id": execution_id,
-                "trigger_id": trigger.id,
-                "trigger_type": trigger.trigger_type.value,
-                "task_prompt": trigger.task_prompt,
-                "status": "pending",
-                "input_data": execution_input,
-                "user_id": str(trigger.user_id),
-                "project_id": str(trigger.project_id)
-            })
-            
-            if has_active_sessions:
-                # Wait for delivery confirmation (10 second timeout)
-                delivery_confirmation = await redis_manager.wait_for_delivery(
-                    execution_id, 
-                    timeout=10.0
-                )
-                
-                if delivery_confirmation:
-                    logger.info("Webhook delivery confirmed", extra={
-                        "execution_id": execution_id,
-                        "session_id": delivery_confirmation.get("session_id")
-                    })
-                    return {
-                        "success": True,
-                        "execution_id": execution_id,
-                        "message": "Webhook trigger delivered to client",
-                        "delivered": True,
-                        "session_id": delivery_confirmation.get("session_id")
-                    }
-                else:
-                    logger.warning("Webhook delivery confirmation timed out", extra={
-                        "execution_id": execution_id,
-                        "trigger_id": trigger.id
-                    })
-                    return {
-                        "success": True,
-                        "execution_id": execution_id,
-                        "message": "Webhook trigger processed but delivery not confirmed",
-                        "delivered": False,
-                        "reason": "timeout"
-                    }
-            else:
-                # No active sessions, execution is queued
-                logger.info("No active WebSocket sessions for user", extra={
-                    "execution_id": execution_id,
-                    "user_id": trigger.user_id
-                })
-                return {
-                    "success": True,
-                    "execution_id": execution_id,
-                    "message": "Webhook trigger processed, no active client connected",
-                    "delivered": False,
-                    "reason": "no_active_sessions"
-                }
-        except Exception as e:
-            logger.warning(f"Failed to publish/confirm WebSocket event: {e}")
-            return {
+        return JSONResponse(
+            status_code=202,
+            content={
                 "success": True,
-                "execution_id": execution_id,
-                "message": "Webhook trigger processed but WebSocket notification failed",
-                "delivered": False,
-                "reason": str(e)
+                "event_id": outbox_id,
+                "message": "Webhook trigger accepted"
             }
+        )
         
     except HTTPException:
         raise
@@ -320,13 +180,10 @@ def get_webhook_info(
     db_session: Session = Depends(session)
 ):
     """Get information about a webhook trigger (public endpoint)."""
-    webhook_url_new = f"/v1/webhook/trigger/{webhook_uuid}"
-    webhook_url_old = f"/webhook/trigger/{webhook_uuid}"
-
     trigger = db_session.exec(
         select(Trigger).where(
             and_(
-                or_(Trigger.webhook_url == webhook_url_new, Trigger.webhook_url == webhook_url_old),
+                Trigger.webhook_uuid == webhook_uuid,
                 Trigger.trigger_type.in_(WEBHOOK_TRIGGER_TYPES)
             )
         )
@@ -244,8 +244,10 @@ class TriggerCrudService:
 
         # 2. Generate webhook URL
         webhook_url = None
+        webhook_uuid = None
         if data.trigger_type in (TriggerType.webhook, TriggerType.slack_trigger):
-            webhook_url = f"/v1/webhook/trigger/{uuid4()}"
+            webhook_uuid = str(uuid4())
+            webhook_url = f"/v1/webhook/trigger/{webhook_uuid}"
 
         # 3. Validate config
         try:
@@ -261,6 +263,7 @@ class TriggerCrudService:
         trigger_data["user_id"] = str(user_id)
         trigger_data["space_id"] = data.space_id or SpaceService.legacy_space_id(user_id)
         trigger_data["webhook_url"] = webhook_url
+        trigger_data["webhook_uuid"] = webhook_uuid
         trigger_data["status"] = initial_status
 
         trigger = Trigger(**trigger_data)
@@ -17,13 +17,19 @@ from typing import List, Tuple, Optional
 from loguru import logger
 from croniter import croniter
 from uuid import uuid4
-import asyncio
+from sqlalchemy import insert, update
 from sqlmodel import select
 
 from app.model.trigger.trigger import Trigger
 from app.model.trigger.trigger_execution import TriggerExecution
 from app.shared.types.trigger_types import TriggerStatus, ExecutionType, ExecutionStatus, TriggerType
-from app.core.trigger_utils import check_rate_limits, MAX_DISPATCH_PER_TICK
+from app.core.trigger_utils import (
+    MAX_DISPATCH_PER_TICK,
+    SCHEDULED_FETCH_BATCH_SIZE,
+    execution_counts,
+    execution_deadline,
+    rate_limit_exceeded,
+)
 from app.model.trigger.app_configs import ScheduleTriggerConfig
 
 
@@ -49,17 +55,23 @@ class TriggerScheduleService:
         """
         self.session = session
     
-    def fetch_due_schedules(self, limit: Optional[int] = 100) -> List[Trigger]:
+    def fetch_due_schedules(self, limit: Optional[int] = None) -> List[Trigger]:
         """
-        Fetch triggers that are due for execution.
+        Claim triggers that are due for execution.
+        
+        Rows are locked with FOR UPDATE SKIP LOCKED, so several pollers can
+        run at once and each claims a disjoint batch. The locks are held until
+        the batch is committed or rolled back.
         
         Args:
-            limit: Maximum number of triggers to fetch
+            limit: Maximum number of triggers to claim
+                   (defaults to SCHEDULED_FETCH_BATCH_SIZE)
             
         Returns:
             List of triggers that need to be executed
         """
         now = datetime.now(timezone.utc)
+        limit = limit or SCHEDULED_FETCH_BATCH_SIZE
         
         try:
             statement = (
@@ -69,6 +81,7 @@ class TriggerScheduleService:
                 .where(Trigger.next_run_at <= now)
                 .order_by(Trigger.next_run_at)
                 .limit(limit)
+                .with_for_update(skip_locked=True)
             )
             
             results = self.session.exec(statement).all()
@@ -89,6 +102,7 @@ class TriggerScheduleService:
                 extra={"error": str(e)},
                 exc_info=True
             )
+            self.session.rollback()
             return []
     
     def calculate_next_run_at(
@@ -141,41 +155,92 @@ class TriggerScheduleService:
             True if dispatched successfully, False otherwise
         """
         try:
+            dispatched, _ = self.dispatch_batch([trigger], check_limits=False)
+            return dispatched == 1
+        except Exception as e:
+            logger.error(
+                "Failed to dispatch trigger",
+                extra={
+                    "trigger_id": trigger.id,
+                    "error": str(e)
+                },
+                exc_info=True
+            )
+            self.session.rollback()
+            return False
+    
+    def dispatch_batch(self, triggers: List[Trigger], check_limits: bool = True) -> Tuple[int, int]:
+        """
+        Dispatch a batch of due triggers in one transaction.
+        
+        Rate limits for the whole batch are counted with one aggregate query.
+        Triggers are updated with one executemany UPDATE and executions
+        inserted with one bulk INSERT in a single commit, and the execution
+        events are then published in one Redis round trip.
+        Every trigger in the batch leaves the due set: dispatched and rate
+        limited triggers move to their next run, expired ones are completed.
+        
+        Args:
+            triggers: Claimed triggers to dispatch
+            check_limits: Whether to enforce hourly/daily rate limits
+            
+        Returns:
+            Tuple of (dispatched_count, rate_limited_count)
+            
+        Raises:
+            Exception: If the batch cannot be committed; the caller rolls back
+        """
+        if not triggers:
+            return 0, 0
+        
+        now = datetime.now(timezone.utc)
+        counts = {}
+        if check_limits:
+            limited = [t for t in triggers if t.max_executions_per_hour or t.max_executions_per_day]
+            counts = execution_counts(
+                self.session,
+                [t.id for t in limited],
+                now,
+                include_day=any(t.max_executions_per_day for t in limited)
+            )
+        
+        executions: List[TriggerExecution] = []
+        events: List[dict] = []
+        rate_limited_count = 0
+        
+        for trigger in triggers:
             # Check schedule expiration before dispatching
-            if not self._check_schedule_valid(trigger):
+            if not self._check_schedule_valid(trigger, commit=False):
+                if trigger.status != TriggerStatus.completed:
+                    # Invalid config: skip this run instead of re-claiming it forever
+                    self._advance_next_run(trigger, now)
                 logger.info(
-                    "Schedule trigger expired, skipping dispatch",
+                    "Schedule trigger not valid, skipping dispatch",
                     extra={"trigger_id": trigger.id, "trigger_name": trigger.name}
                 )
-                return False
+                continue
+            
+            hourly_count, daily_count = counts.get(trigger.id, (0, 0))
+            if check_limits and rate_limit_exceeded(trigger, hourly_count, daily_count):
+                rate_limited_count += 1
+                # Still update next_run_at even if rate limited, so we don't keep checking
+                self._advance_next_run(trigger, now)
+                continue
             
-            # Create execution record
-            execution_id = str(uuid4())
             execution = TriggerExecution(
                 trigger_id=trigger.id,
-                execution_id=execution_id,
+                execution_id=str(uuid4()),
                 execution_type=ExecutionType.scheduled,
                 status=ExecutionStatus.pending,
-                input_data={"scheduled_at": datetime.now(timezone.utc).isoformat()},
-                started_at=datetime.now(timezone.utc)
+                input_data={"scheduled_at": now.isoformat()},
+                started_at=now
             )
-            
-            self.session.add(execution)
+            executions.append(execution)
             
             # Update trigger statistics
-            trigger.last_executed_at = datetime.now(timezone.utc)
+            trigger.last_executed_at = now
             trigger.last_execution_status = "pending"
-            
-            # Calculate and set next run time
-            try:
-                trigger.next_run_at = self.calculate_next_run_at(trigger, datetime.now(timezone.utc))
-            except Exception as e:
-                logger.error(
-                    "Failed to calculate next run time, trigger will be skipped",
-                    extra={"trigger_id": trigger.id, "error": str(e)}
-                )
-                # Set next_run_at far in the future to prevent immediate re-execution
-                trigger.next_run_at = datetime.now(timezone.utc) + timedelta(days=365)
+            self._advance_next_run(trigger, now)
             
             # If single execution, deactivate the trigger
             if trigger.is_single_execution:
@@ -185,67 +250,75 @@ class TriggerScheduleService:
                     extra={"trigger_id": trigger.id}
                 )
             
-            self.session.add(trigger)
-            self.session.commit()
-            
-            # TODO: Queue the actual task execution
-            # This would integrate with a task queue (e.g., Celery) to execute the trigger's action
-            # For now event is sent to client for execution
-            
-            logger.info(
-                "Trigger dispatched successfully",
-                extra={
-                    "trigger_id": trigger.id,
-                    "trigger_name": trigger.name,
-                    "execution_id": execution_id,
-                    "next_run_at": trigger.next_run_at.isoformat() if trigger.next_run_at else None
-                }
-            )
-            
-            # Notify WebSocket subscribers
-            # Using asyncio.run() to run async code from sync Celery worker context
-            try:
-                # Notify WebSocket subscribers via Redis pub/sub
-                from app.core.redis_utils import get_redis_manager
-                redis_manager = get_redis_manager()
-                redis_manager.publish_execution_event({
-                    "type": "execution_created",
-                    "execution_id": execution_id,
-                    "trigger_id": trigger.id,
-                    "trigger_type": "schedule",
-                    "status": "pending",
-                    "input_data": execution.input_data,
-                    "task_prompt": trigger.task_prompt,
-                    "execution_type": "schedule",
-                    "user_id": str(trigger.user_id),
-                    "project_id": str(trigger.project_id)
-                })
-                
-                logger.debug("WebSocket notification sent", extra={
-                    "execution_id": execution_id,
-                    "trigger_id": trigger.id
-                })
-            except Exception as e:
-                # Don't fail the trigger dispatch if notification fails
-                logger.warning("Failed to send WebSocket notification", extra={
-                    "trigger_id": trigger.id,
-                    "execution_id": execution_id,
-                    "error": str(e)
+            events.append({
+                "type": "execution_created",
+                "execution_id": execution.execution_id,
+                "trigger_id": trigger.id,
+                "trigger_type": "schedule",
+                "status": "pending",
+                "input_data": execution.input_data,
+                "task_prompt": trigger.task_prompt,
+                "execution_type": "schedule",
+                "user_id": str(trigger.user_id),
+                "project_id": str(trigger.project_id)
+            })
+        
+        trigger_rows = [
+            {
+                "id": trigger.id,
+                "status": trigger.status,
+                "next_run_at": trigger.next_run_at,
+                "last_executed_at": trigger.last_executed_at,
+                "last_execution_status": trigger.last_execution_status
+            }
+            for trigger in triggers
+        ]
+        execution_rows = []
+        for execution in executions:
+            # Bulk inserts skip mapper events, so set what before_insert would
+            row = execution.model_dump(exclude={"id"})
+            row["deadline_at"] = execution_deadline(execution)
+            execution_rows.append(row)
+        # The rows above carry every change; drop the pending attribute changes
+        # so the commit does not flush each trigger again as its own UPDATE
+        for trigger in triggers:
+            self.session.expire(trigger)
+        
+        self.session.execute(update(Trigger), trigger_rows)
+        if execution_rows:
+            self.session.execute(insert(TriggerExecution), execution_rows)
+        self.session.commit()
+        
+        logger.info(
+            "Trigger batch dispatched",
+            extra={
+                "claimed": len(triggers),
+                "dispatched": len(executions),
+                "rate_limited": rate_limited_count
+            }
+        )
+        
+        # Notify WebSocket subscribers via Redis pub/sub; a failed notification
+        # does not undo the dispatch, clients pick executions up on reconnect
+        if events:
+            from app.core.redis_utils import get_redis_manager
+            if not get_redis_manager().publish_execution_events(events):
+                logger.warning("Failed to send WebSocket notifications", extra={
+                    "execution_ids": [event["execution_id"] for event in events]
                 })
-            
-            return True
-            
+        
+        return len(executions), rate_limited_count
+    
+    def _advance_next_run(self, trigger: Trigger, now: datetime) -> None:
+        try:
+            trigger.next_run_at = self.calculate_next_run_at(trigger, now)
         except Exception as e:
             logger.error(
-                "Failed to dispatch trigger",
-                extra={
-                    "trigger_id": trigger.id,
-                    "error": str(e)
-                },
-                exc_info=True
+                "Failed to calculate next run time, trigger will be skipped",
+                extra={"trigger_id": trigger.id, "error": str(e)}
             )
-            self.session.rollback()
-            return False
+            # Set next_run_at far in the future to prevent immediate re-execution
+            trigger.next_run_at = now + timedelta(days=365)
     
     def process_schedules(self, due_schedules: List[Trigger]) -> Tuple[int, int]:
         """
@@ -257,32 +330,19 @@ class TriggerScheduleService:
         Returns:
             Tuple of (dispatched_count, rate_limited_count)
         """
-        dispatched_count = 0
-        rate_limited_count = 0
-        
-        for trigger in due_schedules:
-            # Check rate limits
-            if not check_rate_limits(self.session, trigger):
-                rate_limited_count += 1
-                
-                # Still update next_run_at even if rate limited, so we don't keep checking
-                try:
-                    trigger.next_run_at = self.calculate_next_run_at(trigger, datetime.now(timezone.utc))
-                    self.session.add(trigger)
-                    self.session.commit()
-                except Exception as e:
-                    logger.error(
-                        "Failed to update next_run_at for rate limited trigger",
-                        extra={"trigger_id": trigger.id, "error": str(e)}
-                    )
-                
-                continue
-            
-            # Dispatch the trigger
-            if self.dispatch_trigger(trigger):
-                dispatched_count += 1
-        
-        return dispatched_count, rate_limited_count
+        try:
+            return self.dispatch_batch(due_schedules)
+        except Exception as e:
+            logger.error(
+                "Failed to dispatch trigger batch",
+                extra={
+                    "trigger_ids": [trigger.id for trigger in due_schedules],
+                    "error": str(e)
+                },
+                exc_info=True
+            )
+            self.session.rollback()
+            return 0, 0
     
     def poll_and_execute_due_triggers(
         self, 
@@ -304,12 +364,28 @@ class TriggerScheduleService:
         
         # Process in batches until we've handled all due schedules or hit the limit
         while True:
-            due_schedules = self.fetch_due_schedules()
+            limit = SCHEDULED_FETCH_BATCH_SIZE
+            if max_dispatch > 0:
+                limit = min(limit, max_dispatch - total_dispatched)
+            due_schedules = self.fetch_due_schedules(limit)
             
             if not due_schedules:
                 break
             
-            dispatched_count, rate_limited_count = self.process_schedules(due_schedules)
+            try:
+                dispatched_count, rate_limited_count = self.dispatch_batch(due_schedules)
+            except Exception as e:
+                # The claimed rows stay due; stop this tick rather than re-claiming them
+                logger.error(
+                    "Failed to dispatch trigger batch",
+                    extra={
+                        "trigger_ids": [trigger.id for trigger in due_schedules],
+                        "error": str(e)
+                    },
+                    exc_info=True
+                )
+                self.session.rollback()
+                break
             total_dispatched += dispatched_count
             total_rate_limited += rate_limited_count
             
@@ -340,7 +416,7 @@ class TriggerScheduleService:
         
         return total_dispatched, total_rate_limited
     
-    def _check_schedule_valid(self, trigger: Trigger) -> bool:
+    def _check_schedule_valid(self, trigger: Trigger, commit: bool = True) -> bool:
         """
         Check if a scheduled trigger is valid for execution.
         
@@ -352,6 +428,8 @@ class TriggerScheduleService:
         
         Args:
             trigger: The trigger to check
+            commit: Commit the status change here; batch dispatch commits
+                    it together with the rest of the batch
             
         Returns:
             True if trigger is valid for execution, False if expired
@@ -376,7 +454,8 @@ class TriggerScheduleService:
             # Mark trigger as completed
             trigger.status = TriggerStatus.completed
             self.session.add(trigger)
-            self.session.commit()
+            if commit:
+                self.session.commit()
             
             logger.info(
                 "Schedule trigger expired and marked as completed",
@@ -18,23 +18,25 @@ Celery tasks for trigger scheduling: poll due triggers and check execution timeo
 
 import logging
 from datetime import datetime, timezone
+from typing import Dict, List
 
 from celery import shared_task
-from sqlmodel import select, or_
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, col, select
 
 from app.core.database import session_make
-from app.core.environment import env
-from app.core.trigger_utils import MAX_DISPATCH_PER_TICK
+from app.core.trigger_utils import (
+    EXECUTION_PENDING_TIMEOUT_SECONDS,
+    EXECUTION_RUNNING_TIMEOUT_SECONDS,
+    MAX_DISPATCH_PER_TICK,
+    execution_deadline,
+)
 from app.core.redis_utils import get_redis_manager
 from app.model.trigger.trigger_execution import TriggerExecution
-from app.model.trigger.trigger import Trigger
 from app.shared.types.trigger_types import ExecutionStatus
 from app.domains.trigger.service.trigger_schedule_service import TriggerScheduleService
 from app.domains.trigger.service.trigger_service import TriggerService
 
-EXECUTION_PENDING_TIMEOUT_SECONDS = int(env("EXECUTION_PENDING_TIMEOUT_SECONDS", "60"))
-EXECUTION_RUNNING_TIMEOUT_SECONDS = int(env("EXECUTION_RUNNING_TIMEOUT_SECONDS", "600"))
-
 logger = logging.getLogger("server_trigger_schedule_task")
 
 
@@ -53,93 +55,138 @@ def poll_trigger_schedules() -> None:
         session.close()
 
 
+def _backfill_deadlines(session: Session) -> int:
+    """Set deadline_at on in-flight executions written before it existed."""
+    executions = session.exec(
+        select(TriggerExecution).where(
+            col(TriggerExecution.status).in_([ExecutionStatus.pending, ExecutionStatus.running]),
+            col(TriggerExecution.deadline_at).is_(None)
+        )
+    ).all()
+    for execution in executions:
+        execution.deadline_at = execution_deadline(execution)
+        session.add(execution)
+    if executions:
+        session.commit()
+    return len(executions)
+
+
+def _expire_executions(
+    session: Session,
+    from_status: ExecutionStatus,
+    to_status: ExecutionStatus,
+    error_message: str,
+    now: datetime
+) -> List[Dict]:
+    """
+    Move every execution in ``from_status`` past its deadline to ``to_status``.
+    
+    One UPDATE ... RETURNING on the (status, deadline_at) index claims the
+    expired rows, so executions acknowledged or completed concurrently are
+    left alone. Durations are then written with one executemany.
+    
+    Returns:
+        id, execution_id, trigger_id and started_at of each expired execution
+    """
+    connection = session.connection()
+    rows = connection.execute(
+        update(TriggerExecution)
+        .where(
+            col(TriggerExecution.status) == from_status,
+            col(TriggerExecution.deadline_at) <= now.replace(tzinfo=None)
+        )
+        .values(
+            status=to_status,
+            completed_at=now,
+            error_message=error_message,
+            deadline_at=None
+        )
+        .returning(
+            TriggerExecution.id,
+            TriggerExecution.execution_id,
+            TriggerExecution.trigger_id,
+            TriggerExecution.started_at
+        )
+    ).mappings().all()
+
+    durations = []
+    for row in rows:
+        started_at = row["started_at"]
+        if started_at:
+            if started_at.tzinfo is None:
+                started_at = started_at.replace(tzinfo=timezone.utc)
+            durations.append({"b_id": row["id"], "b_duration": (now - started_at).total_seconds()})
+    if durations:
+        connection.execute(
+            update(TriggerExecution)
+            .where(col(TriggerExecution.id) == bindparam("b_id"))
+            .values(duration_seconds=bindparam("b_duration")),
+            durations
+        )
+    return [dict(row) for row in rows]
+
+
 @shared_task(queue="check_execution_timeouts")
 def check_execution_timeouts() -> None:
-    """Check for timed-out pending and running executions."""
+    """Check for timed-out pending and running executions.
+    
+    Only executions whose deadline_at has passed are read and written, so a
+    sweep costs in proportion to the expired executions rather than to every
+    in-flight one.
+    """
     logger.info("Starting check_execution_timeouts task", extra={
         "pending_timeout": EXECUTION_PENDING_TIMEOUT_SECONDS,
         "running_timeout": EXECUTION_RUNNING_TIMEOUT_SECONDS
     })
 
     session = session_make()
-    redis_manager = get_redis_manager()
     trigger_service = TriggerService(session)
 
     try:
-        now = datetime.now(timezone.utc)
+        backfilled = _backfill_deadlines(session)
+        if backfilled:
+            logger.info("Backfilled execution deadlines", extra={"count": backfilled})
 
-        executions = session.exec(
-            select(TriggerExecution).where(
-                or_(
-                    TriggerExecution.status == ExecutionStatus.pending,
-                    TriggerExecution.status == ExecutionStatus.running
-                )
-            )
-        ).all()
-
-        timed_out_pending_count = 0
-        timed_out_running_count = 0
-
-        for execution in executions:
-            is_pending = execution.status == ExecutionStatus.pending
-            is_running = execution.status == ExecutionStatus.running
-
-            if is_pending:
-                reference_time = execution.created_at
-                timeout_seconds = EXECUTION_PENDING_TIMEOUT_SECONDS
-            else:
-                reference_time = execution.started_at or execution.created_at
-                timeout_seconds = EXECUTION_RUNNING_TIMEOUT_SECONDS
-
-            if reference_time.tzinfo is None:
-                reference_time = reference_time.replace(tzinfo=timezone.utc)
-            time_elapsed = (now - reference_time).total_seconds()
-
-            if time_elapsed > timeout_seconds:
-                if is_pending:
-                    new_status = ExecutionStatus.missed
-                    error_message = f"Execution acknowledgment timeout ({timeout_seconds} seconds)"
-                    timed_out_pending_count += 1
-                else:
-                    new_status = ExecutionStatus.failed
-                    error_message = f"Execution running timeout ({timeout_seconds} seconds) - no completion received"
-                    timed_out_running_count += 1
-
-                trigger_service.update_execution_status(
-                    execution=execution,
-                    status=new_status,
-                    error_message=error_message
-                )
-
-                try:
-                    trigger = session.get(Trigger, execution.trigger_id)
-                    if trigger and trigger.user_id:
-                        user_session_ids = redis_manager.get_user_sessions(trigger.user_id)
-                        for session_id in user_session_ids:
-                            redis_manager.remove_pending_execution(session_id, execution.execution_id)
-                except Exception as e:
-                    logger.warning("Failed to remove execution from Redis", extra={
-                        "execution_id": execution.execution_id,
-                        "trigger_id": execution.trigger_id,
-                        "error": str(e)
-                    })
-
-                logger.info("Execution timed out", extra={
-                    "execution_id": execution.execution_id,
-                    "trigger_id": execution.trigger_id,
-                    "original_status": "pending" if is_pending else "running",
-                    "new_status": new_status.value,
-                    "time_elapsed": time_elapsed
-                })
-
-        total_timed_out = timed_out_pending_count + timed_out_running_count
-        if total_timed_out > 0:
-            logger.info("Marked executions as timed out", extra={
-                "timed_out_pending_count": timed_out_pending_count,
-                "timed_out_running_count": timed_out_running_count,
-                "total_timed_out": total_timed_out
+        now = datetime.now(timezone.utc)
+        timed_out_pending = _expire_executions(
+            session,
+            ExecutionStatus.pending,
+            ExecutionStatus.missed,
+            f"Execution acknowledgment timeout ({EXECUTION_PENDING_TIMEOUT_SECONDS} seconds)",
+            now
+        )
+        timed_out_running = _expire_executions(
+            session,
+            ExecutionStatus.running,
+            ExecutionStatus.failed,
+            f"Execution running timeout ({EXECUTION_RUNNING_TIMEOUT_SECONDS} seconds) - no completion received",
+            now
+        )
+        session.commit()
+
+        outcomes = [(row["trigger_id"], ExecutionStatus.missed) for row in timed_out_pending]
+        outcomes += [(row["trigger_id"], ExecutionStatus.failed) for row in timed_out_running]
+        if not outcomes:
+            return
+
+        triggers = trigger_service.record_failed_executions(outcomes)
+
+        executions_by_user: Dict[str, List[str]] = {}
+        for row in timed_out_pending + timed_out_running:
+            trigger = triggers.get(row["trigger_id"])
+            if trigger and trigger.user_id:
+                executions_by_user.setdefault(str(trigger.user_id), []).append(row["execution_id"])
+        if not get_redis_manager().remove_pending_executions_for_users(executions_by_user):
+            logger.warning("Failed to remove timed-out executions from Redis", extra={
+                "user_count": len(executions_by_user)
             })
 
+        logger.info("Marked executions as timed out", extra={
+            "timed_out_pending_count": len(timed_out_pending),
+            "timed_out_running_count": len(timed_out_running),
+            "total_timed_out": len(outcomes)
+        })
+
     except Exception as e:
         logger.error("Error checking execution timeouts", extra={
             "error": str(e),
@@ -13,7 +13,7 @@
 # ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlmodel import select, and_, or_
 from uuid import uuid4
 from loguru import logger
@@ -143,6 +143,42 @@ class TriggerService:
         
         return execution
     
+    def record_failed_executions(self, outcomes: List[Tuple[int, ExecutionStatus]]) -> Dict[int, Trigger]:
+        """
+        Apply failed or missed execution outcomes to their triggers.
+        
+        Bulk counterpart of the trigger bookkeeping in update_execution_status:
+        loads every affected trigger in one query, applies the outcomes in
+        order and commits once.
+        
+        Args:
+            outcomes: (trigger_id, failed or missed status) per execution
+        
+        Returns:
+            The affected triggers keyed by id
+        """
+        trigger_ids = {trigger_id for trigger_id, _ in outcomes}
+        if not trigger_ids:
+            return {}
+        
+        triggers = {
+            trigger.id: trigger
+            for trigger in self.session.exec(
+                select(Trigger).where(Trigger.id.in_(trigger_ids))
+            ).all()
+        }
+        for trigger_id, status in outcomes:
+            trigger = triggers.get(trigger_id)
+            if trigger is None:
+                continue
+            trigger.last_execution_status = status.value
+            trigger.consecutive_failures += 1
+            self._check_auto_disable(trigger)
+            self.session.add(trigger)
+        
+        self.session.commit()
+        return triggers
+    
     def _check_auto_disable(self, trigger: Trigger) -> bool:
         """
         Check if trigger should be auto-disabled based on consecutive failures.
@@ -0,0 +1,51 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""
+Celery task that turns accepted webhooks into trigger executions.
+"""
+
+import logging
+
+from app.core.database import session_make
+from app.core.redis_utils import get_redis_manager
+from app.domains.trigger.service.webhook_outbox_service import (
+    DISPATCH_QUEUE,
+    DISPATCH_REQUESTED_KEY,
+    WebhookOutboxService,
+)
+from celery import shared_task
+
+logger = logging.getLogger("server_webhook_dispatch_task")
+
+
+@shared_task(queue=DISPATCH_QUEUE)
+def dispatch_webhook_outbox() -> None:
+    """Dispatch every due webhook outbox row.
+
+    Queued by the webhook endpoint and run periodically by beat to pick up
+    retries and requests whose dispatch could not be queued.
+    """
+    # Cleared before claiming: webhooks stored from here on queue another run,
+    # and everything stored earlier is claimed by this one.
+    try:
+        get_redis_manager().client.delete(DISPATCH_REQUESTED_KEY)
+    except Exception as e:
+        logger.warning("Failed to clear webhook dispatch request", extra={"error": str(e)})
+
+    session = session_make()
+    try:
+        WebhookOutboxService(session).dispatch_pending()
+    finally:
+        session.close()
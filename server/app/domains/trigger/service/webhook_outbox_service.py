@@ -0,0 +1,457 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""
+Webhook Outbox Service
+
+The webhook endpoint only authenticates a request and stores it here; the
+dispatcher claims stored requests in batches and does the filtering, rate
+limiting, execution creation and event publishing.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from loguru import logger
+from sqlalchemy import delete
+from sqlmodel import col, func, select
+
+from app.core.trigger_utils import (
+    WEBHOOK_OUTBOX_BATCH_SIZE,
+    WEBHOOK_OUTBOX_MAX_ATTEMPTS,
+    WEBHOOK_OUTBOX_RETRY_BASE_SECONDS,
+    WEBHOOK_OUTBOX_RETRY_MAX_SECONDS,
+    execution_counts,
+    rate_limit_exceeded,
+)
+from app.domains.trigger.service.app_handler_service import get_app_handler
+from app.model.trigger.trigger import Trigger
+from app.model.trigger.trigger_execution import TriggerExecution
+from app.model.trigger.webhook_outbox import WebhookOutbox
+from app.shared.types.trigger_types import (
+    ExecutionStatus,
+    ExecutionType,
+    TriggerStatus,
+    TriggerType,
+    WebhookOutboxStatus,
+)
+
+# Trigger types that use webhooks
+WEBHOOK_TRIGGER_TYPES = [TriggerType.webhook, TriggerType.slack_trigger]
+WEBHOOK_TRIGGER_STATUSES = [TriggerStatus.active, TriggerStatus.pending_verification]
+
+DISPATCH_TASK_NAME = "app.domains.trigger.service.webhook_dispatch_task.dispatch_webhook_outbox"
+DISPATCH_QUEUE = "dispatch_webhook_outbox"
+# Set while a dispatch run is queued, so a burst of webhooks queues one run
+DISPATCH_REQUESTED_KEY = "webhook_outbox:dispatch_requested"
+DISPATCH_REQUESTED_TTL_SECONDS = 30
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after ``attempts`` failed ones."""
+    seconds = WEBHOOK_OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, WEBHOOK_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def parse_webhook_body(body: str):
+    """Parse a stored body the way the webhook endpoint always has."""
+    if not body:
+        return {}
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError:
+        return {"raw_body": body}
+
+
+async def request_dispatch() -> None:
+    """
+    Ask a worker to drain the outbox.
+
+    Only the first webhook after a dispatch run starts queues another run.
+    Failures are logged and left to the periodic outbox sweep.
+    """
+    try:
+        from app.core.redis_utils import get_async_redis_manager
+        redis_client = get_async_redis_manager().client
+        if not await redis_client.set(DISPATCH_REQUESTED_KEY, "1", nx=True, ex=DISPATCH_REQUESTED_TTL_SECONDS):
+            return
+        from app.core.celery import celery
+        celery.send_task(DISPATCH_TASK_NAME, queue=DISPATCH_QUEUE)
+    except Exception as e:
+        logger.warning(f"Failed to request webhook dispatch: {e}")
+
+
+class WebhookOutboxService:
+    """Service for storing accepted webhooks and dispatching them.
+
+    Rows move from pending to delivering when their execution is created and
+    are deleted once the execution event has been published, or when the
+    event is filtered out. Failed attempts are retried with exponential
+    backoff; after WEBHOOK_OUTBOX_MAX_ATTEMPTS the row is kept as failed.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    def enqueue(self, trigger: Trigger, request_meta: dict, body_raw: str) -> int:
+        """
+        Store an authenticated webhook request for the dispatcher.
+
+        Args:
+            trigger: The trigger the webhook was addressed to
+            request_meta: headers, query_params, method, url and client_ip
+            body_raw: Decoded request body
+
+        Returns:
+            ID of the stored outbox row
+        """
+        row = WebhookOutbox(
+            trigger_id=trigger.id,
+            method=request_meta["method"],
+            url=request_meta["url"],
+            client_ip=request_meta.get("client_ip"),
+            headers=request_meta.get("headers"),
+            query_params=request_meta.get("query_params"),
+            body=body_raw
+        )
+        self.session.add(row)
+        self.session.flush()
+        row_id = row.id
+        self.session.commit()
+        return row_id
+
+    def claim_batch(self, limit: Optional[int] = None) -> List[WebhookOutbox]:
+        """
+        Claim outbox rows whose next attempt is due, oldest first.
+
+        Rows are locked with FOR UPDATE SKIP LOCKED, so several dispatchers
+        can run at once and each claims a disjoint batch.
+        """
+        statement = (
+            select(WebhookOutbox)
+            .where(col(WebhookOutbox.status).in_([WebhookOutboxStatus.pending, WebhookOutboxStatus.delivering]))
+            .where(WebhookOutbox.next_attempt_at <= _utcnow())
+            .order_by(WebhookOutbox.id)
+            .limit(limit or WEBHOOK_OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        return list(self.session.exec(statement).all())
+
+    def dispatch_batch(self, rows: List[WebhookOutbox]) -> Tuple[int, int, int]:
+        """
+        Dispatch a batch of claimed outbox rows.
+
+        Triggers, rate limit counts and single-execution counts for the
+        whole batch are read with one query each. Executions are inserted,
+        filtered rows deleted and failed rows rescheduled in one commit; the
+        execution events are then published in one Redis round trip.
+        Delivering rows are leased until their next retry, so a dispatcher
+        that dies before publishing leaves them to be published again.
+
+        Must not be called from a running event loop: app handler filters
+        are coroutines and are run with asyncio.run.
+
+        Args:
+            rows: Claimed outbox rows
+
+        Returns:
+            Tuple of (dispatched_count, ignored_count, retried_count)
+
+        Raises:
+            Exception: If the batch cannot be committed; the caller rolls back
+        """
+        if not rows:
+            return 0, 0, 0
+
+        now = datetime.now(timezone.utc)
+        triggers = {
+            trigger.id: trigger
+            for trigger in self.session.exec(
+                select(Trigger).where(col(Trigger.id).in_({row.trigger_id for row in rows}))
+            ).all()
+        }
+        fresh = [row for row in rows if row.status == WebhookOutboxStatus.pending]
+        redelivered = [row for row in rows if row.status == WebhookOutboxStatus.delivering]
+
+        reasons, errors = asyncio.run(self._filter_events(fresh, triggers)) if fresh else ({}, {})
+
+        limited = [t for t in triggers.values() if t.max_executions_per_hour or t.max_executions_per_day]
+        counts = execution_counts(
+            self.session,
+            [t.id for t in limited],
+            now,
+            include_day=any(t.max_executions_per_day for t in limited)
+        )
+        single = [t.id for t in triggers.values() if t.is_single_execution]
+        executed: Dict[int, int] = {}
+        if single:
+            executed = dict(self.session.exec(
+                select(TriggerExecution.trigger_id, func.count())
+                .where(col(TriggerExecution.trigger_id).in_(single))
+                .group_by(TriggerExecution.trigger_id)
+            ).all())
+
+        executions: List[TriggerExecution] = []
+        events: List[dict] = []
+        delivering: List[WebhookOutbox] = []
+        ignored_ids: List[int] = []
+        retried = 0
+
+        for row in fresh:
+            if row.id in errors:
+                self._record_failure(row, errors[row.id])
+                retried += 1
+                continue
+
+            trigger = triggers.get(row.trigger_id)
+            reason = reasons.get(row.id)
+            if reason is None and trigger.is_single_execution and executed.get(trigger.id, 0) > 0:
+                reason = "single_execution_completed"
+            hourly_count, daily_count = counts.get(trigger.id, (0, 0)) if trigger else (0, 0)
+            if reason is None and rate_limit_exceeded(trigger, hourly_count, daily_count):
+                reason = "rate_limited"
+            if reason is not None:
+                logger.debug("Webhook event ignored", extra={
+                    "outbox_id": row.id,
+                    "trigger_id": row.trigger_id,
+                    "reason": reason
+                })
+                ignored_ids.append(row.id)
+                continue
+
+            try:
+                execution_input = self._normalize(row, trigger)
+            except Exception as e:
+                self._record_failure(row, f"normalize failed: {e}")
+                retried += 1
+                continue
+
+            handler = get_app_handler(trigger.trigger_type)
+            execution = TriggerExecution(
+                trigger_id=trigger.id,
+                execution_id=str(uuid4()),
+                execution_type=handler.execution_type if handler else ExecutionType.webhook,
+                status=ExecutionStatus.pending,
+                input_data=execution_input,
+                started_at=now
+            )
+            executions.append(execution)
+            counts[trigger.id] = (hourly_count + 1, daily_count + 1)
+            executed[trigger.id] = executed.get(trigger.id, 0) + 1
+
+            trigger.last_executed_at = now
+            trigger.last_execution_status = "pending"
+
+            row.status = WebhookOutboxStatus.delivering
+            row.execution_id = execution.execution_id
+            row.next_attempt_at = now.replace(tzinfo=None) + retry_delay(row.attempts + 1)
+            delivering.append(row)
+            events.append(self._execution_event(execution, trigger))
+
+        if redelivered:
+            pending = {
+                execution.execution_id: execution
+                for execution in self.session.exec(
+                    select(TriggerExecution).where(
+                        col(TriggerExecution.execution_id).in_([row.execution_id for row in redelivered]),
+                        TriggerExecution.status == ExecutionStatus.pending
+                    )
+                ).all()
+            }
+            for row in redelivered:
+                execution = pending.get(row.execution_id)
+                trigger = triggers.get(row.trigger_id)
+                if execution is None or trigger is None:
+                    # Acknowledged, timed out or deleted since the last attempt
+                    ignored_ids.append(row.id)
+                    continue
+                row.next_attempt_at = now.replace(tzinfo=None) + retry_delay(row.attempts + 1)
+                delivering.append(row)
+                events.append(self._execution_event(execution, trigger))
+
+        delivering_ids = [row.id for row in delivering]
+        if ignored_ids:
+            self.session.exec(delete(WebhookOutbox).where(col(WebhookOutbox.id).in_(ignored_ids)))
+        self.session.add_all(executions)
+        self.session.commit()
+
+        # A failed publish keeps the rows for the next attempt; the executions
+        # stay pending either way
+        if events:
+            from app.core.redis_utils import get_redis_manager
+            if get_redis_manager().publish_execution_events(events):
+                self.session.exec(delete(WebhookOutbox).where(col(WebhookOutbox.id).in_(delivering_ids)))
+            else:
+                logger.warning("Failed to publish webhook execution events", extra={
+                    "execution_ids": [event["execution_id"] for event in events]
+                })
+                for row in delivering:
+                    self._record_failure(row, "publish failed")
+                retried += len(delivering)
+            self.session.commit()
+
+        logger.info("Webhook outbox batch dispatched", extra={
+            "claimed": len(rows),
+            "dispatched": len(executions),
+            "ignored": len(ignored_ids),
+            "retried": retried
+        })
+        return len(executions), len(ignored_ids), retried
+
+    def dispatch_pending(self, max_batches: Optional[int] = None) -> Tuple[int, int, int]:
+        """
+        Dispatch due outbox rows in batches until none are left.
+
+        A batch that cannot be committed is rolled back and every row in it
+        is rescheduled, so one bad batch does not stall the rows behind it.
+
+        Returns:
+            Tuple of (total_dispatched, total_ignored, total_retried)
+        """
+        totals = [0, 0, 0]
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = self.claim_batch()
+            if not rows:
+                break
+            batches += 1
+            row_ids = [row.id for row in rows]
+            try:
+                result = self.dispatch_batch(rows)
+            except Exception as e:
+                logger.error("Failed to dispatch webhook outbox batch", extra={
+                    "outbox_ids": row_ids,
+                    "error": str(e)
+                }, exc_info=True)
+                self.session.rollback()
+                if not self._reschedule(row_ids, str(e)):
+                    break
+                result = (0, 0, len(row_ids))
+            for i, count in enumerate(result):
+                totals[i] += count
+
+        if any(totals):
+            logger.info("Webhook outbox drained", extra={
+                "total_dispatched": totals[0],
+                "total_ignored": totals[1],
+                "total_retried": totals[2]
+            })
+        return totals[0], totals[1], totals[2]
+
+    async def _filter_events(
+        self,
+        rows: List[WebhookOutbox],
+        triggers: Dict[int, Trigger]
+    ) -> Tuple[Dict[int, str], Dict[int, str]]:
+        """Run app-specific filters; returns (ignore reasons, errors) by row id."""
+        reasons: Dict[int, str] = {}
+        errors: Dict[int, str] = {}
+        for row in rows:
+            trigger = triggers.get(row.trigger_id)
+            if (
+                trigger is None
+                or trigger.trigger_type not in WEBHOOK_TRIGGER_TYPES
+                or trigger.status not in WEBHOOK_TRIGGER_STATUSES
+            ):
+                reasons[row.id] = "trigger_inactive"
+                continue
+            handler = get_app_handler(trigger.trigger_type)
+            if not handler:
+                continue
+            try:
+                payload = parse_webhook_body(row.body)
+                # For default webhook handler, pass additional context
+                if trigger.trigger_type == TriggerType.webhook:
+                    result = await handler.filter_event(
+                        payload,
+                        trigger,
+                        headers=row.headers or {},
+                        body_raw=row.body
+                    )
+                else:
+                    result = await handler.filter_event(payload, trigger)
+            except Exception as e:
+                errors[row.id] = f"filter failed: {e}"
+                continue
+            if not result.success:
+                reasons[row.id] = result.reason or "filtered"
+        return reasons, errors
+
+    def _normalize(self, row: WebhookOutbox, trigger: Trigger) -> dict:
+        payload = parse_webhook_body(row.body)
+        request_meta = {
+            "headers": row.headers or {},
+            "query_params": row.query_params or {},
+            "method": row.method,
+            "url": row.url,
+            "client_ip": row.client_ip
+        }
+        handler = get_app_handler(trigger.trigger_type)
+        if handler:
+            return handler.normalize_payload(payload, trigger, request_meta=request_meta)
+        return {**request_meta, "body": payload}
+
+    @staticmethod
+    def _execution_event(execution: TriggerExecution, trigger: Trigger) -> dict:
+        return {
+            "type": "execution_created",
+            "execution_id": execution.execution_id,
+            "trigger_id": trigger.id,
+            "trigger_type": trigger.trigger_type.value,
+            "task_prompt": trigger.task_prompt,
+            "status": "pending",
+            "input_data": execution.input_data,
+            "user_id": str(trigger.user_id),
+            "project_id": str(trigger.project_id)
+        }
+
+    def _record_failure(self, row: WebhookOutbox, error: str) -> None:
+        row.attempts += 1
+        row.last_error = error[:1000]
+        if row.attempts >= WEBHOOK_OUTBOX_MAX_ATTEMPTS:
+            row.status = WebhookOutboxStatus.failed
+            logger.error("Webhook outbox row failed permanently", extra={
+                "outbox_id": row.id,
+                "trigger_id": row.trigger_id,
+                "attempts": row.attempts,
+                "error": row.last_error
+            })
+        else:
+            row.next_attempt_at = _utcnow() + retry_delay(row.attempts)
+        self.session.add(row)
+
+    def _reschedule(self, row_ids: List[int], error: str) -> bool:
+        """Record a failed attempt for rows whose batch was rolled back."""
+        try:
+            rows = self.session.exec(
+                select(WebhookOutbox).where(col(WebhookOutbox.id).in_(row_ids)).with_for_update()
+            ).all()
+            for row in rows:
+                self._record_failure(row, error)
+            self.session.commit()
+            return True
+        except Exception as e:
+            logger.error("Failed to reschedule webhook outbox rows", extra={
+                "outbox_ids": row_ids,
+                "error": str(e)
+            }, exc_info=True)
+            self.session.rollback()
+            return False
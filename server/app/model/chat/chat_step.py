@@ -17,12 +17,15 @@ from datetime import datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, field_validator
+from sqlalchemy import Index
 from sqlmodel import JSON, Field
 
 from app.model.abstract.model import AbstractModel, DefaultTimes
 
 
 class ChatStep(AbstractModel, DefaultTimes, table=True):
+    __table_args__ = (Index("ix_chat_step_task_run_timestamp_id", "task_id", "run_id", "timestamp", "id"),)
+
     id: int = Field(default=None, primary_key=True)
     task_id: str = Field(index=True)
     run_id: str | None = Field(default=None, index=True)
@@ -19,8 +19,11 @@ from app.model.space.apply import (
     ApplyFailure,
     ApplyResolutionIn,
     ApplyWarning,
+    MAX_OVERLAY_BATCH_WRITES,
     OVERLAY_SOURCE_PATH_METADATA_KEY,
     OVERLAY_SOURCE_ROOT_METADATA_KEY,
+    SpaceOverlayBatchWriteIn,
+    SpaceOverlayBatchWriteResponse,
     SpaceOverlayDiscardIn,
     SpaceOverlayDiscardResponse,
     SpaceOverlayListResponse,
@@ -57,8 +60,11 @@ __all__ = [
     "ApplyFailure",
     "ApplyResolutionIn",
     "ApplyWarning",
+    "MAX_OVERLAY_BATCH_WRITES",
     "OVERLAY_SOURCE_PATH_METADATA_KEY",
     "OVERLAY_SOURCE_ROOT_METADATA_KEY",
+    "SpaceOverlayBatchWriteIn",
+    "SpaceOverlayBatchWriteResponse",
     "SpaceOverlayDiscardIn",
     "SpaceOverlayDiscardResponse",
     "SpaceOverlayListResponse",
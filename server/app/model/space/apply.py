@@ -54,6 +54,14 @@ class SpaceOverlayWriteIn(BaseModel):
     metadata: dict[str, str | int | float | bool | None] | None = None
 
 
+# Largest batch accepted by the bulk overlay endpoint
+MAX_OVERLAY_BATCH_WRITES = 500
+
+
+class SpaceOverlayBatchWriteIn(BaseModel):
+    writes: list[SpaceOverlayWriteIn] = Field(max_length=MAX_OVERLAY_BATCH_WRITES)
+
+
 class SpaceOverlayOut(BaseModel):
     id: int
     space_id: str
@@ -75,6 +83,12 @@ class SpaceOverlayListResponse(BaseModel):
     overlays: list[SpaceOverlayOut] = Field(default_factory=list)
 
 
+class SpaceOverlayBatchWriteResponse(BaseModel):
+    space_id: str
+    project_id: str
+    overlays: list[SpaceOverlayOut] = Field(default_factory=list)
+
+
 class SpaceOverlayDiscardIn(BaseModel):
     run_id: str | None = None
     paths: list[str] | None = None
@@ -15,6 +15,7 @@
 """Trigger models package."""
 from app.model.trigger.trigger import Trigger, TriggerIn, TriggerUpdate, TriggerOut, TriggerConfigSchemaOut
 from app.model.trigger.trigger_execution import TriggerExecution, TriggerExecutionIn, TriggerExecutionUpdate
+from app.model.trigger.webhook_outbox import WebhookOutbox
 
 __all__ = [
     "Trigger",
@@ -24,5 +25,6 @@ __all__ = [
     "TriggerExecution",
     "TriggerExecutionIn",
     "TriggerExecutionUpdate",
+    "WebhookOutbox",
     "TriggerConfigSchemaOut"
 ]
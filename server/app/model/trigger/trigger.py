@@ -48,6 +48,11 @@ class Trigger(AbstractModel, DefaultTimes, table=True):
         sa_column=Column(String(1024)),
         description="Auto-generated webhook URL for webhook triggers"
     )
+    webhook_uuid: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(64), unique=True, index=True),
+        description="Last path segment of webhook_url; incoming webhooks are looked up by it"
+    )
     webhook_method: Optional[RequestType] = Field(
         default=None,
         sa_column=Column(ChoiceType(RequestType, String(50))),
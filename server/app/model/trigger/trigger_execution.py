@@ -14,6 +14,7 @@
 
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index, event
 from sqlmodel import Field, Column, SmallInteger, JSON, String, Float
 from sqlalchemy_utils import ChoiceType
 from pydantic import BaseModel
@@ -25,6 +26,13 @@ from app.shared.types.trigger_types import ExecutionType, ExecutionStatus
 class TriggerExecution(AbstractModel, DefaultTimes, table=True):
     """Output model for execution records"""
     
+    # Rate limit counts scan one trigger's recent executions; the timeout
+    # sweeper only reads in-flight executions whose deadline has passed
+    __table_args__ = (
+        Index("ix_trigger_execution_trigger_id_created_at", "trigger_id", "created_at"),
+        Index("ix_trigger_execution_status_deadline_at", "status", "deadline_at"),
+    )
+    
     id: int = Field(default=None, primary_key=True)
     trigger_id: int = Field(foreign_key="trigger.id", index=True, description="ID of the trigger that created this execution")
     execution_id: str = Field(unique=True, index=True, description="Unique execution identifier")
@@ -53,6 +61,10 @@ class TriggerExecution(AbstractModel, DefaultTimes, table=True):
         sa_column=Column(Float),
         description="Duration of execution in seconds"
     )
+    deadline_at: Optional[datetime] = Field(
+        default=None,
+        description="UTC time a pending or running execution times out; maintained on insert and update"
+    )
     
     # Execution data
     input_data: Optional[dict] = Field(
@@ -97,6 +109,15 @@ class TriggerExecution(AbstractModel, DefaultTimes, table=True):
     )
 
 
+@event.listens_for(TriggerExecution, "before_insert")
+@event.listens_for(TriggerExecution, "before_update")
+def _set_deadline(mapper, connection, target: TriggerExecution) -> None:
+    # Imported here: trigger_utils imports this module.
+    from app.core.trigger_utils import execution_deadline
+
+    target.deadline_at = execution_deadline(target)
+
+
 class TriggerExecutionIn(BaseModel):
     """Input model for creating trigger executions"""
     trigger_id: int
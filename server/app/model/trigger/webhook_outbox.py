@@ -0,0 +1,69 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Index, Text
+from sqlalchemy_utils import ChoiceType
+from sqlmodel import JSON, Column, Field, String
+
+from app.model.abstract.model import AbstractModel, DefaultTimes
+from app.shared.types.trigger_types import WebhookOutboxStatus
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class WebhookOutbox(AbstractModel, DefaultTimes, table=True):
+    """Accepted webhook request waiting for the webhook dispatcher"""
+
+    # The dispatcher claims rows whose next attempt is due
+    __table_args__ = (
+        Index("ix_webhook_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    trigger_id: int = Field(description="Trigger the webhook was addressed to")
+    status: WebhookOutboxStatus = Field(
+        default=WebhookOutboxStatus.pending,
+        sa_column=Column(ChoiceType(WebhookOutboxStatus, String(50))),
+        description="pending until an execution exists, delivering until its event is published"
+    )
+
+    # Request as received
+    method: str = Field(sa_column=Column(String(10)), description="HTTP method")
+    url: str = Field(sa_column=Column(String(2048)), description="Request URL")
+    client_ip: Optional[str] = Field(default=None, sa_column=Column(String(64)), description="Sender address")
+    headers: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSON),
+        description="Request headers without authorization and cookies"
+    )
+    query_params: Optional[dict] = Field(default=None, sa_column=Column(JSON), description="Query parameters")
+    body: str = Field(default="", sa_column=Column(Text), description="Raw request body")
+
+    # Dispatch state
+    execution_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(64)),
+        description="Execution created for this request, once dispatched"
+    )
+    attempts: int = Field(default=0, description="Failed dispatch attempts so far")
+    next_attempt_at: datetime = Field(
+        default_factory=_utcnow,
+        description="Naive UTC time the dispatcher may next claim this row"
+    )
+    last_error: Optional[str] = Field(default=None, description="Error of the last failed attempt")
@@ -17,7 +17,8 @@ from datetime import date, datetime
 from enum import IntEnum
 
 from pydantic import BaseModel
-from sqlalchemy import Boolean, SmallInteger, text
+from sqlalchemy import Boolean, SmallInteger, delete, event, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy_utils import ChoiceType
 from sqlmodel import Column, Field, Session, col, select
 
@@ -73,32 +74,12 @@ class UserCreditsRecord(AbstractModel, DefaultTimes, table=True):
     @classmethod
     def get_permanent_credits(cls, user_id: int) -> int:
         """
-        获取可用的token总量，直接用SQL聚合sum
+        获取可用的token总量，读取物化的积分余额行
         Returns:
             int: 可用的token总量
         """
-        session = session_make()
-        from sqlalchemy import func
-
-        statement = (
-            select(func.sum(UserCreditsRecord.amount))
-            .where(UserCreditsRecord.user_id == user_id)
-            .where(
-                UserCreditsRecord.channel.in_(
-                    [
-                        CreditsChannel.register,
-                        CreditsChannel.invite,
-                        CreditsChannel.paid,
-                        CreditsChannel.addon,
-                        CreditsChannel.monthly,
-                    ]
-                )
-            )
-            .where(UserCreditsRecord.used == False)
-            .where((UserCreditsRecord.expire_at.is_(None)) | (col(UserCreditsRecord.expire_at) > datetime.now()))
-        )
-        result = session.exec(statement).first()
-        return result or 0
+        with session_make() as session:
+            return UserCreditsBalance.get(user_id, session).permanent
 
     @classmethod
     def get_temp_credits(cls, user_id: int) -> tuple[int, date]:
@@ -109,19 +90,11 @@ class UserCreditsRecord(AbstractModel, DefaultTimes, table=True):
         Returns:
             int: 可用的临时token总量
         """
-        session = session_make()
-        statement = (
-            select(UserCreditsRecord)
-            .where(UserCreditsRecord.user_id == user_id)
-            .where(UserCreditsRecord.channel == CreditsChannel.daily)
-            .where(UserCreditsRecord.used == False)
-            .where(UserCreditsRecord.expire_at.is_not(None))
-            .where(col(UserCreditsRecord.expire_at) > datetime.now())
-        )
-        record: UserCreditsRecord = session.exec(statement).first()
-        if record is None:
-            return 0, None
-        return record.amount - record.balance, record.expire_at
+        with session_make() as session:
+            balance = UserCreditsBalance.get(user_id, session)
+            if balance.daily_expire_at is None:
+                return 0, None
+            return balance.daily, balance.daily_expire_at
 
     @classmethod
     def consume_credits(cls, user_id: int, amount: int, session: Session, source_id: int = 0, remark: str = ""):
@@ -131,242 +104,305 @@ class UserCreditsRecord(AbstractModel, DefaultTimes, table=True):
         同时生成积分消耗记录，更新用户积分credits字段（不包括每日积分）。
         避免重复生成积分消耗记录和重复扣减积分。
         """
+        shortfall = cls.consume_credits_batch(
+            [CreditUsage(user_id=user_id, amount=amount, source_id=source_id, remark=remark)], session
+        )
+        if user_id in shortfall:
+            raise Exception(f"Insufficient credits: need {amount}, remain {shortfall[user_id]}")
 
-        # 检查是否已有积分消耗记录
-        existing_consume_record = None
-        if source_id > 0:
-            existing_consume_record = session.exec(
-                select(UserCreditsRecord)
-                .where(UserCreditsRecord.user_id == user_id)
-                .where(UserCreditsRecord.channel == CreditsChannel.consume)
-                .where(UserCreditsRecord.source_id == source_id)
-            ).first()
-
-        if existing_consume_record:
-            # 如果新amount更大，需要额外消耗积分
-            if amount > 0:
-                existing_consume_record.amount -= amount
-                session.add(existing_consume_record)
-                # 直接处理额外的积分消耗，不生成新的消耗记录
-                cls._consume_credits_internal_update(user_id, amount, session, source_id, remark)
-            # 如果新amount更小，需要退还积分（这里可以根据业务需求决定是否实现）
-            else:
-                # 暂时不实现退还逻辑，可以根据需要添加
-                pass
+    @classmethod
+    def consume_credits_batch(cls, usages: list["CreditUsage"], session: Session) -> dict[int, int]:
+        """
+        批量结算积分消耗，一次事务处理多条 request_usage 事件。
 
-            session.commit()
-            return
+        每个用户仍按 daily → monthly/paid/addon（按过期时间）的顺序扣减。
+        记录的 balance 以比较再写入（compare-and-set）方式更新，并发结算
+        不会重复扣减同一份积分；冲突时回滚重试。
 
-        # 没有现有记录，执行正常的积分消耗流程
-        cls._consume_credits_internal(user_id, amount, session, source_id, remark)
+        Returns:
+            dict[int, int]: 积分不足的用户及其未能扣减的数量
+        """
+        usages = [usage for usage in usages if usage.amount > 0]
+        if not usages:
+            return {}
+        for _ in range(_SETTLE_ATTEMPTS):
+            try:
+                return cls._settle(usages, session)
+            except _BalanceChanged:
+                session.rollback()
+        raise Exception(f"Credit settlement kept conflicting after {_SETTLE_ATTEMPTS} attempts")
 
     @classmethod
-    def _consume_credits_internal(
-        cls, user_id: int, amount: int, session: Session, source_id: int = 0, remark: str = ""
-    ):
-        """
-        内部积分消耗逻辑，处理实际的积分扣减
-        """
+    def _settle(cls, usages: list["CreditUsage"], session: Session) -> dict[int, int]:
         from app.model.user.user import User
 
-        remain = amount
         now = datetime.now()
-        consumed_from_daily = 0
-        consumed_from_other = 0
-
-        # 优先消耗daily
-        statement = (
-            select(UserCreditsRecord)
-            .where(UserCreditsRecord.user_id == user_id)
-            .where(UserCreditsRecord.channel == CreditsChannel.daily)
-            .where(UserCreditsRecord.used == False)
-            .where(UserCreditsRecord.expire_at.is_not(None))
-            .where(col(UserCreditsRecord.expire_at) > now)
-            .order_by(UserCreditsRecord.expire_at)
-        )
-        daily_records = session.exec(statement).first()
-        if daily_records:
-            can_consume = daily_records.amount - daily_records.balance
-            use = min(remain, can_consume)
-            daily_records.balance += use
-            session.add(daily_records)
-            remain -= use
-            consumed_from_daily = use
-            if remain == 0:
-                # 生成积分消耗记录
-                consume_record = UserCreditsRecord(
-                    user_id=user_id,
-                    amount=-amount,
-                    channel=CreditsChannel.consume,
-                    source_id=source_id,
-                    remark=remark or f"Consumed {amount} credits (daily: {consumed_from_daily})",
-                )
-                session.add(consume_record)
-                session.commit()
-                return
-
-        # 若daily不够，继续消耗monthly/paid/addon
-        if remain > 0:
-            statement = (
+        by_user: dict[int, list[CreditUsage]] = {}
+        for usage in usages:
+            by_user.setdefault(usage.user_id, []).append(usage)
+        user_ids = sorted(by_user)
+
+        # Lock users in id order so concurrent settlements for the same user
+        # queue up instead of deadlocking (no-op on SQLite).
+        session.exec(select(User.id).where(col(User.id).in_(user_ids)).order_by(User.id).with_for_update()).all()
+
+        spendable: dict[int, list[UserCreditsRecord]] = {user_id: [] for user_id in user_ids}
+        for record in _spendable_records(session, user_ids, now):
+            spendable[record.user_id].append(record)
+
+        source_ids = {usage.source_id for usage in usages if usage.source_id > 0}
+        existing: dict[tuple[int, int], UserCreditsRecord] = {}
+        if source_ids:
+            for record in session.exec(
                 select(UserCreditsRecord)
-                .where(UserCreditsRecord.user_id == user_id)
-                .where(
-                    UserCreditsRecord.channel.in_(
-                        [
-                            CreditsChannel.monthly,
-                            CreditsChannel.paid,
-                            CreditsChannel.addon,
-                            CreditsChannel.register,
-                            CreditsChannel.invite,
-                        ]
+                .where(col(UserCreditsRecord.user_id).in_(user_ids))
+                .where(UserCreditsRecord.channel == CreditsChannel.consume)
+                .where(col(UserCreditsRecord.source_id).in_(source_ids))
+            ).all():
+                existing.setdefault((record.user_id, record.source_id), record)
+
+        connection = session.connection()
+        shortfall: dict[int, int] = {}
+        for user_id in user_ids:
+            records = spendable[user_id]
+            taken = [0] * len(records)
+            consumed_from_daily = 0
+            consumed_from_other = 0
+            # Consume records added by this batch, keyed by source id.
+            created: dict[int, UserCreditsRecord] = {}
+
+            for usage in by_user[user_id]:
+                remain = usage.amount
+                from_daily = 0
+                from_other = 0
+                for i, record in enumerate(records):
+                    can_consume = record.amount - record.balance - taken[i]
+                    if can_consume <= 0:
+                        continue
+                    use = min(remain, can_consume)
+                    taken[i] += use
+                    remain -= use
+                    if record.channel == CreditsChannel.daily:
+                        from_daily += use
+                    else:
+                        from_other += use
+                    if remain == 0:
+                        break
+                consumed_from_daily += from_daily
+                consumed_from_other += from_other
+                if remain > 0:
+                    shortfall[user_id] = shortfall.get(user_id, 0) + remain
+
+                previous = existing.get((user_id, usage.source_id)) if usage.source_id > 0 else None
+                if previous is not None:
+                    connection.execute(
+                        update(UserCreditsRecord)
+                        .where(col(UserCreditsRecord.id) == previous.id)
+                        .values(amount=UserCreditsRecord.amount - usage.amount)
+                    )
+                elif usage.source_id > 0 and usage.source_id in created:
+                    created[usage.source_id].amount -= usage.amount
+                else:
+                    consume_record = UserCreditsRecord(
+                        user_id=user_id,
+                        amount=-usage.amount,
+                        channel=CreditsChannel.consume,
+                        source_id=usage.source_id,
+                        remark=usage.remark
+                        or f"Consumed {usage.amount} credits (daily: {from_daily}, other: {from_other})",
                     )
+                    session.add(consume_record)
+                    if usage.source_id > 0:
+                        created[usage.source_id] = consume_record
+
+            for record, use in zip(records, taken):
+                if use == 0:
+                    continue
+                result = connection.execute(
+                    update(UserCreditsRecord)
+                    .where(col(UserCreditsRecord.id) == record.id)
+                    .where(col(UserCreditsRecord.balance) == record.balance)
+                    .values(balance=record.balance + use)
                 )
-                .where(UserCreditsRecord.used == False)
-                .where((UserCreditsRecord.expire_at.is_(None)) | (col(UserCreditsRecord.expire_at) > now))
-                .order_by(UserCreditsRecord.expire_at)
+                if result.rowcount != 1:
+                    raise _BalanceChanged(user_id)
+
+            # 更新用户积分字段（只扣除非每日积分消耗的部分）
+            if consumed_from_other > 0:
+                connection.execute(
+                    update(User).where(col(User.id) == user_id).values(credits=User.credits - consumed_from_other)
+                )
+            if consumed_from_daily > 0:
+                connection.execute(
+                    update(UserCreditsBalance)
+                    .where(col(UserCreditsBalance.user_id) == user_id)
+                    .values(daily=UserCreditsBalance.daily - consumed_from_daily)
+                )
+            logger.info(
+                "credits settled",
+                extra={
+                    "user_id": user_id,
+                    "events": len(by_user[user_id]),
+                    "daily": consumed_from_daily,
+                    "other": consumed_from_other,
+                },
             )
-            other_records = session.exec(statement).all()
-            for record in other_records:
-                can_consume = record.amount - record.balance
-                if can_consume <= 0:
-                    continue
-                use = min(remain, can_consume)
-                record.balance += use
-                session.add(record)
-                remain -= use
-                consumed_from_other += use
-                if remain == 0:
-                    break
-
-        # 更新用户积分字段（只扣除非每日积分消耗的部分）
-        if consumed_from_other > 0:
-            user = session.exec(select(User).where(User.id == user_id)).first()
-            if user:
-                user.credits -= consumed_from_other
-                session.add(user)
-
-        # 生成积分消耗记录
-        consume_record = UserCreditsRecord(
-            user_id=user_id,
-            amount=-amount,
-            channel=CreditsChannel.consume,
-            source_id=source_id,
-            remark=remark or f"Consumed {amount} credits (daily: {consumed_from_daily}, other: {consumed_from_other})",
-        )
-        session.add(consume_record)
-        session.commit()
 
-        if remain > 0:
-            raise Exception(f"Insufficient credits: need {amount}, remain {remain}")
+        session.commit()
+        return shortfall
 
     @classmethod
-    def _consume_credits_internal_update(
-        cls, user_id: int, amount: int, session: Session, source_id: int = 0, remark: str = ""
-    ):
+    def get_daily_balance_sum(cls, user_id: int) -> int:
         """
-        内部积分消耗逻辑（更新模式），处理实际的积分扣减但不生成新的消耗记录
-        用于更新现有消耗记录时的额外积分消耗
+        获取用户所有每日积分（daily channel）的balance字段之和
         """
-        from app.model.user.user import User
+        with session_make() as session:
+            statement = (
+                select(UserCreditsRecord.balance)
+                .where(UserCreditsRecord.user_id == user_id)
+                .where(UserCreditsRecord.channel == CreditsChannel.daily)
+            )
+            balances = session.exec(statement).all()
+            return sum(balances) if balances else 0
 
-        remain = amount
-        now = datetime.now()
-        consumed_from_other = 0
-
-        # 优先消耗daily
-        statement = (
-            select(UserCreditsRecord)
-            .where(UserCreditsRecord.user_id == user_id)
-            .where(UserCreditsRecord.channel == CreditsChannel.daily)
-            .where(UserCreditsRecord.used == False)
-            .where(UserCreditsRecord.expire_at.is_not(None))
-            .where(col(UserCreditsRecord.expire_at) > now)
-            .order_by(UserCreditsRecord.expire_at)
-        )
-        daily_records = session.exec(statement).first()
-        if daily_records:
-            can_consume = daily_records.amount - daily_records.balance
-            use = min(remain, can_consume)
-            daily_records.balance += use
-            session.add(daily_records)
-            remain -= use
-            if remain == 0:
-                # 不生成新的消耗记录，只更新现有记录
-                return
-
-        # 若daily不够，继续消耗monthly/paid/addon
-        if remain > 0:
+    @classmethod
+    def get_daily_balance(cls, user_id: int) -> int:
+        """
+        获取用户当前的每日积分数据
+        """
+        with session_make() as session:
             statement = (
                 select(UserCreditsRecord)
                 .where(UserCreditsRecord.user_id == user_id)
-                .where(
-                    UserCreditsRecord.channel.in_(
-                        [
-                            CreditsChannel.monthly,
-                            CreditsChannel.paid,
-                            CreditsChannel.addon,
-                            CreditsChannel.register,
-                            CreditsChannel.invite,
-                        ]
-                    )
-                )
+                .where(UserCreditsRecord.channel == CreditsChannel.daily)
                 .where(UserCreditsRecord.used == False)
-                .where((UserCreditsRecord.expire_at.is_(None)) | (col(UserCreditsRecord.expire_at) > now))
-                .order_by(UserCreditsRecord.expire_at)
             )
-            other_records = session.exec(statement).all()
-            for record in other_records:
-                can_consume = record.amount - record.balance
-                if can_consume <= 0:
-                    continue
-                use = min(remain, can_consume)
-                record.balance += use
-                session.add(record)
-                remain -= use
-                consumed_from_other += use
-                if remain == 0:
-                    break
-        logger.info(f"consumed_from_other: {consumed_from_other}")
-        # 更新用户积分字段（只扣除非每日积分消耗的部分）
-        if consumed_from_other > 0:
-            user = session.exec(select(User).where(User.id == user_id)).first()
-            if user:
-                user.credits -= consumed_from_other
-                session.add(user)
-
-        # 不生成新的消耗记录，因为现有记录已经在主函数中更新了
-
-        if remain > 0:
-            raise Exception(f"Insufficient credits: need {amount}, remain {remain}")
+            record = session.exec(statement).first()
+            return record
+
+
+_SPENDABLE_CHANNELS = [
+    CreditsChannel.monthly,
+    CreditsChannel.paid,
+    CreditsChannel.addon,
+    CreditsChannel.register,
+    CreditsChannel.invite,
+]
+# Each conflict means another settlement for the user committed, so this
+# bounds how many concurrent settlements one call can lose to.
+_SETTLE_ATTEMPTS = 10
+
+
+class _BalanceChanged(Exception):
+    """A credits record changed between reading and settling it."""
+
+
+def _spendable_records(session: Session, user_ids: list[int], now: datetime) -> list[UserCreditsRecord]:
+    """Unused, unexpired records in consumption order for each user.
+
+    Per user: the earliest-expiring daily record first, then monthly, paid,
+    addon, register and invite records by expiry, never-expiring last.
+    """
+    records = session.exec(
+        select(UserCreditsRecord)
+        .where(col(UserCreditsRecord.user_id).in_(user_ids))
+        .where(col(UserCreditsRecord.channel).in_([CreditsChannel.daily, *_SPENDABLE_CHANNELS]))
+        .where(UserCreditsRecord.used == False)
+        .where((UserCreditsRecord.expire_at.is_(None)) | (col(UserCreditsRecord.expire_at) > now))
+    ).all()
+    ordered: list[UserCreditsRecord] = []
+    daily_seen: set[int] = set()
+    for record in sorted(
+        records,
+        key=lambda r: (
+            r.user_id,
+            r.channel != CreditsChannel.daily,
+            r.expire_at is None,
+            r.expire_at or now,
+            r.id,
+        ),
+    ):
+        if record.channel == CreditsChannel.daily:
+            if record.expire_at is None or record.user_id in daily_seen:
+                continue
+            daily_seen.add(record.user_id)
+        ordered.append(record)
+    return ordered
+
+
+class CreditUsage(BaseModel):
+    """One usage event to settle, e.g. from a proxied request_usage step."""
+
+    user_id: int
+    amount: int
+    source_id: int = 0
+    remark: str = ""
+
+
+class UserCreditsBalance(AbstractModel, DefaultTimes, table=True):
+    """
+    物化的用户积分余额，替代每次余额查询时的聚合 SQL。
+
+    permanent 与 get_permanent_credits 的原聚合一致（未使用、未过期的
+    非每日记录 amount 之和），daily 为当前每日记录的剩余量。结算时在同一
+    事务内写穿 daily；发放、过期标记等对记录的 ORM 修改会删除该行，下次
+    读取时重新计算。valid_until 为参与计算的记录中最早的过期时间，过期后
+    同样重新计算。
+    """
+
+    user_id: int = Field(primary_key=True, foreign_key="user.id")
+    permanent: int = Field(default=0)
+    daily: int = Field(default=0)
+    daily_expire_at: datetime | None = Field(default=None, nullable=True)
+    valid_until: datetime | None = Field(default=None, nullable=True)
 
     @classmethod
-    def get_daily_balance_sum(cls, user_id: int) -> int:
-        """
-        获取用户所有每日积分（daily channel）的balance字段之和
-        """
-        session = session_make()
-        statement = (
-            select(UserCreditsRecord.balance)
-            .where(UserCreditsRecord.user_id == user_id)
-            .where(UserCreditsRecord.channel == CreditsChannel.daily)
-        )
-        balances = session.exec(statement).all()
-        return sum(balances) if balances else 0
+    def get(cls, user_id: int, session: Session) -> "UserCreditsBalance":
+        row = session.get(cls, user_id)
+        if row is not None and (row.valid_until is None or row.valid_until > datetime.now()):
+            return row
+        return cls.refresh(user_id, session)
 
     @classmethod
-    def get_daily_balance(cls, user_id: int) -> int:
-        """
-        获取用户当前的每日积分数据
-        """
-        session = session_make()
-        statement = (
-            select(UserCreditsRecord)
-            .where(UserCreditsRecord.user_id == user_id)
-            .where(UserCreditsRecord.channel == CreditsChannel.daily)
-            .where(UserCreditsRecord.used == False)
-        )
-        record = session.exec(statement).first()
-        return record
+    def refresh(cls, user_id: int, session: Session) -> "UserCreditsBalance":
+        """Recompute the balance row from the user's records."""
+        from app.model.user.user import User
+
+        now = datetime.now()
+        # Same lock as settlement, so a concurrent consume cannot commit
+        # between reading the records and writing the row.
+        session.exec(select(User.id).where(User.id == user_id).with_for_update()).all()
+        row = session.get(cls, user_id) or cls(user_id=user_id)
+        row.permanent = 0
+        row.daily = 0
+        row.daily_expire_at = None
+        row.valid_until = None
+        for record in _spendable_records(session, [user_id], now):
+            if record.channel == CreditsChannel.daily:
+                row.daily = record.amount - record.balance
+                row.daily_expire_at = record.expire_at
+            else:
+                row.permanent += record.amount
+            if record.expire_at is not None and (row.valid_until is None or record.expire_at < row.valid_until):
+                row.valid_until = record.expire_at
+        session.add(row)
+        try:
+            session.commit()
+        except IntegrityError:
+            # Another worker inserted the row first; theirs is just as fresh.
+            session.rollback()
+            return session.get(cls, user_id)
+        return row
+
+
+@event.listens_for(UserCreditsRecord, "after_insert")
+@event.listens_for(UserCreditsRecord, "after_update")
+@event.listens_for(UserCreditsRecord, "after_delete")
+def _invalidate_balance(mapper, connection, target: UserCreditsRecord) -> None:
+    # Consumption records do not count towards the balance.
+    if target.channel == CreditsChannel.consume:
+        return
+    connection.execute(delete(UserCreditsBalance).where(col(UserCreditsBalance.user_id) == target.user_id))
 
 
 class UserCreditsRecordWithChatOut(BaseModel):
@@ -0,0 +1,237 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+"""
+In-process cache of verified access tokens and user rows for auth_must.
+
+Tokens map to (user_id, jti, exp) and skip the JWT decode and the Redis
+blacklist lookup on a hit. Cached tokens are only served while this worker
+is subscribed to the blacklist pub/sub channel, so a logout on any worker
+evicts them; if the subscription drops, the token cache is cleared and
+every request goes back to Redis until it reconnects.
+
+User rows are cached as detached snapshots and merged into the request's
+session without a query. Updates and deletes through the ORM evict the
+row in this process; other workers see the change after AUTH_CACHE_TTL.
+Credentials and credit balances are left out of the snapshot and loaded
+from the database when read, since they change on other workers and
+through Core updates that evict nothing.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from redis import asyncio as aioredis
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+
+from app.core.environment import env, env_or_fail
+from app.model.user.user import User
+from app.shared.auth.token_blacklist import BLACKLIST_PUBSUB_CHANNEL
+
+logger = logging.getLogger("server_auth_cache")
+
+AUTH_CACHE_TTL = float(env("AUTH_CACHE_TTL", "30"))
+AUTH_CACHE_MAX_ENTRIES = int(env("AUTH_CACHE_MAX_ENTRIES", "10000"))
+PUBSUB_RECONNECT_BASE_SECONDS = 1.0
+PUBSUB_RECONNECT_MAX_SECONDS = 30.0
+# User columns never served from the cache
+UNCACHED_USER_COLUMNS = (
+    "password",
+    "credits",
+    "last_daily_credit_date",
+    "last_monthly_credit_date",
+)
+
+
+class CachedToken(NamedTuple):
+    user_id: int
+    jti: str | None
+    exp: int
+
+
+class _TTLCache:
+    """Size-bounded LRU whose entries expire after a fixed TTL."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def remove_where(self, predicate) -> int:
+        keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_tokens = _TTLCache(AUTH_CACHE_TTL, AUTH_CACHE_MAX_ENTRIES)
+_users = _TTLCache(AUTH_CACHE_TTL, AUTH_CACHE_MAX_ENTRIES)
+_listener_task: asyncio.Task | None = None
+_listener_ready = False
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_token(token: str) -> CachedToken | None:
+    """Return the verified claims for ``token`` if cached, live and not expired."""
+    if not _listener_ready:
+        return None
+    key = _token_key(token)
+    cached = _tokens.get(key)
+    if cached is None:
+        return None
+    if cached.exp < int(time.time()):
+        _tokens.pop(key)
+        return None
+    return cached
+
+
+def put_token(token: str, cached: CachedToken) -> None:
+    if _listener_ready:
+        _tokens.put(_token_key(token), cached)
+
+
+def revoke_jti(jti: str | None) -> None:
+    """Evict every cached token carrying ``jti``."""
+    if jti:
+        _tokens.remove_where(lambda cached: cached.jti == jti)
+
+
+def get_user(user_id: int, db_session: Session) -> User | None:
+    """Attach the cached row for ``user_id`` to ``db_session`` without a query."""
+    snapshot = _users.get(user_id)
+    if snapshot is None:
+        return None
+    user = db_session.merge(snapshot, load=False)
+    db_session.expire(user, UNCACHED_USER_COLUMNS)
+    return user
+
+
+def put_user(user: User) -> None:
+    values = {
+        attr.key: getattr(user, attr.key)
+        for attr in sa_inspect(User).column_attrs
+        if attr.key not in UNCACHED_USER_COLUMNS
+    }
+    snapshot = User(**values)
+    make_transient_to_detached(snapshot)
+    _users.put(user.id, snapshot)
+
+
+def invalidate_user(user_id: int | None) -> None:
+    if user_id is not None:
+        _users.pop(user_id)
+
+
+def clear() -> None:
+    _tokens.clear()
+    _users.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_changed_user(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
+
+def ensure_listener() -> None:
+    """Start this worker's blacklist subscriber if it is not running."""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.get_running_loop().create_task(_run_listener())
+
+
+async def _run_listener() -> None:
+    global _listener_ready
+    reconnect_delay = PUBSUB_RECONNECT_BASE_SECONDS
+
+    while True:
+        pubsub_client = None
+        pubsub = None
+        try:
+            pubsub_client = aioredis.from_url(
+                env_or_fail("redis_url"),
+                decode_responses=True,
+                socket_connect_timeout=5,
+                health_check_interval=30,
+            )
+            pubsub = pubsub_client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(BLACKLIST_PUBSUB_CHANNEL)
+            # Tokens verified before the subscription may have been revoked
+            # while nobody was listening.
+            _tokens.clear()
+            _listener_ready = True
+            reconnect_delay = PUBSUB_RECONNECT_BASE_SECONDS
+            logger.info("Auth cache subscribed to token revocations")
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                except ValueError:
+                    continue
+                if payload.get("type") == "token_blacklisted":
+                    revoke_jti(payload.get("jti"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Auth cache revocation listener disconnected; reconnecting",
+                extra={"error": str(e), "retry_in_seconds": reconnect_delay},
+            )
+        finally:
+            _listener_ready = False
+            _tokens.clear()
+            if pubsub is not None:
+                await pubsub.aclose()
+            if pubsub_client is not None:
+                await pubsub_client.aclose()
+        await asyncio.sleep(reconnect_delay)
+        reconnect_delay = min(reconnect_delay * 2, PUBSUB_RECONNECT_MAX_SECONDS)
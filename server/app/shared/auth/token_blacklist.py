@@ -59,6 +59,9 @@ async def blacklist_token(jti: str, ttl_seconds: int) -> None:
     """
     if ttl_seconds <= 0:
         return
+    # Other workers evict via the pub/sub message; do this one immediately.
+    from app.shared.auth import auth_cache
+    auth_cache.revoke_jti(jti)
     try:
         r = _get_redis()
         key = f"{BLACKLIST_PREFIX}{jti}"
@@ -33,6 +33,7 @@ from app.core.environment import env, env_not_empty
 from app.model.mcp.proxy import ApiKey
 from app.model.user.key import Key
 from app.model.user.user import User
+from app.shared.auth import auth_cache
 from app.shared.auth.token_blacklist import is_blacklisted
 from app.shared.exception import NoPermissionException, TokenException
 
@@ -85,9 +86,10 @@ oauth2_scheme = OAuth2PasswordBearer(
 class V1UserAuth:
     """v1 user auth context."""
 
-    def __init__(self, id: int, expired_at: datetime):
+    def __init__(self, id: int, expired_at: datetime, jti: str | None = None):
         self.id = id
         self.expired_at = expired_at
+        self.jti = jti
         self._user: User | None = None
 
     @property
@@ -116,7 +118,7 @@ class V1UserAuth:
                     code.token_expired,
                     _message("Validate credentials expired"),
                 )
-            return V1UserAuth(user_id, datetime.fromtimestamp(payload["exp"]))
+            return V1UserAuth(user_id, datetime.fromtimestamp(payload["exp"]), payload.get("jti"))
         except InvalidTokenError:
             raise TokenException(
                 code.token_invalid,
@@ -206,16 +208,32 @@ async def auth_must(
     token: str | None = Depends(oauth2_scheme),
     db_session: Session = Depends(session),
 ) -> V1UserAuth:
-    """Require valid user token. Raises TokenException if invalid or blacklisted."""
+    """Require valid user token. Raises TokenException if invalid or blacklisted.
+
+    Verified tokens and user rows are served from auth_cache when possible,
+    so repeated requests with the same token skip the decode, the blacklist
+    lookup and the user query.
+    """
     if not token:
         raise TokenException(code.token_need, _message("Token required"))
-    model = V1UserAuth.decode_token(token)
-    jti = _get_jti(token)
-    if jti and await is_blacklisted(jti):
-        raise TokenException(code.token_blocked, _message("Token has been revoked"))
-    user = db_session.get(User, model.id)
-    if not user:
-        raise TokenException(code.token_invalid, _message("User not found"))
+    auth_cache.ensure_listener()
+    cached = auth_cache.get_token(token)
+    if cached is not None:
+        model = V1UserAuth(cached.user_id, datetime.fromtimestamp(cached.exp), cached.jti)
+    else:
+        model = V1UserAuth.decode_token(token)
+        if model.jti and await is_blacklisted(model.jti):
+            raise TokenException(code.token_blocked, _message("Token has been revoked"))
+        auth_cache.put_token(
+            token,
+            auth_cache.CachedToken(model.id, model.jti, int(model.expired_at.timestamp())),
+        )
+    user = auth_cache.get_user(model.id, db_session)
+    if user is None:
+        user = db_session.get(User, model.id)
+        if not user:
+            raise TokenException(code.token_invalid, _message("User not found"))
+        auth_cache.put_user(user)
     model._user = user
     return model
 
@@ -46,6 +46,12 @@ class ExecutionStatus(StrEnum):
     cancelled = "cancelled"
     missed = "missed"
     
+class WebhookOutboxStatus(StrEnum):
+    pending = "pending"
+    delivering = "delivering"
+    failed = "failed"
+
+
 class RequestType(StrEnum):
     GET = "GET"
     POST = "POST"
\ No newline at end of file
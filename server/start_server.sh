@@ -113,7 +113,7 @@ trap cleanup SIGINT SIGTERM
 
 # Start services
 echo -e "${YELLOW}[5/7] Starting Celery worker...${NC}"
-uv run celery -A app.core.celery worker --loglevel=info --queues=celery,poll_trigger_schedules,check_execution_timeouts &
+uv run celery -A app.core.celery worker --loglevel=info --queues=celery,poll_trigger_schedules,check_execution_timeouts,dispatch_webhook_outbox &
 CELERY_WORKER_PID=$!
 echo -e "${GREEN}Celery worker started (PID: $CELERY_WORKER_PID)${NC}"
 
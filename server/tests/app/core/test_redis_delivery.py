@@ -0,0 +1,173 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import redis_utils
+from app.core.redis_utils import AsyncRedisSessionManager, RedisSessionManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis_utils,
+        "redis",
+        SimpleNamespace(from_url=lambda url, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True)),
+    )
+    monkeypatch.setattr(
+        redis_utils,
+        "aioredis",
+        SimpleNamespace(from_url=lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, decode_responses=True)),
+    )
+    return server
+
+
+def test_confirm_delivery_stores_the_confirmation(fake_redis):
+    manager = AsyncRedisSessionManager("redis://fake")
+    sync_manager = RedisSessionManager("redis://fake")
+
+    async def run():
+        assert await manager.confirm_delivery("exec-async", "session-1")
+        stored = await manager.client.get(f"{manager.DELIVERY_CONFIRMATION_PREFIX}exec-async")
+        ttl = await manager.client.ttl(f"{manager.DELIVERY_CONFIRMATION_PREFIX}exec-async")
+        await manager.close()
+        return json.loads(stored), ttl
+
+    stored, ttl = asyncio.run(run())
+    assert sync_manager.confirm_delivery("exec-sync", "session-2")
+
+    assert stored["session_id"] == "session-1"
+    assert 0 < ttl <= manager.DELIVERY_TTL
+    assert sync_manager.client.get(f"{sync_manager.DELIVERY_CONFIRMATION_PREFIX}exec-sync") is not None
+
+
+def test_session_lifecycle_matches_sync_manager(fake_redis):
+    manager = AsyncRedisSessionManager("redis://fake")
+    sync_manager = RedisSessionManager("redis://fake")
+
+    async def run():
+        assert await manager.store_session("s1", "u1", {"client": "desktop"})
+        assert await manager.add_pending_execution("s1", "e1")
+        # Both managers share the key layout, so Celery sees async writes.
+        assert sync_manager.get_user_sessions("u1") == {"s1"}
+        assert await manager.has_active_sessions_for_user("u1")
+        assert await manager.get_pending_executions("s1") == {"e1"}
+        session = await manager.get_session("s1")
+        # Metadata is spread into the stored session, as in the sync manager.
+        assert session["client"] == "desktop"
+        assert session["user_id"] == "u1"
+
+        assert await manager.remove_session("s1")
+        assert not await manager.has_active_sessions_for_user("u1")
+        assert await manager.get_pending_executions("s1") == set()
+        assert await manager.get_session("s1") is None
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_execution_events_iterates_published_events(fake_redis):
+    manager = AsyncRedisSessionManager("redis://fake")
+    publisher = RedisSessionManager("redis://fake")
+
+    async def run():
+        received = []
+        subscribed = asyncio.Event()
+
+        async def consume():
+            events = manager.execution_events()
+            try:
+                subscribed.set()
+                async for event in events:
+                    received.append(event)
+                    if len(received) == 2:
+                        break
+            finally:
+                await events.aclose()
+
+        task = asyncio.create_task(consume())
+        await subscribed.wait()
+        # Retry until the subscription is live; pub/sub drops earlier messages.
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            await manager.publish_execution_event({"execution_id": "e1", "type": "execution_created"})
+            await asyncio.sleep(0.05)
+        publisher.publish_execution_event({"execution_id": "e2", "type": "execution_created"})
+        await asyncio.wait_for(task, 5)
+        await manager.close()
+        return received
+
+    received = asyncio.run(run())
+
+    assert received[0]["execution_id"] == "e1"
+    assert received[-1]["execution_id"] == "e2"
+
+
+@pytest.mark.skipif(
+    not os.getenv("SESSION_REDIS_LOAD_TEST_URL"),
+    reason="set SESSION_REDIS_LOAD_TEST_URL to a disposable Redis to run the load test",
+)
+def test_websocket_connect_p99_is_lower_than_sync_manager():
+    url = os.environ["SESSION_REDIS_LOAD_TEST_URL"]
+    connections = 500
+
+    def p99(samples):
+        samples = sorted(samples)
+        return samples[int(len(samples) * 0.99) - 1]
+
+    async def connect(arrived, store):
+        # All connections arrive together; a blocking store delays every
+        # handler queued behind it on the event loop.
+        await store()
+        return time.perf_counter() - arrived
+
+    async def run_sync():
+        manager = RedisSessionManager(url)
+
+        async def store(i):
+            manager.store_session(f"load-sync-{i}", f"user-{i % 50}")
+
+        arrived = time.perf_counter()
+        latencies = await asyncio.gather(*(connect(arrived, lambda i=i: store(i)) for i in range(connections)))
+        for i in range(connections):
+            manager.remove_session(f"load-sync-{i}")
+        manager.close()
+        return latencies
+
+    async def run_async():
+        manager = AsyncRedisSessionManager(url)
+
+        def store(i):
+            return manager.store_session(f"load-async-{i}", f"user-{i % 50}")
+
+        arrived = time.perf_counter()
+        latencies = await asyncio.gather(*(connect(arrived, lambda i=i: store(i)) for i in range(connections)))
+        await asyncio.gather(*(manager.remove_session(f"load-async-{i}") for i in range(connections)))
+        await manager.close()
+        return latencies
+
+    sync_p99 = p99(asyncio.run(run_sync()))
+    async_p99 = p99(asyncio.run(run_async()))
+    print(f"websocket connect p99: sync={sync_p99 * 1000:.1f}ms async={async_p99 * 1000:.1f}ms")
+
+    assert async_p99 < sync_p99
@@ -15,6 +15,7 @@
 
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -27,3 +28,36 @@ sys.path.insert(0, str(server_dir))
 def server_root() -> Path:
     """Return the path to the server root directory."""
     return server_dir
+
+
+@pytest.fixture
+def chat_engine():
+    """In-memory SQLite with chat tables; tasks "a" and "b" belong to user 7."""
+    from sqlalchemy.pool import StaticPool
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from app.domains.chat.service import chat_service
+    from app.model.chat.chat_history import ChatHistory
+    from app.model.chat.chat_step import ChatStep
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[ChatStep.__table__, ChatHistory.__table__])
+    with Session(engine) as db:
+        for task_id, user_id in (("a", 7), ("b", 7), ("foreign", 8)):
+            db.add(
+                ChatHistory(
+                    task_id=task_id,
+                    project_id=f"project-{task_id}",
+                    run_id=f"run-{task_id}",
+                    user_id=user_id,
+                    question="q",
+                    language="en",
+                    model_platform="openai",
+                    model_type="gpt",
+                    api_key="",
+                    api_url="",
+                )
+            )
+        db.commit()
+    with patch.object(chat_service, "session_make", lambda: Session(engine)):
+        yield engine
@@ -192,3 +192,134 @@ def test_share_read_endpoints_remain_public():
     playback_params = list(inspect.signature(share_playback).parameters.keys())
     assert "token" in info_params
     assert "token" in playback_params
+
+
+class TestAuthMustCache:
+    """auth_must serves repeated tokens without decode, blacklist or DB."""
+
+    @pytest.fixture
+    def user_db(self, monkeypatch):
+        from sqlalchemy.pool import StaticPool
+        from sqlmodel import Session, SQLModel, create_engine
+
+        from app.model.user.user import User
+        from app.shared.auth import auth_cache
+
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(engine, tables=[User.__table__])
+        with Session(engine) as db:
+            db.add(User(id=7, email="user@example.com", nickname="before"))
+            db.commit()
+
+        auth_cache.clear()
+        # Pretend the revocation subscriber is connected.
+        monkeypatch.setattr(auth_cache, "ensure_listener", lambda: None)
+        monkeypatch.setattr(auth_cache, "_listener_ready", True)
+        yield engine
+        auth_cache.clear()
+
+    def _auth(self, engine, token):
+        import asyncio
+
+        from sqlmodel import Session
+
+        from app.shared.auth.user_auth import auth_must
+
+        with Session(engine) as db:
+            auth = asyncio.run(auth_must(token=token, db_session=db))
+            return auth.id, auth.jti, auth.user.nickname
+
+    def test_second_request_skips_decode_blacklist_and_db(self, user_db):
+        from unittest.mock import AsyncMock, patch
+
+        from sqlmodel import Session
+
+        from app.shared.auth import user_auth
+
+        token = user_auth.create_access_token(7)
+        blacklist = AsyncMock(return_value=False)
+        with patch.object(user_auth, "is_blacklisted", blacklist):
+            first = self._auth(user_db, token)
+            with (
+                patch.object(user_auth.V1UserAuth, "decode_token") as decode,
+                patch.object(Session, "get") as db_get,
+            ):
+                second = self._auth(user_db, token)
+                decode.assert_not_called()
+                db_get.assert_not_called()
+
+        assert first == second
+        assert first[0] == 7 and first[1]
+        assert blacklist.await_count == 1
+
+    def test_revoked_jti_is_checked_again(self, user_db):
+        from unittest.mock import AsyncMock, patch
+
+        from app.shared.auth import auth_cache, user_auth
+        from app.shared.exception import TokenException
+
+        token = user_auth.create_access_token(7)
+        with patch.object(user_auth, "is_blacklisted", AsyncMock(return_value=False)):
+            _, jti, _ = self._auth(user_db, token)
+
+        auth_cache.revoke_jti(jti)
+
+        with patch.object(user_auth, "is_blacklisted", AsyncMock(return_value=True)):
+            with pytest.raises(TokenException):
+                self._auth(user_db, token)
+
+    def test_tokens_are_not_cached_without_revocation_listener(self, user_db, monkeypatch):
+        from unittest.mock import AsyncMock, patch
+
+        from app.shared.auth import auth_cache, user_auth
+
+        monkeypatch.setattr(auth_cache, "_listener_ready", False)
+        token = user_auth.create_access_token(7)
+        blacklist = AsyncMock(return_value=False)
+        with patch.object(user_auth, "is_blacklisted", blacklist):
+            self._auth(user_db, token)
+            self._auth(user_db, token)
+
+        assert blacklist.await_count == 2
+
+    def test_user_update_evicts_cached_row(self, user_db):
+        from unittest.mock import AsyncMock, patch
+
+        from sqlmodel import Session
+
+        from app.model.user.user import User
+        from app.shared.auth import user_auth
+
+        token = user_auth.create_access_token(7)
+        with patch.object(user_auth, "is_blacklisted", AsyncMock(return_value=False)):
+            assert self._auth(user_db, token)[2] == "before"
+            with Session(user_db) as db:
+                user = db.get(User, 7)
+                user.nickname = "after"
+                db.add(user)
+                db.commit()
+            assert self._auth(user_db, token)[2] == "after"
+
+    def test_credentials_and_credits_are_read_from_the_database(self, user_db):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+
+        from sqlalchemy import update
+        from sqlmodel import Session
+
+        from app.model.user.user import User
+        from app.shared.auth import user_auth
+        from app.shared.auth.user_auth import auth_must
+
+        token = user_auth.create_access_token(7)
+        with patch.object(user_auth, "is_blacklisted", AsyncMock(return_value=False)):
+            self._auth(user_db, token)
+            # Core writes and other workers never evict this process's cache
+            with Session(user_db) as db:
+                db.execute(update(User).where(User.id == 7).values(password="new-hash", credits=5))
+                db.commit()
+            with Session(user_db) as db:
+                auth = asyncio.run(auth_must(token=token, db_session=db))
+                assert auth.user.nickname == "before"
+                assert auth.user.password == "new-hash"
+                assert auth.user.credits == 5
@@ -0,0 +1,114 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.domains.chat.api import step_controller
+from app.domains.remote_control.service import remote_control_service
+from app.model.chat.chat_step import ChatStep, ChatStepIn
+
+AUTH = SimpleNamespace(user=SimpleNamespace(id=7))
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    with patch.object(remote_control_service, "get_redis_manager", return_value=SimpleNamespace(client=client)):
+        yield client
+
+
+def _steps(task_ids: list[str]) -> list[ChatStepIn]:
+    return [
+        ChatStepIn(task_id=task_id, step="activate_agent", data={"index": index}, timestamp=float(index))
+        for index, task_id in enumerate(task_ids)
+    ]
+
+
+def _create_batch(chat_engine, steps):
+    with Session(chat_engine) as db:
+        return asyncio.run(step_controller.create_chat_steps_batch(steps, db_session=db, auth=AUTH))
+
+
+def test_batch_inserts_in_order_and_publishes_once(chat_engine, redis_client):
+    statements: list[str] = []
+    threads: set[int] = set()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+        threads.add(threading.get_ident())
+
+    event.listen(chat_engine, "before_cursor_execute", record)
+    result = _create_batch(chat_engine, _steps(["a", "b", "a", "a", "b"]))
+    event.remove(chat_engine, "before_cursor_execute", record)
+
+    assert result["count"] == 5
+    with Session(chat_engine) as db:
+        rows = db.exec(select(ChatStep).order_by(ChatStep.id)).all()
+    assert [(row.task_id, row.data["index"]) for row in rows] == [("a", 0), ("b", 1), ("a", 2), ("a", 3), ("b", 4)]
+    assert all(row.run_id == row.task_id for row in rows)
+    # One ownership query, one project lookup for the fan-out, and no
+    # per-row refresh selects; all of it off the event loop thread.
+    assert sum(s.lstrip().upper().startswith("SELECT") for s in statements) == 2
+    assert threading.get_ident() not in threads
+
+    redis_client.pipeline.assert_called_once_with(transaction=False)
+    pipe = redis_client.pipeline.return_value
+    pipe.execute.assert_called_once()
+    published = [call.args for call in pipe.publish.call_args_list]
+    assert [channel for channel, _ in published] == [
+        "project:project-a:step",
+        "project:project-b:step",
+        "project:project-a:step",
+        "project:project-a:step",
+        "project:project-b:step",
+    ]
+    payloads = [json.loads(payload) for _, payload in published]
+    assert [payload["step_id"] for payload in payloads] == [row.id for row in rows]
+
+
+def test_batch_rejects_foreign_task_without_writing(chat_engine, redis_client):
+    with pytest.raises(HTTPException) as exc:
+        _create_batch(chat_engine, _steps(["a", "foreign"]))
+
+    assert exc.value.status_code == 403
+    with Session(chat_engine) as db:
+        assert db.exec(select(ChatStep)).all() == []
+    redis_client.pipeline.assert_not_called()
+
+
+def test_batch_rejects_oversized_payload():
+    steps = _steps(["a"] * (step_controller.MAX_STEP_BATCH_SIZE + 1))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(step_controller.create_chat_steps_batch(steps, db_session=MagicMock(), auth=AUTH))
+
+    assert exc.value.status_code == 413
+
+
+def test_single_step_uses_the_bulk_path(chat_engine, redis_client):
+    with Session(chat_engine) as db:
+        result = asyncio.run(step_controller.create_chat_step(_steps(["b"])[0], db_session=db, auth=AUTH))
+
+    assert result == {"code": 200, "msg": "success"}
+    with Session(chat_engine) as db:
+        assert [row.task_id for row in db.exec(select(ChatStep)).all()] == ["b"]
+    redis_client.pipeline.return_value.execute.assert_called_once()
@@ -0,0 +1,132 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import asyncio
+import inspect
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.domains.chat.api import step_controller
+from app.model.chat.chat_step import ChatStep
+
+AUTH = SimpleNamespace(user=SimpleNamespace(id=7))
+# Insertion order -> (timestamp, run_id); playback orders by timestamp with
+# NULLs last and id as the tie-breaker.
+SEEDED = [(3.0, "run-a"), (1.0, "run-a"), (None, "run-a"), (1.0, None), (2.0, "other"), (None, "run-a")]
+
+
+@pytest.fixture
+def step_ids(chat_engine):
+    with Session(chat_engine) as db:
+        steps = [
+            ChatStep(task_id="a", run_id=run_id, step="activate_agent", data={"n": n}, timestamp=timestamp)
+            for n, (timestamp, run_id) in enumerate(SEEDED)
+        ]
+        steps.append(ChatStep(task_id="foreign", step="activate_agent", data={}, timestamp=0.0))
+        db.add_all(steps)
+        db.commit()
+        return [step.id for step in steps]
+
+
+def _collect(chat_engine, endpoint, *args, **kwargs) -> list[dict]:
+    async def run():
+        with Session(chat_engine) as db:
+            response = await endpoint(*args, delay_time=0, db_session=db, auth=AUTH, **kwargs)
+            return [chunk async for chunk in response.body_iterator]
+
+    frames = []
+    for chunk in asyncio.run(run()):
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        payload = json.loads(fields["data"])
+        if "id" in fields:
+            assert int(fields["id"]) == payload["id"]
+        frames.append(payload)
+    return frames
+
+
+def test_share_playback_streams_in_keyset_order_across_pages(chat_engine, step_ids, monkeypatch):
+    monkeypatch.setattr(step_controller, "PLAYBACK_PAGE_SIZE", 2)
+
+    frames = _collect(chat_engine, step_controller.share_playback, "a", since_id=None, last_event_id=None)
+
+    ids = step_ids
+    assert [frame["id"] for frame in frames] == [ids[1], ids[3], ids[4], ids[0], ids[2], ids[5]]
+
+
+@pytest.mark.parametrize("resume_index", [1, 4, 2])
+def test_share_playback_resumes_after_since_id(chat_engine, step_ids, monkeypatch, resume_index):
+    monkeypatch.setattr(step_controller, "PLAYBACK_PAGE_SIZE", 2)
+    ids = step_ids
+    order = [ids[1], ids[3], ids[4], ids[0], ids[2], ids[5]]
+    since_id = ids[resume_index]
+
+    by_query = _collect(chat_engine, step_controller.share_playback, "a", since_id=since_id, last_event_id=None)
+    by_header = _collect(chat_engine, step_controller.share_playback, "a", since_id=None, last_event_id=str(since_id))
+
+    expected = order[order.index(since_id) + 1 :]
+    assert [frame["id"] for frame in by_query] == expected
+    assert [frame["id"] for frame in by_header] == expected
+
+
+def test_resume_from_last_step_ends_without_error_frame(chat_engine, step_ids):
+    frames = _collect(chat_engine, step_controller.share_playback, "a", since_id=step_ids[5], last_event_id=None)
+
+    assert frames == []
+
+
+def test_since_id_from_another_task_is_rejected(chat_engine, step_ids):
+    with pytest.raises(HTTPException) as exc:
+        _collect(chat_engine, step_controller.share_playback, "a", since_id=step_ids[-1], last_event_id=None)
+
+    assert exc.value.status_code == 404
+
+
+def test_run_playback_filters_run_and_keeps_order(chat_engine, step_ids):
+    frames = _collect(chat_engine, step_controller.run_playback, "run-a", since_id=None, last_event_id=None)
+
+    ids = step_ids
+    assert [frame["id"] for frame in frames] == [ids[1], ids[3], ids[0], ids[2], ids[5]]
+
+
+def test_list_chat_steps_pages_with_since_id_and_limit(chat_engine, step_ids):
+    async def page(since_id):
+        with Session(chat_engine) as db:
+            rows = await step_controller.list_chat_steps(
+                "a", run_id=None, step=None, since_id=since_id, limit=4, db_session=db, auth=AUTH
+            )
+            return [row.id for row in rows]
+
+    ids = step_ids
+    first = asyncio.run(page(None))
+    second = asyncio.run(page(first[-1]))
+
+    assert first == [ids[1], ids[3], ids[4], ids[0]]
+    assert second == [ids[2], ids[5]]
+
+
+def test_list_chat_steps_default_and_capped_limit(chat_engine, step_ids, monkeypatch):
+    limit = inspect.signature(step_controller.list_chat_steps).parameters["limit"].default
+    assert limit.default == step_controller.PLAYBACK_PAGE_SIZE
+
+    monkeypatch.setattr(step_controller, "MAX_LIST_LIMIT", 2)
+    with Session(chat_engine) as db:
+        rows = asyncio.run(step_controller.list_chat_steps(
+            "a", run_id=None, step=None, since_id=None, limit=10_000, db_session=db, auth=AUTH
+        ))
+
+    assert [row.id for row in rows] == [step_ids[1], step_ids[3]]
@@ -0,0 +1,202 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.trigger_utils import EXECUTION_PENDING_TIMEOUT_SECONDS, EXECUTION_RUNNING_TIMEOUT_SECONDS
+from app.domains.trigger.service import trigger_schedule_task
+from app.model.trigger.trigger import Trigger
+from app.model.trigger.trigger_execution import TriggerExecution
+from app.shared.types.trigger_types import ExecutionStatus, ExecutionType, TriggerStatus, TriggerType
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def trigger_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[Trigger.__table__, TriggerExecution.__table__])
+    return engine
+
+
+@pytest.fixture
+def removed(monkeypatch, trigger_engine):
+    calls = []
+    manager = SimpleNamespace(
+        remove_pending_executions_for_users=lambda by_user: calls.append(by_user) or True
+    )
+    monkeypatch.setattr(trigger_schedule_task, "get_redis_manager", lambda: manager)
+    monkeypatch.setattr(trigger_schedule_task, "session_make", lambda: Session(trigger_engine))
+    return calls
+
+
+@pytest.fixture
+def trigger_id(trigger_engine):
+    with Session(trigger_engine) as db:
+        trigger = Trigger(
+            user_id="user-1",
+            project_id="project-1",
+            name="trigger",
+            trigger_type=TriggerType.schedule,
+            status=TriggerStatus.active,
+            custom_cron_expression="*/5 * * * *",
+            task_prompt="run",
+        )
+        db.add(trigger)
+        db.commit()
+        return trigger.id
+
+
+def _execution(trigger_id: int, execution_id: str, status: ExecutionStatus, age: timedelta) -> TriggerExecution:
+    started = _utcnow() - age
+    return TriggerExecution(
+        trigger_id=trigger_id,
+        execution_id=execution_id,
+        execution_type=ExecutionType.scheduled,
+        status=status,
+        created_at=started,
+        started_at=started,
+    )
+
+
+def _statuses(engine) -> dict:
+    with Session(engine) as db:
+        return {e.execution_id: e.status for e in db.exec(select(TriggerExecution)).all()}
+
+
+def test_deadline_follows_status(trigger_engine, trigger_id):
+    with Session(trigger_engine) as db:
+        execution = _execution(trigger_id, "e1", ExecutionStatus.pending, timedelta(0))
+        db.add(execution)
+        db.commit()
+        assert execution.deadline_at == execution.created_at + timedelta(seconds=EXECUTION_PENDING_TIMEOUT_SECONDS)
+
+        execution.status = ExecutionStatus.running
+        execution.started_at = datetime.now(timezone.utc) + timedelta(seconds=5)
+        db.add(execution)
+        db.commit()
+        expected = execution.started_at.replace(tzinfo=None) + timedelta(seconds=EXECUTION_RUNNING_TIMEOUT_SECONDS)
+        assert abs(execution.deadline_at - expected) < timedelta(seconds=1)
+
+        execution.status = ExecutionStatus.completed
+        db.add(execution)
+        db.commit()
+        assert execution.deadline_at is None
+
+
+def test_only_expired_executions_are_timed_out(trigger_engine, trigger_id, removed):
+    pending_expired = timedelta(seconds=EXECUTION_PENDING_TIMEOUT_SECONDS + 30)
+    running_expired = timedelta(seconds=EXECUTION_RUNNING_TIMEOUT_SECONDS + 30)
+    with Session(trigger_engine) as db:
+        db.add_all([
+            _execution(trigger_id, "pending-old", ExecutionStatus.pending, pending_expired),
+            _execution(trigger_id, "pending-new", ExecutionStatus.pending, timedelta(0)),
+            _execution(trigger_id, "running-old", ExecutionStatus.running, running_expired),
+            _execution(trigger_id, "running-new", ExecutionStatus.running, pending_expired),
+            _execution(trigger_id, "done-old", ExecutionStatus.completed, running_expired),
+        ])
+        db.commit()
+
+    trigger_schedule_task.check_execution_timeouts()
+
+    assert _statuses(trigger_engine) == {
+        "pending-old": ExecutionStatus.missed,
+        "pending-new": ExecutionStatus.pending,
+        "running-old": ExecutionStatus.failed,
+        "running-new": ExecutionStatus.running,
+        "done-old": ExecutionStatus.completed,
+    }
+    with Session(trigger_engine) as db:
+        timed_out = db.exec(
+            select(TriggerExecution).where(TriggerExecution.execution_id == "running-old")
+        ).one()
+        assert timed_out.deadline_at is None
+        assert timed_out.completed_at is not None
+        assert timed_out.duration_seconds >= EXECUTION_RUNNING_TIMEOUT_SECONDS
+        assert "running timeout" in timed_out.error_message
+
+        trigger = db.get(Trigger, trigger_id)
+        assert trigger.consecutive_failures == 2
+        assert trigger.last_execution_status == "failed"
+
+    assert len(removed) == 1
+    assert sorted(removed[0]["user-1"]) == ["pending-old", "running-old"]
+
+
+def test_executions_without_deadline_are_backfilled(trigger_engine, trigger_id, removed):
+    old = _utcnow() - timedelta(seconds=EXECUTION_PENDING_TIMEOUT_SECONDS + 30)
+    with trigger_engine.begin() as connection:
+        connection.execute(
+            TriggerExecution.__table__.insert(),
+            [
+                {"trigger_id": trigger_id, "execution_id": "legacy-old", "execution_type": ExecutionType.scheduled,
+                 "status": ExecutionStatus.pending, "created_at": old, "attempts": 1, "max_retries": 3},
+                {"trigger_id": trigger_id, "execution_id": "legacy-new", "execution_type": ExecutionType.scheduled,
+                 "status": ExecutionStatus.pending, "created_at": _utcnow(), "attempts": 1, "max_retries": 3},
+            ],
+        )
+
+    trigger_schedule_task.check_execution_timeouts()
+
+    assert _statuses(trigger_engine) == {
+        "legacy-old": ExecutionStatus.missed,
+        "legacy-new": ExecutionStatus.pending,
+    }
+    with Session(trigger_engine) as db:
+        pending = db.exec(
+            select(TriggerExecution).where(TriggerExecution.execution_id == "legacy-new")
+        ).one()
+        assert pending.deadline_at is not None
+
+
+def test_sweep_cost_does_not_grow_with_in_flight_executions(trigger_engine, trigger_id, removed):
+    def sweep_statements() -> int:
+        statements = 0
+
+        def count_statement(*args):
+            nonlocal statements
+            statements += 1
+
+        event.listen(trigger_engine, "before_cursor_execute", count_statement)
+        try:
+            trigger_schedule_task.check_execution_timeouts()
+        finally:
+            event.remove(trigger_engine, "before_cursor_execute", count_statement)
+        return statements
+
+    expired = timedelta(seconds=EXECUTION_RUNNING_TIMEOUT_SECONDS + 30)
+    with Session(trigger_engine) as db:
+        db.add_all(_execution(trigger_id, f"old-{i}", ExecutionStatus.running, expired) for i in range(3))
+        db.add_all(_execution(trigger_id, f"new-{i}", ExecutionStatus.running, timedelta(0)) for i in range(5))
+        db.commit()
+    few_in_flight = sweep_statements()
+
+    with Session(trigger_engine) as db:
+        db.add_all(_execution(trigger_id, f"old2-{i}", ExecutionStatus.running, expired) for i in range(3))
+        db.add_all(_execution(trigger_id, f"new2-{i}", ExecutionStatus.running, timedelta(0)) for i in range(500))
+        db.commit()
+    many_in_flight = sweep_statements()
+
+    assert many_in_flight == few_in_flight
+    statuses = _statuses(trigger_engine)
+    assert sum(status == ExecutionStatus.failed for status in statuses.values()) == 6
+    assert sum(status == ExecutionStatus.running for status in statuses.values()) == 505
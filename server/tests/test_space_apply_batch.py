@@ -0,0 +1,227 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import hashlib
+import os
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+os.environ.setdefault("database_url", "sqlite:////private/tmp/eigent_space_apply_batch_test.db")
+
+from app.domains.space.service import apply_service
+from app.domains.space.service.apply_service import SpaceApplyService, _IndexedStat, _live_hashes
+from app.model.project import Project
+from app.model.space import (
+    OVERLAY_SOURCE_PATH_METADATA_KEY,
+    OVERLAY_SOURCE_ROOT_METADATA_KEY,
+    Space,
+    SpaceFileIndex,
+    SpaceFileIndexOverlay,
+    SpaceProjectApplyIn,
+    SpaceSourceType,
+)
+
+
+def _sha(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+@pytest.fixture
+def apply_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(apply_service, "assert_local_file_operations_enabled", lambda: None)
+    monkeypatch.setattr(apply_service, "space_write_lock", lambda space_id: nullcontext())
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            Space.__table__,
+            Project.__table__,
+            SpaceFileIndex.__table__,
+            SpaceFileIndexOverlay.__table__,
+        ],
+    )
+    root = tmp_path / "space"
+    workdir = tmp_path / "workdir"
+    root.mkdir()
+    workdir.mkdir()
+    with Session(engine) as db:
+        db.add(
+            Space(id="space_1", user_id="user_1", name="Repo", source_type=SpaceSourceType.FOLDER, root_path=str(root))
+        )
+        db.add(Project(id="project_1", user_id="user_1", space_id="space_1", name="Project"))
+        db.commit()
+    return engine, root, workdir
+
+
+def _add_overlays(engine, root, workdir, count: int) -> list[str]:
+    paths = []
+    with Session(engine) as db:
+        for i in range(count):
+            path = f"dir{i % 50}/file{i}.txt"
+            base, mine = f"base {i}".encode(), f"mine {i}\n".encode()
+            for directory, content in ((root, base), (workdir, mine)):
+                target = directory / path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(content)
+            db.add(
+                SpaceFileIndexOverlay(
+                    space_id="space_1",
+                    project_id="project_1",
+                    run_id="run_1",
+                    path=path,
+                    status="modified",
+                    hash=_sha(mine),
+                    base_hash=_sha(base),
+                    metadata_json={
+                        OVERLAY_SOURCE_PATH_METADATA_KEY: str(workdir / path),
+                        OVERLAY_SOURCE_ROOT_METADATA_KEY: str(workdir),
+                    },
+                )
+            )
+            paths.append(path)
+        db.commit()
+    return paths
+
+
+def _apply(engine):
+    with Session(engine) as db:
+        return SpaceApplyService.apply_project_run(
+            "space_1", "project_1", SpaceProjectApplyIn(run_id="run_1"), "user_1", db
+        )
+
+
+def _count_commits(engine) -> list[int]:
+    commits = [0]
+
+    def count(*args):
+        commits[0] += 1
+
+    event.listen(engine, "commit", count)
+    return commits
+
+
+def test_applied_paths_are_committed_in_groups(apply_env):
+    engine, root, workdir = apply_env
+    paths = _add_overlays(engine, root, workdir, 450)
+    commits = _count_commits(engine)
+
+    response = _apply(engine)
+
+    assert response.kind == "success"
+    assert [applied.path for applied in response.applied] == paths
+    assert commits[0] == 3
+    assert (root / paths[7]).read_bytes() == b"mine 7\n"
+    with Session(engine) as db:
+        assert db.exec(select(func.count()).select_from(SpaceFileIndexOverlay)).one() == 0
+        indexed = db.exec(select(SpaceFileIndex).where(SpaceFileIndex.path == paths[7])).one()
+        assert indexed.hash == _sha(b"mine 7\n")
+        assert indexed.size == len(b"mine 7\n")
+
+
+def test_stale_index_still_reports_conflicts(apply_env):
+    engine, root, workdir = apply_env
+    paths = _add_overlays(engine, root, workdir, 3)
+    with Session(engine) as db:
+        old = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.add(
+            SpaceFileIndex(
+                space_id="space_1",
+                path=paths[1],
+                hash=_sha(b"base 1"),
+                size=len(b"base 1"),
+                modified_at=old,
+                indexed_at=old,
+            )
+        )
+        db.commit()
+    (root / paths[1]).write_bytes(b"changed by someone else")
+
+    response = _apply(engine)
+
+    assert response.kind == "conflict"
+    assert [conflict.path for conflict in response.conflicts] == [paths[1]]
+    assert response.conflicts[0].current_hash == _sha(b"changed by someone else")
+
+
+def test_index_hash_is_reused_unless_racy(tmp_path, monkeypatch):
+    hashed = []
+    original = apply_service.sha256_of_file
+    monkeypatch.setattr(apply_service, "sha256_of_file", lambda path: hashed.append(path) or original(path))
+
+    jobs = []
+    for name, indexed_after in (("settled", timedelta(seconds=30)), ("racy", timedelta(0))):
+        target = tmp_path / name
+        target.write_bytes(b"content")
+        st = os.lstat(target)
+        modified_at = datetime.fromtimestamp(st.st_mtime, timezone.utc)
+        jobs.append((target, _IndexedStat("indexed-hash", st.st_size, modified_at, modified_at + indexed_after)))
+    jobs.append((tmp_path / "missing", None))
+
+    assert _live_hashes(jobs) == ["indexed-hash", _sha(b"content"), None]
+    assert sorted(hashed) == [tmp_path / "missing", tmp_path / "racy"]
+
+
+def test_failed_group_commit_only_fails_the_bad_path(apply_env, monkeypatch):
+    engine, root, workdir = apply_env
+    paths = _add_overlays(engine, root, workdir, 5)
+    original = SpaceApplyService._index_row_values
+
+    def index_row_values(space, rel_path, *args):
+        if rel_path == paths[2]:
+            raise RuntimeError("index write failed")
+        return original(space, rel_path, *args)
+
+    monkeypatch.setattr(SpaceApplyService, "_index_row_values", staticmethod(index_row_values))
+
+    response = _apply(engine)
+
+    assert response.kind == "partial"
+    assert [failure.path for failure in response.failed] == [paths[2]]
+    assert [applied.path for applied in response.applied] == paths[:2] + paths[3:]
+    with Session(engine) as db:
+        remaining = db.exec(select(SpaceFileIndexOverlay.path)).all()
+        assert remaining == [paths[2]]
+        indexed = db.exec(select(SpaceFileIndex.path).order_by(SpaceFileIndex.path)).all()
+        assert sorted(indexed) == sorted(paths[:2] + paths[3:])
+
+
+def test_five_thousand_overlays_apply_in_bounded_transactions(apply_env):
+    engine, root, workdir = apply_env
+    total = 5_000
+    paths = _add_overlays(engine, root, workdir, total)
+    commits = _count_commits(engine)
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+
+    started = time.monotonic()
+    response = _apply(engine)
+    elapsed = time.monotonic() - started
+
+    assert response.kind == "success"
+    assert len(response.applied) == total
+    assert commits[0] == total // 200
+    # Index lookups in chunks plus a few bulk statements per group, not per path.
+    assert statements[0] < 250
+    assert (root / paths[-1]).read_bytes() == f"mine {total - 1}\n".encode()
+    assert elapsed < 120
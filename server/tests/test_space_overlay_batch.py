@@ -0,0 +1,126 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import os
+from contextlib import nullcontext
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+os.environ.setdefault("database_url", "sqlite:////private/tmp/eigent_space_overlay_batch_test.db")
+
+from app.domains.space.service import overlay_service
+from app.domains.space.service.overlay_service import SpaceOverlayService
+from app.model.project import Project
+from app.model.space import (
+    MAX_OVERLAY_BATCH_WRITES,
+    Space,
+    SpaceFileIndexOverlay,
+    SpaceOverlayBatchWriteIn,
+    SpaceOverlayWriteIn,
+    SpaceSourceType,
+)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(overlay_service, "assert_local_file_operations_enabled", lambda: None)
+    monkeypatch.setattr(overlay_service, "space_write_lock", lambda space_id: nullcontext())
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[Space.__table__, Project.__table__, SpaceFileIndexOverlay.__table__],
+    )
+    with Session(engine) as db:
+        db.add(Space(id="space_1", user_id="user_1", name="Repo", source_type=SpaceSourceType.FOLDER))
+        db.add(Project(id="project_1", user_id="user_1", space_id="space_1", name="Project"))
+        db.commit()
+    return engine
+
+
+def _write(path: str, status: str = "modified", **kwargs) -> SpaceOverlayWriteIn:
+    return SpaceOverlayWriteIn(
+        run_id=kwargs.pop("run_id", "run_1"),
+        path=path,
+        status=status,
+        hash=None if status == "deleted" else f"hash-{path}",
+        base_hash=kwargs.pop("base_hash", "base"),
+        source_path=f"/work/{path}",
+        source_root="/work",
+        **kwargs,
+    )
+
+
+def _count_commits(engine) -> list[int]:
+    commits = [0]
+    event.listen(engine, "commit", lambda conn: commits.__setitem__(0, commits[0] + 1))
+    return commits
+
+
+def test_batch_commits_once(engine):
+    commits = _count_commits(engine)
+    writes = [_write(f"file{i}.txt") for i in range(50)]
+
+    with Session(engine) as db:
+        response = SpaceOverlayService.record_overlay_writes("space_1", "project_1", writes, "user_1", db)
+
+    assert commits[0] == 1
+    assert [overlay.path for overlay in response.overlays] == [f"file{i}.txt" for i in range(50)]
+    assert all(overlay.id is not None for overlay in response.overlays)
+
+
+def test_batch_merges_repeated_paths_like_single_writes(engine):
+    with Session(engine) as db:
+        SpaceOverlayService.record_overlay_write(
+            "space_1", "project_1", _write("existing.txt", "deleted"), "user_1", db
+        )
+        response = SpaceOverlayService.record_overlay_writes(
+            "space_1",
+            "project_1",
+            [
+                _write("new.txt", "added", base_hash=None),
+                _write("existing.txt", "modified"),
+                _write("new.txt", "modified", base_hash=None),
+                _write("gone.txt", "modified"),
+                _write("gone.txt", "deleted"),
+            ],
+            "user_1",
+            db,
+        )
+
+    statuses = {overlay.path: overlay.status for overlay in response.overlays}
+    assert statuses == {"new.txt": "added", "existing.txt": "modified", "gone.txt": "deleted"}
+    with Session(engine) as db:
+        rows = db.exec(select(SpaceFileIndexOverlay)).all()
+    assert len(rows) == 3
+    assert next(row for row in rows if row.path == "gone.txt").hash is None
+
+
+def test_invalid_write_rejects_the_whole_batch(engine):
+    writes = [_write("ok.txt"), _write("bad.txt").model_copy(update={"source_root": None})]
+
+    with Session(engine) as db:
+        with pytest.raises(ValueError, match="source_root"):
+            SpaceOverlayService.record_overlay_writes("space_1", "project_1", writes, "user_1", db)
+
+    with Session(engine) as db:
+        assert db.exec(select(SpaceFileIndexOverlay)).all() == []
+
+
+def test_batch_size_is_bounded():
+    with pytest.raises(ValidationError):
+        SpaceOverlayBatchWriteIn(writes=[_write(f"f{i}") for i in range(MAX_OVERLAY_BATCH_WRITES + 1)])
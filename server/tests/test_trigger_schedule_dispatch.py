@@ -0,0 +1,159 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.core import redis_utils
+from app.core.trigger_utils import check_rate_limits
+from app.domains.trigger.service.trigger_schedule_service import TriggerScheduleService
+from app.model.trigger.trigger import Trigger
+from app.model.trigger.trigger_execution import TriggerExecution
+from app.shared.types.trigger_types import ExecutionStatus, ExecutionType, TriggerStatus, TriggerType
+
+
+@pytest.fixture
+def trigger_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[Trigger.__table__, TriggerExecution.__table__])
+    return engine
+
+
+@pytest.fixture
+def published(monkeypatch):
+    batches = []
+    manager = SimpleNamespace(publish_execution_events=lambda events: batches.append(list(events)) or True)
+    monkeypatch.setattr(redis_utils, "get_redis_manager", lambda: manager)
+    return batches
+
+
+def _due_trigger(i: int, **overrides) -> dict:
+    values = {
+        "user_id": f"user-{i % 10}",
+        "project_id": f"project-{i}",
+        "name": f"trigger-{i}",
+        "trigger_type": TriggerType.schedule,
+        "status": TriggerStatus.active,
+        "custom_cron_expression": "*/5 * * * *",
+        "task_prompt": "run",
+        "next_run_at": datetime.now(timezone.utc) - timedelta(minutes=1),
+    }
+    values.update(overrides)
+    return values
+
+
+def _add_executions(db: Session, trigger_id: int, *ages: timedelta) -> None:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for i, age in enumerate(ages):
+        db.add(
+            TriggerExecution(
+                trigger_id=trigger_id,
+                execution_id=f"{trigger_id}-{i}",
+                execution_type=ExecutionType.scheduled,
+                status=ExecutionStatus.completed,
+                created_at=now - age,
+            )
+        )
+
+
+def test_batch_is_inserted_and_published_together(trigger_engine, published):
+    with Session(trigger_engine) as db:
+        db.add_all(Trigger(**_due_trigger(i)) for i in range(5))
+        db.add(Trigger(**_due_trigger(99, next_run_at=datetime.now(timezone.utc) + timedelta(hours=1))))
+        db.commit()
+
+        dispatched, rate_limited = TriggerScheduleService(db).poll_and_execute_due_triggers()
+
+        assert (dispatched, rate_limited) == (5, 0)
+        assert db.exec(select(func.count()).select_from(TriggerExecution)).one() == 5
+        assert len(published) == 1
+        assert sorted(event["project_id"] for event in published[0]) == [f"project-{i}" for i in range(5)]
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert all(trigger.next_run_at.replace(tzinfo=None) > now for trigger in db.exec(select(Trigger)).all())
+
+
+def test_rate_limits_are_counted_per_batch(trigger_engine, published):
+    with Session(trigger_engine) as db:
+        hourly = Trigger(**_due_trigger(1, max_executions_per_hour=2))
+        daily = Trigger(**_due_trigger(2, max_executions_per_day=1))
+        free = Trigger(**_due_trigger(3, max_executions_per_hour=5))
+        db.add_all([hourly, daily, free])
+        db.commit()
+        _add_executions(db, hourly.id, timedelta(minutes=5), timedelta(minutes=30), timedelta(hours=3))
+        _add_executions(db, daily.id, timedelta(hours=3))
+        _add_executions(db, free.id, timedelta(minutes=5), timedelta(hours=2))
+        db.commit()
+
+        assert not check_rate_limits(db, hourly)
+        assert not check_rate_limits(db, daily)
+        assert check_rate_limits(db, free)
+
+        dispatched, rate_limited = TriggerScheduleService(db).poll_and_execute_due_triggers()
+
+        assert (dispatched, rate_limited) == (1, 2)
+        assert [event["trigger_id"] for event in published[0]] == [free.id]
+
+
+def test_due_triggers_are_claimed_with_skip_locked(trigger_engine):
+    with Session(trigger_engine) as db:
+        statements = []
+        exec_ = db.exec
+        db.exec = lambda statement, **kwargs: statements.append(statement) or exec_(statement, **kwargs)
+
+        TriggerScheduleService(db).fetch_due_schedules()
+
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_ten_thousand_due_triggers_finish_in_bounded_batches(trigger_engine, published):
+    total = 10_000
+    with trigger_engine.begin() as connection:
+        connection.execute(Trigger.__table__.insert(), [_due_trigger(i) for i in range(total)])
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(trigger_engine, "before_cursor_execute", count_statement)
+    with Session(trigger_engine) as db:
+        started = time.monotonic()
+        dispatched, rate_limited = TriggerScheduleService(db).poll_and_execute_due_triggers()
+        elapsed = time.monotonic() - started
+
+        assert (dispatched, rate_limited) == (total, 0)
+        assert db.exec(select(func.count()).select_from(TriggerExecution)).one() == total
+        # Bulk inserts bypass the before_insert hook; the deadline must still be set
+        assert db.exec(
+            select(func.count()).select_from(TriggerExecution).where(TriggerExecution.deadline_at.is_(None))
+        ).one() == 0
+        assert db.exec(
+            select(func.count()).select_from(Trigger).where(Trigger.next_run_at <= datetime.now(timezone.utc))
+        ).one() == 0
+
+    batches = len(published)
+    assert batches == total // 100
+    assert sum(len(events) for events in published) == total
+    # Per batch: claim, execution insert, trigger update, commit; plus the final empty claim.
+    assert statements <= batches * 6 + 2
+    assert elapsed < 60
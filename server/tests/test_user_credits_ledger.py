@@ -0,0 +1,162 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.model.user import user_credits_record
+from app.model.user.user import User
+from app.model.user.user_credits_record import (
+    CreditsChannel,
+    CreditUsage,
+    UserCreditsBalance,
+    UserCreditsRecord,
+)
+
+
+@pytest.fixture
+def credits_engine(tmp_path, monkeypatch):
+    """File-backed SQLite so concurrent sessions use separate connections.
+
+    User 1 has 100 daily, 100 monthly and 200 paid credits.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'credits.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    SQLModel.metadata.create_all(
+        engine, tables=[User.__table__, UserCreditsRecord.__table__, UserCreditsBalance.__table__]
+    )
+    now = datetime.now()
+    with Session(engine) as db:
+        db.add(User(id=1, email="user@example.com", credits=300))
+        db.add(UserCreditsRecord(user_id=1, amount=200, channel=CreditsChannel.paid))
+        db.add(
+            UserCreditsRecord(
+                user_id=1, amount=100, channel=CreditsChannel.monthly, expire_at=now + timedelta(days=10)
+            )
+        )
+        db.add(
+            UserCreditsRecord(user_id=1, amount=100, channel=CreditsChannel.daily, expire_at=now + timedelta(days=1))
+        )
+        db.commit()
+    monkeypatch.setattr(user_credits_record, "session_make", lambda: Session(engine))
+    return engine
+
+
+def _balances(engine) -> dict[CreditsChannel, int]:
+    with Session(engine) as db:
+        records = db.exec(select(UserCreditsRecord).where(UserCreditsRecord.channel != CreditsChannel.consume)).all()
+        return {record.channel: record.balance for record in records}
+
+
+def _user_credits(engine) -> int:
+    with Session(engine) as db:
+        return db.get(User, 1).credits
+
+
+def test_batch_keeps_daily_monthly_paid_order(credits_engine):
+    with Session(credits_engine) as db:
+        shortfall = UserCreditsRecord.consume_credits_batch(
+            [CreditUsage(user_id=1, amount=amount, source_id=i + 1) for i, amount in enumerate((50, 80, 30, 40))],
+            db,
+        )
+
+    assert shortfall == {}
+    assert _balances(credits_engine) == {
+        CreditsChannel.daily: 100,
+        CreditsChannel.monthly: 100,
+        CreditsChannel.paid: 0,
+    }
+    assert _user_credits(credits_engine) == 200
+
+    with Session(credits_engine) as db:
+        UserCreditsRecord.consume_credits_batch([CreditUsage(user_id=1, amount=10)], db)
+    assert _balances(credits_engine)[CreditsChannel.paid] == 10
+
+
+def test_events_for_one_source_share_a_consume_record(credits_engine):
+    with Session(credits_engine) as db:
+        UserCreditsRecord.consume_credits_batch(
+            [CreditUsage(user_id=1, amount=10, source_id=9), CreditUsage(user_id=1, amount=5, source_id=9)], db
+        )
+        UserCreditsRecord.consume_credits(1, 7, db, source_id=9)
+
+    with Session(credits_engine) as db:
+        consumed = db.exec(select(UserCreditsRecord).where(UserCreditsRecord.channel == CreditsChannel.consume)).all()
+    assert [(record.source_id, record.amount) for record in consumed] == [(9, -22)]
+
+
+def test_insufficient_credits(credits_engine):
+    with Session(credits_engine) as db:
+        assert UserCreditsRecord.consume_credits_batch([CreditUsage(user_id=1, amount=450)], db) == {1: 50}
+        with pytest.raises(Exception, match="Insufficient credits"):
+            UserCreditsRecord.consume_credits(1, 1, db)
+
+
+def test_balance_row_is_written_through_and_invalidated_by_grants(credits_engine, monkeypatch):
+    assert UserCreditsRecord.get_temp_credits(1)[0] == 100
+    assert UserCreditsRecord.get_permanent_credits(1) == 300
+
+    def no_refresh(*args, **kwargs):
+        raise AssertionError("balance should not be recomputed")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(UserCreditsBalance, "refresh", no_refresh)
+        with Session(credits_engine) as db:
+            UserCreditsRecord.consume_credits(1, 30, db)
+        assert UserCreditsRecord.get_temp_credits(1)[0] == 70
+
+    with Session(credits_engine) as db:
+        db.add(UserCreditsRecord(user_id=1, amount=500, channel=CreditsChannel.addon))
+        db.commit()
+        assert db.get(UserCreditsBalance, 1) is None
+    assert UserCreditsRecord.get_permanent_credits(1) == 800
+
+
+def test_concurrent_settlement_never_double_spends(credits_engine):
+    workers = 8
+    amount = 60
+    barrier = threading.Barrier(workers)
+    shortfalls: list[int] = []
+    errors: list[Exception] = []
+
+    def settle(i: int):
+        barrier.wait()
+        try:
+            with Session(credits_engine) as db:
+                shortfall = UserCreditsRecord.consume_credits_batch(
+                    [CreditUsage(user_id=1, amount=amount, source_id=i + 1)], db
+                )
+                shortfalls.append(shortfall.get(1, 0))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=settle, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    charged = workers * amount - sum(shortfalls)
+    balances = _balances(credits_engine)
+    # 480 requested against 400 available: every credit is spent exactly once.
+    assert charged == 400
+    assert sum(balances.values()) == 400
+    assert balances == {CreditsChannel.daily: 100, CreditsChannel.monthly: 100, CreditsChannel.paid: 200}
+    assert _user_credits(credits_engine) == 0
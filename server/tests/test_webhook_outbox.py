@@ -0,0 +1,247 @@
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Eigent.ai All Rights Reserved. =========
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.core import redis_utils
+from app.core.database import session
+from app.domains.trigger.api import webhook_controller
+from app.domains.trigger.service.webhook_outbox_service import WebhookOutboxService
+from app.model.trigger.trigger import Trigger
+from app.model.trigger.trigger_execution import TriggerExecution
+from app.model.trigger.webhook_outbox import WebhookOutbox
+from app.shared.types.trigger_types import TriggerStatus, TriggerType, WebhookOutboxStatus
+
+
+@pytest.fixture
+def trigger_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[Trigger.__table__, TriggerExecution.__table__, WebhookOutbox.__table__]
+    )
+    return engine
+
+
+@pytest.fixture
+def published(monkeypatch):
+    batches = []
+    manager = SimpleNamespace(publish_execution_events=lambda events: batches.append(list(events)) or True)
+    monkeypatch.setattr(redis_utils, "get_redis_manager", lambda: manager)
+    return batches
+
+
+def _webhook_trigger(db: Session, uuid: str = "hook-1", **overrides) -> Trigger:
+    values = {
+        "user_id": "user-1",
+        "project_id": "project-1",
+        "name": "webhook",
+        "trigger_type": TriggerType.webhook,
+        "status": TriggerStatus.active,
+        "webhook_url": f"/v1/webhook/trigger/{uuid}",
+        "webhook_uuid": uuid,
+        "task_prompt": "run",
+    }
+    values.update(overrides)
+    trigger = Trigger(**values)
+    db.add(trigger)
+    db.commit()
+    db.refresh(trigger)
+    return trigger
+
+
+def _enqueue(db: Session, trigger: Trigger, *bodies: dict) -> None:
+    service = WebhookOutboxService(db)
+    for body in bodies:
+        service.enqueue(
+            trigger,
+            {"method": "POST", "url": "http://testserver/", "headers": {}, "query_params": {}},
+            json.dumps(body)
+        )
+
+
+def test_batch_creates_executions_and_publishes_once(trigger_engine, published):
+    with Session(trigger_engine) as db:
+        trigger = _webhook_trigger(db)
+        _enqueue(db, trigger, *({"n": i} for i in range(5)))
+
+        assert WebhookOutboxService(db).dispatch_pending() == (5, 0, 0)
+
+        executions = db.exec(select(TriggerExecution).order_by(TriggerExecution.id)).all()
+        assert [execution.input_data["body"] for execution in executions] == [{"n": i} for i in range(5)]
+        assert len(published) == 1
+        assert [event["execution_id"] for event in published[0]] == [e.execution_id for e in executions]
+        assert db.exec(select(func.count()).select_from(WebhookOutbox)).one() == 0
+
+
+def test_filters_and_rate_limits_are_applied_by_the_dispatcher(trigger_engine, published):
+    with Session(trigger_engine) as db:
+        filtered = _webhook_trigger(db, "filtered", config={"body_contains": "deploy"})
+        limited = _webhook_trigger(db, "limited", max_executions_per_hour=2)
+        single = _webhook_trigger(db, "single", is_single_execution=True)
+        _enqueue(db, filtered, {"text": "deploy now"}, {"text": "ignore me"})
+        _enqueue(db, limited, *({"n": i} for i in range(5)))
+        _enqueue(db, single, {"n": 1}, {"n": 2})
+
+        dispatched, ignored, retried = WebhookOutboxService(db).dispatch_pending()
+
+        assert (dispatched, ignored, retried) == (4, 5, 0)
+        counts = dict(db.exec(
+            select(TriggerExecution.trigger_id, func.count()).group_by(TriggerExecution.trigger_id)
+        ).all())
+        assert counts == {filtered.id: 1, limited.id: 2, single.id: 1}
+        assert db.exec(select(func.count()).select_from(WebhookOutbox)).one() == 0
+
+
+def test_failed_publish_is_retried_without_a_second_execution(trigger_engine, monkeypatch):
+    attempts = []
+    manager = SimpleNamespace(
+        publish_execution_events=lambda events: attempts.append(list(events)) or len(attempts) > 1
+    )
+    monkeypatch.setattr(redis_utils, "get_redis_manager", lambda: manager)
+
+    with Session(trigger_engine) as db:
+        trigger = _webhook_trigger(db)
+        _enqueue(db, trigger, {"n": 1})
+        service = WebhookOutboxService(db)
+
+        assert service.dispatch_pending() == (1, 0, 1)
+        row = db.exec(select(WebhookOutbox)).one()
+        assert row.status == WebhookOutboxStatus.delivering
+        assert row.attempts == 1
+        assert row.next_attempt_at > datetime.now(timezone.utc).replace(tzinfo=None)
+
+        # Not due yet
+        assert service.dispatch_pending() == (0, 0, 0)
+        row.next_attempt_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+        db.add(row)
+        db.commit()
+
+        assert service.dispatch_pending() == (0, 0, 0)
+        assert len(attempts) == 2
+        assert attempts[0][0]["execution_id"] == attempts[1][0]["execution_id"]
+        assert db.exec(select(func.count()).select_from(TriggerExecution)).one() == 1
+        assert db.exec(select(func.count()).select_from(WebhookOutbox)).one() == 0
+
+
+def test_rows_are_kept_as_failed_after_max_attempts(trigger_engine, published, monkeypatch):
+    from app.domains.trigger.service import webhook_outbox_service
+
+    monkeypatch.setattr(webhook_outbox_service, "WEBHOOK_OUTBOX_MAX_ATTEMPTS", 2)
+    with Session(trigger_engine) as db:
+        trigger = _webhook_trigger(db, config={"message_filter": "("})
+        _enqueue(db, trigger, {"text": "x"})
+        service = WebhookOutboxService(db)
+
+        for _ in range(2):
+            row = db.exec(select(WebhookOutbox)).one()
+            row.next_attempt_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+            db.add(row)
+            db.commit()
+            assert service.dispatch_pending() == (0, 0, 1)
+
+        row = db.exec(select(WebhookOutbox)).one()
+        assert row.status == WebhookOutboxStatus.failed
+        assert row.last_error.startswith("filter failed")
+        assert db.exec(select(func.count()).select_from(TriggerExecution)).one() == 0
+
+
+def test_outbox_rows_are_claimed_with_skip_locked(trigger_engine):
+    with Session(trigger_engine) as db:
+        statements = []
+        exec_ = db.exec
+        db.exec = lambda statement, **kwargs: statements.append(statement) or exec_(statement, **kwargs)
+
+        WebhookOutboxService(db).claim_batch()
+
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+@pytest.fixture
+def webhook_client(trigger_engine, monkeypatch):
+    dispatch_requests = []
+
+    async def request_dispatch():
+        dispatch_requests.append(1)
+
+    monkeypatch.setattr(webhook_controller, "request_dispatch", request_dispatch)
+
+    def test_session():
+        with Session(trigger_engine) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(webhook_controller.router)
+    app.dependency_overrides[session] = test_session
+    for route in webhook_controller.router.routes:
+        for dependency in getattr(route, "dependencies", []):
+            app.dependency_overrides[dependency.dependency] = lambda: None
+    with TestClient(app) as client:
+        client.dispatch_requests = dispatch_requests
+        yield client
+
+
+def test_webhook_is_accepted_without_creating_an_execution(trigger_engine, webhook_client):
+    with Session(trigger_engine) as db:
+        _webhook_trigger(db, "legacy-hook", webhook_url="/webhook/trigger/legacy-hook")
+
+    response = webhook_client.post("/webhook/trigger/legacy-hook", json={"n": 1})
+
+    assert response.status_code == 202
+    assert webhook_client.dispatch_requests == [1]
+    with Session(trigger_engine) as db:
+        row = db.exec(select(WebhookOutbox)).one()
+        assert response.json()["event_id"] == row.id
+        assert json.loads(row.body) == {"n": 1}
+        assert db.exec(select(func.count()).select_from(TriggerExecution)).one() == 0
+
+    assert webhook_client.post("/webhook/trigger/unknown", json={}).status_code == 404
+
+
+def test_burst_from_a_stand_in_sender(trigger_engine, webhook_client, published):
+    """A local sender fires a burst at the endpoint; the dispatcher drains it afterwards."""
+    total = 1_000
+    with Session(trigger_engine) as db:
+        _webhook_trigger(db, "burst")
+
+    started = time.monotonic()
+    statuses = [
+        webhook_client.post("/webhook/trigger/burst", json={"n": i}).status_code
+        for i in range(total)
+    ]
+    accept_elapsed = time.monotonic() - started
+
+    assert statuses == [202] * total
+    with Session(trigger_engine) as db:
+        started = time.monotonic()
+        dispatched, ignored, retried = WebhookOutboxService(db).dispatch_pending()
+        dispatch_elapsed = time.monotonic() - started
+
+        assert (dispatched, ignored, retried) == (total, 0, 0)
+        assert db.exec(select(func.count()).select_from(TriggerExecution)).one() == total
+
+    assert len(published) == total // 100
+    assert accept_elapsed < 60
+    assert dispatch_elapsed < 60